@@ -11,7 +11,7 @@
 import time, os
 
 # Third-party Library
-import win32com.client
+# win32com 仅在首次真正连接 AEDT 时导入, 见 DispatchAnsoftApp
 
 # Import the OSL with "from"
 from typing import TypeVar
@@ -24,11 +24,283 @@ from typing import List, Tuple, Dict
 # 该变量类型表示 hfss 控件句柄
 handle = TypeVar("handle")
 
+
+# 句柄钩子列表 每个钩子为 hook(instance, handle) -> handle, 读取非空句柄时依次调用, 如 hfss.instrument 的计时代理
+# 列表为空时读取句柄没有额外开销
+handleHooks = []
+
+
+# LazyHandle 类的定义 句柄描述符, 句柄为空时通过对象的 resolver 按需解析
+class LazyHandle(object):
+    """
+    各对象的 handle 属性均为该描述符. 读取 handle 时若句柄为空且对象设置了 resolver,
+    则调用 resolver() 解析句柄并缓存; 解析结果为 None 时不缓存, 下次读取时重新解析.
+    直接给 handle 赋值的用法保持不变. 非空句柄在返回前经过 handleHooks 中的钩子.
+    """
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        __handle = instance.__dict__.get("_handle")
+        if __handle is None:
+            resolver = instance.__dict__.get("resolver")
+            if resolver is not None:
+                __handle = resolver()
+                self.__set__(instance, __handle)
+        if handleHooks and __handle is not None:
+            for hook in handleHooks:
+                __handle = hook(instance, __handle)
+        return __handle
+
+    def __set__(self, instance, value):
+        previous = instance.__dict__.get("_handle")
+        # COM 每次返回新的包装对象, 因此用 == 判断是否为同一个 AEDT 对象
+        changed = previous is not value and (previous is None or value is None or previous != value)
+        instance.__dict__["_handle"] = value
+        # 句柄发生变化时通知对象清理与旧句柄相关的客户端状态
+        if changed and hasattr(instance, "HandleChanged"):
+            instance.HandleChanged()
+
+
+# 脚本接口工厂 appFactory(hfss_app, new_instance) -> 脚本接口句柄, 为 None 时使用 COM
+# 通过 hfss.backend.UseSimulated() 替换为纯 Python 的模拟后端, 或设置环境变量 HFSS_API_BACKEND=simulated
+appFactory = None
+
+
+def DefaultAppFactory(hfss_app: str, new_instance: bool = False) -> handle:
+    """
+    默认的脚本接口工厂: 环境变量 HFSS_API_BACKEND=simulated 时使用模拟后端, 否则通过 COM 连接 (或启动) AEDT,
+    win32com 在此处才被导入
+    :param hfss_app: COM 程序标识 如 "AnsoftHfss.HfssScriptInterface"
+    :param new_instance: 为 True 时启动新的 AEDT 进程, 否则连接已运行的 AEDT
+    :return: 脚本接口 IDispatch
+    """
+    if os.environ.get("HFSS_API_BACKEND", "com").lower() == "simulated":
+        from hfss import backend
+        return backend.SimulatedAnsoftApp()
+    import win32com.client
+    if new_instance:
+        return win32com.client.DispatchEx(hfss_app)
+    return win32com.client.Dispatch(hfss_app)
+
+
+def DispatchAnsoftApp(hfss_app: str, new_instance: bool = False) -> handle:
+    """
+    创建脚本接口, 设置了 appFactory 时由其创建, 否则使用 DefaultAppFactory
+    :param hfss_app: COM 程序标识 如 "AnsoftHfss.HfssScriptInterface"
+    :param new_instance: 为 True 时启动新的 AEDT 进程, 否则连接已运行的 AEDT
+    :return: 脚本接口 IDispatch
+    """
+    if appFactory is not None:
+        return appFactory(hfss_app, new_instance)
+    return DefaultAppFactory(hfss_app, new_instance)
+
+
+# VariableCache 类的定义 项目/设计变量的客户端缓存, 读取变量时命中缓存则无需 COM 调用
+class VariableCache(object):
+    """
+    缓存变量名列表和变量值. 通过本库的 ChangeProperty/SetVariableValue 写入变量时同步更新缓存,
+    在 AEDT 界面或其他脚本中修改变量后应调用 Invalidate() 使缓存失效.
+    hits 为命中次数, 即节省的 COM 调用次数; misses 为未命中 (实际调用 COM) 的次数.
+    """
+    # ChangeProperty 中与变量相关的属性页
+    VARIABLE_TABS = ("LocalVariableTab", "ProjectVariableTab")
+
+    def __init__(self):
+        self.names = None  # 变量名元组, None 表示尚未从 AEDT 读取
+        self.values = {}  # {变量名: 值字符串}
+        self.hits = 0
+        self.misses = 0
+
+    def Invalidate(self):
+        """
+        清空缓存, 下次读取时重新从 AEDT 获取
+        :return: None
+        """
+        self.names = None
+        self.values = {}
+
+    def Peek(self, name):
+        """
+        读取缓存的变量值, 不计入命中统计, 未缓存时返回 None
+        :param name: 变量名
+        :return: 值字符串或 None
+        """
+        return self.values.get(name)
+
+    def Store(self, name, value):
+        """
+        写入变量值, 新变量同时加入变量名列表
+        :param name: 变量名
+        :param value: 变量值
+        :return: None
+        """
+        self.values[name] = str(value)
+        if self.names is not None and name not in self.names:
+            self.names = self.names + (name,)
+
+    def Remove(self, name):
+        self.values.pop(name, None)
+        if self.names is not None and name in self.names:
+            self.names = tuple(n for n in self.names if n != name)
+
+    def ApplyChangeProperty(self, args):
+        """
+        根据 ChangeProperty 的参数更新缓存, 无法识别的变量修改 (如重命名) 使缓存失效
+        :param args: ChangeProperty 的参数
+        :return: None
+        """
+        for tab in args[1:]:
+            if not isinstance(tab, (list, tuple)) or len(tab) == 0 or \
+                    tab[0][len("NAME:"):] not in self.VARIABLE_TABS:
+                continue
+            for group in tab[1:]:
+                if not isinstance(group, (list, tuple)) or len(group) == 0:
+                    continue
+                group_name = group[0]
+                if group_name == "NAME:PropServers":
+                    continue
+                for prop in group[1:]:
+                    if isinstance(prop, str):
+                        prop_name = prop[len("NAME:"):] if prop.startswith("NAME:") else prop
+                        if group_name == "NAME:DeletedProps":
+                            self.Remove(prop_name)
+                        else:
+                            self.Invalidate()
+                        continue
+                    prop_name = prop[0][len("NAME:"):]
+                    if group_name == "NAME:DeletedProps":
+                        self.Remove(prop_name)
+                    elif group_name in ("NAME:NewProps", "NAME:ChangedProps") and "Value:=" in prop \
+                            and "NewName:=" not in prop:
+                        self.Store(prop_name, prop[list(prop).index("Value:=") + 1])
+                    else:
+                        self.Invalidate()
+
+    def Statistics(self) -> Dict[str, int]:
+        """
+        :return: {"hits": 命中次数, "misses": 未命中次数, "cached": 已缓存的变量个数}
+        """
+        return {"hits": self.hits, "misses": self.misses, "cached": len(self.values)}
+
+
+# SolutionState 类的定义 设计求解状态的客户端记录, 用于在求解结果未变化时跳过报告更新、导出和重复计算
+class SolutionState(object):
+    """
+    每个求解设置有一个求解版本, 通过本库 Analyze/AnalyzeDistributed/Solve 求解后递增;
+    通过本库修改变量或属性、Undo/Redo 时 generation 递增, 全部求解设置的结果视为已变化.
+    reports 记录已知存在的报告名, report_args 记录创建各报告的参数, exports 记录每个导出文件对应的求解版本,
+    results 缓存按版本计算的结果.
+    在 AEDT 界面或通过 oEditor 修改模型后应调用 Invalidate().
+    """
+
+    def __init__(self):
+        self.generation = 0
+        self.versions = {}  # {求解设置名: 求解次数}
+        self.reports = None  # 已知存在的报告名集合, None 表示尚未从 AEDT 读取
+        self.report_args = {}  # {报告名: 创建报告的参数}
+        self.exports = {}  # {(报告名, 文件路径): 导出时的版本}
+        self.results = {}  # {键: 结果}
+        self.data_path = None  # 仿真数据保存路径
+
+    @staticmethod
+    def SetupName(setup) -> str:
+        return str(setup).split(":")[0].strip()
+
+    def Version(self, setup) -> tuple:
+        """
+        :param setup: 求解设置名, 也可以是 "Setup1 : Sweep" 形式的求解名
+        :return: 求解版本, 版本相同时求解结果相同
+        """
+        return self.generation, self.versions.get(self.SetupName(setup), 0)
+
+    def Solved(self, setup):
+        name = self.SetupName(setup)
+        self.versions[name] = self.versions.get(name, 0) + 1
+
+    def Invalidate(self):
+        """
+        使全部求解结果的版本失效
+        :return: None
+        """
+        self.generation += 1
+        self.results = {}
+
+    def Reset(self):
+        """
+        清空全部记录, 句柄变化时调用
+        :return: None
+        """
+        self.Invalidate()
+        self.versions = {}
+        self.reports = None
+        self.report_args = {}
+        self.exports = {}
+        self.data_path = None
+
+    def IsExported(self, report_name: str, file_path: str, version) -> bool:
+        return self.exports.get((report_name, file_path)) == version and os.path.exists(file_path)
+
+    def MarkExported(self, report_name: str, file_path: str, version):
+        self.exports[(report_name, file_path)] = version
+
+
 # hfss 类的定义: AnsoftApp, Desktop, Project, Design, Editor, Module.
 # Object 类的定义 该类包含 常用对象的公用方法
 class Object(object):
+    handle = LazyHandle()
+
     def __init__(self):
         self.handle = None
+        # 句柄为空时用于按需解析句柄的函数, 如 oProject 的 resolver 为 oDesktop.GetActiveProject
+        self.resolver = None
+        # 项目/设计变量缓存
+        self.variable_cache = VariableCache()
+        # 句柄由本对象派生的对象 (如设计之于项目), 本对象句柄变化时它们的句柄被置空并重新解析
+        self.dependents = []
+
+    def IsResolved(self) -> bool:
+        """
+        判断句柄是否已经解析, 不会触发解析
+        :return: bool
+        """
+        return self.__dict__.get("_handle") is not None
+
+    def HandleChanged(self):
+        """
+        句柄变化时调用, 清理与旧句柄相关的客户端状态
+        :return: None
+        """
+        if "variable_cache" in self.__dict__:
+            self.variable_cache.Invalidate()
+        if "solution_state" in self.__dict__:
+            self.solution_state.Reset()
+        if "geometry_model" in self.__dict__:
+            self.geometry_model = None
+        if "model_revision" in self.__dict__:
+            self.model_revision += 1
+        for dependent in self.__dict__.get("dependents", ()):
+            dependent.handle = None
+
+    def ContentChanged(self):
+        """
+        通过本库修改变量或属性后调用, 使本对象及派生对象 (如项目之于设计) 的求解状态失效
+        :return: None
+        """
+        if "solution_state" in self.__dict__:
+            self.solution_state.Invalidate()
+        for dependent in self.__dict__.get("dependents", ()):
+            if isinstance(dependent, Object):
+                dependent.ContentChanged()
+
+    def LoadVariables(self):
+        """
+        一次性读取所有变量名及变量值并填充缓存
+        :return: {变量名: 值字符串}
+        """
+        for name in self.GetVariables():
+            self.GetVariablesValue(name)
+        return dict(self.variable_cache.values)
 
     def GetName(self):
         """ 描述
@@ -106,8 +378,15 @@ class Object(object):
         Returns a list of all defined variables. To get a list of project variables, execute this command using
         oProject. To get a list of local variables, use oDesign.
         :return: Array of strings containing the variables
+        结果被缓存, 再次调用时不访问 COM
         """
-        return self.handle.GetVariables()
+        cache = self.variable_cache
+        if cache.names is None:
+            cache.misses += 1
+            cache.names = tuple(self.handle.GetVariables())
+        else:
+            cache.hits += 1
+        return cache.names
 
     def GetVariablesValue(self, VarName):
         """
@@ -116,8 +395,16 @@ class Object(object):
         :param VarName: str
             Name of the variable to access.
         :return: A string representing the value of the variable.
+        结果被缓存, 再次调用时不访问 COM
         """
-        return self.handle.GetVariablesValue(VarName)
+        cache = self.variable_cache
+        if VarName in cache.values:
+            cache.hits += 1
+            return cache.values[VarName]
+        cache.misses += 1
+        value = self.handle.GetVariablesValue(VarName)
+        cache.values[VarName] = value
+        return value
 
     def ChangeProperty(self, args):
         """
@@ -132,6 +419,8 @@ class Object(object):
         :return: None
         """
         self.handle.ChangeProperty(args)
+        self.variable_cache.ApplyChangeProperty(args)
+        self.ContentChanged()
 
     def SetPropertyValue(self, propTab, propServer, propName, propValue):
         """
@@ -161,6 +450,7 @@ class Object(object):
         :return: None
         """
         self.handle.SetPropertyValue(propTab, propServer, propName, propValue)
+        self.ContentChanged()
 
     def SetVariableValue(self, VarName, VarValue):
         """
@@ -173,12 +463,27 @@ class Object(object):
         :return: None
         """
         self.handle.SetVariableValue(VarName, VarValue)
+        self.variable_cache.Store(VarName, VarValue)
+        self.ContentChanged()
 
 
 # Desktop 类的定义 该类对象用于执行桌面级的操作，包括项目管理
 class Desktop(object):
+    handle = LazyHandle()
+
     def __init__(self, ansoft_handle):
-        self.handle = ansoft_handle.GetAppDesktop()
+        """
+        :param ansoft_handle: AnsoftApp 对象或脚本接口句柄, 桌面句柄在首次使用时才通过其 GetAppDesktop 获取
+        """
+        self.handle = None
+        self.resolver = ansoft_handle.GetAppDesktop
+
+    def IsResolved(self) -> bool:
+        """
+        判断桌面句柄是否已经解析, 不会触发连接
+        :return: bool
+        """
+        return self.__dict__.get("_handle") is not None
 
     def AddMessage(self, project_name, design_name, severity, msg,
                    *category):
@@ -264,7 +569,7 @@ class Desktop(object):
             print("当前桌面无可用项目")
         return __handle
 
-    def GetMassages(self, project_name, design_name, severity):
+    def GetMessages(self, project_name, design_name, severity):
         """ 描述
         Get the messages from a specified project and design
 
@@ -285,7 +590,30 @@ class Desktop(object):
         -------
         A simple array of strings.
         """
-        return self.handle.GetMassages(project_name, design_name, severity)
+        return self.handle.GetMessages(project_name, design_name, severity)
+
+    # 早期版本的拼写, 保留以兼容已有脚本
+    GetMassages = GetMessages
+
+    def StopSimulations(self):
+        """ 描述
+        Stops all simulations that are currently running.
+
+        Returns
+        -------
+        None
+        """
+        self.handle.StopSimulations()
+
+    def AreThereSimulationsRunning(self) -> bool:
+        """ 描述
+        Checks whether any simulation is currently running.
+
+        Returns
+        -------
+        bool
+        """
+        return bool(self.handle.AreThereSimulationsRunning())
 
     def NewProject(self):
         self.handle.NewProject()
@@ -514,6 +842,8 @@ class Project(Object):
 
     def Redo(self):
         self.handle.Redo()
+        self.variable_cache.Invalidate()
+        self.ContentChanged()
 
     def Rename(self, new_name, over_write_ok):
         """ 描述
@@ -622,6 +952,8 @@ class Project(Object):
         None
         """
         self.handle.Undo()
+        self.variable_cache.Invalidate()
+        self.ContentChanged()
 
     def UpdateDefinitions(self):
         """ 描述
@@ -731,6 +1063,20 @@ class Design(Object):
     def __init__(self):
         super(Design, self).__init__()
         self.handle = None
+        # 求解状态, 见 SolutionState
+        self.solution_state = SolutionState()
+        # 最近一次通过 hfss.modeler.Apply 应用的声明式模型, 下次应用时与其比较, 只修改变化的部分
+        self.geometry_model = None
+        # 模型版本, 本库修改几何、求解设置或远场球坐标时递增, 见 ModelChanged
+        self.model_revision = 0
+
+    def ModelChanged(self):
+        """
+        通过本库修改几何、求解设置或远场球坐标后调用, 模型版本递增;
+        依赖模型指纹的客户端缓存 (如 hfss.cache.ResultCache) 在版本变化后重新计算指纹. 只修改设计变量时不调用
+        :return: None
+        """
+        self.model_revision += 1
 
     """ < ModuleName >
     Analysis Module – "AnalysisSetup"
@@ -792,7 +1138,9 @@ class Design(Object):
         Example
         oDesign.Analyze('TR1')
         """
-        return self.handle.Analyze(setup)
+        result = self.handle.Analyze(setup)
+        self.solution_state.Solved(setup)
+        return result
 
     def AnalyzeDistributed(self, SetupName):
         """
@@ -802,7 +1150,9 @@ class Design(Object):
         :return: int
             0 – Success, Else – Error
         """
-        self.handle.AnalyzeDistributed(SetupName)
+        result = self.handle.AnalyzeDistributed(SetupName)
+        self.solution_state.Solved(SetupName)
+        return result
 
     def ClearLinkedData(self):
         """
@@ -1127,6 +1477,10 @@ class Design(Object):
 
     def Redo(self):
         self.handle.Redo()
+        self.variable_cache.Invalidate()
+        self.geometry_model = None
+        self.ModelChanged()
+        self.ContentChanged()
 
     def RenameDesignInstance(self, OldName, NewName):
         self.handle.RenameDesignInstance(OldName, NewName)
@@ -1213,10 +1567,17 @@ class Design(Object):
             Array containing string simulation names.
         :return:  0 – Simulation(s) completed. 1 – Simulation error. -1 – Command execution error.
         """
-        return self.handle.Solve(SimulationNames)
+        result = self.handle.Solve(SimulationNames)
+        for name in SimulationNames:
+            self.solution_state.Solved(name)
+        return result
 
     def Undo(self):
         self.handle.Undo()
+        self.variable_cache.Invalidate()
+        self.geometry_model = None
+        self.ModelChanged()
+        self.ContentChanged()
 
     def ValidateDesign(self):
         return self.handle.ValidateDesign()
@@ -1623,6 +1984,23 @@ class Module(Object):
         """
         self.handle.InsertFarFieldSphereSetup(InfSphereParams)
 
+    def EditFarFieldSphereSetup(self, SetupName, InfSphereParams):
+        """
+        Modifies an existing far-field infinite sphere radiation setup.
+        :param SetupName: str, name of the infinite sphere setup to edit
+        :param InfSphereParams: same as InsertFarFieldSphereSetup
+        :return: None
+        """
+        self.handle.EditFarFieldSphereSetup(SetupName, InfSphereParams)
+
+    def DeleteFarFieldSetup(self, SetupNameArray):
+        """
+        Deletes existing far-field radiation setups.
+        :param SetupNameArray: array of str
+        :return: None
+        """
+        self.handle.DeleteFarFieldSetup(SetupNameArray)
+
     # AnalysisSetup
     def GetSetups(self) -> tuple:
         """
@@ -1631,6 +2009,14 @@ class Module(Object):
         """
         return self.handle.GetSetups()
 
+    def GetSweeps(self, SetupName) -> tuple:
+        """
+        Gets the names of all sweeps in a given solution setup.
+        :param SetupName: str
+        :return: tuple of str
+        """
+        return self.handle.GetSweeps(SetupName)
+
     def InsertSetup(self, SetupType, AttributesArray):
         """
         :param SetupType:
@@ -1710,6 +2096,51 @@ class Module(Object):
         """
         self.handle.EditFrequencySweep(SetupName, SweepName, AttributesArray)
 
+    def EditSetup(self, SetupName, AttributesArray):
+        """
+        Modifies an existing setup. Also used by the Optimetrics module for parametric setups.
+        :param SetupName: str
+        :param AttributesArray: array, same structure as InsertSetup
+        :return: None
+        """
+        self.handle.EditSetup(SetupName, AttributesArray)
+
+    def DeleteSetups(self, SetupNameArray):
+        """
+        Deletes one or more setups. Also used by the Optimetrics module.
+        :param SetupNameArray: array of str
+        :return: None
+        """
+        self.handle.DeleteSetups(SetupNameArray)
+
+    # Optimetrics
+    def GetSetupNames(self, SetupType=None) -> tuple:
+        """
+        Gets the names of the Optimetrics setups in the design.
+        For the RadField module, gets the names of the far-field or near-field setups of the given type.
+        :param SetupType: str, RadField only, "Infinite Sphere", "Near Line"...
+        :return: tuple of str
+        """
+        if SetupType is None:
+            return self.handle.GetSetupNames()
+        return self.handle.GetSetupNames(SetupType)
+
+    def GetSetupNamesByType(self, OptimetricsType) -> tuple:
+        """
+        Gets the names of the Optimetrics setups of a given type.
+        :param OptimetricsType: str "OptiParametric", "OptiOptimization", "OptiSensitivity", "OptiStatistical"...
+        :return: tuple of str
+        """
+        return self.handle.GetSetupNamesByType(OptimetricsType)
+
+    def SolveSetup(self, SetupName):
+        """
+        Solves an Optimetrics setup. Equivalent to oDesign.Analyze(SetupName).
+        :param SetupName: str
+        :return: int 0 – Success, Else – Error
+        """
+        return self.handle.SolveSetup(SetupName)
+
     # Solutions
     def ExportNetworkData(self, DesignVariationKey, SolnSelectionArray, FileFormat, OutFile, FreqsArray,
                           DoRenorm, RenormImped, DataType, Pass, ComplexFormat, TouchstoneNumberofDigitsPrecision,
@@ -2027,13 +2458,13 @@ class Editor(Object):
         self.handle.DeletePolylinePoint(DeletePointArray)
 
     def DuplicateAlongLine(self, SelectionsArray, ParametersArray, OptionsArray, CreateGroup):
-        self.handle.DuplicateAlongLine(SelectionsArray, ParametersArray, OptionsArray, CreateGroup)
+        return self.handle.DuplicateAlongLine(SelectionsArray, ParametersArray, OptionsArray, CreateGroup)
 
     def DuplicateAroundAxis(self, SelectionsArray, ParametersArray, OptionsArray, CreateGroup):
-        self.handle.DuplicateAroundAxis(SelectionsArray, ParametersArray, OptionsArray, CreateGroup)
+        return self.handle.DuplicateAroundAxis(SelectionsArray, ParametersArray, OptionsArray, CreateGroup)
 
     def DuplicateMirror(self, SelectionsArray, ParametersArray, OptionsArray, CreateGroup):
-        self.handle.DuplicateMirror(SelectionsArray, ParametersArray, OptionsArray, CreateGroup)
+        return self.handle.DuplicateMirror(SelectionsArray, ParametersArray, OptionsArray, CreateGroup)
 
     def Mirror(self, SelectionsArray, MirrorParameters):
         self.handle.Mirror(SelectionsArray, MirrorParameters)
@@ -2322,11 +2753,31 @@ class Editor(Object):
 
 # AnsoftApp 类的定义 该类对象为IronPython或 VBScript 提供了一个访问 Ansoft.ElectronicsDesktop 产品。
 class AnsoftApp(object):
-    def __init__(self, hfss_app):
-        self.handle = win32com.client.Dispatch(hfss_app)
+    handle = LazyHandle()
+
+    def __init__(self, hfss_app, new_instance=False):
+        # 仅记录程序标识, 首次访问 handle 时才进行 COM 连接
+        self.app_name = hfss_app
+        self.new_instance = new_instance
+        self.handle = None
+        self.resolver = lambda: DispatchAnsoftApp(self.app_name, self.new_instance)
         self.oDesktop = None
         pass
 
+    def IsConnected(self) -> bool:
+        """
+        判断是否已经连接 AEDT, 不会触发连接
+        :return: bool
+        """
+        return self.__dict__.get("_handle") is not None
+
+    def Connect(self):
+        """
+        立即连接 AEDT, 一般无需调用, 首次访问句柄时会自动连接
+        :return: 脚本接口句柄
+        """
+        return self.handle
+
     def GetAppDesktop(self):
         return self.handle.GetAppDesktop()
         pass
@@ -2340,16 +2791,123 @@ class AnsoftApp(object):
         pass
 
 
+# Session 类的定义 该类对象对应于一个 AEDT 桌面连接
+class Session(object):
+    def __init__(self, hfss_app="AnsoftHfss.HfssScriptInterface", new_instance=False, ansoft_app=None, desktop=None):
+        """
+        :param hfss_app: COM 程序标识
+        :param new_instance: 为 True 时启动独立的 AEDT 进程, 用于同时驱动多个桌面
+        :param ansoft_app: 已有的 AnsoftApp 对象, 为 None 时新建 (不立即连接)
+        :param desktop: 已有的 Desktop 对象, 为 None 时新建
+        """
+        self.oAnsoftApp = ansoft_app if ansoft_app is not None else AnsoftApp(hfss_app, new_instance)
+        self.oDesktop = desktop if desktop is not None else Desktop(self.oAnsoftApp)
+
+    def CreateContext(self, project_name=None, design_name=None):
+        """
+        在该桌面上创建一个设计上下文
+        :param project_name: 项目名称, 为 None 时使用活动项目
+        :param design_name: 设计名称, 为 None 时使用活动设计
+        :return: DesignContext
+        """
+        return DesignContext(self, project_name, design_name)
+
+
+# DesignContext 类的定义 该类对象持有一个设计的项目、设计及各模块句柄, 句柄只解析一次并在项目/设计变化时失效
+class DesignContext(object):
+    def __init__(self, session=None, project_name=None, design_name=None, project=None, design=None):
+        """
+        :param session: Session 对象, 为 None 时使用默认会话 oSession
+        :param project_name: 项目名称, 为 None 时使用活动项目
+        :param design_name: 设计名称, 为 None 时使用活动设计
+        :param project: 已有的 Project 对象, 为 None 时新建
+        :param design: 已有的 Design 对象, 为 None 时新建
+        """
+        self.session = session if session is not None else oSession
+        self.oDesktop = self.session.oDesktop
+        self.project_name = project_name
+        self.design_name = design_name
+        self.oProject = project if project is not None else Project()
+        self.oDesign = design if design is not None else Design()
+        self.oProject.resolver = self.ResolveProject
+        self.oDesign.resolver = self.ResolveDesign
+        self.oProject.dependents.append(self.oDesign)
+        # {模块名: Module 对象} 如 AnalysisSetup, ReportSetup, RadField, Solutions
+        self.modules = {}
+
+    def ResolveProject(self) -> handle:
+        if self.project_name is None:
+            return self.oDesktop.GetActiveProject()
+        return self.oDesktop.SetActiveProject(self.project_name)
+
+    def ResolveDesign(self) -> handle:
+        if self.oProject.handle is None:
+            return None
+        if self.design_name is None:
+            return self.oProject.GetActiveDesign()
+        return self.oProject.GetDesign(self.design_name)
+
+    def GetModule(self, module_name: str) -> Module:
+        """
+        得到设计的模块对象, 模块句柄在首次使用时解析一次, 设计变化后重新解析
+        :param module_name: 模块名 如 "AnalysisSetup", "ReportSetup", "RadField", "Solutions"
+        :return: Module
+        """
+        module = self.modules.get(module_name)
+        if module is None:
+            module = Module()
+            module.resolver = lambda: self.oDesign.GetModule(module_name)
+            self.oDesign.dependents.append(module)
+            self.modules[module_name] = module
+        return module
+
+    def GetEditor(self, editor_name: str = "3D Modeler") -> Editor:
+        """
+        得到设计的编辑器对象, 句柄解析规则同 GetModule
+        :param editor_name: 编辑器名 默认为 "3D Modeler"
+        :return: Editor
+        """
+        key = "Editor:" + editor_name
+        editor = self.modules.get(key)
+        if editor is None:
+            editor = Editor()
+            editor.resolver = lambda: self.oDesign.SetActiveEditor(editor_name)
+            self.oDesign.dependents.append(editor)
+            self.modules[key] = editor
+        return editor
+
+    def Reset(self):
+        """
+        置空项目句柄 (设计及模块句柄随之置空), 下次使用时重新解析
+        :return: None
+        """
+        self.oProject.handle = None
+
+
+def ResolveContext(context=None) -> DesignContext:
+    """
+    模块级函数使用的上下文, context 为 None 时返回默认上下文 oContext
+    :param context: DesignContext 或 None
+    :return: DesignContext
+    """
+    if context is None:
+        return oContext
+    return context
+
+
 # 下面为 hfss 各对象的实例化
 # hfss 脚本控制接口
 hfssAppName = "AnsoftHfss.HfssScriptInterface"
 
-# 各对象实例化
+# 各对象实例化 导入时不连接 AEDT, 各句柄在首次使用时按需解析
 oAnsoftApp = AnsoftApp(hfssAppName)
-oDesktop = Desktop(oAnsoftApp.handle)
-# 下面对象句柄初始化为空 使用时应先对句柄进行相应的初始化
+oDesktop = Desktop(oAnsoftApp)
+oSession = Session(ansoft_app=oAnsoftApp, desktop=oDesktop)
+# 下面对象句柄初始化为空 未赋值时 oProject/oDesign 分别解析为当前活动的项目/设计
 oProject = Project()
 oDesign = Design()
+# 默认上下文 basic/analysis 中的模块级函数在未指定 context 时使用
+oContext = DesignContext(oSession, project=oProject, design=oDesign)
 oEditor = Editor()
 oModule = Module()
 
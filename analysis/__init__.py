@@ -12,16 +12,19 @@
 """
 
 # Official Standard Library
+import math
 import os
+import re
 # import csv
 
 # Third-party Library
-import pandas as pd
+# pandas 仅在解析仿真数据时导入, 见 GetAntennaPerformance
 
 # Local Library
 # import hfss
 
 # Import the OSL with "from"
+from collections import OrderedDict
 
 
 # Import the TPL with "from"
@@ -29,68 +32,194 @@ import pandas as pd
 
 # Import the LL with "from"
 # 引入 hfss 控制对象
-from hfss import oDesktop, oProject, oDesign, oModule
+from hfss import ResolveContext
 
 
-def InsertRadFieldSphereSetup():
+# 各函数的 context 参数为 DesignContext, 为 None 时使用默认上下文 hfss.oContext
+def GetAnalysisDataPath(context=None) -> str:
+    """
+    得到仿真数据的保存路径 <工程路径>/<工程名>.system_analysis_data, 不存在则创建
+    :return: str
+    """
+    ctx = ResolveContext(context)
+    state = ctx.oDesign.solution_state
+    if state.data_path is not None and os.path.exists(state.data_path):
+        return state.data_path
+    project_path = ctx.oProject.GetPath()  # 获得当前工程文件路径
+    project_name = ctx.oProject.GetName()  # 获得当前工程名
+    data_path = project_path + "/" + project_name + ".system_analysis_data"
+    if os.path.exists(data_path) is False:
+        os.makedirs(data_path)  # 如果不存在则需创建文件夹
+        pass
+    state.data_path = data_path
+    return data_path
+
+
+# 远场球坐标的分辨率预设 {名称: ((ThetaStart, ThetaStop, ThetaStep), (PhiStart, PhiStop, PhiStep))} 单位 deg
+SPHERE_PRESETS = OrderedDict([
+    ("Full", ((-180, 180, 1), (0, 360, 1))),  # 1deg 全球面, 原默认设置
+    ("Standard", ((-180, 180, 2), (0, 360, 5))),
+    ("Coarse", ((-180, 180, 10), (0, 360, 10))),
+    ("Cuts", ((-180, 180, 1), (0, 90, 90))),  # Phi 0deg 与 90deg 两个主平面, 可用于 GenerateRadiationPattern
+    ("Boresight", ((0, 0, 1), (0, 90, 90))),  # 仅主轴方向, 满足 GetAntennaPerformance 的轴比和增益
+    # 命名切面
+    ("EPlane", ((-180, 180, 1), (0, 0, 1))),
+    ("HPlane", ((-180, 180, 1), (90, 90, 1))),
+])
+
+
+def SphereParams(sphere_name: str, theta, phi) -> list:
+    """
+    生成远场球坐标设置参数
+    :param sphere_name: 远场球坐标名称
+    :param theta: (ThetaStart, ThetaStop, ThetaStep) 单位 deg
+    :param phi: (PhiStart, PhiStop, PhiStep) 单位 deg
+    :return: InsertFarFieldSphereSetup 的参数
+    """
+    return [
+        "NAME:" + sphere_name,
+        "UseCustomRadiationSurface:=", False,
+        "CSDefinition:=", "Theta-Phi",
+        "Polarization:=", "Linear",
+        "ThetaStart:=", str(theta[0]) + "deg",
+        "ThetaStop:=", str(theta[1]) + "deg",
+        "ThetaStep:=", str(theta[2]) + "deg",
+        "PhiStart:=", str(phi[0]) + "deg",
+        "PhiStop:=", str(phi[1]) + "deg",
+        "PhiStep:=", str(phi[2]) + "deg",
+        "UseLocalCS:=", False
+    ]
+
+
+def SetSphere(sphere_name: str, theta, phi, context=None) -> bool:
+    """
+    插入远场球坐标, 已存在时修改其范围
+    :return: 是否修改了已存在的远场球坐标
+    """
+    ctx = ResolveContext(context)
+    module = ctx.GetModule("RadField")
+    params = SphereParams(sphere_name, theta, phi)
+    ctx.oDesign.ModelChanged()
+    if sphere_name in module.GetSetupNames("Infinite Sphere"):
+        module.EditFarFieldSphereSetup(sphere_name, params)
+        return True
+    module.InsertFarFieldSphereSetup(params)
+    return False
+
+
+def InsertRadFieldSphereSetup(preset: str = "Full", sphere_name: str = "Infinite Sphere1", theta=None, phi=None,
+                              context=None):
     """
     插入远场球坐标 Theta 起始坐标、结束坐标及步进弧度, Phi 起始坐标、结束坐标及步进弧度
+    只需要主轴方向的增益和轴比时使用 "Boresight", 远场计算及报告导出的点数远少于 "Full"
+    :param preset: 分辨率预设或命名切面, 见 SPHERE_PRESETS, 默认为 1deg 全球面
+    :param sphere_name: 远场球坐标名称, 已存在时修改其范围
+    :param theta: (ThetaStart, ThetaStop, ThetaStep) 单位 deg, 给出时覆盖预设
+    :param phi: (PhiStart, PhiStop, PhiStep) 单位 deg, 给出时覆盖预设
     :return:
     """
-    if oProject.handle is None:
-        oProject.handle = oDesktop.GetActiveProject()
-    if oDesign.handle is None:
-        oDesign.handle = oProject.GetActiveDesign()
-    oModule.handle = oDesign.GetModule("RadField")
-    oModule.InsertFarFieldSphereSetup(
-        [
-            "NAME:Infinite Sphere1",
-            "UseCustomRadiationSurface:=", False,
-            "CSDefinition:=", "Theta-Phi",
-            "Polarization:=", "Linear",
-            "ThetaStart:=", "-180deg",
-            "ThetaStop:=", "180deg",
-            "ThetaStep:=", "1deg",
-            "PhiStart:=", "0deg",
-            "PhiStop:=", "360deg",
-            "PhiStep:=", "1deg",
-            "UseLocalCS:=", False
+    if preset not in SPHERE_PRESETS:
+        raise ValueError("没有该远场球坐标预设: %s, 可选 %s" % (preset, ", ".join(SPHERE_PRESETS)))
+    ctx = ResolveContext(context)
+    preset_theta, preset_phi = SPHERE_PRESETS[preset]
+    if SetSphere(sphere_name, theta or preset_theta, phi or preset_phi, ctx):
+        # 远场球坐标变化后已导出的远场报告数据不再有效
+        ctx.oDesign.solution_state.Invalidate()
+
+
+class MeshLinkConfig(object):
+    """
+    求解设置的网格导入 (MeshLink): 以源设计在给定变化下求解得到的网格作为初始网格, 自适应迭代从该网格开始
+    """
+
+    def __init__(self, design_name: str, variables: dict, solution: str = "Setup1 : LastAdaptive",
+                 project: str = "This Project*", apply_mesh_ops: bool = True, force_source_to_solve: bool = False):
+        """
+        :param design_name: 源设计名称
+        :param variables: 源设计的变化 {变量名: 带单位的值}, 如 {"length": "30mm"}
+        :param solution: 源设计的求解结果, 如 "Setup1 : LastAdaptive"
+        :param project: 源项目, "This Project*" 为当前项目
+        :param apply_mesh_ops: 导入后是否应用本设计的网格操作
+        :param force_source_to_solve: 源设计在该变化下没有结果时是否先求解源设计
+        """
+        self.design_name = design_name
+        self.variables = dict(variables)
+        self.solution = solution
+        self.project = project
+        self.apply_mesh_ops = apply_mesh_ops
+        self.force_source_to_solve = force_source_to_solve
+
+    def Params(self) -> list:
+        """
+        :return: 求解设置参数中的 MeshLink 数组
+        """
+        params = ["NAME:Params"]
+        for name, value in self.variables.items():
+            params += [name + ":=", value]
+        return [
+            "NAME:MeshLink",
+            "ImportMesh:=", True,
+            "Project:=", self.project,
+            "Product:=", "HFSS",
+            "Design:=", self.design_name,
+            "Soln:=", self.solution,
+            params,
+            "ForceSourceToSolve:=", self.force_source_to_solve,
+            "PreservePartnerSoln:=", True,
+            "PathRelativeTo:=", "TargetProject",
+            "ApplyMeshOp:=", self.apply_mesh_ops
         ]
-    )
 
 
-def InsertSetup(setup_name: str, center_freq: float, max_delta: float, setup_type: str,
-                start_freq: float, stop_freq: float, range_count: int):
+# 不导入网格的 MeshLink 数组
+NO_MESH_LINK = ["NAME:MeshLink", "ImportMesh:=", False]
+
+
+class SetupConfig(object):
     """
-    插入求解设置
-    :param setup_name: 求解设置名称
-    :param center_freq: 求解中心频率 单位为 GHz
-    :param max_delta: 求解最大误差
-    :param setup_type: 频点遍历类型
-    :param start_freq: 起始频率 单位为 GHz
-    :param stop_freq: 结束频率 单位为 GHz
-    :param range_count: 求解点数
-    :return:
+    求解设置 (HfssDriven) 的参数, 默认值与 InsertSetup 原有的设置相同
     """
-    if oProject.handle is None:
-        oProject.handle = oDesktop.GetActiveProject()
-    if oDesign.handle is None:
-        oDesign.handle = oProject.GetActiveDesign()
-    oModule.handle = oDesign.GetModule("AnalysisSetup")
-    oModule.InsertSetup(
-        "HfssDriven",
-        [
+
+    def __init__(self, center_freq: float = 2.5, max_delta: float = 0.02, max_passes: int = 99, min_passes: int = 1,
+                 min_converged_passes: int = 3, percent_refinement: int = 30, basis_order: int = 1,
+                 save_any_fields: bool = True, mesh_link: MeshLinkConfig = None):
+        """
+        :param center_freq: 求解中心频率 (自适应网格剖分频率) 单位为 GHz
+        :param max_delta: 收敛条件 最大 Delta S
+        :param max_passes: 最大自适应迭代次数
+        :param min_passes: 最小自适应迭代次数
+        :param min_converged_passes: 连续满足收敛条件的迭代次数
+        :param percent_refinement: 每次迭代网格加密的百分比
+        :param basis_order: 基函数阶数 0, 1, 2, -1 为混合阶
+        :param save_any_fields: 是否保存场数据, 为 False 时只有 S 参数
+        :param mesh_link: 导入网格的设置, 为 None 时从初始网格开始自适应迭代
+        """
+        self.center_freq = center_freq
+        self.max_delta = max_delta
+        self.max_passes = max_passes
+        self.min_passes = min_passes
+        self.min_converged_passes = min_converged_passes
+        self.percent_refinement = percent_refinement
+        self.basis_order = basis_order
+        self.save_any_fields = save_any_fields
+        self.mesh_link = mesh_link
+
+    def Params(self, setup_name: str) -> list:
+        """
+        :return: InsertSetup / EditSetup 的参数
+        """
+        return [
             "NAME:" + setup_name,
             "SolveType:=", "Single",
-            "Frequency:=", str(center_freq) + "GHz",
-            "MaxDeltaS:=", max_delta,
+            "Frequency:=", str(self.center_freq) + "GHz",
+            "MaxDeltaS:=", self.max_delta,
             "UseMatrixConv:=", False,
-            "MaximumPasses:=", 99, "MinimumPasses:=", 1,
-            "MinimumConvergedPasses:=", 3,
-            "PercentRefinement:=", 30,
+            "MaximumPasses:=", self.max_passes, "MinimumPasses:=", self.min_passes,
+            "MinimumConvergedPasses:=", self.min_converged_passes,
+            "PercentRefinement:=", self.percent_refinement,
             "IsEnabled:=", True,
-            ["NAME:MeshLink", "ImportMesh:=", False],
-            "BasisOrder:=", 1,
+            self.mesh_link.Params() if self.mesh_link is not None else list(NO_MESH_LINK),
+            "BasisOrder:=", self.basis_order,
             "DoLambdaRefine:=", True,
             "DoMaterialLambda:=", True,
             "SetLambdaTarget:=", False,
@@ -102,316 +231,918 @@ def InsertSetup(setup_name: str, center_freq: float, max_delta: float, setup_typ
             "UseDomains:=", False,
             "UseIterativeSolver:=", False,
             "SaveRadFieldsOnly:=", False,
-            "SaveAnyFields:=", True,
+            "SaveAnyFields:=", self.save_any_fields,
             "IESolverType:=", "Auto",
             "LambdaTargetForIESolver:=", 0.15,
             "UseDefaultLambdaTgtForIESolver:=", True,
             "IE Solver Accuracy:=", "Balanced"
         ]
-    )
-    pass
 
-    oModule.InsertFrequencySweep(
-        setup_name,
-        [
-            "NAME:Sweep",
-            "IsEnabled:=", True,
-            "RangeType:=", "LinearCount",
-            "RangeStart:=", str(start_freq) + "GHz",
-            "RangeEnd:=", str(stop_freq) + "GHz",
-            "RangeCount:=", range_count,
-            "Type:=", setup_type,
-            "SaveFields:=", True,  # 保存场求解数据
-            "SaveRadFields:=", True,  # 保存远场求解数据
+
+class SweepConfig(object):
+    """
+    扫频的参数. 场数据只在需要的频点保存:
+    save_fields / save_rad_fields 对离散扫频和快速扫频的全部频点有效, 插值扫频不能在全部频点保存场数据,
+    只在 field_frequencies 的各单频点保存 (SaveSingleField)
+    """
+
+    def __init__(self, sweep_type: str = "Interpolating", start_freq: float = 2.0, stop_freq: float = 3.0,
+                 range_count: int = 101, save_fields: bool = False, save_rad_fields: bool = False,
+                 field_frequencies=(), key_frequencies=(), tolerance: float = 0.5, max_solutions: int = 250,
+                 min_solutions: int = 0, sweep_name: str = "Sweep"):
+        """
+        :param sweep_type: "Discrete", "Fast" 或 "Interpolating"
+        :param start_freq: 起始频率 单位为 GHz
+        :param stop_freq: 结束频率 单位为 GHz
+        :param range_count: 线性等分的频点数, 为 0 时只求解 key_frequencies 和 field_frequencies
+        :param save_fields: 保存全部频点的场数据 (离散扫频和快速扫频)
+        :param save_rad_fields: 只保存全部频点的远场数据 (离散扫频和快速扫频), 远小于全部场数据
+        :param field_frequencies: 保存场数据的单频点 单位为 GHz
+        :param key_frequencies: 另外求解但不保存场数据的单频点 单位为 GHz
+        :param tolerance: 插值扫频的误差容限 单位为 %
+        :param max_solutions: 插值扫频的最大求解频点数
+        :param min_solutions: 插值扫频的最小求解频点数
+        :param sweep_name: 扫频名称, 报告数据使用 "Setup1 : Sweep"
+        """
+        self.sweep_type = sweep_type
+        self.start_freq = start_freq
+        self.stop_freq = stop_freq
+        self.range_count = range_count
+        self.save_fields = save_fields
+        self.save_rad_fields = save_rad_fields
+        self.field_frequencies = list(field_frequencies)
+        self.key_frequencies = [f for f in key_frequencies if f not in field_frequencies]
+        self.tolerance = tolerance
+        self.max_solutions = max_solutions
+        self.min_solutions = min_solutions
+        self.sweep_name = sweep_name
+
+    def Subranges(self) -> list:
+        """
+        :return: 各频率范围的属性列表, 每个为 ["RangeType:=", ..., "RangeStart:=", ...] 形式
+        """
+        subranges = []
+        if self.range_count > 0:
+            subranges.append([
+                "RangeType:=", "LinearCount",
+                "RangeStart:=", str(self.start_freq) + "GHz",
+                "RangeEnd:=", str(self.stop_freq) + "GHz",
+                "RangeCount:=", self.range_count
+            ])
+        for frequencies, save in ((self.field_frequencies, True), (self.key_frequencies, False)):
+            for frequency in frequencies:
+                subranges.append([
+                    "RangeType:=", "SinglePoints",
+                    "RangeStart:=", str(frequency) + "GHz",
+                    "RangeEnd:=", str(frequency) + "GHz",
+                    "SaveSingleField:=", save
+                ])
+        if len(subranges) == 0:
+            raise ValueError("扫频没有频点: range_count 为 0 且没有给出单频点")
+        return subranges
+
+    def Params(self) -> list:
+        """
+        :return: InsertFrequencySweep / EditFrequencySweep 的参数,
+                 第一个频率范围为扫频本身的属性, 其余在 SweepRanges 中
+        """
+        subranges = self.Subranges()
+        params = ["NAME:" + self.sweep_name, "IsEnabled:=", True] + subranges[0] + [
+            "Type:=", self.sweep_type,
+            "SaveFields:=", self.save_fields,  # 保存场求解数据
+            "SaveRadFields:=", self.save_rad_fields,  # 保存远场求解数据
             "GenerateFieldsForAllFreqs:=", False
         ]
-    )
-    pass
+        if self.sweep_type == "Interpolating":
+            params += [
+                "InterpTolerance:=", self.tolerance,
+                "InterpMaxSolns:=", self.max_solutions,
+                "InterpMinSolns:=", self.min_solutions,
+                "InterpMinSubranges:=", 1,
+                "InterpUseS:=", True,
+                "InterpUsePortImped:=", False,
+                "InterpUsePropConst:=", True,
+                "UseDerivativeConvergence:=", False,
+                "InterpDerivTolerance:=", 0.2,
+                "UseFullBasis:=", True,
+                "EnforcePassivity:=", True,
+                "PassivityErrorTolerance:=", 0.0001
+            ]
+        if len(subranges) > 1:
+            params += ["SweepRanges:=", ["NAME:Subranges"] + [["NAME:Subrange"] + r for r in subranges[1:]]]
+        return params
+
+
+# 求解设置与扫频的预设 {名称: (SetupConfig 参数, SweepConfig 参数)}, 频率由 SetupPreset 给出
+SETUP_PRESETS = OrderedDict([
+    # 快速筛选: 放宽收敛条件, 快速扫频只保存远场数据, 可得到全部 GetAntennaPerformance 指标
+    ("Screening", ({"max_delta": 0.05, "max_passes": 10, "min_converged_passes": 1},
+                   {"sweep_type": "Fast", "save_rad_fields": True})),
+    # 插值扫频: 只在中心频率保存场数据, 中心频率的轴比和增益可用, 其余频点只有 S 参数
+    ("Interpolating", ({}, {"sweep_type": "Interpolating", "tolerance": 0.5, "max_solutions": 250})),
+    # 离散扫频只求解关键频点 (默认为起始、中心、结束频率) 并保存远场数据; 没有连续扫频, 不能计算 S11 带宽,
+    # S11 为 frequency 附近各频点的平均值, 与扫频的结果不同
+    ("KeyFrequencies", ({}, {"sweep_type": "Discrete", "range_count": 0, "save_rad_fields": True})),
+    # 高精度: 收紧收敛条件, 二阶基函数, 离散扫频保存全部频点的远场数据
+    ("HighAccuracy", ({"max_delta": 0.01, "min_converged_passes": 2, "percent_refinement": 20, "basis_order": 2},
+                      {"sweep_type": "Discrete", "save_rad_fields": True})),
+])
 
 
-def Analyze(setup_name):
+def SetupPreset(preset: str, center_freq: float, start_freq: float, stop_freq: float, range_count: int = 101,
+                key_frequencies=None, max_delta: float = None):
+    """
+    由预设生成求解设置与扫频的参数
+    :param preset: 见 SETUP_PRESETS
+    :param center_freq: 求解中心频率 单位为 GHz
+    :param start_freq: 起始频率 单位为 GHz
+    :param stop_freq: 结束频率 单位为 GHz
+    :param range_count: 求解点数, "KeyFrequencies" 预设不使用
+    :param key_frequencies: "KeyFrequencies" 预设求解的频点, 默认为起始、中心、结束频率
+    :param max_delta: 收敛条件, 给出时覆盖预设
+    :return: (SetupConfig, SweepConfig)
+    """
+    if preset not in SETUP_PRESETS:
+        raise ValueError("没有该求解设置预设: %s, 可选 %s" % (preset, ", ".join(SETUP_PRESETS)))
+    setup_args, sweep_args = SETUP_PRESETS[preset]
+    setup = SetupConfig(center_freq, **setup_args)
+    if max_delta is not None:
+        setup.max_delta = max_delta
+    sweep_args = dict({"range_count": range_count}, **sweep_args)
+    if preset == "KeyFrequencies":
+        sweep_args["key_frequencies"] = key_frequencies or [start_freq, center_freq, stop_freq]
+    elif preset == "Interpolating":
+        sweep_args["field_frequencies"] = [center_freq]
+    return setup, SweepConfig(start_freq=start_freq, stop_freq=stop_freq, **sweep_args)
+
+
+def ApplySetup(setup_name: str, setup: SetupConfig, sweeps, context=None) -> bool:
+    """
+    插入求解设置及其扫频, 已存在时修改, 原有但不在 sweeps 中的扫频保持不变
+    :param setup_name: 求解设置名称
+    :param setup: SetupConfig
+    :param sweeps: SweepConfig 或其列表
+    :return: 是否修改了已存在的求解设置
+    """
+    ctx = ResolveContext(context)
+    module = ctx.GetModule("AnalysisSetup")
+    if isinstance(sweeps, SweepConfig):
+        sweeps = [sweeps]
+    ctx.oDesign.ModelChanged()
+    if setup_name not in module.GetSetups():
+        module.InsertSetup("HfssDriven", setup.Params(setup_name))
+        for sweep in sweeps:
+            module.InsertFrequencySweep(setup_name, sweep.Params())
+        return False
+    module.EditSetup(setup_name, setup.Params(setup_name))
+    existing = module.GetSweeps(setup_name)
+    for sweep in sweeps:
+        if sweep.sweep_name in existing:
+            module.EditFrequencySweep(setup_name, sweep.sweep_name, sweep.Params())
+        else:
+            module.InsertFrequencySweep(setup_name, sweep.Params())
+    # 求解设置变化后已导出的报告数据不再有效
+    ctx.oDesign.solution_state.Invalidate()
+    return True
+
+
+def SetMeshLink(setup_name: str, mesh_link: MeshLinkConfig = None, context=None):
+    """
+    修改求解设置的网格导入, 其余设置不变
+    :param setup_name: 求解设置名称
+    :param mesh_link: MeshLinkConfig, 为 None 时不导入网格
+    :return:
+    """
+    ctx = ResolveContext(context)
+    link = mesh_link.Params() if mesh_link is not None else list(NO_MESH_LINK)
+    ctx.GetModule("AnalysisSetup").EditSetup(setup_name, ["NAME:" + setup_name, link])
+    ctx.oDesign.ModelChanged()
+    ctx.oDesign.solution_state.Invalidate()
+
+
+def InsertSetup(setup_name: str, center_freq: float, max_delta: float, setup_type: str,
+                start_freq: float, stop_freq: float, range_count: int, context=None):
+    """
+    插入求解设置, 扫频保存全部频点的场数据; 只在需要的频点保存场数据时使用 InsertSetupPreset
+    :param setup_name: 求解设置名称
+    :param center_freq: 求解中心频率 单位为 GHz
+    :param max_delta: 求解最大误差
+    :param setup_type: 频点遍历类型
+    :param start_freq: 起始频率 单位为 GHz
+    :param stop_freq: 结束频率 单位为 GHz
+    :param range_count: 求解点数
+    :return:
+    """
+    ApplySetup(setup_name, SetupConfig(center_freq, max_delta),
+               SweepConfig(setup_type, start_freq, stop_freq, range_count, save_fields=True, save_rad_fields=True),
+               context)
+
+
+def InsertSetupPreset(setup_name: str, preset: str, center_freq: float, start_freq: float, stop_freq: float,
+                      range_count: int = 101, key_frequencies=None, max_delta: float = None, context=None) -> bool:
+    """
+    按预设插入求解设置及扫频 "Sweep", 已存在时修改
+    插值扫频 ("Interpolating") 只求解少量基函数频点且只在中心频率保存场数据, 求解时间和磁盘占用远小于
+    在每个频点保存场数据的离散扫频; 需要各频点远场数据 (如轴比带宽) 时使用 "Screening" 或 "HighAccuracy"
+    :param setup_name: 求解设置名称
+    :param preset: 见 SETUP_PRESETS
+    :param center_freq: 求解中心频率 单位为 GHz
+    :param start_freq: 起始频率 单位为 GHz
+    :param stop_freq: 结束频率 单位为 GHz
+    :param range_count: 求解点数
+    :param key_frequencies: "KeyFrequencies" 预设求解的频点 单位为 GHz
+    :param max_delta: 收敛条件, 给出时覆盖预设
+    :return: 是否修改了已存在的求解设置
+    """
+    setup, sweep = SetupPreset(preset, center_freq, start_freq, stop_freq, range_count, key_frequencies, max_delta)
+    return ApplySetup(setup_name, setup, sweep, context)
+
+
+def Analyze(setup_name, context=None):
     """
     进行仿真分析
     :param setup_name:
     :return: None
     """
-    if oProject.handle is None:
-        oProject.handle = oDesktop.GetActiveProject()
-    if oDesign.handle is None:
-        oDesign.handle = oProject.GetActiveDesign()
-        pass
-    oModule.handle = oDesign.GetModule("AnalysisSetup")
-    names = oModule.GetSetups()
+    ctx = ResolveContext(context)
+    names = ctx.GetModule("AnalysisSetup").GetSetups()
     if setup_name in names:
-        oDesign.Analyze(setup_name)
+        ctx.oDesign.Analyze(setup_name)
     else:
         print("该设计中没有该setup")
 
 
-def ExportAnalysisDataToFile(file_path: str):
+def ExportAnalysisDataToFile(file_path: str, context=None):
     """
     将仿真数据导出至文件 仿真数据包括 s11参数 阻抗带宽 轴比 轴比带宽 增益
+    导出的 Touchstone 文件可用 hfss.touchstone.ReadTouchstone 读取
     :param file_path:
-    :return: None
+    :return: 导出的文件路径
     """
-    if oProject.handle is None:
-        oProject.handle = oDesktop.GetActiveProject()
-    if oDesign.handle is None:
-        oDesign.handle = oProject.GetActiveDesign()
-    oModule.handle = oDesign.GetModule("Solutions")
+    ctx = ResolveContext(context)
     if file_path is None:
         export_data_file_path = "P://python//hfss-api//data_path"
     else:
         export_data_file_path = file_path
-    oModule.handle = oDesign.GetModule("Solutions")
-    oModule.ExportNetworkData(
+    network_data_file = export_data_file_path + "NetworkData" + ".s4p"
+    ctx.GetModule("Solutions").ExportNetworkData(
         "",  # Empty string.
         ["Setup1:Sweep"],  # This is the full path of the file from which the solution is loaded.
         3,  # File Type, The number 1.
-        export_data_file_path + "NetworkData" + ".s4p",  # full path of file to export to
+        network_data_file,  # full path of file to export to
         ["all"],  # optional, if none defined all frequencies are used
         False, 50,
         "S",
         -1, 0, 15, True, True
     )
-    pass
+    return network_data_file
 
 
-def GenerateS11Graph():
+def RefreshReport(ctx, report_name: str, create_args, setup_name: str = "Setup1") -> str:
+    """
+    创建或更新报告并导出数据文件 <report_name>.csv; 若该文件已在当前求解版本下导出过, 则不调用 COM
+    :param ctx: DesignContext
+    :param report_name: 报告名称
+    :param create_args: 报告不存在时传给 CreateReport 的其余参数
+        (ReportType, DisplayType, SolutionName, ContextArray, FamiliesArray, ReportDataArray)
+    :param setup_name: 报告数据对应的求解设置名称
+    :return: 数据文件路径
+    """
+    state = ctx.oDesign.solution_state
+    version = state.Version(setup_name)
+    file_path = GetAnalysisDataPath(ctx) + "/" + report_name + ".csv"
+    same_args = state.report_args.get(report_name) == create_args
+    if same_args and state.IsExported(report_name, file_path, version):
+        return file_path
+    module = ctx.GetModule("ReportSetup")
+    if state.reports is None:
+        state.reports = set(module.GetAllReportNames())
+    # 检索报告是否存在
+    if report_name not in state.reports:
+        # 不存在就创建新数据表
+        module.CreateReport(report_name, *create_args)
+        state.reports.add(report_name)
+    elif not same_args:
+        # UpdateReports 不改变报告的参数 (如辐射图的频率), 参数变化或不是本库创建的报告时删除后重新创建
+        module.DeleteReports([report_name])
+        module.CreateReport(report_name, *create_args)
+    else:  # 存在就仅更新该报告
+        module.UpdateReports([report_name])
+    state.report_args[report_name] = create_args
+    # 导出数据文件
+    module.ExportToFile(report_name, file_path, False)
+    state.MarkExported(report_name, file_path, version)
+    return file_path
+
+
+def GenerateS11Graph(context=None):
     """
     生成 S11 参数图像 单位为 dB
     生成图表命名为 S Parameter Plot 1
     :return: none
     """
-    local_var_array = oDesign.GetVariables()
+    ctx = ResolveContext(context)
+    local_var_array = ctx.oDesign.GetVariables()
     local_var_list = ["Freq:=", ["All"]]
     for i in range(len(local_var_array)):
         local_var_list = local_var_list + [local_var_array[i] + ":=", ["Nominal"]]
         pass
-    # print(local_var_list)
-    if oProject.handle is None:
-        oProject.handle = oDesktop.GetActiveProject()
-    if oDesign.handle is None:
-        oDesign.handle = oProject.GetActiveDesign()
-    oModule.handle = oDesign.GetModule("ReportSetup")
-    ReportNames = oModule.GetAllReportNames()
-    # 检索 S11 参数报告是否存在
-    if "S Parameter Plot 1" not in ReportNames:
-        # 不存在就创建新数据表
-        oModule.CreateReport("S Parameter Plot 1", "Modal Solution Data", "Rectangular Plot", "Setup1 : Sweep",
-                             ["Domain:=", "Sweep"],
-                             local_var_list,
-                             [
-                                 "X Component:=", "Freq",
-                                 "Y Component:=", ["dB(S(1,1))"]
-                             ])
-    else:  # 存在就仅更新报告
-        oModule.UpdateAllReports()
-    # print("S Parameter 图表创建成功")
-    project_path = oProject.GetPath()  # 获得当前工程文件路径
-    project_name = oProject.GetName()  # 获得当前工程名
-    data_path = project_path + "/" + project_name + ".system_analysis_data"
-    if os.path.exists(data_path) is False:
-        os.makedirs(data_path)  # 如果不存在则需创建文件夹
-        pass
-    # 导出数据文件
-    oModule.ExportToFile("S Parameter Plot 1", data_path + "/S Parameter Plot 1.csv", False)
-    # print("S Parameter 数据导出成功")
+    RefreshReport(ctx, "S Parameter Plot 1",
+                  ("Modal Solution Data", "Rectangular Plot", "Setup1 : Sweep",
+                   ["Domain:=", "Sweep"],
+                   local_var_list,
+                   [
+                       "X Component:=", "Freq",
+                       "Y Component:=", ["dB(S(1,1))"]
+                   ]))
     pass
 
 
-def GenerateARBWGraph():
+def GenerateARBWGraph(context=None):
     """
     生成轴比带宽图像 theta:= 0 deg, phi:= 0 deg
     生成图表 命名为 Axial Ratio BW Plot 1
     :return: None
     """
-    local_var_array = oDesign.GetVariables()
+    ctx = ResolveContext(context)
+    local_var_array = ctx.oDesign.GetVariables()
     local_var_list = ["Freq:=", ["All"], "Phi:=", ["0deg"], "Theta:=", ["0deg"]]
     for i in range(len(local_var_array)):
         local_var_list = local_var_list + [local_var_array[i] + ":=", ["Nominal"]]
         pass
-    if oProject.handle is None:
-        oProject.handle = oDesktop.GetActiveProject()
-    if oDesign.handle is None:
-        oDesign.handle = oProject.GetActiveDesign()
-    oModule.handle = oDesign.GetModule("ReportSetup")
-    ReportNames = oModule.GetAllReportNames()
-    # 检索 AR BW 参数报告是否存在
-    if "Axial Ratio BW Plot 1" not in ReportNames:
-        # 不存在就创建新数据表
-        oModule.CreateReport("Axial Ratio BW Plot 1", "Far Fields", "Rectangular Plot", "Setup1 : Sweep",
-                             ["Context:=", "Infinite Sphere1"],
-                             local_var_list,
-                             [
-                                 "X Component:=", "Freq",
-                                 "Y Component:=", ["dB(AxialRatioValue)"]
-                             ])
-    else:  # 存在就仅更新报告
-        oModule.UpdateReports("Axial Ratio BW Plot 1")
-    # print("Axial Ratio BW 图表创建成功")
-    project_path = oProject.GetPath()  # 获得当前工程文件路径
-    project_name = oProject.GetName()  # 获得当前工程名
-    data_path = project_path + "/" + project_name + ".system_analysis_data"
-    if os.path.exists(data_path) is False:
-        os.makedirs(data_path)  # 如果不存在则需创建文件夹
-        pass
-    # 导出数据文件
-    oModule.ExportToFile("Axial Ratio BW Plot 1", data_path + "/Axial Ratio BW Plot 1.csv", False)
-    # print("Axial Ratio BW  数据导出成功")
+    RefreshReport(ctx, "Axial Ratio BW Plot 1",
+                  ("Far Fields", "Rectangular Plot", "Setup1 : Sweep",
+                   ["Context:=", "Infinite Sphere1"],
+                   local_var_list,
+                   [
+                       "X Component:=", "Freq",
+                       "Y Component:=", ["dB(AxialRatioValue)"]
+                   ]))
     pass
 
 
-def GenerateRadiationPattern(frequency: float):
+def GenerateRadiationPattern(frequency: float, context=None):
     """
     生成指定频率下 2D 辐射图 Gain
     生成图表 命名为 Gain 2D Radiation Pattern Plot 1
     :return: None
     """
-    local_var_array = oDesign.GetVariables()
+    ctx = ResolveContext(context)
+    local_var_array = ctx.oDesign.GetVariables()
     local_var_list = ["Theta:=", ["All"], "Phi:=", ["0deg", "90deg"], "Freq:=", [str(frequency) + "GHz"]]
     for i in range(len(local_var_array)):
         local_var_list = local_var_list + [local_var_array[i] + ":=", ["Nominal"]]
         pass
-    if oProject.handle is None:
-        oProject.handle = oDesktop.GetActiveProject()
-    if oDesign.handle is None:
-        oDesign.handle = oProject.GetActiveDesign()
-    oModule.handle = oDesign.GetModule("ReportSetup")
-    ReportNames = oModule.GetAllReportNames()
-    # 检索 Gain 2D Radiation Pattern Plot 1 参数报告是否存在
-    if "Gain 2D Radiation Pattern Plot 1" not in ReportNames:
-        # 不存在就创建新数据表
-        oModule.CreateReport("Gain 2D Radiation Pattern Plot 1", "Far Fields", "Radiation Pattern", "Setup1 : Sweep",
-                             ["Context:=", "Infinite Sphere1"],
-                             local_var_list,
-                             [
-                                 "Ang Component:=", "Theta",
-                                 "Mag Component:=", ["dB(RealizedGainLHCP)", "dB(RealizedGainRHCP)"]
-                             ])
-    else:  # 存在就仅更新报告
-        oModule.UpdateReports("Gain 2D Radiation Pattern Plot 1")
-    # print("Gain 2D Radiation Pattern Plot 1 图表创建成功")
-    project_path = oProject.GetPath()  # 获得当前工程文件路径
-    project_name = oProject.GetName()  # 获得当前工程名
-    data_path = project_path + "/" + project_name + ".system_analysis_data"
-    if os.path.exists(data_path) is False:
-        os.makedirs(data_path)  # 如果不存在则需创建文件夹
-        pass
-    # 导出数据文件
-    oModule.ExportToFile("Gain 2D Radiation Pattern Plot 1", data_path + "/Gain 2D Radiation Pattern Plot 1.csv", False)
-    # print("Gain 2D Radiation Pattern Plot 1  数据导出成功")
+    RefreshReport(ctx, "Gain 2D Radiation Pattern Plot 1",
+                  ("Far Fields", "Radiation Pattern", "Setup1 : Sweep",
+                   ["Context:=", "Infinite Sphere1"],
+                   local_var_list,
+                   [
+                       "Ang Component:=", "Theta",
+                       "Mag Component:=", ["dB(RealizedGainLHCP)", "dB(RealizedGainRHCP)"]
+                   ]))
     pass
 
 
-def Generate3DGainRadiationPattern(frequency: float):
+def Generate3DGainRadiationPattern(frequency: float, context=None):
     """
     生成 指定频率下 3D 极坐标 辐射模式图
     生成图表命名为 Gain 3D Radiation Pattern Plot 1
     :frequency: 单位 GHz
     :return: None
     """
-    local_var_array = oDesign.GetVariables()
+    ctx = ResolveContext(context)
+    local_var_array = ctx.oDesign.GetVariables()
     local_var_list = ["Theta:=", ["All"], "Phi:=", ["All"], "Freq:=", [str(frequency) + "GHz"]]
     for i in range(len(local_var_array)):
         local_var_list = local_var_list + [local_var_array[i] + ":=", ["Nominal"]]
         pass
-    oModule.handle = oDesign.GetModule("ReportSetup")
-    if oProject.handle is None:
-        oProject.handle = oDesktop.GetActiveProject()
-    if oDesign.handle is None:
-        oDesign.handle = oProject.GetActiveDesign()
-    oModule.handle = oDesign.GetModule("ReportSetup")
-    ReportNames = oModule.GetAllReportNames()
-    if "Gain 3D Radiation Pattern Plot 1" not in ReportNames:
-        oModule.CreateReport("Gain 3D Radiation Pattern Plot 1", "Far Fields", "3D Polar Plot", "Setup1 : LastAdaptive",
-                             [
-                                 "Context:=", "Infinite Sphere1"
-                             ],
-                             local_var_list,
-                             [
-                                 "Theta Component:=", "Theta",
-                                 "Phi Component:="	, "Phi",
-                                 "Mag Component:="		, ["dB(GainTotal)"]
-                             ])
-        pass
-    else:  # 存在就仅更新报告
-        oModule.UpdateReports("Gain 3D Radiation Pattern Plot 1")
-        pass
-    # print("Gain 3D 辐射图 创建完成")
-    project_path = oProject.GetPath()  # 获得当前工程文件路径
-    project_name = oProject.GetName()   # 获得当前工程名
-    data_path = project_path+"/"+project_name+".system_analysis_data"
-    if os.path.exists(data_path) is False:
-        os.makedirs(data_path)  # 如果不存在则需创建文件夹
-        pass
-    # 导出数据文件
-    oModule.ExportToFile("Gain 3D Radiation Pattern Plot 1", data_path+"/Gain 3D Radiation Pattern Plot 1.csv", False)
-    # print("Gain 3D Radiation Pattern Plot 1  数据导出成功")
+    RefreshReport(ctx, "Gain 3D Radiation Pattern Plot 1",
+                  ("Far Fields", "3D Polar Plot", "Setup1 : LastAdaptive",
+                   [
+                       "Context:=", "Infinite Sphere1"
+                   ],
+                   local_var_list,
+                   [
+                       "Theta Component:=", "Theta",
+                       "Phi Component:="	, "Phi",
+                       "Mag Component:="		, ["dB(GainTotal)"]
+                   ]))
     pass
 
 
-def GetAntennaPerformance(frequency: float):
+# GetAntennaPerformance 可计算的指标及其所需的报告
+ANTENNA_METRICS = ("S11", "BW", "AR", "Gain")
+
+
+def InvalidateSolutionState(context=None):
+    """
+    使 active 设计的求解状态失效, 下次获取天线参数时重新更新并导出报告.
+    在 AEDT 界面、通过 oEditor 修改模型或在其他脚本中求解后调用
+    :return: None
+    """
+    state = ResolveContext(context).oDesign.solution_state
+    state.Invalidate()
+    state.reports = None
+
+
+def GetAntennaPerformance(frequency: float, context=None, metrics=ANTENNA_METRICS):
     """
     获得对应频率下的天线参数
+    只更新所需指标对应的报告, 求解结果未变化时不更新报告也不导出, 同一求解结果的重复查询直接返回缓存的结果
     :frequency: 单位 GHz
+    :param metrics: 需要的指标, 为 ANTENNA_METRICS 的子集; S11/BW 需要 S 参数图, AR 需要轴比图, Gain 需要 2D 辐射图,
+                    未请求的指标返回 0.0
     :return: 返回天线的S11,带宽,轴比,增益 __S11, __BW, __AR, __Gain
     单位[dB] [GHz] [dB] [dB]
     """
+    ctx = ResolveContext(context)
+    state = ctx.oDesign.solution_state
+    key = ("GetAntennaPerformance", frequency, tuple(metrics), state.Version("Setup1"))
+    if key in state.results:
+        return state.results[key]
+    import numpy as np
+    import pandas as pd
+    from hfss import metrics as antenna_metrics
     # 创建变量
     __S11, __BW, __AR, __Gain = 0.0, 0.0, 0.0, 0.0
-    # 更新图表文件
-    GenerateS11Graph()
-    GenerateARBWGraph()
-    # Generate3DGainRadiationPattern(2.5)
-    GenerateRadiationPattern(2.5)
-
     data_sheet_name_list = ["S Parameter Plot 1.csv", "Axial Ratio BW Plot 1.csv",
                             "Gain 2D Radiation Pattern Plot 1.csv", "Gain 3D Radiation Pattern Plot 1.csv"]
-    project_path = oProject.GetPath()  # 获得当前工程文件路径
-    project_name = oProject.GetName()   # 获得当前工程名
-    data_path = project_path+"/"+project_name+".system_analysis_data"
-
-    # 使用 pandas 读取 S Parameter Plot 1.csv 文件
-    df = pd.read_csv(data_path + "/" + data_sheet_name_list[0])
-    # 查询 frequency频率 在仿真文件中是否存在
-    if frequency in df["Freq [GHz]"].values:
-        # 默认返回10点值
-        __index = df[df["Freq [GHz]"] == 2.5].index[0]
-        __data = df["dB(S(1,1)) []"].iloc[max(__index-5, 0): min(__index+5, len(df))].values
-        __S11 = sum(__data)
-        __S11_fre = df[df["Freq [GHz]"] == frequency].values[0][1]
-        __S11 = (__S11_fre + __S11)/(len(__data)+1)
-        pass
+    data_path = GetAnalysisDataPath(ctx)
+
+    # 各指标由 hfss.metrics 按频率容差计算, 与 GetAntennaPerformanceDirect 及参数扫描的结果相同
+    if "S11" in metrics or "BW" in metrics:
+        # 更新图表文件
+        GenerateS11Graph(ctx)
+        df = pd.read_csv(data_path + "/" + data_sheet_name_list[0])
+        # S11 为 frequency 处与附近 10 点的平均值, 带宽阈值为 -10dB, 取包含 frequency 的连续频段
+        result = antenna_metrics.S11Metrics(df["Freq [GHz]"].values, df["dB(S(1,1)) []"].values, frequency)
+        __S11, __BW = result["S11"][0], result["BW"][0]
+
+    if "AR" in metrics:
+        GenerateARBWGraph(ctx)
+        # frequency 处 phi theta 角为 0deg 处的 AR 值, 没有该频点时为 999
+        df = pd.read_csv(data_path + "/" + data_sheet_name_list[1])
+        __AR = antenna_metrics.AxialRatioMetrics(df["Freq [GHz]"].values, df["dB(AxialRatioValue) []"].values,
+                                                 frequency)["AR"][0]
+
+    if "Gain" in metrics:
+        GenerateRadiationPattern(frequency, ctx)
+        # frequency 处 phi 0deg 切面上 theta 0deg 方向的增益, 没有该频点时为 0
+        df = pd.read_csv(data_path + "/" + data_sheet_name_list[2])
+        df = df[np.isclose(df["Phi [deg]"].values, 0.0)]
+        pattern = df.pivot_table(index="Freq [GHz]", columns="Theta [deg]", values="dB(RealizedGainLHCP) []")
+        if len(pattern) > 0:
+            __Gain = antenna_metrics.GainMetrics(pattern.index.values, pattern.values[np.newaxis], frequency,
+                                                 pattern.columns.values)["Gain"][0]
+
+    __S11, __BW, __AR, __Gain = float(__S11), float(__BW), float(__AR), float(__Gain)
+    state.results[key] = (__S11, __BW, __AR, __Gain)
+    return __S11, __BW, __AR, __Gain
+
+
+# 参数扫描批量求解
+# 参数扫描报告名称
+PARAMETRIC_S11_REPORT = "Parametric S Parameter Plot"
+PARAMETRIC_FAR_FIELD_REPORT = "Parametric Far Field Plot"
+
+
+def InsertParametricSetup(props_name_array, props_value_table, setup_name: str = "Setup1",
+                          parametric_name: str = "ParametricSetup1", context=None):
+    """
+    创建或更新参数扫描设置, 各变量的扫描同步 (Synchronize) 即按行配对, 每行为一个变化
+    :param props_name_array: 变量名列表
+    :param props_value_table: 变量值表, 每行为一组变量值, 单位为 mm
+    :param setup_name: 参数扫描使用的求解设置名称
+    :param parametric_name: 参数扫描设置名称
+    :return: None
+    """
+    ctx = ResolveContext(context)
+    sweeps = ["NAME:Sweeps"]
+    for i in range(len(props_name_array)):
+        sweeps.append(["NAME:SweepDefinition",
+                       "Variable:=", props_name_array[i],
+                       "Data:=", ", ".join(str(row[i]) + "mm" for row in props_value_table),
+                       "OffsetF1:=", False,
+                       "Synchronize:=", 1])
+    attributes = ["NAME:" + parametric_name,
+                  "IsEnabled:=", True,
+                  ["NAME:ProdOptiSetupDataV2",
+                   "SaveFields:=", False,  # 不保存各变化的场数据
+                   "CopyMesh:=", False,
+                   "SolveWithCopiedMeshOnly:=", True],
+                  ["NAME:StartingPoint"],
+                  "Sim. Setups:=", [setup_name],
+                  sweeps,
+                  ["NAME:Sweep Operations"],
+                  ["NAME:Goals"]]
+    module = ctx.GetModule("Optimetrics")
+    if parametric_name in module.GetSetupNames():
+        module.EditSetup(parametric_name, attributes)
     else:
-        __S11 = 0
-        __BW = 0
-
-    # 获取 BW 值
-    # S11 带宽阈值设置为 -10dB
-    threshold_value = -10
-    mask = df['dB(S(1,1)) []'] < threshold_value
-    groups = (mask != mask.shift()).cumsum()
-    result = df[mask].groupby(groups)['Freq [GHz]'].agg(['count', 'first', 'last']).values
-    for i in range(len(result)):
-        if result[i][1] <= frequency <= result[i][2]:
-            __BW = result[i][2] - result[i][1]
-            break
+        module.InsertSetup("OptiParametric", attributes)
 
-    # 获取frequency处 phi theta角为0deg处的 AR 值
-    df = pd.read_csv(data_path + "/" + data_sheet_name_list[1])
-    if frequency in df["Freq [GHz]"].values:
-        __AR = df[df["Freq [GHz]"] == frequency].values[0][3]
-        pass
+
+def GenerateParametricGraphs(props_name_array, setup_name: str = "Setup1",
+                             parametric_name: str = "ParametricSetup1", context=None):
+    """
+    生成包含全部已求解变化的 S11 图和远场图 (theta = phi = 0deg 处的轴比与增益), 并导出数据文件;
+    扫描的变量与创建报告时不同时由 RefreshReport 删除后重新创建报告
+    :param props_name_array: 扫描的变量名列表, 其余变量取 Nominal
+    :param setup_name: 求解设置名称
+    :param parametric_name: 参数扫描设置名称, 该设置的求解版本不变时不重新导出
+    :return: (S11 数据文件路径, 远场数据文件路径)
+    """
+    ctx = ResolveContext(context)
+    local_var_list = []
+    for name in ctx.oDesign.GetVariables():
+        local_var_list = local_var_list + [name + ":=", ["All"] if name in props_name_array else ["Nominal"]]
+    s11_file = RefreshReport(ctx, PARAMETRIC_S11_REPORT, (
+        "Modal Solution Data", "Rectangular Plot", setup_name + " : Sweep",
+        ["Domain:=", "Sweep"],
+        ["Freq:=", ["All"]] + local_var_list,
+        [
+            "X Component:=", "Freq",
+            "Y Component:=", ["dB(S(1,1))"]
+        ]), parametric_name)
+    far_field_file = RefreshReport(ctx, PARAMETRIC_FAR_FIELD_REPORT, (
+        "Far Fields", "Rectangular Plot", setup_name + " : Sweep",
+        ["Context:=", "Infinite Sphere1"],
+        ["Freq:=", ["All"], "Phi:=", ["0deg"], "Theta:=", ["0deg"]] + local_var_list,
+        [
+            "X Component:=", "Freq",
+            "Y Component:=", ["dB(AxialRatioValue)", "dB(RealizedGainLHCP)"]
+        ]), parametric_name)
+    return s11_file, far_field_file
+
+
+def ParseVariationColumns(columns, props_name_array) -> dict:
+    """
+    解析多变化报告的列名, 如 "dB(S(1,1)) [] - length='30mm' width='28mm'"
+    :return: {(表达式列名, 变量值元组): 列名} 变量值按 props_name_array 的顺序换算为浮点数
+    """
+    result = {}
+    for column in columns:
+        expression, separator, variation = column.partition(" - ")
+        if separator == "":
+            continue
+        values = dict(re.findall(r"(\w+)='([^']*)'", variation))
+        try:
+            key = tuple(round(float(re.match(r"\s*[-+0-9.eE]+", values[name]).group()), 9)
+                        for name in props_name_array)
+        except (KeyError, AttributeError, ValueError):
+            continue
+        result[(expression, key)] = column
+    return result
+
+
+def S11Performance(frequency: float, freqs, s11):
+    """
+    由 S11 曲线计算 frequency 处的 S11 (该点与附近 10 点的平均值) 和 -10dB 阻抗带宽,
+    由 metrics.S11Metrics 按频率容差计算, 与 GetAntennaPerformance 的结果相同
+    :param frequency: 单位 GHz
+    :param freqs: 频率数组 单位 GHz
+    :param s11: dB(S(1,1)) 数组
+    :return: (S11, BW)
+    """
+    from hfss import metrics
+    result = metrics.S11Metrics(freqs, s11, frequency)
+    __S11, __BW = result["S11"][0], result["BW"][0]
+    return __S11, __BW
+
+
+def GetParametricPerformance(props_name_array, props_value_table, frequency: float, setup_name: str = "Setup1",
+                             parametric_name: str = "ParametricSetup1", context=None) -> list:
+    """
+    从参数扫描报告中批量得到各变化的天线参数
+    :param props_name_array: 变量名列表
+    :param props_value_table: 变量值表, 每行为一组变量值, 单位为 mm
+    :param frequency: 单位 GHz
+    :param setup_name: 求解设置名称
+    :param parametric_name: 参数扫描设置名称
+    :return: 与 props_value_table 各行对应的 (S11, BW, AR, Gain) 列表, 未求解的变化为 None
+    """
+    import pandas as pd
+    from hfss import metrics
+    s11_file, far_field_file = GenerateParametricGraphs(props_name_array, setup_name, parametric_name, context)
+    s11_df = pd.read_csv(s11_file)
+    far_field_df = pd.read_csv(far_field_file)
+    s11_columns = ParseVariationColumns(s11_df.columns, props_name_array)
+    far_field_columns = ParseVariationColumns(far_field_df.columns, props_name_array)
+    freqs = s11_df["Freq [GHz]"].values
+    far_field_freqs = far_field_df["Freq [GHz]"].values
+    # 按 props_value_table 的行顺序收集各变化的数据列, 一次计算全部变化的指标
+    keys = [tuple(round(float(v), 9) for v in row) for row in props_value_table]
+    solved = [i for i, key in enumerate(keys) if ("dB(S(1,1)) []", key) in s11_columns]
+    for i in range(len(keys)):
+        if i not in solved:
+            print("该变化没有求解结果:", dict(zip(props_name_array, props_value_table[i])))
+    results = [None] * len(keys)
+    if len(solved) == 0:
+        return results
+    s11 = s11_df[[s11_columns[("dB(S(1,1)) []", keys[i])] for i in solved]].values.T
+    ar = far_field_df[[far_field_columns[("dB(AxialRatioValue) []", keys[i])] for i in solved]].values.T
+    gain = far_field_df[[far_field_columns[("dB(RealizedGainLHCP) []", keys[i])] for i in solved]].values.T
+    result = metrics.S11Metrics(freqs, s11, frequency)
+    result.update(metrics.AxialRatioMetrics(far_field_freqs, ar, frequency))
+    result.update(metrics.GainMetrics(far_field_freqs, gain, frequency))
+    for i, performance in zip(solved, metrics.PerformanceTuples(result)):
+        results[i] = performance
+    return results
+
+
+def AnalyzeParametric(props_name_array, props_value_table, frequency: float, setup_name: str = "Setup1",
+                      parametric_name: str = "ParametricSetup1", distributed: bool = False, context=None) -> list:
+    """
+    将一组候选解作为一个参数扫描一次求解, 并批量得到各候选解的天线参数.
+    求解器只启动一次, distributed 为 True 时由 AEDT 将各变化分配到多个任务并行求解.
+    :param props_name_array: 变量名列表
+    :param props_value_table: 变量值表, 每行为一个候选解, 单位为 mm
+    :param frequency: 单位 GHz
+    :param setup_name: 求解设置名称
+    :param parametric_name: 参数扫描设置名称
+    :param distributed: 为 True 时使用 AnalyzeDistributed
+    :return: 与 props_value_table 各行对应的 (S11, BW, AR, Gain) 列表 单位[dB] [GHz] [dB] [dB]
+    """
+    ctx = ResolveContext(context)
+    InsertParametricSetup(props_name_array, props_value_table, setup_name, parametric_name, ctx)
+    if distributed:
+        ctx.oDesign.AnalyzeDistributed(parametric_name)
     else:
-        __AR = 999
+        ctx.oDesign.Analyze(parametric_name)
+    return GetParametricPerformance(props_name_array, props_value_table, frequency, setup_name, parametric_name,
+                                    ctx)
+
 
-    # 获取frequency处 天线的最大增益
-    df = pd.read_csv(data_path + "/" + data_sheet_name_list[2])
-    __Gain = df[(df["Freq [GHz]"] == frequency) & (df["Phi [deg]"] == 0) & (df["Theta [deg]"] == 0)].values[0][3]
+# 直接读取求解数据 (不经过报告导出和 CSV)
+# 频率单位换算为 GHz
+_FREQUENCY_SCALE = {"hz": 1e-9, "khz": 1e-6, "mhz": 1e-3, "ghz": 1.0, "thz": 1e3}
 
+
+def GetSolutionData(report_type: str, solution_name: str, context_array, families_array, expressions,
+                    context=None) -> list:
+    """
+    通过 GetSolutionDataPerVariation 直接得到求解数据, 不创建报告, 不导出文件
+    :param report_type: 报告类型 如 "Modal Solution Data", "Far Fields"
+    :param solution_name: 求解名称 如 "Setup1 : Sweep"
+    :param context_array: 如 ["Domain:=", "Sweep"] 或 ["Context:=", "Infinite Sphere1"]
+    :param families_array: 如 ["Freq:=", ["All"], "length:=", ["Nominal"]]
+    :param expressions: 表达式列表 如 ["dB(S(1,1))"]
+    :return: 每个变化一个字典 {"variables": {变量名: 值}, "axes": {扫描变量: 一维数组}, "data": {表达式: 多维数组}}
+             axes 按扫描变量的顺序排列, data 中数组的各维依次对应 axes; 频率单位为 GHz, 角度单位为 deg
+    """
+    import numpy as np
+    ctx = ResolveContext(context)
+    variations = ctx.GetModule("ReportSetup").GetSolutionDataPerVariation(
+        report_type, solution_name, context_array, families_array, list(expressions))
+    results = []
+    for solution in variations:
+        sweeps = OrderedDict()
+        for name in solution.GetSweepNames():
+            values = np.asarray(solution.GetSweepValues(name, False), dtype=float)
+            if name == "Freq":
+                values = values * _FREQUENCY_SCALE.get(str(solution.GetSweepUnits(name)).lower(), 1.0)
+            sweeps[name] = values
+        data = OrderedDict((e, np.asarray(solution.GetRealDataValues(e, False), dtype=float)) for e in expressions)
+        point_count = len(next(iter(data.values()))) if data else 0
+        axes = OrderedDict()
+        if all(len(values) == point_count for values in sweeps.values()):
+            # 扫描变量的值按数据点展开, 按数值还原各维的索引
+            indices = []
+            for name, values in sweeps.items():
+                axes[name], index = np.unique(values, return_inverse=True)
+                indices.append(index)
+            shape = tuple(len(axis) for axis in axes.values())
+            for expression, values in data.items():
+                array = np.full(shape, np.nan)
+                array[tuple(indices)] = values
+                data[expression] = array
+        else:
+            # 扫描变量的值未展开, 数据点为各扫描变量的笛卡尔积, 第一个扫描变量变化最慢
+            for name, values in sweeps.items():
+                axes[name] = np.asarray(list(OrderedDict.fromkeys(values.tolist())))
+            shape = tuple(len(axis) for axis in axes.values())
+            for expression, values in data.items():
+                data[expression] = values.reshape(shape)
+        variables = {name: solution.GetDesignVariableValue(name) for name in solution.GetDesignVariableNames()}
+        results.append({"variables": variables, "axes": axes, "data": data})
+    return results
+
+
+def AlongFrequency(solution_data: dict, expression: str):
+    """
+    取出求解数据中表达式沿频率的一维数组 (其余扫描变量取第一个值)
+    :return: (频率数组 单位 GHz, 数据数组)
+    """
+    import numpy as np
+    names = list(solution_data["axes"])
+    array = np.moveaxis(solution_data["data"][expression], names.index("Freq"), 0)
+    return solution_data["axes"]["Freq"], array.reshape(array.shape[0], -1)[:, 0]
+
+
+def GetAntennaPerformanceDirect(frequency: float, setup_name: str = "Setup1", export_csv: bool = False,
+                                context=None):
+    """
+    获得对应频率下的天线参数, 通过 GetSolutionDataPerVariation 直接读取求解数据到 NumPy 数组,
+    不创建/更新报告, 不经过 CSV 文件. 各指标与 GetAntennaPerformance 相同由 hfss.metrics 按频率容差计算, 结果相同
+    :param frequency: 单位 GHz
+    :param setup_name: 求解设置名称
+    :param export_csv: 为 True 时仍生成报告并导出 CSV 文件, 仅作为附带输出
+    :return: 返回天线的S11,带宽,轴比,增益 __S11, __BW, __AR, __Gain
+    单位[dB] [GHz] [dB] [dB]
+    """
+    from hfss import metrics
+    ctx = ResolveContext(context)
+    state = ctx.oDesign.solution_state
+    key = ("GetAntennaPerformanceDirect", frequency, setup_name, state.Version(setup_name))
+    if not export_csv and key in state.results:
+        return state.results[key]
+    nominal = []
+    for name in ctx.oDesign.GetVariables():
+        nominal = nominal + [name + ":=", ["Nominal"]]
+    s11_data = GetSolutionData("Modal Solution Data", setup_name + " : Sweep", ["Domain:=", "Sweep"],
+                               ["Freq:=", ["All"]] + nominal, ["dB(S(1,1))"], ctx)
+    far_field_data = GetSolutionData("Far Fields", setup_name + " : Sweep", ["Context:=", "Infinite Sphere1"],
+                                     ["Freq:=", ["All"], "Phi:=", ["0deg"], "Theta:=", ["0deg"]] + nominal,
+                                     ["dB(AxialRatioValue)", "dB(RealizedGainLHCP)"], ctx)
+    if export_csv:
+        GenerateS11Graph(ctx)
+        GenerateARBWGraph(ctx)
+        GenerateRadiationPattern(frequency, ctx)
+    if len(s11_data) == 0 or len(far_field_data) == 0:
+        print("该设计没有求解结果")
+        return 0.0, 0.0, 999, 0.0
+    freqs, s11 = AlongFrequency(s11_data[0], "dB(S(1,1))")
+    __S11, __BW = S11Performance(frequency, freqs, s11)
+    freqs, ar = AlongFrequency(far_field_data[0], "dB(AxialRatioValue)")
+    gain = AlongFrequency(far_field_data[0], "dB(RealizedGainLHCP)")[1]
+    # 换算为 GHz 的频率不能精确比较, 按容差查找; 没有对应频点时 AR 为 999, Gain 为 0
+    __AR = metrics.AtFrequency(freqs, ar, frequency, metrics.MISSING_AR)[0]
+    __Gain = metrics.AtFrequency(freqs, gain, frequency, 0.0)[0]
+    state.results[key] = (__S11, __BW, __AR, __Gain)
     return __S11, __BW, __AR, __Gain
 
+
+def StoreRadiationPattern(frequencies, store_path: str = None, expression: str = "dB(GainTotal)",
+                          setup_name: str = "Setup1", sphere_name: str = "Infinite Sphere1", per_frequency: bool = False,
+                          context=None) -> str:
+    """
+    将远场球坐标全部 Theta/Phi 上的方向图直接读取并保存为二进制存储 (见 hfss.pattern), 不创建报告, 不导出 CSV.
+    与 Generate3DGainRadiationPattern 导出的数据相同, 读取时可按频点或切面按需映射
+    :param frequencies: 频率或频率列表 单位 GHz
+    :param store_path: 存储文件夹路径, 默认为 <仿真数据路径>/Gain 3D Radiation Pattern Plot 1.pattern
+    :param expression: 表达式 如 "dB(GainTotal)"
+    :param setup_name: 求解设置名称
+    :param sphere_name: 远场球坐标名称
+    :param per_frequency: 为 True 时每个频点保存为一个数据文件
+    :return: 存储文件夹路径, 没有求解结果时为 None
+    """
+    from hfss import pattern
+    ctx = ResolveContext(context)
+    if isinstance(frequencies, (int, float)):
+        frequencies = [frequencies]
+    if store_path is None:
+        store_path = GetAnalysisDataPath(ctx) + "/Gain 3D Radiation Pattern Plot 1.pattern"
+    nominal = []
+    for name in ctx.oDesign.GetVariables():
+        nominal = nominal + [name + ":=", ["Nominal"]]
+    solution_data = GetSolutionData("Far Fields", setup_name + " : Sweep", ["Context:=", sphere_name],
+                                    ["Theta:=", ["All"], "Phi:=", ["All"],
+                                     "Freq:=", [str(f) + "GHz" for f in frequencies]] + nominal,
+                                    [expression], ctx)
+    if len(solution_data) == 0:
+        print("该设计没有求解结果")
+        return None
+    return pattern.PatternFromArrays(store_path, solution_data[0]["axes"], solution_data[0]["data"][expression],
+                                     expression, per_frequency)
+
+
+def SphereGrid(frequency: float, sphere_name: str, expression: str = "dB(GainTotal)", setup_name: str = "Setup1",
+               context=None):
+    """
+    直接读取远场球坐标上全部方向的数据
+    :param frequency: 单位 GHz
+    :param sphere_name: 远场球坐标名称
+    :return: (theta 数组, phi 数组, (Phi 点数, Theta 点数) 数组) 单位 deg, 没有求解结果时为 None
+    """
+    import numpy as np
+    ctx = ResolveContext(context)
+    nominal = []
+    for name in ctx.oDesign.GetVariables():
+        nominal = nominal + [name + ":=", ["Nominal"]]
+    solution_data = GetSolutionData("Far Fields", setup_name + " : Sweep", ["Context:=", sphere_name],
+                                    ["Theta:=", ["All"], "Phi:=", ["All"], "Freq:=", [str(frequency) + "GHz"]]
+                                    + nominal, [expression], ctx)
+    if len(solution_data) == 0:
+        return None
+    axes = list(solution_data[0]["axes"])
+    values = solution_data[0]["data"][expression]
+    others = [i for i, name in enumerate(axes) if name not in ("Phi", "Theta")]
+    grid = np.moveaxis(values, [axes.index("Phi"), axes.index("Theta")] + others, range(len(axes)))
+    grid = grid.reshape(grid.shape[0], grid.shape[1], -1)[:, :, 0]
+    return solution_data[0]["axes"]["Theta"], solution_data[0]["axes"]["Phi"], grid
+
+
+def LocalMinima(grid, phi):
+    """
+    (Phi 点数, Theta 点数) 网格中低于 8 个相邻点的点, phi 覆盖 360deg 时首尾相接
+    :return: [(phi 序号, theta 序号)] 按数值从小到大排列
+    """
+    import numpy as np
+    # phi 包含 0deg 和 360deg 时最后一行与第一行重复
+    full = len(phi) > 1 and phi[-1] - phi[0] >= 360 - 1e-9
+    values = grid[:-1] if full else grid
+    wrap = full or (len(phi) > 1 and phi[-1] - phi[0] + phi[1] - phi[0] >= 360 - 1e-9)
+    padded = np.pad(values, ((0, 0), (1, 1)), constant_values=np.inf)
+    if wrap:
+        padded = np.concatenate((padded[-1:], padded, padded[:1]))
+    else:
+        padded = np.pad(padded, ((1, 1), (0, 0)), constant_values=np.inf)
+    center = padded[1:-1, 1:-1]
+    minimum = np.ones(center.shape, dtype=bool)
+    for dp in (-1, 0, 1):
+        for dt in (-1, 0, 1):
+            if dp or dt:
+                minimum &= center < padded[1 + dp:padded.shape[0] - 1 + dp, 1 + dt:padded.shape[1] - 1 + dt]
+    rows, columns = np.nonzero(minimum)
+    order = np.argsort(values[rows, columns])
+    return list(zip(rows[order].tolist(), columns[order].tolist()))
+
+
+def AngularDistance(theta1: float, phi1: float, theta2: float, phi2: float) -> float:
+    """
+    球面上两个方向的夹角, phi 相差 360deg 时为同一方向
+    :return: 单位 deg
+    """
+    t1, p1, t2, p2 = (math.radians(v) for v in (theta1, phi1, theta2, phi2))
+    c = math.cos(t1) * math.cos(t2) + math.sin(t1) * math.sin(t2) * math.cos(p1 - p2)
+    return math.degrees(math.acos(max(-1.0, min(1.0, c))))
+
+
+def AdaptiveRadiationSphere(frequency: float, expression: str = "dB(GainTotal)", coarse_step: float = 10.0,
+                            fine_step: float = 1.0, span: float = None, null_count: int = 2,
+                            setup_name: str = "Setup1", sphere_name: str = "Adaptive Sphere", context=None) -> dict:
+    """
+    自适应远场球坐标: 先计算粗网格 (coarse_step), 再在主瓣最大值和最深的 null_count 个零点附近
+    各插入一个 ±span 范围、步进 fine_step 的局部球坐标并读取, 得到与全球面细网格相同精度的主瓣和零点,
+    计算的方向数约为全球面细网格的几十分之一.
+    粗网格为 Theta 0~180deg、Phi 0~360deg, 每个方向只出现一次; 主瓣与零点之间按球面上的夹角判断间隔.
+    使用的远场球坐标为 <sphere_name> Coarse、<sphere_name> Beam、<sphere_name> Null1...,
+    已存在时修改其范围; 不使用本库生成报告的远场球坐标, 因此不使已导出的报告失效
+    :param frequency: 单位 GHz
+    :param expression: 表达式 如 "dB(GainTotal)"
+    :param coarse_step: 粗网格步进 单位 deg
+    :param fine_step: 局部细网格步进 单位 deg
+    :param span: 局部球坐标的半宽 单位 deg, 默认为 coarse_step
+    :param null_count: 细化的零点个数
+    :param setup_name: 求解设置名称
+    :param sphere_name: 远场球坐标名称前缀
+    :return: {"beam": {"value", "theta", "phi", "sphere"}, "nulls": [同 beam], "points": 计算的方向数,
+              "full_points": 全球面细网格的方向数}, 没有求解结果时为 None
+    """
+    import numpy as np
+    ctx = ResolveContext(context)
+    if span is None:
+        span = coarse_step
+    coarse_name = sphere_name + " Coarse"
+    SetSphere(coarse_name, (0, 180, coarse_step), (0, 360, coarse_step), ctx)
+    coarse = SphereGrid(frequency, coarse_name, expression, setup_name, ctx)
+    if coarse is None:
+        print("该设计没有求解结果")
+        return None
+    theta, phi, grid = coarse
+    points = grid.size
+    targets = [("Beam", np.unravel_index(int(np.nanargmax(grid)), grid.shape), True)]
+    for p, t in LocalMinima(grid, phi):
+        if len(targets) > null_count:
+            break
+        # 与已选的主瓣/零点在球面上的夹角大于局部球坐标的半宽
+        if all(AngularDistance(theta[t], phi[p], theta[q[1]], phi[q[0]]) > span for _, q, _ in targets):
+            targets.append(("Null%d" % len(targets), (p, t), False))
+    result = {"beam": None, "nulls": []}
+    for label, (p, t), maximum in targets:
+        name = sphere_name + " " + label
+        local_theta = (max(theta[t] - span, 0), min(theta[t] + span, 180), fine_step)
+        local_phi = (phi[p] - span, phi[p] + span, fine_step)
+        SetSphere(name, local_theta, local_phi, ctx)
+        local = SphereGrid(frequency, name, expression, setup_name, ctx)
+        if local is None:
+            print("该设计没有求解结果")
+            return None
+        fine_theta, fine_phi, fine = local
+        points += fine.size
+        index = np.unravel_index(int(np.nanargmax(fine) if maximum else np.nanargmin(fine)), fine.shape)
+        extremum = {"value": float(fine[index]), "theta": float(fine_theta[index[1]]),
+                    "phi": float(fine_phi[index[0]] % 360), "sphere": name}
+        if maximum:
+            result["beam"] = extremum
+        else:
+            result["nulls"].append(extremum)
+    result["points"] = points
+    result["full_points"] = int((180 / fine_step + 1) * (360 / fine_step + 1))
+    return result
+
+
 if __name__ == '__main__':
     # from hfss import basic
     # projectPath = "P:\\Ansoft\\ProjectStudy.aedt"
@@ -0,0 +1,1784 @@
+"""
+@FileName: backend/__init__.py
+@Description: 该文件提供纯 Python 实现的模拟 AEDT 后端, 无需 HFSS 和 win32com 即可在 Linux 上运行 basic/analysis 等接口.
+              模拟后端实现 Desktop/Project/Design/Module/Editor 的常用方法, 记录项目、设计、变量、求解设置、报告等状态,
+              并根据设计变量生成确定性的合成仿真数据 (S11 曲线、轴比、增益方向图), 求解和导出的耗时可配置,
+              用于单独测量本库在 Python 侧的开销.
+              使用方法:
+                  from hfss import backend
+                  backend.UseSimulated(backend.SimulationConfig(analyze_seconds=0.5))
+              或设置环境变量 HFSS_API_BACKEND=simulated
+@Author: SJY
+@Time: 2026/10/18
+@Coding: UTF-8
+@Vision: V1.0
+"""
+
+# Official Standard Library
+import itertools
+import math
+import os
+import re
+import tempfile
+import time
+import zlib
+
+# Import the OSL with "from"
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+
+# Import the LL with "from"
+import hfss
+
+
+class SimulationConfig(object):
+    """
+    模拟后端的配置, 各耗时单位为 s
+    """
+
+    def __init__(self, analyze_seconds: float = 0.0, per_frequency_seconds: float = 0.0,
+                 regenerate_seconds: float = 0.0, report_seconds: float = 0.0, export_row_seconds: float = 0.0,
+                 project_directory: str = None, center_frequency: float = 2.5, strict: bool = False,
+                 field_save_seconds: float = 0.0, pass_seconds: float = 0.0, mesh_import_tolerance: float = 0.2,
+                 result_bytes: int = 0, variation_seconds: float = 0.0, modeler_seconds: float = 0.0):
+        """
+        :param analyze_seconds: 每次 Analyze 的固定耗时 (求解器启动、网格剖分等)
+        :param per_frequency_seconds: 扫频中每个频点的求解耗时
+        :param regenerate_seconds: 每次修改变量后模型重新计算的耗时
+        :param report_seconds: 每次创建/更新报告的耗时
+        :param export_row_seconds: 导出报告时每行数据的耗时
+        :param project_directory: 模拟项目的保存路径, 默认为系统临时文件夹下的 hfss_simulated
+        :param center_frequency: 合成天线模型的标称谐振频率 单位 GHz
+        :param strict: 为 True 时调用未实现的方法抛出 AttributeError, 否则记录调用并返回 None
+        :param field_save_seconds: 扫频中每个保存全部场数据的频点写出场数据的耗时
+        :param pass_seconds: 第一次自适应迭代的耗时, 之后各次迭代的耗时与网格的四面体个数成正比
+        :param mesh_import_tolerance: 导入网格 (MeshLink) 时变量相对源变化的最大相对变化, 超过时网格无法映射, 求解失败
+        :param result_bytes: 每个变化写入结果文件夹 (.aedtresults) 的场数据文件大小 单位 byte, 网格文件为其一半,
+                             为 0 时不写文件
+        :param variation_seconds: 项目中每个保留场数据的变化使每次求解和 Project.Save 增加的耗时
+        :param modeler_seconds: 每次建模操作 (创建、删除、复制、布尔运算、修改属性等) 的耗时
+        """
+        self.analyze_seconds = analyze_seconds
+        self.per_frequency_seconds = per_frequency_seconds
+        self.regenerate_seconds = regenerate_seconds
+        self.report_seconds = report_seconds
+        self.export_row_seconds = export_row_seconds
+        if project_directory is None:
+            project_directory = os.path.join(tempfile.gettempdir(), "hfss_simulated")
+        self.project_directory = project_directory
+        self.center_frequency = center_frequency
+        self.strict = strict
+        self.field_save_seconds = field_save_seconds
+        self.pass_seconds = pass_seconds
+        self.mesh_import_tolerance = mesh_import_tolerance
+        self.result_bytes = result_bytes
+        self.variation_seconds = variation_seconds
+        self.modeler_seconds = modeler_seconds
+
+    @staticmethod
+    def Spend(seconds: float):
+        if seconds > 0:
+            time.sleep(seconds)
+
+
+class SimulationError(Exception):
+    """
+    模拟后端中的错误, 对应 COM 调用失败
+    """
+    pass
+
+
+# 工具函数
+def ParseNamedArray(array) -> Tuple[str, Dict[str, object]]:
+    """
+    解析 ["NAME:<名称>", "Key:=", value, ...] 形式的数组
+    :return: (名称, {Key: value}) 其中嵌套的 "NAME:..." 数组以其名称为键
+    """
+    name = ""
+    props = OrderedDict()
+    items = list(array)
+    index = 0
+    if items and isinstance(items[0], str) and items[0].startswith("NAME:"):
+        name = items[0][len("NAME:"):]
+        index = 1
+    while index < len(items):
+        item = items[index]
+        if isinstance(item, str) and item.endswith(":=") and index + 1 < len(items):
+            props[item[:-2]] = items[index + 1]
+            index += 2
+            continue
+        if isinstance(item, (list, tuple)) and item and isinstance(item[0], str) and item[0].startswith("NAME:"):
+            props[item[0][len("NAME:"):]] = item
+        index += 1
+    return name, props
+
+
+_UNIT_SCALE = {"": 1.0, "hz": 1e-9, "khz": 1e-6, "mhz": 1e-3, "ghz": 1.0, "thz": 1e3,
+               "deg": 1.0, "rad": 180.0 / math.pi,
+               "mm": 1.0, "um": 1e-3, "nm": 1e-6, "cm": 10.0, "m": 1e3, "mil": 0.0254, "in": 25.4, "meter": 1e3}
+_QUANTITY_PATTERN = re.compile(r"^\s*([-+0-9.eE]+)\s*([a-zA-Z]*)\s*$")
+
+
+def ParseQuantity(value, default=None):
+    """
+    解析带单位的数值, 频率换算为 GHz, 角度换算为 deg, 长度换算为 mm
+    :param value: 如 "2.5GHz", "-180deg", "12mm", 3.0
+    :param default: 无法解析时的返回值
+    :return: float
+    """
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = _QUANTITY_PATTERN.match(str(value))
+    if match is None:
+        return default
+    scale = _UNIT_SCALE.get(match.group(2).lower())
+    if scale is None:
+        return default
+    return float(match.group(1)) * scale
+
+
+def LinearCount(start: float, stop: float, count: int) -> List[float]:
+    """
+    线性等分点, 结果保留 10 位小数, 保证 2.5 这类频点可以精确比较
+    """
+    if count <= 1:
+        return [round(start, 10)]
+    step = (stop - start) / (count - 1)
+    return [round(start + i * step, 10) for i in range(count)]
+
+
+def LinearStep(start: float, stop: float, step: float) -> List[float]:
+    if step == 0:
+        return [round(start, 10)]
+    count = int(math.floor((stop - start) / step + 1e-9)) + 1
+    return [round(start + i * step, 10) for i in range(count)]
+
+
+def VariationKey(variables: Dict[str, str]) -> str:
+    """
+    变量字典对应的设计变化键 形如 "a='1mm' b='2mm'"
+    """
+    return " ".join("%s='%s'" % (name, value) for name, value in variables.items())
+
+
+def ParseVariationKey(variation_key: str) -> Dict[str, str]:
+    """
+    解析 "length='30mm' width='28mm'" 形式的变化键
+    """
+    return OrderedDict((m.group(1), m.group(2)) for m in re.finditer(r"(\w+)='([^']*)'", str(variation_key)))
+
+
+def FormatNumber(value: float) -> str:
+    return repr(float(value))
+
+
+class AntennaModel(object):
+    """
+    合成天线模型 由设计变量确定性地生成谐振频率、带宽、轴比和增益, 同一组变量总得到相同的数据
+    """
+
+    def __init__(self, variables: Dict[str, str], center_frequency: float = 2.5):
+        mix = 0.0
+        for name, value in variables.items():
+            number = ParseQuantity(value)
+            weight = (zlib.crc32(name.encode("utf-8")) % 1000) / 1000.0 + 0.5
+            if number is None:
+                number = (zlib.crc32(str(value).encode("utf-8")) % 1000) / 100.0
+            mix += math.sin(weight * number)
+        self.mix = mix
+        self.f0 = center_frequency * (1.0 + 0.08 * math.tanh(mix / 3.0))
+        self.q = 12.0 + 6.0 * math.cos(mix)
+        self.depth = -12.0 - 18.0 * (0.5 + 0.5 * math.sin(1.7 * mix))
+        self.f_ar = self.f0 * (1.0 + 0.01 * math.sin(2.3 * mix))
+        self.ar_min = 0.5 + 1.5 * (0.5 + 0.5 * math.cos(3.1 * mix))
+        self.gain = 5.0 + 2.0 * math.sin(0.7 * mix)
+        self.order = 1.5 + 0.5 * math.cos(1.3 * mix)
+        # 自适应迭代: Delta S 按几何级数下降到 delta_floor, 约 1/4 的变量组合 delta_floor 高于常用的收敛条件 0.02,
+        # 迭代到 MaximumPasses 也不收敛
+        self.delta_start = 0.3 + 0.2 * (0.5 + 0.5 * math.sin(2.9 * mix))
+        self.delta_rate = 0.5 + 0.2 * (0.5 + 0.5 * math.cos(1.9 * mix))
+        if math.cos(2.3 * mix + 1.0) < 0.7:
+            self.delta_floor = 0.002
+        else:
+            self.delta_floor = 0.03 + 0.02 * (0.5 + 0.5 * math.sin(5.1 * mix))
+
+    # 初始网格的四面体个数
+    TETRAHEDRA = 5000
+
+    def DeltaS(self, pass_number: int) -> float:
+        """
+        第 pass_number 次自适应迭代的最大 Delta S, 第一次迭代没有 Delta S, 返回 nan
+        """
+        if pass_number < 2:
+            return float("nan")
+        return self.delta_floor + self.delta_start * self.delta_rate ** (pass_number - 2)
+
+    def Tetrahedra(self, pass_number: int, percent_refinement: float = 30.0) -> int:
+        """
+        第 pass_number 次自适应迭代的四面体个数, 每次迭代按 percent_refinement 的一半增加 (局部加密)
+        """
+        return int(self.TETRAHEDRA * (1.0 + 0.005 * percent_refinement * (pass_number - 1)))
+
+    def S11(self, freq: float) -> complex:
+        """
+        复数反射系数, 谐振处 |S11| 为 10^(depth/20)
+        """
+        x = 2.0 * self.q * (freq - self.f0) / self.f0
+        gamma_min = 10 ** (self.depth / 20.0)
+        magnitude = math.sqrt(1.0 - (1.0 - gamma_min ** 2) / (1.0 + x * x))
+        phase = -math.atan(x) - math.pi * freq / self.f0
+        return complex(magnitude * math.cos(phase), magnitude * math.sin(phase))
+
+    def S11dB(self, freq: float) -> float:
+        return 20.0 * math.log10(max(abs(self.S11(freq)), 1e-12))
+
+    def AxialRatiodB(self, freq: float, theta: float = 0.0, phi: float = 0.0) -> float:
+        detune = (freq - self.f_ar) / self.f_ar
+        return self.ar_min + 4000.0 * detune * detune + 0.02 * abs(theta) * (1.0 + 0.3 * math.cos(math.radians(phi)))
+
+    def GainTotaldB(self, freq: float, theta: float, phi: float) -> float:
+        c = math.cos(math.radians(theta))
+        pattern = max(c, 0.0) ** self.order + 1e-3 * (1.5 + math.cos(math.radians(2 * phi)))
+        mismatch = 10.0 * math.log10(max(1.0 - abs(self.S11(freq)) ** 2, 1e-6))
+        return self.gain + 10.0 * math.log10(pattern) + 0.5 * mismatch
+
+    def RealizedGainRHCPdB(self, freq: float, theta: float, phi: float) -> float:
+        return self.GainTotaldB(freq, theta, phi) - 0.1 * self.AxialRatiodB(freq, theta, phi)
+
+    def RealizedGainLHCPdB(self, freq: float, theta: float, phi: float) -> float:
+        return self.GainTotaldB(freq, theta, phi) - 15.0 - self.AxialRatiodB(freq, theta, phi)
+
+    def Evaluate(self, expression: str, freq: float, theta: float = 0.0, phi: float = 0.0) -> float:
+        """
+        计算报告表达式的值
+        :param expression: 如 "dB(S(1,1))", "dB(AxialRatioValue)", "dB(GainTotal)", "mag(S(1,1))"
+        """
+        expression = expression.replace(" ", "")
+        match = re.match(r"^(dB|mag|re|im|ang_deg)?\(?(.+?)\)?$", expression)
+        function, quantity = match.group(1), match.group(2)
+        if quantity.startswith("S("):
+            s = self.S11(freq)
+            if function == "dB":
+                return 20.0 * math.log10(max(abs(s), 1e-12))
+            if function == "re":
+                return s.real
+            if function == "im":
+                return s.imag
+            if function == "ang_deg":
+                return math.degrees(math.atan2(s.imag, s.real))
+            return abs(s)
+        evaluators = {
+            "AxialRatioValue": self.AxialRatiodB,
+            "GainTotal": self.GainTotaldB,
+            "RealizedGainTotal": self.GainTotaldB,
+            "GainRHCP": self.RealizedGainRHCPdB,
+            "GainLHCP": self.RealizedGainLHCPdB,
+            "RealizedGainRHCP": self.RealizedGainRHCPdB,
+            "RealizedGainLHCP": self.RealizedGainLHCPdB,
+        }
+        if quantity not in evaluators:
+            raise SimulationError("模拟后端不支持的表达式: " + expression)
+        value = evaluators[quantity](freq, theta, phi)
+        if function == "dB":
+            return value
+        return 10 ** (value / 10.0)
+
+
+class SimulatedSolution(object):
+    """
+    一次求解的结果: 求解时的变量、扫频频点及合成天线模型
+    """
+
+    def __init__(self, setup_name: str, variables: Dict[str, str], center_frequency: float,
+                 sweep_frequencies: Dict[str, List[float]], model: AntennaModel,
+                 field_frequencies: Dict[str, List[float]] = None, solved_points: int = 0,
+                 saved_field_points: int = 0):
+        """
+        :param field_frequencies: {扫频名称: 有场数据或远场数据的频点}, 未给出的扫频视为全部频点都有场数据
+        :param solved_points: 扫频中实际求解的频点数
+        :param saved_field_points: 扫频中保存全部场数据的频点数, 与场数据占用的磁盘空间成正比
+        """
+        self.setup_name = setup_name
+        self.variables = OrderedDict(variables)
+        self.center_frequency = center_frequency
+        self.sweep_frequencies = sweep_frequencies
+        self.model = model
+        self.field_frequencies = field_frequencies or {}
+        self.solved_points = solved_points
+        self.saved_field_points = saved_field_points
+        self.solved_at = time.time()
+        self.convergence = []  # [(迭代次数, 四面体个数, Delta S)]
+        self.fields = True  # 是否保留场数据, DeleteFieldVariation 后为 False
+        self.mesh = True
+
+    def Frequencies(self, solution_name: str) -> List[float]:
+        """
+        :param solution_name: "LastAdaptive" 或扫频名称
+        """
+        if solution_name in self.sweep_frequencies:
+            return self.sweep_frequencies[solution_name]
+        return [self.center_frequency]
+
+    def FieldFrequencies(self, solution_name: str) -> List[float]:
+        """
+        有场数据或远场数据 (远场报告可用) 的频点
+        """
+        if solution_name in self.field_frequencies:
+            return self.field_frequencies[solution_name]
+        return self.Frequencies(solution_name)
+
+
+# 模拟对象基类
+class SimulatedObject(object):
+    """
+    模拟对象基类 未实现的方法在非严格模式下记录到 unsupported_calls 并返回 None
+    """
+
+    def __init__(self, config: SimulationConfig):
+        self.config = config
+        self.unsupported_calls = []
+
+    def __getattr__(self, name):
+        if name.startswith("_") or not name[:1].isupper() or self.__dict__.get("config") is None \
+                or self.config.strict:
+            raise AttributeError("%s 没有方法 %s" % (type(self).__name__, name))
+
+        def Unsupported(*args):
+            self.unsupported_calls.append((name, args))
+            return None
+        return Unsupported
+
+
+class SimulatedAnsoftApp(SimulatedObject):
+    def __init__(self, config: SimulationConfig = None):
+        super(SimulatedAnsoftApp, self).__init__(config if config is not None else SimulationConfig())
+        self.desktop = SimulatedDesktop(self.config)
+
+    def GetAppDesktop(self):
+        return self.desktop
+
+
+class SimulatedDesktop(SimulatedObject):
+    def __init__(self, config: SimulationConfig):
+        super(SimulatedDesktop, self).__init__(config)
+        self.projects = OrderedDict()  # type: Dict[str, SimulatedProject]
+        self.active_project = None
+        self.project_directory = config.project_directory
+        self.messages = []  # [(project, design, severity, message)]
+        self.running = True
+        self.simulations = 0  # 正在运行的求解个数
+        self.stop_requested = False
+
+    def NewProject(self):
+        index = 1
+        while "Project%d" % index in self.projects:
+            index += 1
+        project = SimulatedProject(self, "Project%d" % index, self.project_directory)
+        self.projects[project.name] = project
+        self.active_project = project
+        return project
+
+    def OpenProject(self, file_name: str):
+        directory, name_ext = os.path.split(file_name)
+        name = os.path.splitext(name_ext)[0]
+        if name in self.projects:
+            raise SimulationError("项目已打开: " + name)
+        project = SimulatedProject(self, name, directory)
+        self.projects[name] = project
+        self.active_project = project
+        return project
+
+    def GetActiveProject(self):
+        return self.active_project
+
+    def SetActiveProject(self, project_name: str):
+        if project_name not in self.projects:
+            raise SimulationError("项目不存在: " + project_name)
+        self.active_project = self.projects[project_name]
+        return self.active_project
+
+    def GetProjectList(self):
+        return tuple(self.projects)
+
+    @property
+    def GetProjects(self):
+        return tuple(self.projects.values())
+
+    def CloseProject(self, project_name: str):
+        project = self.projects.pop(project_name, None)
+        if project is None:
+            raise SimulationError("项目不存在: " + project_name)
+        if self.active_project is project:
+            self.active_project = next(reversed(self.projects.values()), None) if self.projects else None
+
+    def DeleteProject(self, project_name: str):
+        self.CloseProject(project_name)
+
+    def QuitApplication(self):
+        self.projects.clear()
+        self.active_project = None
+        self.running = False
+
+    def SetProjectDirectory(self, directory_path: str):
+        self.project_directory = directory_path
+
+    def EnableAutoSave(self, enable):
+        pass
+
+    def AddMessage(self, project_name, design_name, severity, msg, *category):
+        self.messages.append((project_name, design_name, severity, msg))
+
+    def GetMessages(self, project_name, design_name, severity):
+        return tuple("[%s] %s" % (("info", "warning", "error", "fatal")[min(m[2], 3)], m[3])
+                     for m in self.messages
+                     if (project_name == "" or m[0] == project_name) and
+                     (design_name == "" or m[1] == design_name) and m[2] >= severity)
+
+    GetMassages = GetMessages
+
+    def StopSimulations(self):
+        """
+        停止正在运行的求解, 在当前自适应迭代完成后生效
+        """
+        if self.simulations > 0:
+            self.stop_requested = True
+
+    def AreThereSimulationsRunning(self):
+        return self.simulations > 0
+
+    def PauseScript(self, message):
+        pass
+
+
+class SimulatedVariableOwner(SimulatedObject):
+    """
+    拥有变量的模拟对象 (项目和设计) 的公共部分
+    """
+    VARIABLE_TAB = "LocalVariableTab"
+
+    def __init__(self, config: SimulationConfig, name: str):
+        super(SimulatedVariableOwner, self).__init__(config)
+        self.name = name
+        self.variables = OrderedDict()  # type: Dict[str, str]
+        self.regenerations = 0
+        self.properties = {}  # 非变量属性 {(tab, server, name): value}
+
+    def GetName(self):
+        return self.name
+
+    def GetVariables(self):
+        return tuple(self.variables)
+
+    def GetVariableValue(self, var_name):
+        if var_name not in self.variables:
+            raise SimulationError("变量不存在: " + var_name)
+        return self.variables[var_name]
+
+    GetVariablesValue = GetVariableValue
+
+    def SetVariableValue(self, var_name, var_value):
+        self.variables[var_name] = str(var_value)
+        self.Regenerate()
+
+    def Regenerate(self):
+        self.regenerations += 1
+        self.config.Spend(self.config.regenerate_seconds)
+
+    def ChangeProperty(self, args):
+        variables_changed = False
+        for tab in list(args)[1:]:
+            tab_name = tab[0][len("NAME:"):]
+            servers = []
+            for group in list(tab)[1:]:
+                group_name = group[0][len("NAME:"):]
+                if group_name == "PropServers":
+                    servers = list(group[1:])
+                    continue
+                for prop in list(group)[1:]:
+                    if isinstance(prop, str):
+                        prop_name, props = (prop[len("NAME:"):] if prop.startswith("NAME:") else prop), {}
+                    else:
+                        prop_name, props = ParseNamedArray(prop)
+                    if tab_name in ("LocalVariableTab", "ProjectVariableTab"):
+                        variables_changed = True
+                        self.ChangeVariableProp(group_name, prop_name, props)
+                    else:
+                        for server in servers:
+                            self.ChangeOtherProp(tab_name, server, group_name, prop_name, props)
+        if variables_changed:
+            self.Regenerate()
+
+    def ChangeVariableProp(self, group_name, prop_name, props):
+        if group_name == "DeletedProps":
+            self.variables.pop(prop_name, None)
+            return
+        if group_name == "ChangedProps" and prop_name not in self.variables:
+            raise SimulationError("变量不存在: " + prop_name)
+        if "NewName" in props:
+            self.variables = OrderedDict((props["NewName"] if k == prop_name else k, v)
+                                         for k, v in self.variables.items())
+            prop_name = props["NewName"]
+        if "Value" in props:
+            self.variables[prop_name] = str(props["Value"])
+
+    def ChangeOtherProp(self, tab_name, server, group_name, prop_name, props):
+        self.properties[(tab_name, server, prop_name)] = props
+
+    def GetPropertyValue(self, prop_tab, prop_server, prop_name):
+        if prop_tab in ("LocalVariableTab", "ProjectVariableTab"):
+            return self.GetVariableValue(prop_name)
+        props = self.properties.get((prop_tab, prop_server, prop_name))
+        if props is None:
+            raise SimulationError("属性不存在: " + prop_name)
+        return props.get("Value")
+
+    def Undo(self):
+        pass
+
+    def Redo(self):
+        pass
+
+
+class SimulatedProject(SimulatedVariableOwner):
+    def __init__(self, desktop: SimulatedDesktop, name: str, path: str):
+        super(SimulatedProject, self).__init__(desktop.config, name)
+        self.desktop = desktop
+        self.path = path
+        self.designs = OrderedDict()  # type: Dict[str, SimulatedDesign]
+        self.active_design = None
+        self.clipboard = None
+        self.saves = 0
+
+    def GetPath(self):
+        return self.path
+
+    def Rename(self, new_name, over_write_ok):
+        directory, name_ext = os.path.split(new_name)
+        name = os.path.splitext(name_ext)[0]
+        self.desktop.projects = OrderedDict((name if k == self.name else k, v)
+                                            for k, v in self.desktop.projects.items())
+        self.name = name
+        if directory:
+            self.path = directory
+        self.Save()
+
+    def Save(self):
+        self.saves += 1
+        if os.path.exists(self.path) is False:
+            os.makedirs(self.path)
+        self.config.Spend(self.config.variation_seconds * self.FieldVariations())
+
+    def FieldVariations(self) -> int:
+        """
+        项目中保留场数据的变化个数
+        """
+        return sum(1 for design in self.designs.values() for solution in design.solutions.values() if solution.fields)
+
+    def SaveAs(self, new_name, over_write_ok, *args):
+        self.Rename(new_name, over_write_ok)
+
+    def InsertDesign(self, design_type, design_name, solution_type, *args):
+        if design_name in self.designs:
+            raise SimulationError("设计已存在: " + design_name)
+        design = SimulatedDesign(self, design_name, solution_type)
+        self.designs[design_name] = design
+        self.active_design = design
+        return design
+
+    def GetDesign(self, design_name):
+        if design_name not in self.designs:
+            raise SimulationError("设计不存在: " + design_name)
+        return self.designs[design_name]
+
+    def GetActiveDesign(self):
+        return self.active_design
+
+    def SetActiveDesign(self, design_name):
+        self.active_design = self.GetDesign(design_name)
+        return self.active_design
+
+    def GetTopDesignList(self):
+        return tuple(self.designs)
+
+    def CopyDesign(self, design_name):
+        self.clipboard = self.GetDesign(design_name)
+
+    def Paste(self):
+        if self.clipboard is None:
+            raise SimulationError("剪贴板为空")
+        index = 1
+        while "%s_%d" % (self.clipboard.name, index) in self.designs:
+            index += 1
+        design = self.clipboard.Copy(self, "%s_%d" % (self.clipboard.name, index))
+        self.designs[design.name] = design
+        self.active_design = design
+
+    def DeleteDesign(self, design_name):
+        design = self.designs.pop(design_name, None)
+        if design is None:
+            raise SimulationError("设计不存在: " + design_name)
+        if self.active_design is design:
+            self.active_design = None
+
+    def RenameDesign(self, old_name, new_name):
+        self.designs = OrderedDict((new_name if k == old_name else k, v) for k, v in self.designs.items())
+        self.designs[new_name].name = new_name
+
+    def AnalyzeAll(self):
+        for design in self.designs.values():
+            for setup_name in design.GetModule("AnalysisSetup").GetSetups():
+                design.Analyze(setup_name)
+
+    SimulateAll = AnalyzeAll
+
+    def ValidateDesign(self):
+        return 1
+
+
+class SimulatedDesign(SimulatedVariableOwner):
+    def __init__(self, project: SimulatedProject, name: str, solution_type: str):
+        super(SimulatedDesign, self).__init__(project.config, name)
+        self.project = project
+        self.solution_type = solution_type
+        self.modules = {}
+        self.editor = SimulatedEditor(self)
+        self.solutions = OrderedDict()  # type: Dict[Tuple[str, str], SimulatedSolution]
+        self.analyses = 0
+        self.convergence = {}  # {求解设置: [(迭代次数, 四面体个数, Delta S)]} 求解过程中逐次追加
+
+    def Copy(self, project: SimulatedProject, name: str):
+        design = SimulatedDesign(project, name, self.solution_type)
+        design.variables = OrderedDict(self.variables)
+        design.properties = dict(self.properties)
+        for module_name, module in self.modules.items():
+            design.modules[module_name] = module.Copy(design)
+        design.editor = self.editor.Copy(design)
+        return design
+
+    def GetDesignType(self):
+        return "HFSS"
+
+    def GetSolutionType(self):
+        return self.solution_type
+
+    def RenameDesignInstance(self, old_name, new_name):
+        self.project.RenameDesign(old_name, new_name)
+
+    def GetModule(self, module_name):
+        module = self.modules.get(module_name)
+        if module is None:
+            module_class = MODULE_CLASSES.get(module_name, SimulatedModule)
+            module = self.modules[module_name] = module_class(self, module_name)
+        return module
+
+    def SetActiveEditor(self, editor_name):
+        return self.editor
+
+    def GetNominalVariation(self):
+        return VariationKey(self.variables)
+
+    def GetManagedFilesPath(self):
+        return os.path.join(self.project.path, self.project.name + ".aedtresults", self.name)
+
+    def ConstructVariationString(self, names, values):
+        return " ".join("%s='%s'" % (n, v) for n, v in zip(names, values))
+
+    def GetVariationVariableValue(self, variation_string, variable_name):
+        for match in re.finditer(r"(\w+)='([^']*)'", variation_string):
+            if match.group(1) == variable_name:
+                return ParseQuantity(match.group(2))
+        raise SimulationError("变化中不存在变量: " + variable_name)
+
+    def Analyze(self, setup):
+        setup_name = setup.split(":")[0].strip()
+        optimetrics = self.modules.get("Optimetrics")
+        if optimetrics is not None and setup_name in optimetrics.setups:
+            optimetrics.Solve(setup_name)
+            self.analyses += 1
+            return 0
+        setups = self.GetModule("AnalysisSetup")
+        if setup_name not in setups.setups:
+            raise SimulationError("求解设置不存在: " + setup_name)
+        solution = setups.Solve(setup_name, self.variables)
+        self.analyses += 1
+        if solution is None:
+            return 1
+        self.StoreSolution(setup_name, self.variables, solution)
+        return 0
+
+    def ResultFiles(self, setup_name: str, variables: Dict[str, str]) -> Tuple[str, str]:
+        """
+        :return: 变化在结果文件夹中的 (场数据文件, 网格文件) 路径
+        """
+        name = "%08x" % zlib.crc32(VariationKey(variables).encode("utf-8"))
+        directory = os.path.join(self.GetManagedFilesPath(), setup_name)
+        return os.path.join(directory, name + ".fld"), os.path.join(directory, name + ".mesh")
+
+    def StoreSolution(self, setup_name: str, variables: Dict[str, str], solution: SimulatedSolution):
+        """
+        保存求解结果, result_bytes 大于 0 时在结果文件夹中写出场数据和网格文件
+        """
+        self.solutions[(setup_name, VariationKey(variables))] = solution
+        if self.config.result_bytes <= 0:
+            return
+        field_file, mesh_file = self.ResultFiles(setup_name, variables)
+        os.makedirs(os.path.dirname(field_file), exist_ok=True)
+        for file_path, size in ((field_file, self.config.result_bytes), (mesh_file, self.config.result_bytes // 2)):
+            with open(file_path, "wb") as f:
+                f.truncate(size)
+
+    def MatchVariations(self, variation_keys) -> List[Tuple[str, str]]:
+        """
+        :param variation_keys: 变化键列表, 含 "All" 时为全部变化
+        :return: 匹配的 design.solutions 的键
+        """
+        keys = list(variation_keys)
+        if "All" in keys:
+            return list(self.solutions)
+        wanted = [ParseVariationKey(key) for key in keys]
+        return [key for key, solution in self.solutions.items()
+                if any(all(solution.variables.get(n) == v for n, v in variables.items()) for variables in wanted)]
+
+    @staticmethod
+    def RemoveFile(file_path: str):
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+    def DeleteFieldVariation(self, variation_keys, delete_mesh, delete_linked_data, preserve_rad_fields=False):
+        """
+        删除变化的场数据 (及网格), S 参数保留; preserve_rad_fields 为 True 时远场报告仍可用
+        """
+        for key in self.MatchVariations(variation_keys):
+            solution = self.solutions[key]
+            field_file, mesh_file = self.ResultFiles(key[0], solution.variables)
+            self.RemoveFile(field_file)
+            solution.fields = False
+            if not preserve_rad_fields:
+                solution.field_frequencies = dict((name, []) for name in list(solution.sweep_frequencies) +
+                                                  ["LastAdaptive"])
+            if delete_mesh:
+                self.RemoveFile(mesh_file)
+                solution.mesh = False
+
+    def DeleteFullVariation(self, variation_keys, delete_linked_data):
+        """
+        删除变化的全部求解数据
+        """
+        for key in self.MatchVariations(variation_keys):
+            solution = self.solutions.pop(key)
+            for file_path in self.ResultFiles(key[0], solution.variables):
+                self.RemoveFile(file_path)
+
+    def ExportConvergence(self, setup, variation_key, file_path, overwrite=True):
+        """
+        写出求解设置各次自适应迭代的四面体个数和最大 Delta S, 求解过程中调用时为已完成的迭代
+        """
+        setup_name = setup.split(":")[0].strip()
+        if setup_name not in self.GetModule("AnalysisSetup").setups:
+            raise SimulationError("求解设置不存在: " + setup_name)
+        if os.path.exists(file_path) and not overwrite:
+            raise SimulationError("文件已存在: " + file_path)
+        lines = ["Setup: %s : LastAdaptive" % setup_name, "Pass Number|# Tetrahedra|Max Mag. Delta S|"]
+        for pass_number, tetrahedra, delta in list(self.convergence.get(setup_name, [])):
+            lines.append("%d|%d|%s|" % (pass_number, tetrahedra, "N/A" if math.isnan(delta) else "%.6g" % delta))
+        with open(file_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+    def AnalyzeDistributed(self, setup_name):
+        return self.Analyze(setup_name)
+
+    def Solve(self, simulation_names):
+        for name in simulation_names:
+            self.Analyze(name)
+        return 0
+
+    def SetupProperties(self, prop_server) -> Dict[str, object]:
+        """
+        HfssTab 中求解设置 "AnalysisSetup:<setup>" 及扫频 "AnalysisSetup:<setup>:<sweep>" 的属性
+        """
+        parts = str(prop_server).split(":")
+        setups = self.GetModule("AnalysisSetup").setups
+        if parts[0] != "AnalysisSetup" or len(parts) < 2 or parts[1] not in setups:
+            return None
+        if len(parts) == 2:
+            return setups[parts[1]]["attributes"]
+        return setups[parts[1]]["sweeps"].get(parts[2])
+
+    def GetProperties(self, prop_tab, prop_server):
+        if prop_tab == "HfssTab":
+            props = self.SetupProperties(prop_server)
+            if props is None:
+                raise SimulationError("属性服务器不存在: " + str(prop_server))
+            return tuple(props)
+        return tuple(name for (tab, server, name) in self.properties if tab == prop_tab and server == prop_server)
+
+    def GetPropertyValue(self, prop_tab, prop_server, prop_name):
+        if prop_tab == "HfssTab":
+            props = self.SetupProperties(prop_server)
+            prop_name = SETUP_PROPERTY_NAMES.get(prop_name, prop_name)
+            if props is None or prop_name not in props:
+                raise SimulationError("属性不存在: " + prop_name)
+            return str(props[prop_name])
+        return super(SimulatedDesign, self).GetPropertyValue(prop_tab, prop_server, prop_name)
+
+    def GetSolution(self, solution_name: str, variables: Dict[str, str] = None) -> SimulatedSolution:
+        """
+        得到求解结果, solution_name 形如 "Setup1 : Sweep", 未求解时返回 None
+        """
+        setup_name = solution_name.split(":")[0].strip()
+        if variables is None:
+            variables = self.variables
+        return self.solutions.get((setup_name, VariationKey(variables)))
+
+    def ValidateDesign(self):
+        return 1
+
+
+class SimulatedModule(SimulatedObject):
+    def __init__(self, design: SimulatedDesign, module_name: str):
+        super(SimulatedModule, self).__init__(design.config)
+        self.design = design
+        self.module_name = module_name
+
+    def Copy(self, design: SimulatedDesign):
+        module = type(self)(design, self.module_name)
+        for key, value in self.__dict__.items():
+            if key not in ("design", "config", "unsupported_calls"):
+                module.__dict__[key] = _DeepCopy(value)
+        return module
+
+    def GetName(self):
+        return self.module_name
+
+
+def _DeepCopy(value):
+    if isinstance(value, OrderedDict):
+        return OrderedDict((k, _DeepCopy(v)) for k, v in value.items())
+    if isinstance(value, dict):
+        return {k: _DeepCopy(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_DeepCopy(v) for v in value]
+    return value
+
+
+class SimulatedAnalysisSetup(SimulatedModule):
+    def __init__(self, design: SimulatedDesign, module_name: str):
+        super(SimulatedAnalysisSetup, self).__init__(design, module_name)
+        self.setups = OrderedDict()  # {setup: {"type": str, "attributes": dict, "sweeps": {sweep: dict}}}
+
+    def GetSetups(self):
+        return tuple(self.setups)
+
+    def InsertSetup(self, setup_type, attributes_array):
+        name, attributes = ParseNamedArray(attributes_array)
+        if name in self.setups:
+            raise SimulationError("求解设置已存在: " + name)
+        self.setups[name] = {"type": setup_type, "attributes": attributes, "sweeps": OrderedDict()}
+
+    def EditSetup(self, setup_name, attributes_array):
+        if setup_name not in self.setups:
+            raise SimulationError("求解设置不存在: " + setup_name)
+        name, attributes = ParseNamedArray(attributes_array)
+        setup = self.setups.pop(setup_name)
+        setup["attributes"].update(attributes)
+        self.setups[name or setup_name] = setup
+
+    def DeleteSetups(self, setup_names):
+        for name in setup_names:
+            self.setups.pop(name, None)
+
+    def GetSweeps(self, setup_name):
+        return tuple(self.setups[setup_name]["sweeps"])
+
+    def InsertFrequencySweep(self, setup_name, attributes_array):
+        if setup_name not in self.setups:
+            raise SimulationError("求解设置不存在: " + setup_name)
+        name, attributes = ParseNamedArray(attributes_array)
+        self.setups[setup_name]["sweeps"][name] = attributes
+
+    def EditFrequencySweep(self, setup_name, sweep_name, attributes_array):
+        name, attributes = ParseNamedArray(attributes_array)
+        sweeps = self.setups[setup_name]["sweeps"]
+        sweep = sweeps.pop(sweep_name)
+        sweep.update(attributes)
+        sweeps[name or sweep_name] = sweep
+
+    # 快速扫频的求解耗时折合的离散频点数
+    FAST_SWEEP_POINTS = 5
+
+    @staticmethod
+    def Subranges(sweep: dict) -> List[dict]:
+        """
+        扫频的各频率范围, 第一个范围为扫频本身的 RangeType 等属性, 其余为 SweepRanges 中的 Subrange
+        """
+        subranges = [sweep]
+        extra = sweep.get("SweepRanges")
+        if extra:
+            for item in list(extra)[1:]:
+                if isinstance(item, (list, tuple)):
+                    subranges.append(ParseNamedArray(item)[1])
+        return subranges
+
+    @staticmethod
+    def RangeFrequencies(subrange: dict) -> List[float]:
+        range_type = subrange.get("RangeType", "LinearCount")
+        start = ParseQuantity(subrange.get("RangeStart", "1GHz"))
+        stop = ParseQuantity(subrange.get("RangeEnd", "1GHz"))
+        if range_type == "LinearStep":
+            return LinearStep(start, stop, ParseQuantity(subrange.get("RangeStep", "0.1GHz")))
+        if range_type == "SinglePoints":
+            return [round(start, 10)]
+        return LinearCount(start, stop, int(subrange.get("RangeCount", 101)))
+
+    @staticmethod
+    def SweepFrequencies(sweep: dict) -> List[float]:
+        freqs = set()
+        for subrange in SimulatedAnalysisSetup.Subranges(sweep):
+            freqs.update(SimulatedAnalysisSetup.RangeFrequencies(subrange))
+        return sorted(freqs)
+
+    @staticmethod
+    def SweepFieldFrequencies(sweep: dict, rad_fields: bool = True) -> List[float]:
+        """
+        保存场数据的频点: 离散扫频和快速扫频 SaveFields (rad_fields 为 True 时还有 SaveRadFields) 为 True 时为全部频点,
+        插值扫频只在 SaveSingleField 为 True 的单频点保存场数据
+        """
+        sweep_type = sweep.get("Type", "Discrete")
+        saved = sweep.get("SaveFields", False) or (rad_fields and sweep.get("SaveRadFields", False))
+        if sweep_type != "Interpolating" and saved:
+            return SimulatedAnalysisSetup.SweepFrequencies(sweep)
+        freqs = set()
+        for subrange in SimulatedAnalysisSetup.Subranges(sweep):
+            if subrange.get("RangeType") == "SinglePoints" and subrange.get("SaveSingleField", False):
+                freqs.update(SimulatedAnalysisSetup.RangeFrequencies(subrange))
+        return sorted(freqs)
+
+    @staticmethod
+    def SolvedPoints(sweep: dict, point_count: int) -> int:
+        """
+        扫频实际求解的频点数: 离散扫频为全部频点, 快速扫频折合 FAST_SWEEP_POINTS 个,
+        插值扫频为 1 + ceil(4 / sqrt(InterpTolerance)) 个基函数频点, 并限制在 InterpMinSolns 到 InterpMaxSolns 之间
+        """
+        sweep_type = sweep.get("Type", "Discrete")
+        if sweep_type == "Fast":
+            return min(point_count, SimulatedAnalysisSetup.FAST_SWEEP_POINTS)
+        if sweep_type == "Interpolating":
+            tolerance = max(float(sweep.get("InterpTolerance", 0.5)), 1e-6)
+            count = max(1 + int(math.ceil(4.0 / math.sqrt(tolerance))), int(sweep.get("InterpMinSolns", 0)))
+            return min(point_count, int(sweep.get("InterpMaxSolns", 250)), count)
+        return point_count
+
+    def ImportedMesh(self, link: list, variables: Dict[str, str]) -> Tuple[int, int]:
+        """
+        导入网格 (MeshLink): 源设计在 Params 给出的变化下的最终网格作为初始网格.
+        几何对象不同 (拓扑变化) 或变量相对源变化的最大相对变化超过 mesh_import_tolerance 时网格无法映射
+        :return: (相当于已完成的迭代次数, 初始网格的四面体个数)
+        """
+        _, props = ParseNamedArray(link)
+        source = self.design.project.designs.get(props.get("Design"))
+        if source is None:
+            raise SimulationError("Mesh import failed: source design %s not found." % props.get("Design"))
+        _, params = ParseNamedArray(props.get("Params", ["NAME:Params"]))
+        source_variables = OrderedDict((name, str(params.get(name, value))) for name, value in source.variables.items())
+        solution = source.GetSolution(str(props.get("Soln", "")), source_variables)
+        if solution is None or not solution.convergence or not solution.mesh:
+            raise SimulationError("Mesh import failed: source solution %s is not available for the linked variation."
+                                  % props.get("Soln"))
+        if set(source.editor.objects) != set(self.design.editor.objects):
+            raise SimulationError("Mesh import failed: source and target designs are not topologically equivalent.")
+        distance = 0.0
+        for name, value in variables.items():
+            target, reference = ParseQuantity(value), ParseQuantity(source_variables.get(name))
+            if target is not None and reference is not None:
+                distance = max(distance, abs(target - reference) / max(abs(reference), 1e-9))
+        tolerance = self.config.mesh_import_tolerance
+        if distance > tolerance:
+            raise SimulationError("Mesh import failed: the source mesh cannot be mapped onto the target geometry.")
+        offset = int(round((len(solution.convergence) - 1) * (1.0 - distance / tolerance)))
+        return offset, solution.convergence[-1][1]
+
+    def AdaptivePasses(self, setup_name: str, model: AntennaModel, variables: Dict[str, str] = None) -> str:
+        """
+        按求解设置的收敛条件进行自适应迭代, 每次迭代的结果追加到 design.convergence[setup_name],
+        Desktop.StopSimulations 在当前迭代完成后生效.
+        导入网格时从源网格开始迭代, Delta S 从源变化迭代 offset 次后的值开始, 每次迭代的耗时随源网格增加
+        :return: "converged", "not converged" 或 "stopped"
+        """
+        attributes = self.setups[setup_name]["attributes"]
+        passes = self.design.convergence[setup_name] = []
+        offset, initial_tetrahedra = 0, model.TETRAHEDRA
+        link = attributes.get("MeshLink")
+        if isinstance(link, (list, tuple)) and ParseNamedArray(link)[1].get("ImportMesh", False):
+            offset, initial_tetrahedra = self.ImportedMesh(link, variables or {})
+        max_passes = int(attributes.get("MaximumPasses", 6))
+        min_passes = int(attributes.get("MinimumPasses", 1))
+        min_converged = int(attributes.get("MinimumConvergedPasses", 1))
+        max_delta = float(attributes.get("MaxDeltaS", 0.02))
+        refinement = float(attributes.get("PercentRefinement", 30))
+        desktop = self.design.project.desktop
+        converged = 0
+        for pass_number in range(1, max_passes + 1):
+            if desktop.stop_requested:
+                return "stopped"
+            tetrahedra = int(model.Tetrahedra(pass_number, refinement) * initial_tetrahedra / model.TETRAHEDRA)
+            self.config.Spend(self.config.pass_seconds * tetrahedra / model.TETRAHEDRA)
+            delta = model.DeltaS(pass_number + offset) if pass_number > 1 else float("nan")
+            passes.append((pass_number, tetrahedra, delta))
+            converged = converged + 1 if delta <= max_delta else 0
+            if converged >= min_converged and pass_number >= min_passes:
+                return "converged"
+        return "stopped" if desktop.stop_requested else "not converged"
+
+    def Solve(self, setup_name: str, variables: Dict[str, str], startup: bool = True) -> SimulatedSolution:
+        """
+        :param startup: 为 False 时不计求解器启动耗时 (参数扫描中除第一个变化外的各变化)
+        :return: SimulatedSolution, 被 StopSimulations 停止时返回 None
+        """
+        setup = self.setups[setup_name]
+        desktop = self.design.project.desktop
+        model = AntennaModel(variables, self.config.center_frequency)
+        # 结果文件夹中的变化越多, 每次求解的管理开销越大
+        self.config.Spend(self.config.variation_seconds * self.design.project.FieldVariations())
+        desktop.simulations += 1
+        desktop.stop_requested = False
+        project_name, design_name = self.design.project.name, self.design.name
+        try:
+            self.config.Spend(self.config.analyze_seconds * startup)
+            status = self.AdaptivePasses(setup_name, model, variables)
+        except SimulationError as error:
+            desktop.AddMessage(project_name, design_name, 2, "%s: %s" % (setup_name, error))
+            return None
+        finally:
+            desktop.simulations -= 1
+            desktop.stop_requested = False
+        if status == "stopped":
+            desktop.AddMessage(project_name, design_name, 2, "%s: Simulation stopped by user." % setup_name)
+            return None
+        if status == "converged":
+            desktop.AddMessage(project_name, design_name, 0, "%s: Adaptive Passes converged." % setup_name)
+        else:
+            desktop.AddMessage(project_name, design_name, 1,
+                               "%s: Adaptive Passes did not converge based on specified criteria." % setup_name)
+        center = ParseQuantity(setup["attributes"].get("Frequency", "%gGHz" % self.config.center_frequency))
+        sweeps, field_frequencies = OrderedDict(), OrderedDict()
+        solved_points, field_points = 0, 0
+        for sweep_name, sweep in setup["sweeps"].items():
+            if sweep.get("IsEnabled", True):
+                sweeps[sweep_name] = self.SweepFrequencies(sweep)
+                field_frequencies[sweep_name] = self.SweepFieldFrequencies(sweep)
+                solved_points += self.SolvedPoints(sweep, len(sweeps[sweep_name]))
+                field_points += len(self.SweepFieldFrequencies(sweep, rad_fields=False))
+        # 只保存远场数据的耗时和磁盘占用相对全部场数据可以忽略
+        self.config.Spend(self.config.per_frequency_seconds * solved_points + self.config.field_save_seconds * field_points)
+        solution = SimulatedSolution(setup_name, variables, center, sweeps, model, field_frequencies, solved_points,
+                                     field_points)
+        solution.convergence = list(self.design.convergence[setup_name])
+        return solution
+
+
+class SimulatedRadField(SimulatedModule):
+    def __init__(self, design: SimulatedDesign, module_name: str):
+        super(SimulatedRadField, self).__init__(design, module_name)
+        self.spheres = OrderedDict()  # {名称: 属性}
+
+    def InsertFarFieldSphereSetup(self, params):
+        name, attributes = ParseNamedArray(params)
+        if name in self.spheres:
+            raise SimulationError("远场球坐标已存在: " + name)
+        self.spheres[name] = attributes
+
+    def EditFarFieldSphereSetup(self, name, params):
+        new_name, attributes = ParseNamedArray(params)
+        sphere = self.spheres.pop(name)
+        sphere.update(attributes)
+        self.spheres[new_name or name] = sphere
+
+    def GetSetupNames(self, setup_type="Infinite Sphere"):
+        return tuple(self.spheres)
+
+    def DeleteSetup(self, names):
+        for name in names:
+            self.spheres.pop(name, None)
+
+    def DeleteFarFieldSetup(self, names):
+        self.DeleteSetup(names)
+
+    def SphereAxes(self, sphere_name: str) -> Tuple[List[float], List[float]]:
+        """
+        :return: (theta 列表, phi 列表) 单位 deg
+        """
+        sphere = self.spheres.get(sphere_name)
+        if sphere is None:
+            raise SimulationError("远场球坐标不存在: " + sphere_name)
+        theta = LinearStep(ParseQuantity(sphere["ThetaStart"]), ParseQuantity(sphere["ThetaStop"]),
+                           ParseQuantity(sphere["ThetaStep"]))
+        phi = LinearStep(ParseQuantity(sphere["PhiStart"]), ParseQuantity(sphere["PhiStop"]),
+                         ParseQuantity(sphere["PhiStep"]))
+        return theta, phi
+
+
+class SimulatedOptimetrics(SimulatedModule):
+    def __init__(self, design: SimulatedDesign, module_name: str):
+        super(SimulatedOptimetrics, self).__init__(design, module_name)
+        # {名称: {"type": str, "attributes": dict, "sweeps": [{Variable, Data, Synchronize}], "simulations": [str]}}
+        self.setups = OrderedDict()
+
+    @staticmethod
+    def ParseSetup(setup_type, attributes_array) -> Tuple[str, dict]:
+        name, attributes = ParseNamedArray(attributes_array)
+        sweeps = []
+        # 多个 SweepDefinition 同名, 需逐个解析
+        for item in list(attributes.get("Sweeps", []))[1:]:
+            sweeps.append(ParseNamedArray(item)[1])
+        simulations = attributes.get("Sim. Setups", [])
+        return name, {"type": setup_type, "attributes": attributes, "sweeps": sweeps,
+                      "simulations": [simulations] if isinstance(simulations, str) else list(simulations)}
+
+    def InsertSetup(self, setup_type, attributes_array):
+        name, setup = self.ParseSetup(setup_type, attributes_array)
+        if name in self.setups:
+            raise SimulationError("参数扫描设置已存在: " + name)
+        self.setups[name] = setup
+
+    def EditSetup(self, setup_name, attributes_array):
+        if setup_name not in self.setups:
+            raise SimulationError("参数扫描设置不存在: " + setup_name)
+        name, setup = self.ParseSetup(self.setups.pop(setup_name)["type"], attributes_array)
+        self.setups[name or setup_name] = setup
+
+    def GetSetupNames(self):
+        return tuple(self.setups)
+
+    def GetSetupNamesByType(self, setup_type):
+        return tuple(name for name, setup in self.setups.items() if setup["type"] == setup_type)
+
+    def DeleteSetups(self, setup_names):
+        for name in setup_names:
+            self.setups.pop(name, None)
+
+    def SolveSetup(self, setup_name):
+        return self.design.Analyze(setup_name)
+
+    @staticmethod
+    def SweepValues(data: str) -> List[str]:
+        """
+        解析扫描数据 "LIN 1mm 3mm 1mm", "LINC 1mm 3mm 5" 或 "1mm, 2mm, 3mm"
+        :return: 变量值字符串列表
+        """
+        items = str(data).split()
+        if items and items[0].upper() in ("LIN", "LINC") and len(items) == 4:
+            unit = _QUANTITY_PATTERN.match(items[1]).group(2)
+            start, stop = float(items[1][:len(items[1]) - len(unit)]), float(items[2][:len(items[2]) - len(unit)])
+            if items[0].upper() == "LIN":
+                step = float(items[3][:len(items[3]) - len(unit)] if items[3].endswith(unit) else items[3])
+                numbers = LinearStep(start, stop, step)
+            else:
+                numbers = LinearCount(start, stop, int(items[3]))
+            return ["%g%s" % (number, unit) for number in numbers]
+        return [item.strip() for item in re.split(r"[,;]", str(data)) if item.strip()]
+
+    def Variations(self, setup_name: str) -> List[Dict[str, str]]:
+        """
+        参数扫描的全部变化: Synchronize 相同 (非 0) 的扫描按行配对, 不同组之间取笛卡尔积
+        :return: [{变量名: 值}]
+        """
+        groups = OrderedDict()
+        for index, sweep in enumerate(self.setups[setup_name]["sweeps"]):
+            if sweep["Variable"] not in self.design.variables:
+                raise SimulationError("变量不存在: " + sweep["Variable"])
+            synchronize = int(sweep.get("Synchronize", 0))
+            key = synchronize if synchronize != 0 else "single%d" % index
+            groups.setdefault(key, []).append((sweep["Variable"], self.SweepValues(sweep["Data"])))
+        rows_per_group = []
+        for sweeps in groups.values():
+            if len(set(len(values) for _, values in sweeps)) != 1:
+                raise SimulationError("同步扫描的点数不一致: " + ", ".join(name for name, _ in sweeps))
+            rows_per_group.append([OrderedDict((name, values[i]) for name, values in sweeps)
+                                   for i in range(len(sweeps[0][1]))])
+        variations = []
+        for combination in itertools.product(*rows_per_group):
+            variation = OrderedDict()
+            for row in combination:
+                variation.update(row)
+            variations.append(variation)
+        return variations
+
+    def Solve(self, setup_name: str):
+        """
+        求解参数扫描: 求解器只启动一次, 各变化的结果按变化键保存在设计中
+        """
+        setup = self.setups[setup_name]
+        analysis_setup = self.design.GetModule("AnalysisSetup")
+        self.config.Spend(self.config.analyze_seconds)
+        for variation in self.Variations(setup_name):
+            variables = OrderedDict(self.design.variables)
+            variables.update(variation)
+            for simulation in setup["simulations"]:
+                simulation_name = simulation.split(":")[0].strip()
+                solution = analysis_setup.Solve(simulation_name, variables, startup=False)
+                if solution is None:
+                    return
+                self.design.StoreSolution(simulation_name, variables, solution)
+
+
+class SimulatedSolutionData(object):
+    """
+    GetSolutionDataPerVariation 返回的一个变化的求解数据, 各扫描变量的值和数据值均按数据点展开,
+    数据点为各扫描变量的笛卡尔积, 第一个扫描变量变化最慢
+    """
+    # 扫描变量的显示单位及换算为国际单位的系数
+    UNITS = {"Freq": ("GHz", 1e9), "Phi": ("deg", math.pi / 180.0), "Theta": ("deg", math.pi / 180.0)}
+
+    def __init__(self, solution: SimulatedSolution, axes: Dict[str, List[float]], expressions: List[str]):
+        self.solution = solution
+        self.axes = axes
+        self.expressions = expressions
+        self.points = list(itertools.product(*axes.values()))
+
+    def GetSweepNames(self):
+        return tuple(self.axes)
+
+    def GetSweepUnits(self, sweep_name):
+        return self.UNITS[sweep_name][0]
+
+    def GetSweepValues(self, sweep_name, si_value=True):
+        index = list(self.axes).index(sweep_name)
+        scale = self.UNITS[sweep_name][1] if si_value else 1.0
+        return tuple(point[index] * scale for point in self.points)
+
+    def GetDataExpressions(self):
+        return tuple(self.expressions)
+
+    def IsDataComplex(self, expression):
+        return False
+
+    def GetDataUnits(self, expression):
+        return ""
+
+    def GetRealDataValues(self, expression, si_value=True):
+        if expression not in self.expressions:
+            raise SimulationError("表达式不存在: " + expression)
+        names = list(self.axes)
+        values = []
+        for point in self.points:
+            coordinates = dict(zip(names, point))
+            values.append(self.solution.model.Evaluate(expression, coordinates.get("Freq", 0.0),
+                                                       coordinates.get("Theta", 0.0), coordinates.get("Phi", 0.0)))
+        return tuple(values)
+
+    def GetImagDataValues(self, expression, si_value=True):
+        return tuple(0.0 for _ in self.points)
+
+    def GetDesignVariableNames(self):
+        return tuple(self.solution.variables)
+
+    def GetDesignVariableValue(self, variable_name):
+        return ParseQuantity(self.solution.variables[variable_name])
+
+    def GetDesignVariableUnits(self, variable_name):
+        return "mm"
+
+
+class SimulatedReportSetup(SimulatedModule):
+    # 报告中各扫描变量的列名
+    AXIS_COLUMNS = OrderedDict([("Freq", "Freq [GHz]"), ("Phi", "Phi [deg]"), ("Theta", "Theta [deg]")])
+
+    def __init__(self, design: SimulatedDesign, module_name: str):
+        super(SimulatedReportSetup, self).__init__(design, module_name)
+        self.reports = OrderedDict()  # {名称: 定义}
+        self.updates = 0
+        self.exports = 0
+
+    def GetAllReportNames(self):
+        return tuple(self.reports)
+
+    def CreateReport(self, report_name, report_type, display_type, solution_name, context_array, families_array,
+                     report_data_array, *args):
+        if report_name in self.reports:
+            raise SimulationError("报告已存在: " + report_name)
+        self.reports[report_name] = {
+            "report_type": report_type,
+            "display_type": display_type,
+            "solution": solution_name,
+            "context": ParseNamedArray(list(context_array))[1],
+            "families": ParseNamedArray(list(families_array))[1],
+            "data": ParseNamedArray(list(report_data_array))[1],
+        }
+        self.config.Spend(self.config.report_seconds)
+
+    def UpdateReports(self, report_names):
+        if isinstance(report_names, str):
+            report_names = [report_names]
+        for name in report_names:
+            if name not in self.reports:
+                raise SimulationError("报告不存在: " + name)
+            self.updates += 1
+            self.config.Spend(self.config.report_seconds)
+
+    def UpdateAllReports(self):
+        self.UpdateReports(list(self.reports))
+
+    def DeleteReports(self, report_names):
+        for name in report_names:
+            self.reports.pop(name, None)
+
+    def DeleteAllReports(self):
+        self.reports.clear()
+
+    def RenameReport(self, old_name, new_name):
+        self.reports = OrderedDict((new_name if k == old_name else k, v) for k, v in self.reports.items())
+
+    def GetReportTraceNames(self, report_name):
+        return tuple(self.Expressions(self.reports[report_name]))
+
+    @staticmethod
+    def Expressions(report: dict) -> List[str]:
+        expressions = []
+        for key, value in report["data"].items():
+            if key in ("Y Component", "Mag Component"):
+                expressions.extend(value if isinstance(value, (list, tuple)) else [value])
+        return expressions
+
+    def FamilyValues(self, report: dict, axis: str, solution: SimulatedSolution) -> List[float]:
+        values = report["families"].get(axis)
+        solution_name = report["solution"].split(":")[-1].strip()
+        if axis == "Freq":
+            if report["report_type"] == "Far Fields":
+                # 远场报告只有保存了场数据的频点
+                available = solution.FieldFrequencies(solution_name)
+                if values is None or list(values) == ["All"]:
+                    return available
+                return [f for f in (round(ParseQuantity(v), 10) for v in values) if f in available]
+            if values is None or list(values) == ["All"]:
+                return solution.Frequencies(solution_name)
+            return [round(ParseQuantity(v), 10) for v in values]
+        if values is None:
+            return None
+        if list(values) == ["All"]:
+            sphere = report["context"].get("Context", "Infinite Sphere1")
+            theta, phi = self.design.GetModule("RadField").SphereAxes(sphere)
+            return theta if axis == "Theta" else phi
+        return [round(ParseQuantity(v), 10) for v in values]
+
+    def SweptVariations(self, report: dict) -> List[Tuple[str, Dict[str, str]]]:
+        """
+        报告中扫描的设计变量 (families 中不为 "Nominal" 的设计变量) 的已求解变化
+        :return: [(列名后缀中的变化键, 完整变量字典)], 未扫描设计变量时返回 None
+        """
+        setup_name = report["solution"].split(":")[0].strip()
+        swept = OrderedDict()
+        for name in self.design.variables:
+            values = report["families"].get(name)
+            if values is None or list(values) == ["Nominal"]:
+                continue
+            if list(values) == ["All"]:
+                values = []
+                for (solved_setup, _), solution in self.design.solutions.items():
+                    value = solution.variables.get(name)
+                    if solved_setup == setup_name and value is not None and value not in values:
+                        values.append(value)
+            swept[name] = list(values)
+        if len(swept) == 0:
+            return None
+        variations = []
+        for combination in itertools.product(*swept.values()):
+            variation = OrderedDict(zip(swept, combination))
+            variables = OrderedDict(self.design.variables)
+            variables.update(variation)
+            if self.design.GetSolution(report["solution"], variables) is not None:
+                variations.append((VariationKey(variation), variables))
+        return variations
+
+    def ReportTable(self, report: dict, variables: Dict[str, str] = None) -> Tuple[List[str], List[List[float]]]:
+        """
+        计算报告数据, 扫描设计变量时每个变化的每个表达式为一列, 列名形如 "dB(S(1,1)) [] - a='1mm' b='2mm'"
+        :return: (列名列表, 行列表)
+        """
+        variations = self.SweptVariations(report) if variables is None else None
+        if variations is None:
+            solution = self.design.GetSolution(report["solution"], variables)
+            solutions = [("", solution)] if solution is not None else []
+        else:
+            solutions = [(" - " + key, self.design.GetSolution(report["solution"], v)) for key, v in variations]
+        expressions = self.Expressions(report)
+        axes = OrderedDict()
+        if solutions:
+            for axis in self.AXIS_COLUMNS:
+                values = self.FamilyValues(report, axis, solutions[0][1])
+                if values is not None:
+                    axes[axis] = values
+        else:
+            axes["Freq"] = []
+        columns = [self.AXIS_COLUMNS[a] for a in axes]
+        rows = []
+        if not solutions:
+            return columns + [e + " []" for e in expressions], rows
+        columns += [e + " []" + suffix for suffix, _ in solutions for e in expressions]
+        freqs = axes["Freq"]
+        phis = axes.get("Phi", [0.0])
+        thetas = axes.get("Theta", [0.0])
+        for f in freqs:
+            for p in phis:
+                for t in thetas:
+                    row = [f]
+                    if "Phi" in axes:
+                        row.append(p)
+                    if "Theta" in axes:
+                        row.append(t)
+                    row.extend(solution.model.Evaluate(e, f, t, p) for _, solution in solutions for e in expressions)
+                    rows.append(row)
+        return columns, rows
+
+    def GetSolutionDataPerVariation(self, report_type, solution_name, context_array, families_array, expressions):
+        """
+        不创建报告, 直接返回各变化的求解数据 (SimulatedSolutionData), 扫描设计变量的规则与报告相同
+        """
+        report = {
+            "report_type": report_type,
+            "display_type": "",
+            "solution": solution_name,
+            "context": ParseNamedArray(list(context_array))[1],
+            "families": ParseNamedArray(list(families_array))[1],
+            "data": {"Y Component": list(expressions)},
+        }
+        variations = self.SweptVariations(report)
+        if variations is None:
+            solutions = [self.design.GetSolution(solution_name)]
+        else:
+            solutions = [self.design.GetSolution(solution_name, variables) for _, variables in variations]
+        result = []
+        for solution in solutions:
+            if solution is None:
+                continue
+            axes = OrderedDict()
+            for axis in self.AXIS_COLUMNS:
+                values = self.FamilyValues(report, axis, solution)
+                if values is not None:
+                    axes[axis] = values
+            result.append(SimulatedSolutionData(solution, axes, list(expressions)))
+        self.config.Spend(self.config.report_seconds)
+        return tuple(result)
+
+    def ExportToFile(self, report_name, file_name, over_write=False):
+        if report_name not in self.reports:
+            raise SimulationError("报告不存在: " + report_name)
+        columns, rows = self.ReportTable(self.reports[report_name])
+        with open(file_name, "w", encoding="utf-8") as f:
+            f.write(",".join('"%s"' % c for c in columns) + "\n")
+            for row in rows:
+                f.write(",".join(FormatNumber(v) for v in row) + "\n")
+        self.exports += 1
+        self.config.Spend(self.config.export_row_seconds * len(rows))
+
+
+class SimulatedSolutions(SimulatedModule):
+    """
+    模拟 Solutions 模块 ExportNetworkData 写出 Touchstone v1 文件.
+    端口数由文件扩展名 .sNp 确定, 各端口的反射系数为合成天线模型的 S11, 端口间耦合为确定性的小量
+    """
+    # ComplexFormat 与 Touchstone 格式的对应关系
+    FORMATS = {0: "MA", 1: "RI", 2: "DB"}
+
+    def __init__(self, design: SimulatedDesign, module_name: str):
+        super(SimulatedSolutions, self).__init__(design, module_name)
+        self.exports = 0
+
+    @staticmethod
+    def Matrix(model: AntennaModel, freq: float, ports: int) -> List[List[complex]]:
+        s11 = model.S11(freq)
+        coupling = 0.1 * (1.0 - abs(s11))
+        matrix = []
+        for i in range(ports):
+            row = []
+            for j in range(ports):
+                if i == j:
+                    row.append(s11)
+                else:
+                    angle = -math.pi * freq / model.f0 * (abs(i - j) + 1)
+                    row.append(coupling / abs(i - j) * complex(math.cos(angle), math.sin(angle)))
+            matrix.append(row)
+        return matrix
+
+    def ExportNetworkData(self, design_variation_key, soln_selection_array, file_format, out_file, freqs_array,
+                          do_renorm, renorm_imped, data_type, pass_number=-1, complex_format=0, precision=15,
+                          include_gamma_comments=True, non_standard_extensions=True):
+        if int(file_format) != 3:
+            raise SimulationError("模拟后端只支持导出 Touchstone 文件 (FileFormat 3)")
+        if data_type != "S":
+            raise SimulationError("模拟后端只支持导出 S 参数")
+        solution_name = list(soln_selection_array)[0]
+        solution = self.design.GetSolution(solution_name)
+        if solution is None:
+            raise SimulationError("没有求解结果: " + solution_name)
+        freqs = solution.Frequencies(solution_name.split(":")[-1].strip())
+        if list(freqs_array) not in ([], ["all"], ["All"]):
+            freqs = [round(ParseQuantity(v), 10) for v in freqs_array]
+        match = re.search(r"\.s(\d+)p$", out_file, re.IGNORECASE)
+        ports = int(match.group(1)) if match is not None else 1
+        complex_format = self.FORMATS[int(complex_format)]
+        reference = float(renorm_imped) if do_renorm else 50.0
+        number = "%." + str(int(precision)) + "g"
+        with open(out_file, "w", encoding="utf-8") as f:
+            f.write("! Touchstone file exported by the simulated backend\n")
+            f.write("! Solution: %s\n" % solution_name)
+            f.write("# GHZ S %s R %s\n" % (complex_format, FormatNumber(reference)))
+            for freq in freqs:
+                matrix = self.Matrix(solution.model, freq, ports)
+                if ports == 2:
+                    # 二端口数据的顺序为 S11 S21 S12 S22
+                    matrix = [[matrix[0][0], matrix[1][0], matrix[0][1], matrix[1][1]]]
+                lines = []
+                for row in matrix:
+                    fields = []
+                    for value in row:
+                        if complex_format == "RI":
+                            pair = (value.real, value.imag)
+                        else:
+                            magnitude = abs(value)
+                            if complex_format == "DB":
+                                magnitude = 20.0 * math.log10(max(magnitude, 1e-300))
+                            pair = (magnitude, math.degrees(math.atan2(value.imag, value.real)))
+                        fields.extend(number % v for v in pair)
+                    # Touchstone v1 每行最多 4 对数据, 矩阵的每一行从新的一行开始
+                    lines.extend(" ".join(fields[k:k + 8]) for k in range(0, len(fields), 8))
+                f.write(number % freq + " " + "\n    ".join(lines) + "\n")
+                if include_gamma_comments:
+                    f.write("! Gamma ! %s\n" % " ".join("0 1" for _ in range(ports)))
+                    f.write("! Port Impedance %s\n" % " ".join(FormatNumber(reference) + " 0" for _ in range(ports)))
+        self.exports += 1
+        self.config.Spend(self.config.export_row_seconds * len(freqs))
+        return 0
+
+
+# AEDT 属性窗口中求解设置属性的显示名称与求解设置参数名的对应关系
+SETUP_PROPERTY_NAMES = {
+    "Max. Number of Passes": "MaximumPasses",
+    "Min. Number of Passes": "MinimumPasses",
+    "Min. Converged Passes": "MinimumConvergedPasses",
+    "Maximum Delta S": "MaxDeltaS",
+    "Percent Refinement": "PercentRefinement",
+}
+
+
+# 模块名与模拟模块类的对应关系, 未列出的模块使用 SimulatedModule
+MODULE_CLASSES = {
+    "AnalysisSetup": SimulatedAnalysisSetup,
+    "RadField": SimulatedRadField,
+    "ReportSetup": SimulatedReportSetup,
+    "Optimetrics": SimulatedOptimetrics,
+    "Solutions": SimulatedSolutions,
+}
+
+
+class SimulatedEditor(SimulatedObject):
+    """
+    模拟 3D Modeler 记录几何对象及建模操作
+    """
+
+    def __init__(self, design: SimulatedDesign):
+        super(SimulatedEditor, self).__init__(design.config)
+        self.design = design
+        self.objects = OrderedDict()  # {名称: {"type": str, "parameters": dict, "attributes": dict}}
+        self.operations = 0
+
+    def Copy(self, design: SimulatedDesign):
+        editor = SimulatedEditor(design)
+        editor.objects = _DeepCopy(self.objects)
+        return editor
+
+    def Operate(self):
+        self.operations += 1
+        self.config.Spend(self.config.modeler_seconds)
+
+    def UniqueName(self, name: str) -> str:
+        if name not in self.objects:
+            return name
+        index = 1
+        while "%s_%d" % (name, index) in self.objects:
+            index += 1
+        return "%s_%d" % (name, index)
+
+    def AddObject(self, object_type, parameters, attributes):
+        self.Operate()
+        _, parameter_props = ParseNamedArray(parameters)
+        _, attribute_props = ParseNamedArray(attributes)
+        name = self.UniqueName(attribute_props.get("Name", object_type))
+        attribute_props["Name"] = name
+        self.objects[name] = {"type": object_type, "parameters": parameter_props, "attributes": attribute_props}
+        return name
+
+    def CreateBox(self, parameters, attributes):
+        return self.AddObject("Box", parameters, attributes)
+
+    def CreateRectangle(self, parameters, attributes):
+        return self.AddObject("Rectangle", parameters, attributes)
+
+    def CreateCylinder(self, parameters, attributes):
+        return self.AddObject("Cylinder", parameters, attributes)
+
+    def CreateCircle(self, parameters, attributes):
+        return self.AddObject("Circle", parameters, attributes)
+
+    def CreatePolyline(self, parameters, attributes):
+        return self.AddObject("Polyline", parameters, attributes)
+
+    def CreateSphere(self, parameters, attributes):
+        return self.AddObject("Sphere", parameters, attributes)
+
+    def CreateRegion(self, parameters, attributes):
+        return self.AddObject("Region", parameters, attributes)
+
+    @staticmethod
+    def SelectionNames(selections) -> List[str]:
+        _, props = ParseNamedArray(selections)
+        names = []
+        for key in ("Selections", "Blank Parts", "Tool Parts"):
+            if props.get(key):
+                names.extend(n.strip() for n in str(props[key]).split(","))
+        return names
+
+    def RequireObjects(self, names):
+        for name in names:
+            if name not in self.objects:
+                raise SimulationError("对象不存在: " + name)
+
+    def Delete(self, selections):
+        self.Operate()
+        names = self.SelectionNames(selections)
+        self.RequireObjects(names)
+        for name in names:
+            self.objects.pop(name)
+
+    def Subtract(self, selections, parameters):
+        self.Operate()
+        _, props = ParseNamedArray(selections)
+        _, options = ParseNamedArray(parameters)
+        tools = [n.strip() for n in str(props.get("Tool Parts", "")).split(",") if n.strip()]
+        self.RequireObjects(tools)
+        if not options.get("KeepOriginals", False):
+            for name in tools:
+                self.objects.pop(name)
+
+    def Unite(self, selections, parameters):
+        self.Operate()
+        names = self.SelectionNames(selections)
+        self.RequireObjects(names)
+        _, options = ParseNamedArray(parameters)
+        if not options.get("KeepOriginals", False):
+            for name in names[1:]:
+                self.objects.pop(name)
+
+    def Duplicate(self, selections, count: int) -> List[str]:
+        self.Operate()
+        names = self.SelectionNames(selections)
+        self.RequireObjects(names)
+        created = []
+        # 与 AEDT 相同按副本顺序返回, 每个副本内按选择的对象顺序
+        for _ in range(count - 1):
+            for name in names:
+                copy = _DeepCopy(self.objects[name])
+                new_name = self.UniqueName(name)
+                copy["attributes"]["Name"] = new_name
+                self.objects[new_name] = copy
+                created.append(new_name)
+        return created
+
+    def DuplicateAlongLine(self, selections, parameters, options, create_group):
+        _, props = ParseNamedArray(parameters)
+        return tuple(self.Duplicate(selections, int(props.get("NumClones", 2))))
+
+    def DuplicateAroundAxis(self, selections, parameters, options, create_group):
+        _, props = ParseNamedArray(parameters)
+        return tuple(self.Duplicate(selections, int(props.get("NumClones", 2))))
+
+    def Move(self, selections, parameters):
+        self.Operate()
+        self.RequireObjects(self.SelectionNames(selections))
+
+    def AssignMaterial(self, selections, attributes):
+        self.Operate()
+        _, props = ParseNamedArray(attributes)
+        names = self.SelectionNames(selections)
+        self.RequireObjects(names)
+        for name in names:
+            if "MaterialValue" in props:
+                self.objects[name]["attributes"]["MaterialValue"] = props["MaterialValue"]
+            else:
+                self.objects[name]["attributes"]["MaterialName"] = props.get("MaterialName")
+            if "SolveInside" in props:
+                self.objects[name]["attributes"]["SolveInside"] = props["SolveInside"]
+
+    def RenamePart(self, parameters):
+        self.Operate()
+        _, props = ParseNamedArray(parameters)
+        old_name, new_name = props["Rename Target"], props["New Name"]
+        self.objects = OrderedDict((new_name if k == old_name else k, v) for k, v in self.objects.items())
+        self.objects[new_name]["attributes"]["Name"] = new_name
+
+    def ChangeProperty(self, args):
+        """
+        修改对象创建命令 (Geometry3DCmdTab, 属性服务器如 "Box1:CreateBox:1") 或对象属性 (Geometry3DAttributeTab) 的属性
+        """
+        self.Operate()
+        for tab in list(args)[1:]:
+            tab_name, _ = ParseNamedArray(tab)
+            servers, changed = [], []
+            for item in tab[1:]:
+                if isinstance(item, (list, tuple)) and item and item[0] == "NAME:PropServers":
+                    servers = [str(server).split(":")[0] for server in item[1:]]
+                elif isinstance(item, (list, tuple)) and item and item[0] == "NAME:ChangedProps":
+                    changed = [ParseNamedArray(prop) for prop in item[1:]]
+            key = {"Geometry3DCmdTab": "parameters", "Geometry3DAttributeTab": "attributes"}.get(tab_name)
+            if key is None:
+                continue
+            self.RequireObjects(servers)
+            for server in servers:
+                for prop_name, props in changed:
+                    value = props["Value"] if "Value" in props else tuple(props.values())
+                    self.objects[server][key][prop_name] = value
+
+    def GetObjectsInGroup(self, group):
+        return tuple(self.objects)
+
+    def GetMatchedObjectName(self, wildcard_text):
+        pattern = re.compile("^" + re.escape(wildcard_text).replace("\\*", ".*") + "$")
+        return tuple(n for n in self.objects if pattern.match(n))
+
+    def GetNumObjects(self):
+        return len(self.objects)
+
+    def GetModelUnits(self):
+        return "mm"
+
+
+def UseSimulated(config: SimulationConfig = None) -> SimulatedAnsoftApp:
+    """
+    将 hfss 切换为模拟后端: 之后新建的 AnsoftApp/Session 均连接模拟 AEDT,
+    默认会话 oSession 及默认上下文 oContext 的句柄被置空, 下次使用时连接模拟 AEDT
+    :param config: 模拟配置
+    :return: 默认会话连接的模拟脚本接口
+    """
+    config = config if config is not None else SimulationConfig()
+    hfss.appFactory = lambda hfss_app, new_instance: SimulatedAnsoftApp(config)
+    ResetDefaultSession()
+    return hfss.oAnsoftApp.handle
+
+
+def UseCom():
+    """
+    恢复为 COM 后端
+    :return: None
+    """
+    hfss.appFactory = None
+    ResetDefaultSession()
+
+
+def ResetDefaultSession():
+    """
+    置空默认会话和默认上下文的全部句柄
+    :return: None
+    """
+    hfss.oAnsoftApp.handle = None
+    hfss.oDesktop.handle = None
+    hfss.oContext.Reset()
+    hfss.oProject.handle = None
@@ -24,36 +24,40 @@ import os
 
 # Import the LL with "from"
 # 引用 hfss 对象
-from hfss import oDesktop, oAnsoftApp, oProject, oDesign
+from hfss import ResolveContext
 
 
-# 函数定义
-def OpenAnsysElectronicsDesktop():
+# 函数定义 各函数的 context 参数为 DesignContext, 为 None 时使用默认上下文 hfss.oContext
+def OpenAnsysElectronicsDesktop(context=None):
     """
-    该函数用于打开 Ansys 电子桌面
+    该函数用于打开 Ansys 电子桌面 (立即连接, 不再等待首次调用时按需连接)
     :return: None
     """
-    oDesktop.handle = oAnsoftApp.oDesktop
+    ctx = ResolveContext(context)
+    ctx.oDesktop.handle = ctx.session.oAnsoftApp.GetAppDesktop()
 
 
-def CloseAnsysElectronicsDesktop():
+def CloseAnsysElectronicsDesktop(context=None):
     """
     该函数用于关闭 Ansys 电子桌面
     :return: None
     """
-    oProject.handle = oDesktop.GetActiveProject()
-    if oProject.handle is not None:
-        oDesktop.CloseProject(oProject.GetName())
-    oDesktop.QuitApplication()
+    ctx = ResolveContext(context)
+    ctx.oProject.handle = ctx.oDesktop.GetActiveProject()
+    if ctx.oProject.handle is not None:
+        ctx.oDesktop.CloseProject(ctx.oProject.GetName())
+    ctx.oDesktop.QuitApplication()
+    ctx.Reset()
     # del oProject, oDesign, oDesktop, oAnsoftApp
 
 
-def OpenProject(project_path: str):
+def OpenProject(project_path: str, context=None):
     """
     该函数用于打开一个已存在的工程文件
     :param project_path: 工程文件路径
     :return None:
     """
+    ctx = ResolveContext(context)
     try:
         if not os.path.exists(project_path):
             raise FileNotFoundError
@@ -62,15 +66,15 @@ def OpenProject(project_path: str):
         file_name, file_ext = os.path.splitext(file_name_ext)
         if file_ext != ".aedt":
             raise TypeError
-        oProject.handle = oDesktop.GetActiveProject()
-        if oProject.handle is not None:
-            if oProject.GetName() == file_name:
+        ctx.oProject.handle = ctx.oDesktop.GetActiveProject()
+        if ctx.oProject.handle is not None:
+            if ctx.oProject.GetName() == file_name:
                 # print("Project already open")
                 pass
             else:
-                oDesktop.OpenProject(project_path)
+                ctx.oProject.handle = ctx.oDesktop.OpenProject(project_path)
         else:
-            oDesktop.OpenProject(project_path)
+            ctx.oProject.handle = ctx.oDesktop.OpenProject(project_path)
     except FileNotFoundError:
         print("FileNotFoundError")
     except TypeError:
@@ -78,42 +82,42 @@ def OpenProject(project_path: str):
     pass
 
 
-def CreateProject(project_name):
+def CreateProject(project_name, context=None):
     """
     创建一个新工程
     :param project_name: 得包含路径名称 新工程名字
     :return:
     """
-    oDesktop.NewProject()
-    oProject.handle = oDesktop.GetActiveProject()
-    oProject.Rename(project_name, False)
+    ctx = ResolveContext(context)
+    ctx.oDesktop.NewProject()
+    ctx.oProject.handle = ctx.oDesktop.GetActiveProject()
+    ctx.oProject.Rename(project_name, False)
 
     pass
 
 
-def CloseProject(project_name):
+def CloseProject(project_name, context=None):
     """
     在桌面中关闭项目,但不退出应用
     :param project_name:
     :return:
     """
-    oProject.handle = oDesktop.GetActiveProject()
-    if oProject.handle is not None:
-        oProject.Save()
-    project_name_list = oDesktop.GetProjectList()
+    ctx = ResolveContext(context)
+    if ctx.oProject.handle is not None:
+        ctx.oProject.Save()
+    project_name_list = ctx.oDesktop.GetProjectList()
     if project_name in project_name_list:
-        oDesktop.CloseProject(project_name)
+        ctx.oDesktop.CloseProject(project_name)
+        ctx.Reset()
     else:
         print(project_name, "is non-existence")
     pass
 
-def CopyHFSSDesign(design_name, new_design_name):
-    if oProject.handle is None:
-        oProject.handle = oDesktop.GetActiveProject()
-        pass
-    design_name_list = oProject.GetTopDesignList()
+def CopyHFSSDesign(design_name, new_design_name, context=None):
+    ctx = ResolveContext(context)
+    design_name_list = ctx.oProject.GetTopDesignList()
     if design_name in design_name_list:
-        oProject.CopyDesign(design_name)
+        ctx.oProject.CopyDesign(design_name)
     else:
         print(design_name, "is non-existence.")
         return 0
@@ -121,103 +125,126 @@ def CopyHFSSDesign(design_name, new_design_name):
         print(new_design_name, "is already existing.")
         pass
     else:
-        oProject.Paste()
-        oDesign.handle = oProject.GetActiveDesign()
-        if oDesign.handle is None:
+        ctx.oProject.Paste()
+        ctx.oDesign.handle = ctx.oProject.GetActiveDesign()
+        if ctx.oDesign.handle is None:
             # design_name_list = oProject.GetTopDesignList()
             # oDesign.handle = oProject.GetDesign(design_name_list[-1])
-            oDesign.handle = oProject.GetDesign("HFSSDesign13")
+            ctx.oDesign.handle = ctx.oProject.GetDesign("HFSSDesign13")
             pass
-        name = oDesign.GetName()
-        oDesign.RenameDesignInstance(name, new_design_name)
-    oProject.Save()
+        name = ctx.oDesign.GetName()
+        ctx.oDesign.RenameDesignInstance(name, new_design_name)
+    ctx.oProject.Save()
     pass
 
-def DeleteHFSSDesign(design_name):
-    if oProject.handle is None:
-        oProject.handle = oDesktop.GetActiveProject()
-        pass
-    design_name_list = oProject.GetTopDesignList()
+def DeleteHFSSDesign(design_name, context=None):
+    ctx = ResolveContext(context)
+    design_name_list = ctx.oProject.GetTopDesignList()
     if design_name in design_name_list:
-        oProject.DeleteDesign(design_name)
+        ctx.oProject.DeleteDesign(design_name)
     else:
         print(design_name,"is non-existence.")
         pass
-    oProject.Save()
+    ctx.oProject.Save()
     pass
 
 
-def InsertHFSSDesign(design_name, solution_type):
+def InsertHFSSDesign(design_name, solution_type, context=None):
     """
     新建一个设计
     :param design_name: 新建设计名称
     :param solution_type: 求解类型 "DrivenModal", "DrivenTerminal", or "Eigenmode".
     :return:
     """
-    if oProject.handle is None:
-        oProject.handle = oDesktop.GetActiveProject()
-    oProject.InsertDesign("HFSS", design_name, solution_type)
+    ctx = ResolveContext(context)
+    ctx.oProject.InsertDesign("HFSS", design_name, solution_type)
 
 
-def CreateNewVariable(props_name_array, props_value_array):
+def CreateNewVariable(props_name_array, props_value_array, context=None):
     """
-    在 active 设计中批量创建一些长度变量
+    在 active 设计中批量创建一些长度变量, 所有变量打包在一次 ChangeProperty 调用中完成, 模型只重新计算一次
     :param props_name_array: 字符串 列表,每个元素为字符串
     :param props_value_array: 浮点数 列表,每个元素为浮点数,单位为 mm
     :return:
     """
-    if oDesign.handle is None:
-        oDesign.handle = oProject.GetActiveDesign()
+    ctx = ResolveContext(context)
+    new_props = ["NAME:NewProps"]
     for i in range(len(props_name_array)):
-        oDesign.ChangeProperty(["NAME:AllTabs",
+        new_props.append(["NAME:" + props_name_array[i], "PropType:=", "VariableProp", "UserDef:=", True,
+                          "Value:=", str(props_value_array[i]) + "mm"])
+    if len(new_props) == 1:
+        return
+    ctx.oDesign.ChangeProperty(["NAME:AllTabs",
                                 ["NAME:LocalVariableTab",
                                  ["NAME:PropServers", "LocalVariables"],
-                                 ["NAME:NewProps",
-                                  ["NAME:"+props_name_array[i], "PropType:=", "VariableProp", "UserDef:=", True,
-                                   "Value:=", str(props_value_array[i])+"mm"]]]])
+                                 new_props]])
 
 
-def GetVariableName() -> tuple:
+def GetVariableName(context=None) -> tuple:
     """
-    得到 active 设计中所有变量的名称
+    得到 active 设计中所有变量的名称, 首次调用后从变量缓存读取
     :return: tuple 包含当前设计所有变量的名称 字符串元组
     """
-    if oDesign.handle is None:
-        oDesign.handle = oProject.GetActiveDesign()
-    return oDesign.GetVariables()
+    return ResolveContext(context).oDesign.GetVariables()
 
 
-def GetVariableValue(variable_name):
+def GetVariableValue(variable_name, context=None):
     """
-    得到 active 设计中变量variable_name的值
+    得到 active 设计中变量variable_name的值, 首次调用后从变量缓存读取
     :return: 字符串
     """
-    if oDesign.handle is None:
-        oDesign.handle = oProject.GetActiveDesign()
-    return oDesign.GetVariablesValue(variable_name)
+    return ResolveContext(context).oDesign.GetVariablesValue(variable_name)
     pass
 
 
-def ChangeVariable(props_name_array, props_value_array):
+def ChangeVariable(props_name_array, props_value_array, force=False, context=None):
     """
     批量修改 active 设计 变量的值
+    所有变化的变量打包在一次 ChangeProperty 调用中完成, 模型只重新计算一次;
+    与变量缓存中的值相同的变量被跳过, 全部未变化时不调用 COM.
+    注意: 在 AEDT 界面中手动修改变量后应传入 force=True 或先调用 InvalidateVariableCache()
     :param props_name_array: 字符串 列表,每个元素为字符串
     :param props_value_array: 浮点数 列表,每个元素为浮点数,单位为 mm
-    :return:
+    :param force: 为 True 时不跳过未变化的变量
+    :return: int 实际修改的变量个数
     """
-    if oDesign.handle is None:
-        oDesign.handle = oProject.GetActiveDesign()
-    # oDesign.handle = oProject.GetActiveDesign()
-    if oDesign.handle is None:
-        oDesign.handle = oProject.GetDesign("HFSSDesign13")
-        print(type(oDesign))
+    ctx = ResolveContext(context)
+    if ctx.oDesign.handle is None:
+        ctx.oDesign.handle = ctx.oProject.GetDesign("HFSSDesign13")
+        print(type(ctx.oDesign))
+    changed = {}
     for i in range(len(props_name_array)):
-        oDesign.ChangeProperty(["NAME:AllTabs",
+        value = str(props_value_array[i]) + "mm"
+        if force or ctx.oDesign.variable_cache.Peek(props_name_array[i]) != value:
+            changed[props_name_array[i]] = value
+    if len(changed) == 0:
+        return 0
+    changed_props = ["NAME:ChangedProps"]
+    for name, value in changed.items():
+        changed_props.append(["NAME:" + name, "PropType:=", "VariableProp", "UserDef:=", True, "Value:=", value])
+    ctx.oDesign.ChangeProperty(["NAME:AllTabs",
                                 ["NAME:LocalVariableTab",
                                  ["NAME:PropServers", "LocalVariables"],
-                                 ["NAME:ChangedProps",
-                                  ["NAME:"+props_name_array[i], "PropType:=", "VariableProp", "UserDef:=", True,
-                                   "Value:=", str(props_value_array[i])+"mm"]]]])
+                                 changed_props]])
+    return len(changed)
+
+
+def InvalidateVariableCache(context=None):
+    """
+    使 active 项目和设计的变量缓存失效, 在 AEDT 界面或其他脚本修改变量后调用
+    :return: None
+    """
+    ctx = ResolveContext(context)
+    ctx.oProject.variable_cache.Invalidate()
+    ctx.oDesign.variable_cache.Invalidate()
+
+
+def GetVariableCacheStatistics(context=None) -> dict:
+    """
+    得到 active 设计变量缓存的命中统计, hits 即节省的 COM 调用次数
+    :return: {"hits": int, "misses": int, "cached": int}
+    """
+    return ResolveContext(context).oDesign.variable_cache.Statistics()
 
 
 # 函数测试
@@ -0,0 +1,78 @@
+"""
+@FileName: benchmark/__init__.py
+@Description: 该包提供 hfss 接口的性能基准测试, 包括计时工具和结果保存功能, 各项基准测试见包内模块
+@Author: SJY
+@Time: 2026/10/18
+@Coding: UTF-8
+@Vision: V1.0
+"""
+
+# Official Standard Library
+import json
+import os
+import platform
+import time
+
+# Import the OSL with "from"
+from typing import Dict, List
+
+
+class Timer(object):
+    """
+    计时器 用于 with 语句, 退出时将耗时(秒)累加到 elapsed
+    """
+
+    def __init__(self):
+        self.elapsed = 0.0
+        self.__start = 0.0
+
+    def __enter__(self):
+        self.__start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.elapsed += time.perf_counter() - self.__start
+        return False
+
+
+def Summarize(samples: List[float]) -> Dict[str, float]:
+    """
+    统计一组耗时样本
+    :param samples: 耗时列表 单位 s
+    :return: {"count", "mean", "min", "max", "median"}
+    """
+    if len(samples) == 0:
+        return {"count": 0, "mean": 0.0, "min": 0.0, "max": 0.0, "median": 0.0}
+    ordered = sorted(samples)
+    return {
+        "count": len(ordered),
+        "mean": sum(ordered) / len(ordered),
+        "min": ordered[0],
+        "max": ordered[-1],
+        "median": ordered[len(ordered) // 2],
+    }
+
+
+def SaveResults(name: str, results: dict, output_dir: str = None) -> str:
+    """
+    将基准测试结果保存为 JSON 文件, 文件名为 <name>.json
+    :param name: 基准测试名称
+    :param results: 结果字典
+    :param output_dir: 输出文件夹, 默认为当前工作路径
+    :return: 结果文件路径
+    """
+    if output_dir is None:
+        output_dir = os.getcwd()
+    if os.path.exists(output_dir) is False:
+        os.makedirs(output_dir)
+    file_path = os.path.join(output_dir, name + ".json")
+    document = {
+        "benchmark": name,
+        "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    with open(file_path, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2, ensure_ascii=False)
+    return file_path
@@ -0,0 +1,118 @@
+"""
+@FileName: benchmark/array.py
+@Description: 阵列天线建模基准测试. 在模拟后端上 (每次建模操作耗时 modeler_seconds) 建立 rows x columns 贴片阵列
+              (每个单元为贴片及馈电面, 馈电面上为集总端口), 比较逐个单元创建对象并分配端口与
+              hfss.modeler.RectangularArray 创建一个单元后复制 (端口随对象复制) 的 COM 调用次数和耗时.
+              运行: python -m hfss.benchmark.array --rows 16 --columns 16 --modeler-seconds 0.02
+@Author: SJY
+@Time: 2026/10/18
+@Coding: UTF-8
+@Vision: V1.0
+"""
+
+# Official Standard Library
+import argparse
+import os
+import tempfile
+
+# Import the LL with "from"
+import hfss
+from hfss import backend, basic, instrument, modeler
+from hfss.benchmark import Timer, SaveResults
+
+
+def Element(suffix: str = "", x="0mm", y="0mm") -> list:
+    """
+    阵列单元: 贴片及连接地与贴片的馈电面
+    """
+    return [modeler.Rectangle("Patch" + suffix, [x, y, "1.6mm"], ["length", "length"], material="pec"),
+            modeler.Rectangle("Feed" + suffix, ["%s+length/2" % x, y, "0mm"], ["1mm", "1.6mm"], axis="Y")]
+
+
+def LumpedPort(name: str, sheet: str) -> list:
+    return ["NAME:" + name, "Objects:=", [sheet], "RenormalizeAllTerminals:=", True, "DoDeembed:=", False,
+            ["NAME:Modes", ["NAME:Mode1", "ModeNum:=", 1, "UseIntLine:=", False, "CharImp:=", "Zpi"]],
+            "ShowReporterFilter:=", False, "ReporterFilter:=", [True], "FullResistance:=", "50ohm",
+            "FullReactance:=", "0ohm"]
+
+
+def Substrate(rows: int, columns: int) -> modeler.Model:
+    model = modeler.Model({"length": 30, "pitch": 60})
+    return model.Add(modeler.Box("Substrate", [0, 0, 0], ["%d*pitch" % columns, "%d*pitch" % rows, "1.6mm"],
+                                 "FR4_epoxy"))
+
+
+def PerElement(rows: int, columns: int) -> int:
+    """
+    逐个单元创建贴片和馈电面并分配端口
+    :return: 单元个数
+    """
+    model = Substrate(rows, columns)
+    for i in range(rows):
+        for j in range(columns):
+            model.Add(*Element("_%d_%d" % (i, j), "%d*pitch" % j, "%d*pitch" % i))
+    modeler.Apply(model, verify=False)
+    boundary = hfss.oContext.GetModule("BoundarySetup")
+    for i in range(rows):
+        for j in range(columns):
+            boundary.AssignLumpedPort(LumpedPort("Port_%d_%d" % (i, j), "Feed_%d_%d" % (i, j)))
+    return rows * columns
+
+
+def Duplicated(rows: int, columns: int) -> int:
+    """
+    创建一个单元并分配端口, 由 RectangularArray 复制
+    :return: 单元个数
+    """
+    modeler.Apply(Substrate(rows, columns), verify=False)
+    element = modeler.Model().Add(*Element())
+    names = modeler.CreateElement(element)
+    hfss.oContext.GetModule("BoundarySetup").AssignLumpedPort(LumpedPort("Port1", "Feed"))
+    return len(modeler.RectangularArray(names, rows, columns, ("pitch", "pitch")))
+
+
+def Run(rows: int = 16, columns: int = 16, modeler_seconds: float = 0.02) -> dict:
+    """
+    运行基准测试
+    :param rows: 阵列行数
+    :param columns: 阵列列数
+    :param modeler_seconds: 模拟后端每次建模操作的耗时
+    :return: 结果字典
+    """
+    config = backend.SimulationConfig(modeler_seconds=modeler_seconds,
+                                      project_directory=os.path.join(tempfile.gettempdir(), "hfss_benchmark"))
+    results = []
+    try:
+        for name, build in (("per element", PerElement), ("duplicate", Duplicated)):
+            backend.UseSimulated(config)
+            basic.CreateProject(os.path.join(config.project_directory, "Array_" + name.replace(" ", "_")))
+            basic.InsertHFSSDesign("HFSSDesign1", "DrivenModal")
+            instrument.Enable()
+            instrument.Reset()
+            timer = Timer()
+            with timer:
+                elements = build(rows, columns)
+            report = instrument.Report()["by_method"]
+            results.append({"mode": name, "elements": elements, "seconds": timer.elapsed,
+                            "com_calls": sum(item["count"] for item in report.values()),
+                            "calls": {key: item["count"] for key, item in report.items()},
+                            "objects": hfss.oContext.GetEditor().GetNumObjects()})
+            instrument.Disable()
+    finally:
+        instrument.Disable()
+        backend.UseCom()
+    return {"rows": rows, "columns": columns, "modeler_seconds": modeler_seconds, "results": results}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="阵列天线逐个单元创建与复制单元的建模耗时的基准测试")
+    parser.add_argument("--rows", type=int, default=16)
+    parser.add_argument("--columns", type=int, default=16)
+    parser.add_argument("--modeler-seconds", type=float, default=0.02)
+    parser.add_argument("--output-dir", default=None)
+    args = parser.parse_args()
+    result = Run(args.rows, args.columns, args.modeler_seconds)
+    for item in result["results"]:
+        print("%-12s %4d elements %5d COM calls %8.2f s  %d objects" % (
+            item["mode"], item["elements"], item["com_calls"], item["seconds"], item["objects"]))
+    print(SaveResults("array", result, args.output_dir))
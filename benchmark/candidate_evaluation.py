@@ -0,0 +1,175 @@
+"""
+@FileName: benchmark/candidate_evaluation.py
+@Description: 候选解评估热路径基准测试: basic.ChangeVariable -> analysis.Analyze -> analysis.GetAntennaPerformance.
+              在模拟后端上运行, 将每个候选解的耗时分解为 变量更新、求解调度、报告创建/更新、CSV 导出、pandas 解析,
+              可配置扫频点数 (如 101 到 10001) 和远场网格步进 (如 1deg 与 5deg), 结果保存为 JSON 以便比较各版本.
+              运行: python -m hfss.benchmark.candidate_evaluation --sweep-points 101 1001 10001 --grid-steps 1 5
+@Author: SJY
+@Time: 2026/10/18
+@Coding: UTF-8
+@Vision: V1.0
+"""
+
+# Official Standard Library
+import argparse
+import os
+import random
+import tempfile
+
+# Import the OSL with "from"
+from typing import Dict, List
+
+# Import the LL with "from"
+from hfss import oContext, backend, basic, analysis
+from hfss.benchmark import Timer, Summarize, SaveResults
+from hfss.instrument import Monitor
+
+
+# GetAntennaPerformance 中各 COM 方法所属的阶段, 未列出的方法计入 other_com
+REPORT_METHODS = ("GetAllReportNames", "CreateReport", "UpdateReports", "UpdateAllReports")
+EXPORT_METHODS = ("ExportToFile",)
+STAGES = ("variable_update", "solve", "report", "export", "parse", "other_com", "total")
+
+
+def InsertSphere(step: float):
+    """
+    插入远场球坐标 Infinite Sphere1, Theta/Phi 步进为 step
+    :param step: 网格步进 单位 deg
+    :return: None
+    """
+    oContext.GetModule("RadField").InsertFarFieldSphereSetup(
+        [
+            "NAME:Infinite Sphere1",
+            "UseCustomRadiationSurface:=", False,
+            "CSDefinition:=", "Theta-Phi",
+            "Polarization:=", "Linear",
+            "ThetaStart:=", "-180deg",
+            "ThetaStop:=", "180deg",
+            "ThetaStep:=", str(step) + "deg",
+            "PhiStart:=", "0deg",
+            "PhiStop:=", "360deg",
+            "PhiStep:=", str(step) + "deg",
+            "UseLocalCS:=", False
+        ]
+    )
+
+
+def SplitPerformance(monitor: Monitor, wall_time: float) -> Dict[str, float]:
+    """
+    按 COM 方法将 GetAntennaPerformance 的耗时分解为 报告、导出、其他 COM 调用, 剩余部分为 pandas 解析及本库开销
+    """
+    report, export, other = 0.0, 0.0, 0.0
+    for key, histogram in monitor.by_method.items():
+        method = key.split(".", 1)[1]
+        if method in REPORT_METHODS:
+            report += histogram.total
+        elif method in EXPORT_METHODS:
+            export += histogram.total
+        else:
+            other += histogram.total
+    return {"report": report, "export": export, "other_com": other,
+            "parse": max(wall_time - report - export - other, 0.0)}
+
+
+def RunCase(sweep_points: int, grid_step: float, candidates: List[List[float]], names: List[str],
+            config: backend.SimulationConfig) -> dict:
+    """
+    对一组扫频点数和网格步进运行全部候选解
+    :return: {"sweep_points", "grid_step", "stages": {阶段: 耗时统计}}
+    """
+    backend.UseSimulated(config)
+    basic.CreateProject(os.path.join(config.project_directory, "Benchmark_%d_%s" % (sweep_points, grid_step)))
+    basic.InsertHFSSDesign("HFSSDesign1", "DrivenModal")
+    basic.CreateNewVariable(names, candidates[0])
+    analysis.InsertSetup("Setup1", 2.5, 0.02, "Fast", 2.0, 3.0, sweep_points)
+    InsertSphere(grid_step)
+    # 预热: 首次评估包含 pandas 导入和报告创建, 不计入统计
+    analysis.Analyze("Setup1")
+    analysis.GetAntennaPerformance(2.5)
+
+    monitor = Monitor()
+    samples = {stage: [] for stage in STAGES}
+    for values in candidates:
+        update, solve, performance = Timer(), Timer(), Timer()
+        with update:
+            basic.ChangeVariable(names, values)
+        with solve:
+            analysis.Analyze("Setup1")
+        monitor.Reset()
+        monitor.Enable()
+        try:
+            with performance:
+                analysis.GetAntennaPerformance(2.5)
+        finally:
+            monitor.Disable()
+        stages = SplitPerformance(monitor, performance.elapsed)
+        stages["variable_update"] = update.elapsed
+        stages["solve"] = solve.elapsed
+        stages["total"] = update.elapsed + solve.elapsed + performance.elapsed
+        for stage in STAGES:
+            samples[stage].append(stages[stage])
+    return {"sweep_points": sweep_points, "grid_step": grid_step,
+            "stages": {stage: Summarize(samples[stage]) for stage in STAGES}}
+
+
+def Run(sweep_points=(101, 1001, 10001), grid_steps=(1.0, 5.0), candidate_count: int = 5,
+        config: backend.SimulationConfig = None, seed: int = 0) -> dict:
+    """
+    运行基准测试
+    :param sweep_points: 扫频点数列表
+    :param grid_steps: 远场网格步进列表 单位 deg
+    :param candidate_count: 每种配置评估的候选解个数
+    :param config: 模拟后端配置, 默认各项求解耗时为 0, 即只测量本库、模拟后端和 pandas 的开销
+    :param seed: 随机种子
+    :return: 结果字典
+    """
+    if config is None:
+        config = backend.SimulationConfig(project_directory=os.path.join(tempfile.gettempdir(), "hfss_benchmark"))
+    rng = random.Random(seed)
+    names = ["length", "width", "feed_x", "feed_y"]
+    candidates = [[round(rng.uniform(20, 40), 3) for _ in names] for _ in range(candidate_count)]
+    results = {"candidate_count": candidate_count,
+               "config": {"analyze_seconds": config.analyze_seconds,
+                          "per_frequency_seconds": config.per_frequency_seconds,
+                          "regenerate_seconds": config.regenerate_seconds,
+                          "report_seconds": config.report_seconds,
+                          "export_row_seconds": config.export_row_seconds},
+               "cases": []}
+    try:
+        for points in sweep_points:
+            for step in grid_steps:
+                results["cases"].append(RunCase(points, step, candidates, names, config))
+    finally:
+        backend.UseCom()
+    return results
+
+
+def FormatTable(results: dict) -> str:
+    """
+    将结果格式化为表格 各阶段为每个候选解的平均耗时 单位 ms
+    """
+    lines = ["%8s %6s " % ("points", "step") + " ".join("%15s" % stage for stage in STAGES)]
+    for case in results["cases"]:
+        lines.append("%8d %6g " % (case["sweep_points"], case["grid_step"]) +
+                     " ".join("%15.3f" % (case["stages"][stage]["mean"] * 1e3) for stage in STAGES))
+    return "\n".join(lines)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="候选解评估热路径基准测试")
+    parser.add_argument("--sweep-points", type=int, nargs="+", default=[101, 1001, 10001])
+    parser.add_argument("--grid-steps", type=float, nargs="+", default=[1.0, 5.0])
+    parser.add_argument("--candidates", type=int, default=5)
+    parser.add_argument("--analyze-seconds", type=float, default=0.0)
+    parser.add_argument("--per-frequency-seconds", type=float, default=0.0)
+    parser.add_argument("--regen-seconds", type=float, default=0.0)
+    parser.add_argument("--report-seconds", type=float, default=0.0)
+    parser.add_argument("--export-row-seconds", type=float, default=0.0)
+    parser.add_argument("--output-dir", default=None)
+    args = parser.parse_args()
+    simulation = backend.SimulationConfig(args.analyze_seconds, args.per_frequency_seconds, args.regen_seconds,
+                                          args.report_seconds, args.export_row_seconds,
+                                          os.path.join(tempfile.gettempdir(), "hfss_benchmark"))
+    result = Run(args.sweep_points, args.grid_steps, args.candidates, simulation)
+    print(FormatTable(result))
+    print(SaveResults("candidate_evaluation", result, args.output_dir))
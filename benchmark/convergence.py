@@ -0,0 +1,105 @@
+"""
+@FileName: benchmark/convergence.py
+@Description: 收敛监视基准测试. 在模拟后端上 (每次自适应迭代耗时 pass_seconds) 对同一组随机候选解分别直接求解和
+              用 hfss.convergence 监视求解 (PlateauPolicy), 比较每个候选解的求解时间,
+              并以直接求解的收敛状态检查被停止的候选解是否都是不会收敛的.
+              运行: python -m hfss.benchmark.convergence --candidates 40 --pass-seconds 0.01
+@Author: SJY
+@Time: 2026/10/18
+@Coding: UTF-8
+@Vision: V1.0
+"""
+
+# Official Standard Library
+import argparse
+import os
+import random
+import tempfile
+
+# Import the LL with "from"
+from hfss import backend, basic, analysis, convergence
+from hfss.benchmark import Summarize, SaveResults
+
+
+NAMES = ["length", "width"]
+LOWER, UPPER = [20.0, 20.0], [40.0, 40.0]
+MAX_DELTA_S = 0.02
+
+
+def Prepare(config: backend.SimulationConfig, name: str, frequency: float):
+    backend.UseSimulated(config)
+    basic.CreateProject(os.path.join(config.project_directory, name))
+    basic.InsertHFSSDesign("HFSSDesign1", "DrivenModal")
+    basic.CreateNewVariable(NAMES, [30, 28])
+    # InsertSetup 的 MaximumPasses 为 99, 不收敛的候选解会运行全部迭代
+    analysis.InsertSetup("Setup1", frequency, MAX_DELTA_S, "Fast", 2.0, 3.0, 101)
+
+
+def Run(candidate_count: int = 40, seed: int = 0, frequency: float = 2.5, interval: float = 0.005,
+        config: backend.SimulationConfig = None) -> dict:
+    """
+    运行基准测试
+    :param candidate_count: 候选解个数
+    :param seed: 随机数种子
+    :param frequency: 单位 GHz
+    :param interval: 监视的轮询间隔 单位 s
+    :param config: 模拟后端配置
+    :return: 结果字典
+    """
+    if config is None:
+        config = backend.SimulationConfig(pass_seconds=0.01,
+                                          project_directory=os.path.join(tempfile.gettempdir(), "hfss_benchmark"))
+    rng = random.Random(seed)
+    candidates = [[round(rng.uniform(low, high), 3) for low, high in zip(LOWER, UPPER)]
+                  for _ in range(candidate_count)]
+    policies = [convergence.PlateauPolicy(MAX_DELTA_S)]
+    try:
+        Prepare(config, "ConvergenceBaseline", frequency)
+        baseline = []
+        for values in candidates:
+            basic.ChangeVariable(NAMES, values)
+            baseline.append(convergence.Analyze("Setup1", interval=interval))
+        Prepare(config, "ConvergenceMonitored", frequency)
+        monitored = []
+        for values in candidates:
+            basic.ChangeVariable(NAMES, values)
+            monitored.append(convergence.Analyze("Setup1", policies, interval=interval))
+    finally:
+        backend.UseCom()
+    saved = [b["elapsed"] - m["elapsed"] for b, m in zip(baseline, monitored)]
+    stopped = [m["stopped"] for m in monitored]
+    # 被停止但直接求解时会收敛的候选解
+    false_stops = sum(1 for s, b in zip(stopped, baseline) if s and b["status"] == "converged")
+    # 直接求解时不收敛但未被停止的候选解
+    missed_stops = sum(1 for s, b in zip(stopped, baseline) if not s and b["status"] != "converged")
+    return {"candidates": candidate_count, "pass_seconds": config.pass_seconds, "interval": interval,
+            "baseline": {"seconds": sum(b["elapsed"] for b in baseline),
+                         "passes": sum(b["passes"] for b in baseline),
+                         "not_converged": sum(1 for b in baseline if b["status"] != "converged")},
+            "monitored": {"seconds": sum(m["elapsed"] for m in monitored),
+                          "passes": sum(m["passes"] for m in monitored),
+                          "stopped": sum(stopped), "false_stops": false_stops, "missed_stops": missed_stops},
+            "saved_per_candidate": Summarize(saved),
+            "saved_per_stopped": Summarize([s for s, flag in zip(saved, stopped) if flag])}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="收敛监视提前停止不收敛候选解节省的求解时间的基准测试")
+    parser.add_argument("--candidates", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--pass-seconds", type=float, default=0.01)
+    parser.add_argument("--interval", type=float, default=0.005)
+    parser.add_argument("--output-dir", default=None)
+    args = parser.parse_args()
+    simulation = backend.SimulationConfig(pass_seconds=args.pass_seconds,
+                                          project_directory=os.path.join(tempfile.gettempdir(), "hfss_benchmark"))
+    result = Run(args.candidates, args.seed, interval=args.interval, config=simulation)
+    baseline, monitored = result["baseline"], result["monitored"]
+    print("direct:    %5d passes %8.2f s  %d not converged" % (
+        baseline["passes"], baseline["seconds"], baseline["not_converged"]))
+    print("monitored: %5d passes %8.2f s  stopped: %d  false stops: %d  missed stops: %d" % (
+        monitored["passes"], monitored["seconds"], monitored["stopped"], monitored["false_stops"],
+        monitored["missed_stops"]))
+    print("saved per candidate: %.3f s (mean)  per stopped candidate: %.3f s (mean)" % (
+        result["saved_per_candidate"]["mean"], result["saved_per_stopped"]["mean"]))
+    print(SaveResults("convergence", result, args.output_dir))
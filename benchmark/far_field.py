@@ -0,0 +1,74 @@
+"""
+@FileName: benchmark/far_field.py
+@Description: 远场球坐标分辨率基准测试, 比较 "Full" 与 "Boresight" 预设下 GetAntennaPerformance 的耗时,
+              以及读取 1deg 全球面与 AdaptiveRadiationSphere 得到主瓣的耗时和计算的方向数.
+              运行: python -m hfss.benchmark.far_field --export-row-seconds 2e-6
+@Author: SJY
+@Time: 2026/10/18
+@Coding: UTF-8
+@Vision: V1.0
+"""
+
+# Official Standard Library
+import argparse
+import os
+import tempfile
+
+# Import the LL with "from"
+from hfss import backend, basic, analysis
+from hfss.benchmark import Timer, SaveResults
+
+
+def Run(config: backend.SimulationConfig = None, frequency: float = 2.5) -> dict:
+    """
+    运行基准测试
+    :param config: 模拟后端配置
+    :param frequency: 单位 GHz
+    :return: 结果字典
+    """
+    if config is None:
+        config = backend.SimulationConfig(project_directory=os.path.join(tempfile.gettempdir(), "hfss_benchmark"))
+    backend.UseSimulated(config)
+    try:
+        basic.CreateProject(os.path.join(config.project_directory, "FarField"))
+        basic.InsertHFSSDesign("HFSSDesign1", "DrivenModal")
+        basic.CreateNewVariable(["length", "width"], [30, 28])
+        analysis.InsertSetup("Setup1", frequency, 0.02, "Fast", 2.0, 3.0, 101)
+        analysis.InsertRadFieldSphereSetup()
+        analysis.Analyze("Setup1")
+        results = {"export_row_seconds": config.export_row_seconds}
+        for preset in ("Full", "Boresight"):
+            analysis.InsertRadFieldSphereSetup(preset=preset)
+            timer = Timer()
+            with timer:
+                performance = analysis.GetAntennaPerformance(frequency)
+            results[preset] = {"seconds": timer.elapsed, "performance": [float(v) for v in performance]}
+        analysis.InsertRadFieldSphereSetup(preset="Full")
+        timer = Timer()
+        with timer:
+            theta, phi, grid = analysis.SphereGrid(frequency, "Infinite Sphere1")
+        results["full_grid"] = {"seconds": timer.elapsed, "points": int(grid.size), "peak": float(grid.max())}
+        timer = Timer()
+        with timer:
+            adaptive = analysis.AdaptiveRadiationSphere(frequency)
+        results["adaptive"] = {"seconds": timer.elapsed, "points": adaptive["points"],
+                               "peak": adaptive["beam"]["value"]}
+    finally:
+        backend.UseCom()
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="远场球坐标分辨率预设与自适应模式的基准测试")
+    parser.add_argument("--export-row-seconds", type=float, default=0.0)
+    parser.add_argument("--output-dir", default=None)
+    args = parser.parse_args()
+    simulation = backend.SimulationConfig(export_row_seconds=args.export_row_seconds,
+                                          project_directory=os.path.join(tempfile.gettempdir(), "hfss_benchmark"))
+    result = Run(simulation)
+    print("GetAntennaPerformance  Full: %8.1f ms  Boresight: %8.1f ms" % (
+        result["Full"]["seconds"] * 1e3, result["Boresight"]["seconds"] * 1e3))
+    print("main beam  full grid: %8.1f ms %7d points  adaptive: %8.1f ms %7d points  peak difference: %.1e" % (
+        result["full_grid"]["seconds"] * 1e3, result["full_grid"]["points"], result["adaptive"]["seconds"] * 1e3,
+        result["adaptive"]["points"], abs(result["full_grid"]["peak"] - result["adaptive"]["peak"])))
+    print(SaveResults("far_field", result, args.output_dir))
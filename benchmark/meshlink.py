@@ -0,0 +1,103 @@
+"""
+@FileName: benchmark/meshlink.py
+@Description: 网格复用基准测试. 在模拟后端上 (每次自适应迭代耗时与四面体个数成正比) 对同一组局部搜索的候选解
+              (在初始解附近的小扰动) 分别从初始网格求解和用 hfss.meshlink 导入参考网格求解,
+              比较迭代次数和求解时间 (含参考设计的求解及失败的导入), 并检查两者的天线参数是否一致.
+              运行: python -m hfss.benchmark.meshlink --candidates 40 --pass-seconds 0.01
+@Author: SJY
+@Time: 2026/10/18
+@Coding: UTF-8
+@Vision: V1.0
+"""
+
+# Official Standard Library
+import argparse
+import os
+import random
+import tempfile
+
+# Import the LL with "from"
+from hfss import backend, basic, analysis, convergence, meshlink
+from hfss.benchmark import Timer, SaveResults
+
+
+NAMES = ["length", "width"]
+INITIAL = [30.0, 28.0]
+
+
+def Prepare(config: backend.SimulationConfig, name: str, frequency: float):
+    backend.UseSimulated(config)
+    basic.CreateProject(os.path.join(config.project_directory, name))
+    basic.InsertHFSSDesign("HFSSDesign1", "DrivenModal")
+    basic.CreateNewVariable(NAMES, INITIAL)
+    analysis.InsertSetup("Setup1", frequency, 0.02, "Fast", 2.0, 3.0, 101)
+    analysis.InsertRadFieldSphereSetup(preset="Boresight")
+
+
+def Run(candidate_count: int = 40, seed: int = 0, frequency: float = 2.5, step: float = 0.03,
+        config: backend.SimulationConfig = None) -> dict:
+    """
+    运行基准测试
+    :param candidate_count: 候选解个数
+    :param seed: 随机数种子
+    :param frequency: 单位 GHz
+    :param step: 候选解相对初始解的最大相对扰动
+    :param config: 模拟后端配置
+    :return: 结果字典
+    """
+    if config is None:
+        config = backend.SimulationConfig(pass_seconds=0.01,
+                                          project_directory=os.path.join(tempfile.gettempdir(), "hfss_benchmark"))
+    rng = random.Random(seed)
+    candidates = [[round(v * (1.0 + rng.uniform(-step, step)), 3) for v in INITIAL] for _ in range(candidate_count)]
+    try:
+        Prepare(config, "MeshLinkBaseline", frequency)
+        baseline, baseline_passes = [], 0
+        baseline_timer = Timer()
+        with baseline_timer:
+            for values in candidates:
+                basic.ChangeVariable(NAMES, values)
+                analysis.Analyze("Setup1")
+                baseline_passes += len(convergence.ExportConvergence("Setup1"))
+                baseline.append(tuple(float(v) for v in analysis.GetAntennaPerformance(frequency)))
+        Prepare(config, "MeshLinkReuse", frequency)
+        reuse = meshlink.MeshReuse("Setup1")
+        outputs = []
+        reuse_timer = Timer()
+        with reuse_timer:
+            for values in candidates:
+                outputs.append(meshlink.EvaluateCandidate(NAMES, values, reuse, frequency))
+    finally:
+        backend.UseCom()
+    stats = reuse.Stats()
+    mismatch = max(max(abs(a - b) for a, b in zip(output["performance"], expected))
+                   for output, expected in zip(outputs, baseline) if output["performance"] is not None)
+    reuse_passes = sum(stats[mode]["passes"] for mode in ("reference", "imported", "fresh", "failed"))
+    return {"candidates": candidate_count, "pass_seconds": config.pass_seconds, "step": step,
+            "baseline": {"seconds": baseline_timer.elapsed, "passes": baseline_passes},
+            "reuse": {"seconds": reuse_timer.elapsed, "passes": reuse_passes, "imported": stats["imported"]["count"],
+                      "fallbacks": stats["fallbacks"], "reference_solves": stats["reference"]["count"],
+                      "max_difference": mismatch},
+            "saved_passes_per_candidate": (baseline_passes - reuse_passes) / candidate_count,
+            "saved_seconds_per_candidate": (baseline_timer.elapsed - reuse_timer.elapsed) / candidate_count,
+            "stats": stats}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="导入参考网格节省的自适应迭代次数与求解时间的基准测试")
+    parser.add_argument("--candidates", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--step", type=float, default=0.03)
+    parser.add_argument("--pass-seconds", type=float, default=0.01)
+    parser.add_argument("--output-dir", default=None)
+    args = parser.parse_args()
+    simulation = backend.SimulationConfig(pass_seconds=args.pass_seconds,
+                                          project_directory=os.path.join(tempfile.gettempdir(), "hfss_benchmark"))
+    result = Run(args.candidates, args.seed, step=args.step, config=simulation)
+    baseline, reuse = result["baseline"], result["reuse"]
+    print("initial mesh: %5d passes %8.2f s" % (baseline["passes"], baseline["seconds"]))
+    print("mesh reuse:   %5d passes %8.2f s  imported: %d  fallbacks: %d  reference solves: %d" % (
+        reuse["passes"], reuse["seconds"], reuse["imported"], reuse["fallbacks"], reuse["reference_solves"]))
+    print("saved per candidate: %.1f passes  %.3f s" % (
+        result["saved_passes_per_candidate"], result["saved_seconds_per_candidate"]))
+    print(SaveResults("meshlink", result, args.output_dir))
@@ -0,0 +1,71 @@
+"""
+@FileName: benchmark/metrics.py
+@Description: 指标计算基准测试, 比较逐个变化使用 pandas (mask/shift/cumsum/groupby, 原 GetAntennaPerformance 的算法)
+              计算 -10dB 带宽与 hfss.metrics 一次向量化计算全部变化的耗时, 并检查结果一致.
+              运行: python -m hfss.benchmark.metrics --variations 500 --sweep-points 1001
+@Author: SJY
+@Time: 2026/10/18
+@Coding: UTF-8
+@Vision: V1.0
+"""
+
+# Official Standard Library
+import argparse
+
+# Third-party Library
+import numpy as np
+import pandas as pd
+
+# Import the LL with "from"
+from hfss import metrics
+from hfss.benchmark import Timer, SaveResults
+
+
+def PandasBandwidth(freqs, s11, frequency: float) -> float:
+    """
+    原 GetAntennaPerformance 的带宽算法, 每次处理一条曲线
+    """
+    df = pd.DataFrame({"Freq [GHz]": freqs, "dB(S(1,1)) []": s11})
+    mask = df['dB(S(1,1)) []'] < -10
+    groups = (mask != mask.shift()).cumsum()
+    result = df[mask].groupby(groups)['Freq [GHz]'].agg(['count', 'first', 'last']).values
+    for i in range(len(result)):
+        if result[i][1] <= frequency <= result[i][2]:
+            return result[i][2] - result[i][1]
+    return 0.0
+
+
+def Run(variations: int = 500, sweep_points: int = 1001, frequency: float = 2.5, seed: int = 0) -> dict:
+    """
+    运行基准测试 S11 曲线为随机游走, 保证存在多个 -10dB 频段
+    :param variations: 变化数
+    :param sweep_points: 扫频点数
+    :param frequency: 单位 GHz
+    :param seed: 随机数种子
+    :return: 结果字典
+    """
+    rng = np.random.default_rng(seed)
+    freqs = np.round(np.linspace(2.0, 3.0, sweep_points), 9)
+    s11 = -10 + 0.3 * np.cumsum(rng.normal(size=(variations, sweep_points)), axis=1)
+    pandas_timer, vector_timer = Timer(), Timer()
+    with pandas_timer:
+        expected = np.array([PandasBandwidth(freqs, row, frequency) for row in s11])
+    with vector_timer:
+        result = metrics.S11Metrics(freqs, s11, frequency)
+    return {"variations": variations, "sweep_points": sweep_points,
+            "pandas": pandas_timer.elapsed, "vectorized": vector_timer.elapsed,
+            "speedup": pandas_timer.elapsed / vector_timer.elapsed if vector_timer.elapsed > 0 else 0.0,
+            "max_difference": float(np.abs(result["BW"] - expected).max())}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="逐行 pandas 与向量化指标计算的基准测试")
+    parser.add_argument("--variations", type=int, default=500)
+    parser.add_argument("--sweep-points", type=int, default=1001)
+    parser.add_argument("--output-dir", default=None)
+    args = parser.parse_args()
+    case = Run(args.variations, args.sweep_points)
+    print("%d variations x %d points  pandas: %8.1f ms  vectorized: %6.1f ms  speedup: %6.0fx  max difference: %.1e" % (
+        case["variations"], case["sweep_points"], case["pandas"] * 1e3, case["vectorized"] * 1e3, case["speedup"],
+        case["max_difference"]))
+    print(SaveResults("metrics", case, args.output_dir))
@@ -0,0 +1,109 @@
+"""
+@FileName: benchmark/modeler.py
+@Description: 声明式几何模型基准测试. 在模拟后端上对 20x10 阵列天线 (200 个贴片及介质、开槽的地) 进行一系列修改
+              (设计变量、材料、个别贴片的尺寸、删除贴片), 比较每次删除全部对象后逐个重建与 hfss.modeler.Apply 增量应用
+              的 COM 调用次数和耗时.
+              运行: python -m hfss.benchmark.modeler --rows 10 --columns 20
+@Author: SJY
+@Time: 2026/10/18
+@Coding: UTF-8
+@Vision: V1.0
+"""
+
+# Official Standard Library
+import argparse
+import os
+import tempfile
+
+# Import the LL with "from"
+import hfss
+from hfss import backend, basic, instrument, modeler
+from hfss.benchmark import Timer, SaveResults
+
+
+def BuildArray(rows: int, columns: int, length: float = 30.0, material: str = "pec", resized=(), removed=()):
+    """
+    阵列天线模型
+    :param resized: 尺寸改为 "length*1.1" 的贴片序号
+    :param removed: 删除的贴片序号
+    """
+    model = modeler.Model({"length": length, "pitch": 60})
+    model.Add(modeler.Box("Substrate", [0, 0, 0], ["%d*pitch" % columns, "%d*pitch" % rows, "1.6mm"], "FR4_epoxy"),
+              modeler.Rectangle("Ground", [0, 0, 0], ["%d*pitch" % columns, "%d*pitch" % rows], material="pec"),
+              modeler.Rectangle("Slot", ["pitch/2", "pitch/2", "0mm"], ["2mm", "8mm"]))
+    model.Subtract("Ground", ["Slot"])
+    for i in range(rows * columns):
+        if i in removed:
+            continue
+        size = "length*1.1" if i in resized else "length"
+        model.Add(modeler.Rectangle("Patch%d" % i, ["%d*pitch" % (i % columns), "%d*pitch" % (i // columns), "1.6mm"],
+                                    [size, size], material=material))
+    return model
+
+
+def Rebuild(model: modeler.Model):
+    """
+    不比较差异: 删除全部对象后按模型逐个创建, 即手工调用 Editor 的做法
+    """
+    modeler.Invalidate()
+    editor = hfss.oContext.GetEditor()
+    names = editor.GetMatchedObjectName("*")
+    if names:
+        editor.Delete(["NAME:Selections", "Selections:=", ",".join(names)])
+    modeler.Apply(model, verify=False)
+
+
+def ComCalls() -> int:
+    return sum(item["count"] for item in instrument.Report()["by_method"].values())
+
+
+def Run(rows: int = 10, columns: int = 20, config: backend.SimulationConfig = None) -> dict:
+    """
+    运行基准测试
+    :param rows: 阵列行数
+    :param columns: 阵列列数
+    :param config: 模拟后端配置
+    :return: 结果字典
+    """
+    if config is None:
+        config = backend.SimulationConfig(project_directory=os.path.join(tempfile.gettempdir(), "hfss_benchmark"))
+    steps = [
+        ("initial", {}),
+        ("variable", {"length": 31.0}),
+        ("material", {"length": 31.0, "material": "copper"}),
+        ("resize 3", {"length": 31.0, "material": "copper", "resized": (0, 7, 42)}),
+        ("remove 10", {"length": 31.0, "material": "copper", "resized": (0, 7, 42), "removed": tuple(range(10))}),
+    ]
+    results = []
+    try:
+        for name, apply in (("rebuild", Rebuild), ("incremental", modeler.Apply)):
+            backend.UseSimulated(config)
+            basic.CreateProject(os.path.join(config.project_directory, "Modeler_" + name))
+            basic.InsertHFSSDesign("HFSSDesign1", "DrivenModal")
+            instrument.Enable()
+            for step, arguments in steps:
+                model = BuildArray(rows, columns, **arguments)
+                instrument.Reset()
+                timer = Timer()
+                with timer:
+                    apply(model)
+                results.append({"mode": name, "step": step, "com_calls": ComCalls(), "seconds": timer.elapsed,
+                                "objects": hfss.oContext.GetEditor().GetNumObjects()})
+            instrument.Disable()
+    finally:
+        instrument.Disable()
+        backend.UseCom()
+    return {"rows": rows, "columns": columns, "steps": results}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="声明式几何模型增量应用与逐个重建的 COM 调用次数的基准测试")
+    parser.add_argument("--rows", type=int, default=10)
+    parser.add_argument("--columns", type=int, default=20)
+    parser.add_argument("--output-dir", default=None)
+    args = parser.parse_args()
+    result = Run(args.rows, args.columns)
+    for item in result["steps"]:
+        print("%-12s %-10s %5d COM calls %8.2f ms  %d objects" % (
+            item["mode"], item["step"], item["com_calls"], item["seconds"] * 1e3, item["objects"]))
+    print(SaveResults("modeler", result, args.output_dir))
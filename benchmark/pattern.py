@@ -0,0 +1,97 @@
+"""
+@FileName: benchmark/pattern.py
+@Description: 方向图存储基准测试, 比较从报告导出的 CSV (pandas 解析整个网格后筛选) 与从 hfss.pattern 二进制存储
+              (memmap 只读取一个切面) 读取一个 Phi 切面的耗时及文件大小, 并检查结果一致.
+              运行: python -m hfss.benchmark.pattern --frequencies 1 5 --step 1
+@Author: SJY
+@Time: 2026/10/18
+@Coding: UTF-8
+@Vision: V1.0
+"""
+
+# Official Standard Library
+import argparse
+import os
+import tempfile
+
+# Third-party Library
+import numpy as np
+import pandas as pd
+
+# Import the LL with "from"
+from hfss import pattern
+from hfss.benchmark import Timer, Summarize, SaveResults
+
+
+def WriteCsv(file_path: str, frequency_count: int, step: float):
+    """
+    写出与 Gain 3D Radiation Pattern Plot 1.csv 格式相同的合成方向图, Theta -180~180, Phi 0~360
+    """
+    freqs = np.round(np.linspace(2.0, 3.0, frequency_count), 6) if frequency_count > 1 else np.array([2.5])
+    phi = np.arange(0.0, 360.0 + step / 2, step)
+    theta = np.arange(-180.0, 180.0 + step / 2, step)
+    f, p, t = np.meshgrid(freqs, phi, theta, indexing="ij")
+    gain = 5.0 + 10.0 * np.log10(np.maximum(np.cos(np.deg2rad(t)), 0.0) ** 1.5 + 1e-3) + 0.1 * np.cos(np.deg2rad(p)) * f
+    pd.DataFrame({"Freq [GHz]": f.ravel(), "Phi [deg]": p.ravel(), "Theta [deg]": t.ravel(),
+                  "dB(GainTotal) []": gain.ravel()}).to_csv(file_path, index=False, float_format="%.15g")
+
+
+def RunCase(frequency_count: int, step: float, repeat: int, directory: str) -> dict:
+    csv_path = os.path.join(directory, "Pattern_%d.csv" % frequency_count)
+    WriteCsv(csv_path, frequency_count, step)
+    convert_timer = Timer()
+    with convert_timer:
+        store_path = pattern.PatternFromCsv(csv_path)
+    with pattern.OpenPattern(store_path) as stored:
+        frequency = stored.freqs[len(stored.freqs) // 2]
+    samples = {"csv": [], "store": []}
+    for _ in range(repeat):
+        timer = Timer()
+        with timer:
+            df = pd.read_csv(csv_path)
+            rows = df[(df["Freq [GHz]"] == frequency) & (df["Phi [deg]"] == 90)].sort_values("Theta [deg]")
+            expected = rows["dB(GainTotal) []"].values
+        samples["csv"].append(timer.elapsed)
+        timer = Timer()
+        with timer:
+            with pattern.OpenPattern(store_path) as stored:
+                cut = np.array(stored.PhiCut(frequency, 90))
+        samples["store"].append(timer.elapsed)
+    store_bytes = sum(os.path.getsize(os.path.join(store_path, name)) for name in os.listdir(store_path))
+    csv_time, store_time = Summarize(samples["csv"]), Summarize(samples["store"])
+    return {"frequencies": frequency_count, "step": step, "csv_bytes": os.path.getsize(csv_path),
+            "store_bytes": store_bytes, "convert_seconds": convert_timer.elapsed, "csv": csv_time, "store": store_time,
+            "speedup": csv_time["mean"] / store_time["mean"] if store_time["mean"] > 0 else 0.0,
+            "max_difference": float(np.abs(cut - expected).max())}
+
+
+def Run(frequency_counts=(1, 5), step: float = 1.0, repeat: int = 3, directory: str = None) -> dict:
+    """
+    运行基准测试
+    :param frequency_counts: 方向图的频点数列表
+    :param step: Theta/Phi 步进 单位 deg
+    :param repeat: 每种读取方式的重复次数
+    :param directory: 文件保存路径
+    :return: 结果字典
+    """
+    if directory is None:
+        directory = os.path.join(tempfile.gettempdir(), "hfss_benchmark")
+    if os.path.exists(directory) is False:
+        os.makedirs(directory)
+    return {"repeat": repeat, "cases": [RunCase(count, step, repeat, directory) for count in frequency_counts]}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="CSV 与二进制方向图存储读取切面的基准测试")
+    parser.add_argument("--frequencies", type=int, nargs="+", default=[1, 5])
+    parser.add_argument("--step", type=float, default=1.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output-dir", default=None)
+    args = parser.parse_args()
+    result = Run(args.frequencies, args.step, args.repeat)
+    for case in result["cases"]:
+        print("%2d frequencies  csv: %6.1f MB %8.1f ms  store: %6.1f MB %6.2f ms  speedup: %6.0fx  "
+              "max difference: %.1e" % (case["frequencies"], case["csv_bytes"] / 1e6, case["csv"]["mean"] * 1e3,
+                                        case["store_bytes"] / 1e6, case["store"]["mean"] * 1e3, case["speedup"],
+                                        case["max_difference"]))
+    print(SaveResults("pattern", result, args.output_dir))
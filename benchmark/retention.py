@@ -0,0 +1,114 @@
+"""
+@FileName: benchmark/retention.py
+@Description: 求解数据保留策略基准测试. 在模拟后端上 (结果文件夹中每个保留场数据的变化使求解和保存增加 variation_seconds)
+              对同一组随机候选解分别不清理和用 hfss.retention 清理求解数据, 比较每次求解的耗时随变化个数的增长、
+              项目保存时间及结果文件夹 (.aedtresults) 的磁盘占用.
+              运行: python -m hfss.benchmark.retention --candidates 300 --variation-seconds 0.0005
+@Author: SJY
+@Time: 2026/10/18
+@Coding: UTF-8
+@Vision: V1.0
+"""
+
+# Official Standard Library
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+
+# Import the LL with "from"
+import hfss
+from hfss import backend, basic, analysis, retention
+from hfss.benchmark import Summarize, SaveResults
+
+
+NAMES = ["length", "width"]
+LOWER, UPPER = [20.0, 20.0], [40.0, 40.0]
+
+
+def Prepare(config: backend.SimulationConfig, name: str, frequency: float):
+    backend.UseSimulated(config)
+    shutil.rmtree(os.path.join(config.project_directory, name + ".aedtresults"), ignore_errors=True)
+    basic.CreateProject(os.path.join(config.project_directory, name))
+    basic.InsertHFSSDesign("HFSSDesign1", "DrivenModal")
+    basic.CreateNewVariable(NAMES, [30, 28])
+    analysis.InsertSetup("Setup1", frequency, 0.02, "Fast", 2.0, 3.0, 101)
+    analysis.InsertRadFieldSphereSetup(preset="Boresight")
+
+
+def Evaluate(candidates, frequency: float, policy: retention.RetentionPolicy = None) -> dict:
+    """
+    依次求解候选解, 记录每次求解 (含清理) 的耗时, 最后保存项目
+    """
+    seconds = []
+    for values in candidates:
+        start = time.perf_counter()
+        if policy is None:
+            basic.ChangeVariable(NAMES, values)
+            analysis.Analyze("Setup1")
+            analysis.GetAntennaPerformance(frequency)
+        else:
+            retention.EvaluateCandidate(NAMES, values, policy, frequency=frequency)
+        seconds.append(time.perf_counter() - start)
+    start = time.perf_counter()
+    hfss.oContext.oProject.Save()
+    save_seconds = time.perf_counter() - start
+    tenth = max(len(seconds) // 10, 1)
+    return {"first": Summarize(seconds[:tenth]), "last": Summarize(seconds[-tenth:]), "save_seconds": save_seconds,
+            "usage_bytes": retention.GetResultsUsage()}
+
+
+def Run(candidate_count: int = 300, seed: int = 0, frequency: float = 2.5, best_n: int = 10, recent_n: int = 5,
+        config: backend.SimulationConfig = None) -> dict:
+    """
+    运行基准测试
+    :param candidate_count: 候选解个数
+    :param seed: 随机数种子
+    :param frequency: 单位 GHz
+    :param best_n: 保留得分最好的变化个数
+    :param recent_n: 保留最近记录的变化个数
+    :param config: 模拟后端配置
+    :return: 结果字典
+    """
+    if config is None:
+        config = backend.SimulationConfig(variation_seconds=0.0005, result_bytes=1 << 20,
+                                          project_directory=os.path.join(tempfile.gettempdir(), "hfss_benchmark"))
+    rng = random.Random(seed)
+    candidates = [[round(rng.uniform(low, high), 3) for low, high in zip(LOWER, UPPER)]
+                  for _ in range(candidate_count)]
+    try:
+        Prepare(config, "RetentionBaseline", frequency)
+        baseline = Evaluate(candidates, frequency)
+        Prepare(config, "RetentionPruned", frequency)
+        policy = retention.RetentionPolicy(best_n, recent_n)
+        pruned = Evaluate(candidates, frequency, policy)
+    finally:
+        backend.UseCom()
+    stats = policy.Stats()
+    return {"candidates": candidate_count, "variation_seconds": config.variation_seconds,
+            "result_bytes": config.result_bytes, "baseline": baseline, "pruned": pruned,
+            "retention": {key: value for key, value in stats.items() if key != "usage"},
+            "max_usage_bytes": max([usage for _, usage in stats["usage"]] or [0])}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="清理求解数据对求解耗时、项目保存时间及磁盘占用的影响的基准测试")
+    parser.add_argument("--candidates", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--best-n", type=int, default=10)
+    parser.add_argument("--recent-n", type=int, default=5)
+    parser.add_argument("--variation-seconds", type=float, default=0.0005)
+    parser.add_argument("--result-bytes", type=int, default=1 << 20)
+    parser.add_argument("--output-dir", default=None)
+    args = parser.parse_args()
+    simulation = backend.SimulationConfig(variation_seconds=args.variation_seconds, result_bytes=args.result_bytes,
+                                          project_directory=os.path.join(tempfile.gettempdir(), "hfss_benchmark"))
+    result = Run(args.candidates, args.seed, best_n=args.best_n, recent_n=args.recent_n, config=simulation)
+    for name in ("baseline", "pruned"):
+        item = result[name]
+        print("%-8s solve first %6.1f ms  last %6.1f ms  save %6.1f ms  results %8.1f MB" % (
+            name, item["first"]["mean"] * 1e3, item["last"]["mean"] * 1e3, item["save_seconds"] * 1e3,
+            item["usage_bytes"] / 2.0 ** 20))
+    print(SaveResults("retention", result, args.output_dir))
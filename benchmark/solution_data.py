@@ -0,0 +1,83 @@
+"""
+@FileName: benchmark/solution_data.py
+@Description: 后处理路径基准测试, 比较 GetAntennaPerformance (报告 -> CSV -> pandas) 与
+              GetAntennaPerformanceDirect (GetSolutionDataPerVariation -> NumPy) 在不同扫频点数下的耗时, 并检查结果一致.
+              运行: python -m hfss.benchmark.solution_data --sweep-points 1001 10001
+@Author: SJY
+@Time: 2026/10/18
+@Coding: UTF-8
+@Vision: V1.0
+"""
+
+# Official Standard Library
+import argparse
+import os
+import tempfile
+
+# Import the LL with "from"
+from hfss import backend, basic, analysis
+from hfss.benchmark import Timer, Summarize, SaveResults
+
+
+def RunCase(sweep_points: int, repeat: int, config: backend.SimulationConfig) -> dict:
+    backend.UseSimulated(config)
+    basic.CreateProject(os.path.join(config.project_directory, "SolutionData_%d" % sweep_points))
+    basic.InsertHFSSDesign("HFSSDesign1", "DrivenModal")
+    basic.CreateNewVariable(["length", "width"], [30, 28])
+    analysis.InsertSetup("Setup1", 2.5, 0.02, "Fast", 2.0, 3.0, sweep_points)
+    analysis.InsertRadFieldSphereSetup()
+    analysis.Analyze("Setup1")
+    # 预热: 首次调用包含 pandas 导入和报告创建
+    csv_result = analysis.GetAntennaPerformance(2.5)
+    direct_result = analysis.GetAntennaPerformanceDirect(2.5)
+    samples = {"csv": [], "direct": []}
+    for _ in range(repeat):
+        for key, function in (("csv", analysis.GetAntennaPerformance),
+                              ("direct", analysis.GetAntennaPerformanceDirect)):
+            # 使缓存的结果失效, 测量完整的后处理路径
+            analysis.InvalidateSolutionState()
+            timer = Timer()
+            with timer:
+                function(2.5)
+            samples[key].append(timer.elapsed)
+    difference = max(abs(float(a) - float(b)) for a, b in zip(csv_result, direct_result))
+    csv_time, direct_time = Summarize(samples["csv"]), Summarize(samples["direct"])
+    return {"sweep_points": sweep_points, "csv": csv_time, "direct": direct_time,
+            "speedup": csv_time["mean"] / direct_time["mean"] if direct_time["mean"] > 0 else 0.0,
+            "max_difference": difference}
+
+
+def Run(sweep_points=(1001, 10001), repeat: int = 5, config: backend.SimulationConfig = None) -> dict:
+    """
+    运行基准测试
+    :param sweep_points: 扫频点数列表
+    :param repeat: 每种路径的重复次数
+    :param config: 模拟后端配置
+    :return: 结果字典
+    """
+    if config is None:
+        config = backend.SimulationConfig(project_directory=os.path.join(tempfile.gettempdir(), "hfss_benchmark"))
+    results = {"repeat": repeat, "export_row_seconds": config.export_row_seconds, "cases": []}
+    try:
+        for points in sweep_points:
+            results["cases"].append(RunCase(points, repeat, config))
+    finally:
+        backend.UseCom()
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="报告/CSV 与直接读取求解数据的后处理基准测试")
+    parser.add_argument("--sweep-points", type=int, nargs="+", default=[1001, 10001])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--export-row-seconds", type=float, default=0.0)
+    parser.add_argument("--output-dir", default=None)
+    args = parser.parse_args()
+    simulation = backend.SimulationConfig(export_row_seconds=args.export_row_seconds,
+                                          project_directory=os.path.join(tempfile.gettempdir(), "hfss_benchmark"))
+    result = Run(args.sweep_points, args.repeat, simulation)
+    for case in result["cases"]:
+        print("%6d points  csv: %8.2f ms  direct: %8.2f ms  speedup: %5.1fx  max difference: %.1e" % (
+            case["sweep_points"], case["csv"]["mean"] * 1e3, case["direct"]["mean"] * 1e3, case["speedup"],
+            case["max_difference"]))
+    print(SaveResults("solution_data", result, args.output_dir))
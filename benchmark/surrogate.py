@@ -0,0 +1,103 @@
+"""
+@FileName: benchmark/surrogate.py
+@Description: 代理模型预筛选基准测试. 在模拟后端上对同一组随机候选解分别全部求解和用 hfss.surrogate 预筛选后求解,
+              比较求解次数、耗时, 并以全部求解的结果检查预筛选漏掉的满足条件的候选解个数.
+              运行: python -m hfss.benchmark.surrogate --candidates 200 --analyze-seconds 0.05
+@Author: SJY
+@Time: 2026/10/18
+@Coding: UTF-8
+@Vision: V1.0
+"""
+
+# Official Standard Library
+import argparse
+import os
+import random
+import tempfile
+
+# Import the LL with "from"
+from hfss import backend, basic, analysis, surrogate
+from hfss.benchmark import Timer, SaveResults
+
+
+NAMES = ["length", "width"]
+LOWER, UPPER = [20.0, 20.0], [40.0, 40.0]
+
+
+def Prepare(config: backend.SimulationConfig, name: str, frequency: float):
+    backend.UseSimulated(config)
+    basic.CreateProject(os.path.join(config.project_directory, name))
+    basic.InsertHFSSDesign("HFSSDesign1", "DrivenModal")
+    basic.CreateNewVariable(NAMES, [30, 28])
+    analysis.InsertSetup("Setup1", frequency, 0.02, "Fast", 2.0, 3.0, 101)
+    analysis.InsertRadFieldSphereSetup(preset="Boresight")
+
+
+def Satisfied(performance, criteria) -> bool:
+    for metric, (low, high) in criteria.items():
+        value = performance[surrogate.METRICS.index(metric)]
+        if (low is not None and value < low) or (high is not None and value > high):
+            return False
+    return True
+
+
+def Run(candidate_count: int = 200, seed: int = 0, frequency: float = 2.5, min_probability: float = 0.01,
+        config: backend.SimulationConfig = None) -> dict:
+    """
+    运行基准测试
+    :param candidate_count: 候选解个数
+    :param seed: 随机数种子
+    :param frequency: 单位 GHz
+    :param min_probability: 代理模型跳过候选解的概率阈值
+    :param config: 模拟后端配置
+    :return: 结果字典
+    """
+    if config is None:
+        config = backend.SimulationConfig(project_directory=os.path.join(tempfile.gettempdir(), "hfss_benchmark"))
+    rng = random.Random(seed)
+    candidates = [[round(rng.uniform(low, high), 3) for low, high in zip(LOWER, UPPER)]
+                  for _ in range(candidate_count)]
+    try:
+        Prepare(config, "SurrogateBaseline", frequency)
+        baseline = []
+        baseline_timer = Timer()
+        with baseline_timer:
+            for values in candidates:
+                basic.ChangeVariable(NAMES, values)
+                analysis.Analyze("Setup1")
+                baseline.append(tuple(float(v) for v in analysis.GetAntennaPerformance(frequency)))
+        Prepare(config, "SurrogateScreened", frequency)
+        model = surrogate.Surrogate(NAMES, LOWER, UPPER, min_probability=min_probability)
+        screened_timer = Timer()
+        with screened_timer:
+            outputs = surrogate.EvaluateCandidates(NAMES, candidates, model, frequency=frequency)
+    finally:
+        backend.UseCom()
+    good = [Satisfied(performance, model.criteria) for performance in baseline]
+    missed = sum(1 for output, ok in zip(outputs, good) if output["skipped"] and ok)
+    mismatch = max(max(abs(a - b) for a, b in zip(output["performance"], expected))
+                   for output, expected in zip(outputs, baseline) if not output["skipped"])
+    stats = model.Stats()
+    return {"candidates": candidate_count, "analyze_seconds": config.analyze_seconds,
+            "baseline": {"seconds": baseline_timer.elapsed, "solves": candidate_count, "satisfied": sum(good)},
+            "screened": {"seconds": screened_timer.elapsed, "solves": stats["solved"], "saved": stats["saved"],
+                         "missed": missed, "max_difference": mismatch, "length_scale": stats["length_scale"]}}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="代理模型预筛选节省的求解次数与漏选率的基准测试")
+    parser.add_argument("--candidates", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--min-probability", type=float, default=0.01)
+    parser.add_argument("--analyze-seconds", type=float, default=0.0)
+    parser.add_argument("--output-dir", default=None)
+    args = parser.parse_args()
+    simulation = backend.SimulationConfig(analyze_seconds=args.analyze_seconds,
+                                          project_directory=os.path.join(tempfile.gettempdir(), "hfss_benchmark"))
+    result = Run(args.candidates, args.seed, min_probability=args.min_probability, config=simulation)
+    baseline, screened = result["baseline"], result["screened"]
+    print("all solved: %4d solves %8.2f s  %d satisfy the criteria" % (
+        baseline["solves"], baseline["seconds"], baseline["satisfied"]))
+    print("screened:   %4d solves %8.2f s  saved: %d  missed: %d" % (
+        screened["solves"], screened["seconds"], screened["saved"], screened["missed"]))
+    print(SaveResults("surrogate", result, args.output_dir))
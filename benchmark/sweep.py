@@ -0,0 +1,93 @@
+"""
+@FileName: benchmark/sweep.py
+@Description: 求解设置预设基准测试. 在模拟后端上比较原有设置 (离散扫频, 每个频点保存场数据) 与 InsertSetupPreset 各预设的
+              求解耗时、实际求解的频点数、保存全部场数据的频点数 (与磁盘占用成正比), 并检查 GetAntennaPerformance 的结果一致.
+              模拟后端中插值扫频的求解频点数由误差容限确定, 快速扫频折合固定的频点数, 见 backend.SimulatedAnalysisSetup.
+              运行: python -m hfss.benchmark.sweep --sweep-points 101 1001 --per-frequency-seconds 0.005
+@Author: SJY
+@Time: 2026/10/18
+@Coding: UTF-8
+@Vision: V1.0
+"""
+
+# Official Standard Library
+import argparse
+import os
+import tempfile
+
+# Import the LL with "from"
+from hfss import ResolveContext
+from hfss import backend, basic, analysis
+from hfss.benchmark import Timer, SaveResults
+
+
+PRESETS = ("Screening", "Interpolating", "HighAccuracy")
+
+
+def RunCase(preset: str, sweep_points: int, frequency: float, config: backend.SimulationConfig) -> dict:
+    """
+    :param preset: SETUP_PRESETS 中的预设, 为 None 时使用 InsertSetup 的离散扫频
+    """
+    backend.UseSimulated(config)
+    basic.CreateProject(os.path.join(config.project_directory, "Sweep_%s_%d" % (preset, sweep_points)))
+    basic.InsertHFSSDesign("HFSSDesign1", "DrivenModal")
+    basic.CreateNewVariable(["length", "width"], [30, 28])
+    if preset is None:
+        analysis.InsertSetup("Setup1", frequency, 0.02, "Discrete", 2.0, 3.0, sweep_points)
+    else:
+        analysis.InsertSetupPreset("Setup1", preset, frequency, 2.0, 3.0, sweep_points)
+    analysis.InsertRadFieldSphereSetup(preset="Boresight")
+    timer = Timer()
+    with timer:
+        analysis.Analyze("Setup1")
+    solution = ResolveContext(None).oDesign.handle.GetSolution("Setup1 : Sweep")
+    performance = analysis.GetAntennaPerformance(frequency)
+    return {"preset": preset or "Discrete (InsertSetup)", "sweep_points": sweep_points, "seconds": timer.elapsed,
+            "solved_points": solution.solved_points, "saved_field_points": solution.saved_field_points,
+            "performance": [float(v) for v in performance]}
+
+
+def Run(sweep_points=(101, 1001), frequency: float = 2.5, config: backend.SimulationConfig = None) -> dict:
+    """
+    运行基准测试
+    :param sweep_points: 扫频点数列表
+    :param frequency: 单位 GHz
+    :param config: 模拟后端配置
+    :return: 结果字典
+    """
+    if config is None:
+        config = backend.SimulationConfig(per_frequency_seconds=0.005, field_save_seconds=0.001,
+                                          project_directory=os.path.join(tempfile.gettempdir(), "hfss_benchmark"))
+    results = {"per_frequency_seconds": config.per_frequency_seconds,
+               "field_save_seconds": config.field_save_seconds, "cases": []}
+    try:
+        for points in sweep_points:
+            baseline = RunCase(None, points, frequency, config)
+            results["cases"].append(baseline)
+            for preset in PRESETS:
+                case = RunCase(preset, points, frequency, config)
+                case["speedup"] = baseline["seconds"] / case["seconds"] if case["seconds"] > 0 else 0.0
+                case["max_difference"] = max(abs(a - b) for a, b in zip(case["performance"], baseline["performance"]))
+                results["cases"].append(case)
+    finally:
+        backend.UseCom()
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="求解设置预设的求解耗时与场数据保存量的基准测试")
+    parser.add_argument("--sweep-points", type=int, nargs="+", default=[101, 1001])
+    parser.add_argument("--per-frequency-seconds", type=float, default=0.005)
+    parser.add_argument("--field-save-seconds", type=float, default=0.001)
+    parser.add_argument("--output-dir", default=None)
+    args = parser.parse_args()
+    simulation = backend.SimulationConfig(per_frequency_seconds=args.per_frequency_seconds,
+                                          field_save_seconds=args.field_save_seconds,
+                                          project_directory=os.path.join(tempfile.gettempdir(), "hfss_benchmark"))
+    result = Run(args.sweep_points, config=simulation)
+    for case in result["cases"]:
+        print("%-22s %5d points  solve: %8.1f ms  solved: %5d  fields saved: %5d  speedup: %5.1fx  "
+              "max difference: %.1e" % (case["preset"], case["sweep_points"], case["seconds"] * 1e3,
+                                        case["solved_points"], case["saved_field_points"], case.get("speedup", 1.0),
+                                        case.get("max_difference", 0.0)))
+    print(SaveResults("sweep", result, args.output_dir))
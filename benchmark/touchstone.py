@@ -0,0 +1,114 @@
+"""
+@FileName: benchmark/touchstone.py
+@Description: Touchstone 读取基准测试, 由模拟后端的 ExportNetworkData 导出 15 位有效数字的 .sNp 文件,
+              比较基于 pandas 的通用解析 (read_csv 逐行读取后拼接为每频点一条记录) 与 hfss.touchstone 的耗时, 并检查结果一致.
+              运行: python -m hfss.benchmark.touchstone --ports 4 --sweep-points 10001 100001
+@Author: SJY
+@Time: 2026/10/18
+@Coding: UTF-8
+@Vision: V1.0
+"""
+
+# Official Standard Library
+import argparse
+import os
+import tempfile
+
+# Third-party Library
+import numpy as np
+import pandas as pd
+
+# Import the LL with "from"
+from hfss import ResolveContext
+from hfss import backend, basic, analysis, touchstone
+from hfss.benchmark import Timer, Summarize, SaveResults
+
+
+def PandasTouchstone(file_path: str, ports: int):
+    """
+    基于 pandas 的通用解析: 按空白分隔读取全部数据行, 去除缺失值后按每频点 1 + 2N^2 个数重排, 格式为 MA
+    :return: (频率数组 单位 GHz, 复数数组 (频点数, N, N))
+    """
+    width = 1 + 2 * ports * ports
+    # 跳过数据之前的注释行和选项行
+    skip_rows = 0
+    with open(file_path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.startswith(("!", "#")):
+                break
+            skip_rows += 1
+    df = pd.read_csv(file_path, sep=r"\s+", comment="!", header=None, skiprows=skip_rows, names=range(9),
+                     dtype=float)
+    values = df.values.ravel()
+    values = values[~np.isnan(values)].reshape(-1, width)
+    data = (values[:, 1::2] * np.exp(1j * np.deg2rad(values[:, 2::2]))).reshape(-1, ports, ports)
+    if ports == 2:
+        data = data.transpose(0, 2, 1)
+    return values[:, 0], data
+
+
+def RunCase(ports: int, sweep_points: int, repeat: int, config: backend.SimulationConfig) -> dict:
+    backend.UseSimulated(config)
+    basic.CreateProject(os.path.join(config.project_directory, "Touchstone_%d" % sweep_points))
+    basic.InsertHFSSDesign("HFSSDesign1", "DrivenModal")
+    basic.CreateNewVariable(["length", "width"], [30, 28])
+    analysis.InsertSetup("Setup1", 2.5, 0.02, "Fast", 2.0, 3.0, sweep_points)
+    analysis.Analyze("Setup1")
+    file_path = os.path.join(config.project_directory, "NetworkData_%d.s%dp" % (sweep_points, ports))
+    ResolveContext(None).GetModule("Solutions").ExportNetworkData("", ["Setup1:Sweep"], 3, file_path, ["all"], False,
+                                                                   50, "S", -1, 0, 15, True, True)
+    samples = {"pandas": [], "touchstone": []}
+    results = {}
+    for _ in range(repeat):
+        timer = Timer()
+        with timer:
+            results["pandas"] = PandasTouchstone(file_path, ports)
+        samples["pandas"].append(timer.elapsed)
+        timer = Timer()
+        with timer:
+            network = touchstone.ReadTouchstone(file_path)
+        results["touchstone"] = (network.freqs, network.data)
+        samples["touchstone"].append(timer.elapsed)
+    difference = float(np.abs(results["pandas"][1] - results["touchstone"][1]).max())
+    pandas_time, touchstone_time = Summarize(samples["pandas"]), Summarize(samples["touchstone"])
+    return {"ports": ports, "sweep_points": sweep_points, "file_bytes": os.path.getsize(file_path),
+            "pandas": pandas_time, "touchstone": touchstone_time,
+            "speedup": pandas_time["mean"] / touchstone_time["mean"] if touchstone_time["mean"] > 0 else 0.0,
+            "max_difference": difference}
+
+
+def Run(ports: int = 4, sweep_points=(10001, 100001), repeat: int = 3,
+        config: backend.SimulationConfig = None) -> dict:
+    """
+    运行基准测试
+    :param ports: 端口数
+    :param sweep_points: 扫频点数列表
+    :param repeat: 每种解析方法的重复次数
+    :param config: 模拟后端配置
+    :return: 结果字典
+    """
+    if config is None:
+        config = backend.SimulationConfig(project_directory=os.path.join(tempfile.gettempdir(), "hfss_benchmark"))
+    results = {"repeat": repeat, "cases": []}
+    try:
+        for points in sweep_points:
+            results["cases"].append(RunCase(ports, points, repeat, config))
+    finally:
+        backend.UseCom()
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="pandas 与 hfss.touchstone 读取 Touchstone 文件的基准测试")
+    parser.add_argument("--ports", type=int, default=4)
+    parser.add_argument("--sweep-points", type=int, nargs="+", default=[10001, 100001])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output-dir", default=None)
+    args = parser.parse_args()
+    result = Run(args.ports, args.sweep_points, args.repeat)
+    for case in result["cases"]:
+        print("%d ports %7d points %6.1f MB  pandas: %8.1f ms  touchstone: %7.1f ms  speedup: %5.1fx  "
+              "max difference: %.1e" % (case["ports"], case["sweep_points"], case["file_bytes"] / 1e6,
+                                        case["pandas"]["mean"] * 1e3, case["touchstone"]["mean"] * 1e3,
+                                        case["speedup"], case["max_difference"]))
+    print(SaveResults("touchstone", result, args.output_dir))
@@ -0,0 +1,86 @@
+"""
+@FileName: benchmark/variable_update.py
+@Description: 变量批量更新基准测试, 比较逐个 ChangeProperty 与 basic.ChangeVariable 单次批量更新的模型重新计算次数和耗时
+@Author: SJY
+@Time: 2026/10/18
+@Coding: UTF-8
+@Vision: V1.0
+"""
+
+# Official Standard Library
+import argparse
+import random
+
+# Import the LL with "from"
+from hfss import oDesign, backend, basic
+from hfss.benchmark import Timer, Summarize, SaveResults
+
+
+def ChangeVariablePerProperty(props_name_array, props_value_array):
+    """
+    旧实现: 每个变量一次 ChangeProperty 调用
+    """
+    for i in range(len(props_name_array)):
+        oDesign.ChangeProperty(["NAME:AllTabs",
+                                ["NAME:LocalVariableTab",
+                                 ["NAME:PropServers", "LocalVariables"],
+                                 ["NAME:ChangedProps",
+                                  ["NAME:" + props_name_array[i], "PropType:=", "VariableProp", "UserDef:=", True,
+                                   "Value:=", str(props_value_array[i]) + "mm"]]]])
+
+
+def Run(variable_count: int = 20, candidate_count: int = 50, changed_fraction: float = 0.5,
+        regen_seconds: float = 0.01, seed: int = 0) -> dict:
+    """
+    运行基准测试
+    :param variable_count: 每个候选解的变量个数
+    :param candidate_count: 候选解个数
+    :param changed_fraction: 相邻候选解之间变化的变量比例
+    :param regen_seconds: 模拟后端中每次模型重新计算的耗时 单位 s
+    :param seed: 随机种子
+    :return: 结果字典
+    """
+    rng = random.Random(seed)
+    names = ["var%d" % i for i in range(variable_count)]
+    candidates = []
+    values = [round(rng.uniform(1, 50), 3) for _ in names]
+    for _ in range(candidate_count):
+        values = list(values)
+        for i in rng.sample(range(variable_count), max(1, int(variable_count * changed_fraction))):
+            values[i] = round(rng.uniform(1, 50), 3)
+        candidates.append(values)
+
+    results = {"variable_count": variable_count, "candidate_count": candidate_count,
+               "changed_fraction": changed_fraction, "regen_seconds": regen_seconds}
+    app = backend.UseSimulated(backend.SimulationConfig(regenerate_seconds=regen_seconds))
+    project = app.GetAppDesktop().NewProject()
+    for label, change in (("per_property", ChangeVariablePerProperty), ("batched", basic.ChangeVariable)):
+        design = project.InsertDesign("HFSS", label, "DrivenModal", "")
+        oDesign.handle = design
+        basic.CreateNewVariable(names, candidates[0])
+        design.regenerations = 0
+        samples = []
+        for values in candidates:
+            timer = Timer()
+            with timer:
+                change(names, values)
+            samples.append(timer.elapsed)
+        results[label] = {"regenerations_per_candidate": design.regenerations / candidate_count,
+                          "wall_time_per_candidate": Summarize(samples)}
+    backend.UseCom()
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="ChangeVariable 批量更新基准测试")
+    parser.add_argument("--variables", type=int, default=20)
+    parser.add_argument("--candidates", type=int, default=50)
+    parser.add_argument("--changed-fraction", type=float, default=0.5)
+    parser.add_argument("--regen-seconds", type=float, default=0.01)
+    parser.add_argument("--output-dir", default=None)
+    args = parser.parse_args()
+    result = Run(args.variables, args.candidates, args.changed_fraction, args.regen_seconds)
+    for key in ("per_property", "batched"):
+        print("%-13s regenerations/candidate: %6.2f  mean wall time: %.4f s" % (
+            key, result[key]["regenerations_per_candidate"], result[key]["wall_time_per_candidate"]["mean"]))
+    print(SaveResults("variable_update", result, args.output_dir))
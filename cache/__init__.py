@@ -0,0 +1,326 @@
+"""
+@FileName: cache/__init__.py
+@Description: 该文件提供持久化的评估结果缓存. 结果保存在 SQLite 数据库中, 键为设计变量向量 (统一单位并按有效数字取整)、
+              模型指纹 (求解设置、扫频、几何对象等) 及评估参数的规范化哈希, 优化过程中重复访问相同或取整后相同的
+              几何时直接返回结果, 不再 Analyze 和导出报告. 数据库按最近最少使用淘汰, 可限制条目数和字节数,
+              多个进程 (如 hfss.pool 的工作进程) 可以共享同一个数据库文件.
+              使用方法:
+                  with cache.ResultCache("P://cache/antenna.sqlite", max_entries=100000) as results:
+                      performance = cache.EvaluateCandidate(["length", "width"], [30, 28], results)
+                      results.Stats()["hit_rate"]
+              通过本库修改几何或求解设置后自动重新计算模型指纹; 在本库之外修改模型后调用 results.Invalidate() 或
+              results.ModelChanged()
+@Author: SJY
+@Time: 2026/10/18
+@Coding: UTF-8
+@Vision: V1.0
+"""
+
+# Official Standard Library
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import time
+
+# Import the OSL with "from"
+from typing import Dict
+
+# Import the LL with "from"
+from hfss import ResolveContext
+from hfss import analysis, basic
+
+
+# 变量值规范化时保留的有效数字
+DEFAULT_DIGITS = 9
+# 长度单位换算为 m, 角度单位换算为 deg
+UNIT_SCALE = {
+    "nm": 1e-9, "um": 1e-6, "mm": 1e-3, "cm": 1e-2, "dm": 1e-1, "m": 1.0, "km": 1e3,
+    "mil": 2.54e-5, "in": 0.0254, "ft": 0.3048,
+    "deg": 1.0, "rad": 57.29577951308232,
+}
+_QUANTITY = re.compile(r"^\s*([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)\s*([a-zA-Z]*)\s*$")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    variables TEXT,
+    fingerprint TEXT,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed);
+CREATE INDEX IF NOT EXISTS results_fingerprint ON results (fingerprint);
+CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+"""
+
+
+def CanonicalValue(value, digits: int = DEFAULT_DIGITS) -> str:
+    """
+    规范化变量值: 带单位的数值换算为 m 或 deg 后保留 digits 位有效数字, 如 30, "30mm", "3cm" 均为 "0.03";
+    不带单位的数值视为 mm (与 basic.ChangeVariable 相同); 表达式去除空白后原样保留
+    :param value: 变量值
+    :param digits: 有效数字位数
+    :return: str
+    """
+    if isinstance(value, (int, float)):
+        number, unit = float(value), "mm"
+    else:
+        match = _QUANTITY.match(str(value))
+        if match is None or (match.group(2) and match.group(2) not in UNIT_SCALE):
+            return re.sub(r"\s+", "", str(value))
+        number, unit = float(match.group(1)), match.group(2) or "mm"
+    number *= UNIT_SCALE[unit]
+    return "%.*g" % (digits, number + 0.0)
+
+
+def CacheKey(variables: Dict[str, object], fingerprint: str = "", evaluation=None,
+             digits: int = DEFAULT_DIGITS) -> str:
+    """
+    计算缓存键
+    :param variables: {变量名: 值}, 变量的顺序不影响键
+    :param fingerprint: 模型指纹, 见 ModelFingerprint
+    :param evaluation: 评估参数, 须可转换为 JSON, 如 ("GetAntennaPerformance", 2.5)
+    :param digits: 变量值的有效数字位数
+    :return: 十六进制 SHA-256 字符串
+    """
+    document = {
+        "variables": sorted((name, CanonicalValue(value, digits)) for name, value in variables.items()),
+        "fingerprint": fingerprint,
+        "evaluation": evaluation,
+    }
+    return hashlib.sha256(json.dumps(document, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def ModelFingerprint(setup_name: str = "Setup1", context=None, extra=None) -> str:
+    """
+    计算模型指纹: 设计名称、求解类型、模型单位、几何对象名称、通过 hfss.modeler 应用的模型对象的尺寸表达式、材料
+    及布尔运算、求解设置及其扫频的全部属性、远场球坐标名称.
+    设计变量不计入指纹 (由缓存键单独记录); 指纹无法反映的修改 (如在界面中修改尺寸或材料) 须调用 ResultCache.Invalidate
+    :param setup_name: 求解设置名称
+    :param extra: 额外计入指纹的内容, 须可转换为 JSON, 如建模脚本的版本号
+    :return: 十六进制 SHA-256 字符串
+    """
+    ctx = ResolveContext(context)
+    editor = ctx.GetEditor("3D Modeler")
+    server = "AnalysisSetup:" + setup_name
+    setup = {name: ctx.oDesign.GetPropertyValue("HfssTab", server, name)
+             for name in ctx.oDesign.GetProperties("HfssTab", server)}
+    sweeps = {}
+    for sweep in ctx.GetModule("AnalysisSetup").GetSweeps(setup_name):
+        sweep_server = server + ":" + sweep
+        sweeps[sweep] = {name: ctx.oDesign.GetPropertyValue("HfssTab", sweep_server, name)
+                         for name in ctx.oDesign.GetProperties("HfssTab", sweep_server)}
+    geometry = None
+    model = ctx.oDesign.geometry_model
+    if model is not None:
+        # 尺寸为引用设计变量的表达式, 与变量值无关
+        geometry = [[shape.Geometry(), shape.Material()] for shape in model.shapes.values()]
+        geometry.append([boolean.Key() for boolean in model.booleans])
+    document = {
+        "design": ctx.oDesign.GetName(),
+        "solution_type": ctx.oDesign.GetSolutionType(),
+        "units": editor.GetModelUnits(),
+        "objects": sorted(editor.GetMatchedObjectName("*")),
+        "geometry": geometry,
+        "setup": [setup_name, setup, sweeps],
+        "spheres": sorted(ctx.GetModule("RadField").GetSetupNames("Infinite Sphere") or ()),
+        "extra": extra,
+    }
+    return hashlib.sha256(json.dumps(document, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class ResultCache(object):
+    """
+    SQLite 结果缓存 值以 JSON 保存, 读取时元组变为列表.
+    统计: 本对象的命中/未命中次数, 以及数据库中累计的命中/未命中次数 (多个进程共享)
+    """
+
+    def __init__(self, path: str, max_entries: int = None, max_bytes: int = None, digits: int = DEFAULT_DIGITS,
+                 timeout: float = 30.0):
+        """
+        :param path: 数据库文件路径, 不存在时创建
+        :param max_entries: 最多保存的条目数, 为 None 时不限制
+        :param max_bytes: 保存的结果最多占用的字节数 (JSON 长度之和), 为 None 时不限制
+        :param digits: 变量值的有效数字位数, 取整后相同的几何视为同一几何
+        :param timeout: 等待其他进程释放数据库锁的时间 单位 s
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        if os.path.exists(directory) is False:
+            os.makedirs(directory)
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.digits = digits
+        self.fingerprint = None  # 当前模型指纹, 见 Fingerprint
+        self.fingerprint_key = None  # 计算指纹时的 (设计, 模型版本, 求解设置名, extra)
+        self.hits = 0
+        self.misses = 0
+        self.puts = 0
+        self.evictions = 0
+        self.connection = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(_SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.Close()
+        return False
+
+    def Close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def __Count(self, name: str, increment: int = 1):
+        self.connection.execute("INSERT INTO counters (name, value) VALUES (?, ?) "
+                                "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value", (name, increment))
+
+    def Fingerprint(self, setup_name: str = "Setup1", context=None, extra=None) -> str:
+        """
+        当前模型指纹, 首次调用时计算 (需要若干次 COM 调用); 设计的模型版本 (Design.model_revision, 本库修改几何、
+        求解设置或远场球坐标时递增)、设计、求解设置或 extra 变化时重新计算, 否则使用同一指纹
+        """
+        ctx = ResolveContext(context)
+        key = (id(ctx.oDesign), ctx.oDesign.model_revision, setup_name, repr(extra))
+        if self.fingerprint is None or self.fingerprint_key != key:
+            self.fingerprint = ModelFingerprint(setup_name, ctx, extra)
+            self.fingerprint_key = key
+        return self.fingerprint
+
+    def ModelChanged(self):
+        """
+        模型 (几何、求解设置等) 已在本库之外修改, 下次使用时重新计算指纹; 旧指纹的条目仍然保留, 改回原模型后可以再次命中
+        :return: None
+        """
+        self.fingerprint = None
+
+    def Key(self, variables: Dict[str, object], fingerprint: str = "", evaluation=None) -> str:
+        return CacheKey(variables, fingerprint, evaluation, self.digits)
+
+    def Get(self, key: str, default=None):
+        """
+        查询缓存, 命中时更新条目的访问时间
+        :param key: 缓存键, 见 Key
+        :param default: 未命中时的返回值
+        :return: 缓存的结果
+        """
+        row = self.connection.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            self.__Count("misses")
+            return default
+        self.hits += 1
+        self.__Count("hits")
+        self.connection.execute("UPDATE results SET accessed = ?, hits = hits + 1 WHERE key = ?", (time.time(), key))
+        return json.loads(row[0])
+
+    def Put(self, key: str, value, variables: Dict[str, object] = None, fingerprint: str = ""):
+        """
+        保存结果, 超出条目数或字节数限制时淘汰最近最少使用的条目
+        :param key: 缓存键
+        :param value: 结果, 须可转换为 JSON
+        :param variables: 变量, 仅作为记录
+        :param fingerprint: 模型指纹, 用于 Invalidate(fingerprint)
+        :return: None
+        """
+        text = json.dumps(value)
+        now = time.time()
+        self.connection.execute(
+            "INSERT OR REPLACE INTO results (key, value, variables, fingerprint, size, created, accessed) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (key, text, json.dumps(variables, default=str), fingerprint, len(text), now, now))
+        self.puts += 1
+        self.Evict()
+
+    def Evict(self) -> int:
+        """
+        按最近最少使用淘汰条目直到满足限制
+        :return: 淘汰的条目数
+        """
+        evicted = 0
+        if self.max_entries is not None:
+            cursor = self.connection.execute(
+                "DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,))
+            evicted += max(cursor.rowcount, 0)
+        if self.max_bytes is not None:
+            total = self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+            while total > self.max_bytes:
+                row = self.connection.execute("SELECT key, size FROM results ORDER BY accessed LIMIT 1").fetchone()
+                if row is None:
+                    break
+                self.connection.execute("DELETE FROM results WHERE key = ?", (row[0],))
+                total -= row[1]
+                evicted += 1
+        if evicted:
+            self.evictions += evicted
+            self.__Count("evictions", evicted)
+        return evicted
+
+    def Invalidate(self, fingerprint: str = None) -> int:
+        """
+        删除缓存条目, 模型被修改且指纹无法反映该修改时调用
+        :param fingerprint: 只删除该模型指纹的条目, 为 None 时删除全部条目
+        :return: 删除的条目数
+        """
+        if fingerprint is None:
+            cursor = self.connection.execute("DELETE FROM results")
+        else:
+            cursor = self.connection.execute("DELETE FROM results WHERE fingerprint = ?", (fingerprint,))
+        self.ModelChanged()
+        return max(cursor.rowcount, 0)
+
+    def Stats(self) -> dict:
+        """
+        命中率等统计
+        :return: {"hits", "misses", "hit_rate", "puts", "evictions": 本对象的统计,
+                  "total_hits", "total_misses", "total_hit_rate", "total_evictions": 数据库累计的统计,
+                  "entries", "bytes": 当前条目数及字节数}
+        """
+        counters = dict(self.connection.execute("SELECT name, value FROM counters").fetchall())
+        entries, size = self.connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+        total_hits, total_misses = counters.get("hits", 0), counters.get("misses", 0)
+        lookups, total_lookups = self.hits + self.misses, total_hits + total_misses
+        return {
+            "hits": self.hits, "misses": self.misses, "hit_rate": self.hits / lookups if lookups else 0.0,
+            "puts": self.puts, "evictions": self.evictions,
+            "total_hits": total_hits, "total_misses": total_misses,
+            "total_hit_rate": total_hits / total_lookups if total_lookups else 0.0,
+            "total_evictions": counters.get("evictions", 0),
+            "entries": entries, "bytes": size,
+        }
+
+
+def EvaluateCandidate(props_name_array, props_value_array, results: ResultCache, setup_name: str = "Setup1",
+                      frequency: float = 2.5, context=None):
+    """
+    带缓存的 ChangeVariable -> Analyze -> GetAntennaPerformance. 键包含设计的全部变量 (未修改的变量取当前值),
+    命中时不修改变量、不求解
+    :param props_name_array: 变量名列表
+    :param props_value_array: 变量值列表 单位为 mm
+    :param results: ResultCache
+    :param setup_name: 求解设置名称
+    :param frequency: 单位 GHz
+    :return: (S11, BW, AR, Gain)
+    """
+    ctx = ResolveContext(context)
+    variables = ctx.oDesign.LoadVariables()
+    for name, value in zip(props_name_array, props_value_array):
+        variables[name] = value
+    fingerprint = results.Fingerprint(setup_name, ctx)
+    key = results.Key(variables, fingerprint, ["GetAntennaPerformance", setup_name, frequency])
+    performance = results.Get(key)
+    if performance is not None:
+        return tuple(performance)
+    basic.ChangeVariable(props_name_array, props_value_array, context=ctx)
+    analysis.Analyze(setup_name, ctx)
+    performance = tuple(float(v) for v in analysis.GetAntennaPerformance(frequency, ctx))
+    results.Put(key, performance, variables, fingerprint)
+    return performance
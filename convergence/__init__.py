@@ -0,0 +1,416 @@
+"""
+@FileName: convergence/__init__.py
+@Description: 该文件提供自适应迭代的收敛监视. Analyze 运行期间, 监视线程按 interval 轮询 Design.ExportConvergence,
+              将各次迭代的四面体个数和最大 Delta S 解析为 NumPy 数组, 有新的迭代时调用回调函数, 并由策略判断是否停止求解
+              (Desktop.StopSimulations); 求解结束后由 Desktop.GetMessages 得到收敛状态.
+              策略: PlateauPolicy 在 Delta S 停滞于收敛条件之上时停止, PassCapPolicy 限制筛选阶段候选解的迭代次数,
+              TimeLimitPolicy 限制求解时间.
+              使用 COM 时监视线程建立自己的 AEDT 连接 (COM 句柄不能跨线程使用), 模拟后端直接共享上下文.
+              使用方法:
+                  result = convergence.Analyze("Setup1", [convergence.PlateauPolicy(0.02)],
+                                               callbacks=[lambda data: print(data.passes[-1], data.delta_s[-1])])
+                  result["stopped"], result["reason"], result["data"].delta_s
+@Author: SJY
+@Time: 2026/10/18
+@Coding: UTF-8
+@Vision: V1.0
+"""
+
+# Official Standard Library
+import math
+import os
+import threading
+import time
+
+# Third-party Library
+import numpy as np
+
+# Import the OSL with "from"
+from typing import Callable, List
+
+# Import the LL with "from"
+import hfss
+from hfss import ResolveContext
+from hfss import analysis, backend, basic
+
+
+# 收敛数据文件 (*.conv) 中按列名识别的各列
+PASS_COLUMN = "Pass"
+TETRAHEDRA_COLUMN = "Tetrahedra"
+DELTA_S_COLUMN = "Delta S"
+# GetMessages 中表示求解状态的文本, 按顺序匹配
+STATUS_MESSAGES = (
+    ("stopped", ("stopped by user", "aborted")),
+    ("not converged", ("did not converge",)),
+    ("converged", ("passes converged",)),
+)
+
+
+class ConvergenceData(object):
+    """
+    自适应迭代的收敛数据, 各数组长度为已完成的迭代次数, 第一次迭代的 delta_s 为 nan
+    """
+
+    def __init__(self, passes=(), tetrahedra=(), delta_s=(), setup_name: str = ""):
+        self.setup_name = setup_name
+        self.passes = np.asarray(passes, dtype=int)
+        self.tetrahedra = np.asarray(tetrahedra, dtype=int)
+        self.delta_s = np.asarray(delta_s, dtype=float)
+
+    def __len__(self):
+        return len(self.passes)
+
+    @property
+    def last_delta(self) -> float:
+        """
+        最后一次迭代的 Delta S, 没有时为 nan
+        """
+        return float(self.delta_s[-1]) if len(self.delta_s) else float("nan")
+
+    def Improvement(self, window: int) -> float:
+        """
+        最近 window 次迭代中 Delta S 的下降比例 delta_s[-1] / delta_s[-1 - window], 数据不足时为 nan
+        """
+        if len(self.delta_s) <= window:
+            return float("nan")
+        previous = self.delta_s[-1 - window]
+        if math.isnan(previous) or previous <= 0:
+            return float("nan")
+        return float(self.delta_s[-1] / previous)
+
+
+def ParseConvergence(text: str, setup_name: str = "") -> ConvergenceData:
+    """
+    解析 ExportConvergence 导出的收敛数据, 表头为以 "|" 分隔的列名 (含 "Pass" 的一行), 其后每行一次迭代,
+    "N/A" 等无法解析的值为 nan
+    :param text: 文件内容
+    :param setup_name: 求解设置名称
+    :return: ConvergenceData
+    """
+    columns = None
+    rows = []
+    for line in text.splitlines():
+        cells = [cell.strip() for cell in line.strip().strip("|").split("|")]
+        if columns is None:
+            if len(cells) > 1 and any(PASS_COLUMN in cell for cell in cells):
+                columns = cells
+            continue
+        if not cells or not cells[0].isdigit():
+            continue
+        rows.append(cells)
+    if columns is None:
+        return ConvergenceData(setup_name=setup_name)
+
+    def Column(keyword: str, dtype) -> list:
+        for i, name in enumerate(columns):
+            if keyword in name:
+                values = []
+                for row in rows:
+                    try:
+                        values.append(dtype(row[i]))
+                    except (IndexError, ValueError):
+                        values.append(float("nan") if dtype is float else 0)
+                return values
+        return [float("nan") if dtype is float else 0] * len(rows)
+
+    return ConvergenceData(Column(PASS_COLUMN, int), Column(TETRAHEDRA_COLUMN, int), Column(DELTA_S_COLUMN, float),
+                           setup_name)
+
+
+def ReadConvergence(file_path: str, setup_name: str = "") -> ConvergenceData:
+    with open(file_path, "r", encoding="utf-8", errors="replace") as f:
+        return ParseConvergence(f.read(), setup_name)
+
+
+def ExportConvergence(setup_name: str = "Setup1", file_path: str = None, context=None) -> ConvergenceData:
+    """
+    导出并解析当前变化的收敛数据
+    :param setup_name: 求解设置名称
+    :param file_path: 收敛数据文件路径, 默认为仿真数据路径下的 Convergence_<setup_name>.conv
+    :return: ConvergenceData
+    """
+    ctx = ResolveContext(context)
+    if file_path is None:
+        file_path = os.path.join(analysis.GetAnalysisDataPath(ctx), "Convergence_%s.conv" % setup_name)
+    ctx.oDesign.ExportConvergence(setup_name, "", file_path, True)
+    return ReadConvergence(file_path, setup_name)
+
+
+def MessageStatus(messages) -> str:
+    """
+    由 GetMessages 的消息得到求解状态
+    :return: "stopped", "not converged", "converged" 或 None
+    """
+    for status, keywords in STATUS_MESSAGES:
+        for message in messages:
+            if any(keyword in message.lower() for keyword in keywords):
+                return status
+    return None
+
+
+class Policy(object):
+    """
+    停止策略基类. Prepare/Restore 在求解前后于调用 Analyze 的线程中执行, Check 在监视线程中对每次新的收敛数据执行
+    """
+
+    def Prepare(self, context, setup_name: str):
+        pass
+
+    def Restore(self, context, setup_name: str):
+        pass
+
+    def Check(self, data: ConvergenceData, elapsed: float) -> str:
+        """
+        :param data: 已完成迭代的收敛数据
+        :param elapsed: 求解已运行的时间 单位 s
+        :return: 停止的原因, 不停止时返回 None
+        """
+        return None
+
+
+class PlateauPolicy(Policy):
+    """
+    Delta S 停滞时停止: 迭代次数不少于 min_passes, 最后的 Delta S 仍大于 target,
+    且最近 window 次迭代的下降比例不小于 min_ratio (即下降不足 1 - min_ratio)
+    """
+
+    def __init__(self, target: float = 0.02, window: int = 3, min_ratio: float = 0.8, min_passes: int = 5):
+        """
+        :param target: 收敛条件 最大 Delta S, 与求解设置的 MaxDeltaS 相同
+        :param window: 比较的迭代间隔
+        :param min_ratio: delta_s[-1] / delta_s[-1 - window] 不小于该值视为停滞
+        :param min_passes: 至少完成的迭代次数
+        """
+        self.target = target
+        self.window = window
+        self.min_ratio = min_ratio
+        self.min_passes = min_passes
+
+    def Check(self, data: ConvergenceData, elapsed: float) -> str:
+        if len(data) < self.min_passes or not data.last_delta > self.target:
+            return None
+        ratio = data.Improvement(self.window)
+        if ratio >= self.min_ratio:
+            return "Delta S 停滞于 %.4g (最近 %d 次迭代下降 %.0f%%)" % (data.last_delta, self.window,
+                                                                       (1.0 - ratio) * 100)
+        return None
+
+
+class PassCapPolicy(Policy):
+    """
+    限制迭代次数, 用于筛选阶段的候选解: 求解前读取求解设置的 MaximumPasses 并改为 max_passes, 求解后恢复为原来的值,
+    求解以较粗的网格正常结束并得到结果; edit_setup 为 False 时不修改设置, 达到 max_passes 后停止求解 (没有结果)
+    """
+
+    def __init__(self, max_passes: int = 6, edit_setup: bool = True, restore_passes: int = None):
+        """
+        :param max_passes: 最大迭代次数
+        :param edit_setup: 是否修改求解设置
+        :param restore_passes: 求解后恢复的 MaximumPasses, 默认为求解前读取的值
+        """
+        self.max_passes = max_passes
+        self.edit_setup = edit_setup
+        self.restore_passes = restore_passes
+        self.saved = {}  # {求解设置名: 求解前的 MaximumPasses}
+
+    @staticmethod
+    def __Read(context, setup_name: str) -> int:
+        """
+        :return: 求解设置当前的 MaximumPasses, 读取失败时为 None
+        """
+        errors = (backend.SimulationError, ValueError, TypeError)
+        try:
+            from pywintypes import com_error
+            errors += (com_error,)
+        except ImportError:
+            pass
+        try:
+            return int(float(ResolveContext(context).oDesign.GetPropertyValue(
+                "HfssTab", "AnalysisSetup:" + setup_name, "Max. Number of Passes")))
+        except errors as error:
+            print("无法读取求解设置 %s 的最大迭代次数, 不修改该求解设置: %s" % (setup_name, error))
+            return None
+
+    def __Edit(self, context, setup_name: str, passes: int):
+        ctx = ResolveContext(context)
+        ctx.GetModule("AnalysisSetup").EditSetup(setup_name, ["NAME:" + setup_name, "MaximumPasses:=", passes])
+
+    def Prepare(self, context, setup_name: str):
+        if self.edit_setup:
+            if self.restore_passes is None:
+                passes = self.__Read(context, setup_name)
+                if passes is None:
+                    return
+                self.saved[setup_name] = passes
+            self.__Edit(context, setup_name, self.max_passes)
+
+    def Restore(self, context, setup_name: str):
+        if self.edit_setup:
+            passes = self.restore_passes
+            if passes is None:
+                passes = self.saved.pop(setup_name, None)
+                if passes is None:
+                    return  # Prepare 未修改该求解设置
+            self.__Edit(context, setup_name, passes)
+
+    def Check(self, data: ConvergenceData, elapsed: float) -> str:
+        if not self.edit_setup and len(data) >= self.max_passes:
+            return "达到迭代次数上限 %d" % self.max_passes
+        return None
+
+
+class TimeLimitPolicy(Policy):
+    """
+    求解时间超过 seconds 时停止
+    """
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+
+    def Check(self, data: ConvergenceData, elapsed: float) -> str:
+        if elapsed > self.seconds:
+            return "求解时间超过 %.0f s" % self.seconds
+        return None
+
+
+class ConvergenceMonitor(object):
+    """
+    求解期间的收敛监视
+    """
+
+    def __init__(self, setup_name: str = "Setup1", policies: List[Policy] = (),
+                 callbacks: List[Callable[[ConvergenceData], None]] = (), interval: float = 1.0, context=None,
+                 file_path: str = None, connect: Callable[[], object] = None):
+        """
+        :param setup_name: 求解设置名称
+        :param policies: 停止策略列表, 任一策略给出原因即停止求解
+        :param callbacks: 有新的迭代时调用, 参数为 ConvergenceData, 在监视线程中执行
+        :param interval: 轮询间隔 单位 s
+        :param file_path: 收敛数据文件路径, 默认为仿真数据路径下的 Convergence_<setup_name>.conv
+        :param connect: 在监视线程中调用, 返回监视使用的 DesignContext; 为 None 时模拟后端共享 context,
+                        COM 后端在监视线程中建立新的 AEDT 连接
+        """
+        self.ctx = ResolveContext(context)
+        self.setup_name = setup_name
+        self.policies = list(policies)
+        self.callbacks = list(callbacks)
+        self.interval = interval
+        self.file_path = file_path
+        self.connect = connect
+        self.data = ConvergenceData(setup_name=setup_name)
+        self.reason = None
+        self.errors = []
+        self.polls = 0
+        self.start = None
+        self.done = threading.Event()
+
+    def Poll(self, context) -> bool:
+        """
+        导出并解析收敛数据, 有新的迭代时调用回调函数并检查停止策略
+        :param context: 监视使用的 DesignContext
+        :return: 是否有新的迭代
+        """
+        self.polls += 1
+        data = ExportConvergence(self.setup_name, self.file_path, context)
+        if len(data) <= len(self.data):
+            return False
+        self.data = data
+        for callback in self.callbacks:
+            callback(data)
+        if self.reason is None and not self.done.is_set():
+            elapsed = time.perf_counter() - self.start
+            for policy in self.policies:
+                reason = policy.Check(data, elapsed)
+                if reason is not None:
+                    self.reason = reason
+                    context.oDesktop.StopSimulations()
+                    break
+        return True
+
+    def __Run(self, project_name: str, design_name: str, simulated: bool):
+        pythoncom = None
+        if not simulated:
+            import pythoncom
+            pythoncom.CoInitialize()
+        try:
+            if self.connect is not None:
+                context = self.connect()
+            elif simulated:
+                context = self.ctx
+            else:
+                session = hfss.Session(self.ctx.session.oAnsoftApp.app_name)
+                context = session.CreateContext(project_name, design_name)
+            while not self.done.wait(self.interval):
+                try:
+                    self.Poll(context)
+                except Exception as error:
+                    # 求解尚未开始写出收敛数据等情况, 下次轮询重试
+                    self.errors.append(error)
+        finally:
+            if pythoncom is not None:
+                pythoncom.CoUninitialize()
+
+    def Analyze(self) -> dict:
+        """
+        求解并监视收敛, 在调用线程中运行 Analyze
+        :return: {"setup", "result": Analyze 的返回值, "status": "converged"/"not converged"/"stopped"/None,
+                  "stopped": 是否被策略停止, "reason": 停止原因, "data": ConvergenceData, "passes": 迭代次数,
+                  "elapsed": 求解耗时 s, "messages": 求解期间的新消息}
+        """
+        ctx = self.ctx
+        project_name, design_name = ctx.oProject.GetName(), ctx.oDesign.GetName()
+        simulated = isinstance(ctx.oDesktop.handle, backend.SimulatedObject)
+        if self.file_path is None:
+            self.file_path = os.path.join(analysis.GetAnalysisDataPath(ctx), "Convergence_%s.conv" % self.setup_name)
+        known = len(ctx.oDesktop.GetMessages(project_name, design_name, 0))
+        self.data, self.reason, self.errors = ConvergenceData(setup_name=self.setup_name), None, []
+        self.done.clear()
+        prepared = []
+        try:
+            for policy in self.policies:
+                policy.Prepare(ctx, self.setup_name)
+                prepared.append(policy)
+            thread = threading.Thread(target=self.__Run, args=(project_name, design_name, simulated),
+                                      name="hfss-convergence", daemon=True)
+            self.start = time.perf_counter()
+            thread.start()
+            try:
+                result = ctx.oDesign.Analyze(self.setup_name)
+            finally:
+                self.done.set()
+                thread.join()
+            elapsed = time.perf_counter() - self.start
+            # 求解结束后在调用线程中读取完整的收敛数据
+            self.Poll(ctx)
+        finally:
+            for policy in prepared:
+                policy.Restore(ctx, self.setup_name)
+        messages = list(ctx.oDesktop.GetMessages(project_name, design_name, 0))[known:]
+        status = MessageStatus(messages)
+        return {"setup": self.setup_name, "result": result, "status": status,
+                "stopped": self.reason is not None and status == "stopped", "reason": self.reason,
+                "data": self.data, "passes": len(self.data), "elapsed": elapsed, "messages": messages}
+
+
+def Analyze(setup_name: str = "Setup1", policies: List[Policy] = (),
+            callbacks: List[Callable[[ConvergenceData], None]] = (), interval: float = 1.0, context=None) -> dict:
+    """
+    求解并监视收敛, 参数及返回值见 ConvergenceMonitor
+    """
+    return ConvergenceMonitor(setup_name, policies, callbacks, interval, context).Analyze()
+
+
+def EvaluateCandidate(props_name_array, props_value_array, setup_name: str = "Setup1", frequency: float = 2.5,
+                      policies: List[Policy] = (), callbacks: List[Callable[[ConvergenceData], None]] = (),
+                      interval: float = 1.0, context=None) -> dict:
+    """
+    ChangeVariable -> 监视收敛的 Analyze -> GetAntennaPerformance, 求解被停止时不计算性能
+    :return: {"performance": (S11, BW, AR, Gain) 或 None, "convergence": Analyze 的结果}
+    """
+    ctx = ResolveContext(context)
+    basic.ChangeVariable(props_name_array, props_value_array, context=ctx)
+    result = Analyze(setup_name, policies, callbacks, interval, ctx)
+    performance = None
+    if result["status"] != "stopped":
+        performance = tuple(float(v) for v in analysis.GetAntennaPerformance(frequency, ctx))
+    return {"performance": performance, "convergence": result}
@@ -0,0 +1,291 @@
+"""
+@FileName: executor/__init__.py
+@Description: 该文件提供专用 COM 线程及异步接口. 全部 COM 调用通过请求队列交给一个初始化为 STA 的工作线程执行,
+              调用方得到 concurrent.futures.Future, 或在协程中 await; 在 Analyze 运行期间, 主线程和其他协程可以
+              准备下一个候选解、解析上一次的结果或响应状态查询.
+              注意: 使用本模块后, hfss 对象的句柄在 COM 线程中创建, 只能在 COM 线程中使用, 不要在其他线程直接调用 hfss 对象.
+              超时或取消只能取消尚未开始的请求, 已开始的 COM 调用会执行完并一直占用 COM 线程;
+              AnalyzeAsync 超时或取消时另外建立 AEDT 连接调用 Desktop.StopSimulations 停止正在运行的求解.
+              使用方法:
+                  performance = await executor.GetAntennaPerformanceAsync(2.5)
+                  future = executor.Submit(analysis.Analyze, "Setup1")
+@Author: SJY
+@Time: 2026/10/18
+@Coding: UTF-8
+@Vision: V1.0
+"""
+
+# Official Standard Library
+import asyncio
+import queue
+import threading
+
+# Import the OSL with "from"
+from concurrent.futures import Future
+
+# Import the LL with "from"
+import hfss
+from hfss import ResolveContext
+from hfss import analysis, backend, basic
+
+
+class ExecutorShutdown(Exception):
+    """
+    COM 线程已关闭, 不再接受请求
+    """
+    pass
+
+
+class ComExecutor(object):
+    """
+    专用 COM 线程 请求按提交顺序在同一线程中依次执行
+    """
+    # 请求队列中表示关闭的标记
+    _STOP = object()
+
+    def __init__(self, name: str = "hfss-com"):
+        self.requests = queue.Queue()
+        self.shutdown = False
+        self.completed = 0
+        self.thread = threading.Thread(target=self.__Run, name=name, daemon=True)
+        self.thread.start()
+
+    def __Run(self):
+        # win32com 只在 Windows 上可用, 其他平台 (模拟后端) 无需初始化 COM 套间
+        try:
+            import pythoncom
+        except ImportError:
+            pythoncom = None
+        if pythoncom is not None:
+            pythoncom.CoInitialize()  # 单线程套间 STA
+        try:
+            while True:
+                request = self.requests.get()
+                if request is self._STOP:
+                    break
+                future, function, args, kwargs = request
+                # 已取消的请求不执行
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    result = function(*args, **kwargs)
+                except BaseException as error:
+                    future.set_exception(error)
+                else:
+                    future.set_result(result)
+                self.completed += 1
+        finally:
+            if pythoncom is not None:
+                pythoncom.CoUninitialize()
+
+    def IsComThread(self) -> bool:
+        return threading.current_thread() is self.thread
+
+    def Submit(self, function, *args, **kwargs) -> Future:
+        """
+        提交请求, 在 COM 线程中执行 function(*args, **kwargs)
+        在 COM 线程中提交时立即执行, 避免等待自身造成死锁
+        :return: Future, 可调用 cancel() 取消尚未开始的请求, result(timeout) 等待结果
+        """
+        future = Future()
+        if self.IsComThread():
+            future.set_running_or_notify_cancel()
+            try:
+                future.set_result(function(*args, **kwargs))
+            except BaseException as error:
+                future.set_exception(error)
+            return future
+        if self.shutdown:
+            raise ExecutorShutdown("COM 线程已关闭")
+        self.requests.put((future, function, args, kwargs))
+        return future
+
+    def Call(self, function, *args, timeout: float = None, **kwargs):
+        """
+        在 COM 线程中执行并等待结果
+        :param timeout: 等待时间 单位 s, 超时抛出 concurrent.futures.TimeoutError, 此时请求仍会执行完
+        """
+        return self.Submit(function, *args, **kwargs).result(timeout)
+
+    def Pending(self) -> int:
+        """
+        :return: 队列中等待执行的请求个数
+        """
+        return self.requests.qsize()
+
+    def CancelPending(self) -> int:
+        """
+        取消队列中尚未开始的全部请求, 正在执行的 COM 调用无法中断
+        :return: 取消的请求个数
+        """
+        cancelled = 0
+        while True:
+            try:
+                request = self.requests.get_nowait()
+            except queue.Empty:
+                break
+            if request is self._STOP:
+                self.requests.put(request)
+                break
+            if request[0].cancel():
+                cancelled += 1
+        return cancelled
+
+    def Shutdown(self, wait: bool = True, cancel_pending: bool = False):
+        """
+        关闭 COM 线程, 默认执行完队列中的请求后退出
+        :return: None
+        """
+        if self.shutdown:
+            return
+        self.shutdown = True
+        if cancel_pending:
+            self.CancelPending()
+        self.requests.put(self._STOP)
+        if wait:
+            self.thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.Shutdown()
+        return False
+
+
+# 默认 COM 线程, 首次使用时创建
+_default_executor = None
+_default_lock = threading.Lock()
+
+
+def GetExecutor() -> ComExecutor:
+    """
+    得到默认 COM 线程
+    :return: ComExecutor
+    """
+    global _default_executor
+    with _default_lock:
+        if _default_executor is None or _default_executor.shutdown:
+            _default_executor = ComExecutor()
+        return _default_executor
+
+
+def Submit(function, *args, **kwargs) -> Future:
+    """
+    在默认 COM 线程中执行 function(*args, **kwargs)
+    :return: Future
+    """
+    return GetExecutor().Submit(function, *args, **kwargs)
+
+
+def Shutdown(wait: bool = True, cancel_pending: bool = False):
+    global _default_executor
+    with _default_lock:
+        if _default_executor is not None:
+            _default_executor.Shutdown(wait, cancel_pending)
+            _default_executor = None
+
+
+async def RunAsync(function, *args, timeout: float = None, executor: ComExecutor = None, **kwargs):
+    """
+    在协程中等待 COM 线程执行 function(*args, **kwargs)
+    :param timeout: 等待时间 单位 s, 超时抛出 asyncio.TimeoutError; 尚未开始的请求被取消, 已开始的 COM 调用会执行完
+    :param executor: COM 线程, 默认为 GetExecutor()
+    """
+    executor = executor if executor is not None else GetExecutor()
+    future = executor.Submit(function, *args, **kwargs)
+    try:
+        return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+
+
+def _StopTarget(context=None) -> tuple:
+    """
+    在 COM 线程中执行, 得到停止求解所需的连接信息
+    :return: (模拟后端的 Desktop 或 None, COM 程序标识)
+    """
+    ctx = ResolveContext(context)
+    if isinstance(ctx.oDesktop.handle, backend.SimulatedObject):
+        return ctx.oDesktop, None
+    return None, ctx.session.oAnsoftApp.app_name
+
+
+def StopSimulations(desktop=None, app_name: str = "AnsoftHfss.HfssScriptInterface"):
+    """
+    停止正在运行的求解, 在当前自适应迭代完成后生效. 在 COM 线程以外的线程中调用:
+    COM 线程正在执行 Analyze 时不能处理请求, 且 COM 句柄不能跨线程使用, 因此建立新的 AEDT 连接
+    :param desktop: 模拟后端的 Desktop, 为 None 时以 app_name 建立新的连接
+    :param app_name: COM 程序标识
+    :return: None
+    """
+    if desktop is not None:
+        desktop.StopSimulations()
+        return
+    import pythoncom
+    pythoncom.CoInitialize()
+    try:
+        hfss.Session(app_name).oDesktop.StopSimulations()
+    finally:
+        pythoncom.CoUninitialize()
+
+
+async def AnalyzeAsync(setup_name, context=None, timeout: float = None, executor: ComExecutor = None):
+    """
+    异步进行仿真分析, 见 analysis.Analyze.
+    超时或协程被取消时, 若求解已经开始, 在另一个线程中由新的 AEDT 连接调用 Desktop.StopSimulations 停止求解
+    (当前自适应迭代完成后 Analyze 返回, COM 线程随后继续处理请求), 然后抛出 asyncio.TimeoutError 或 CancelledError
+    :param timeout: 等待时间 单位 s
+    :param executor: COM 线程, 默认为 GetExecutor()
+    """
+    executor = executor if executor is not None else GetExecutor()
+    desktop, app_name = await RunAsync(_StopTarget, context, executor=executor)
+    future = executor.Submit(analysis.Analyze, setup_name, context)
+    try:
+        return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+    except (asyncio.TimeoutError, asyncio.CancelledError):
+        # 尚未开始的请求直接取消, 已开始的求解需要停止, 否则会一直占用 COM 线程
+        if not future.cancel() and not future.done():
+            await asyncio.get_running_loop().run_in_executor(None, StopSimulations, desktop, app_name)
+        raise
+
+
+async def ChangeVariableAsync(props_name_array, props_value_array, context=None, timeout: float = None,
+                              executor: ComExecutor = None):
+    """
+    异步修改变量, 见 basic.ChangeVariable
+    """
+    return await RunAsync(basic.ChangeVariable, props_name_array, props_value_array, False, context,
+                          timeout=timeout, executor=executor)
+
+
+async def GetAntennaPerformanceAsync(frequency: float, context=None, timeout: float = None,
+                                     executor: ComExecutor = None):
+    """
+    异步获得天线参数, 见 analysis.GetAntennaPerformance
+    """
+    return await RunAsync(analysis.GetAntennaPerformance, frequency, context, timeout=timeout, executor=executor)
+
+
+def EvaluateCandidate(props_name_array, props_value_array, setup_name: str, frequency: float, context=None):
+    """
+    在 COM 线程中依次执行 ChangeVariable -> Analyze -> GetAntennaPerformance 的函数, 用于 Submit
+    :return: (S11, BW, AR, Gain)
+    """
+    basic.ChangeVariable(props_name_array, props_value_array, context=context)
+    analysis.Analyze(setup_name, context)
+    return analysis.GetAntennaPerformance(frequency, context)
+
+
+async def EvaluateCandidateAsync(props_name_array, props_value_array, setup_name: str = "Setup1",
+                                 frequency: float = 2.5, context=None, timeout: float = None,
+                                 executor: ComExecutor = None):
+    """
+    异步评估一个候选解, 整个评估作为一个请求执行, 中间不会插入其他请求.
+    超时只取消尚未开始的评估, 已开始的评估会执行完; 需要超时停止求解时依次使用 ChangeVariableAsync、AnalyzeAsync
+    和 GetAntennaPerformanceAsync
+    :return: (S11, BW, AR, Gain)
+    """
+    return await RunAsync(EvaluateCandidate, props_name_array, props_value_array, setup_name, frequency, context,
+                          timeout=timeout, executor=executor)
@@ -0,0 +1,304 @@
+"""
+@FileName: instrument/__init__.py
+@Description: 该文件提供 COM 调用的计时统计功能. 启用后 hfss 各对象的每一次 self.handle.<Method> 调用都被计时,
+              按方法、按直接调用函数、按入口函数 (如 GetAntennaPerformance) 统计调用次数、累计耗时和耗时分布,
+              可导出为 JSON 或打印为表格. 未启用时不产生额外开销.
+@Author: SJY
+@Time: 2026/10/18
+@Coding: UTF-8
+@Vision: V1.0
+"""
+
+# Official Standard Library
+import json
+import math
+import os
+import sys
+import time
+
+# Import the OSL with "from"
+from typing import Dict, Tuple
+
+# Import the LL with "from"
+import hfss
+
+
+# 耗时直方图的分桶: 1us 到 1000s, 每 10 倍分为 8 个对数等距的桶
+BUCKETS_PER_DECADE = 8
+MIN_LATENCY = 1e-6
+BUCKET_COUNT = 9 * BUCKETS_PER_DECADE + 1
+
+# 统计调用函数时跳过的文件: hfss 对象定义文件和本文件
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(hfss.__file__))
+_SKIPPED_FILES = (os.path.abspath(hfss.__file__), os.path.abspath(__file__))
+# 统计入口函数时不视为接口函数的目录
+_NON_API_DIRS = (os.path.join(_PACKAGE_DIR, "benchmark"),)
+
+
+class LatencyHistogram(object):
+    """
+    耗时直方图 对数分桶, 内存占用固定, 分位数按桶的几何中点估计
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self.buckets = [0] * BUCKET_COUNT
+
+    @staticmethod
+    def BucketIndex(elapsed: float) -> int:
+        if elapsed <= MIN_LATENCY:
+            return 0
+        index = int(math.log10(elapsed / MIN_LATENCY) * BUCKETS_PER_DECADE) + 1
+        return min(index, BUCKET_COUNT - 1)
+
+    @staticmethod
+    def BucketValue(index: int) -> float:
+        """
+        桶的代表耗时 (桶上下界的几何中点)
+        """
+        if index == 0:
+            return MIN_LATENCY
+        return MIN_LATENCY * 10 ** ((index - 0.5) / BUCKETS_PER_DECADE)
+
+    def Add(self, elapsed: float):
+        self.count += 1
+        self.total += elapsed
+        if elapsed < self.min:
+            self.min = elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+        self.buckets[self.BucketIndex(elapsed)] += 1
+
+    def Percentile(self, percent: float) -> float:
+        """
+        :param percent: 0~100
+        :return: 耗时 单位 s
+        """
+        if self.count == 0:
+            return 0.0
+        rank = max(1, int(math.ceil(self.count * percent / 100.0)))
+        seen = 0
+        for index, bucket in enumerate(self.buckets):
+            seen += bucket
+            if seen >= rank:
+                return min(max(self.BucketValue(index), self.min), self.max)
+        return self.max
+
+    def ToDict(self) -> dict:
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+            "p50": self.Percentile(50),
+            "p90": self.Percentile(90),
+            "p99": self.Percentile(99),
+            "histogram": {"%.3g" % self.BucketValue(i): n for i, n in enumerate(self.buckets) if n},
+        }
+
+
+class InstrumentedHandle(object):
+    """
+    句柄计时代理 读取属性时返回计时包装后的方法, 由 Monitor 的句柄钩子在读取 handle 时创建
+    """
+    __slots__ = ("raw", "owner", "monitor")
+
+    def __init__(self, raw, owner: str, monitor):
+        self.raw = raw
+        self.owner = owner
+        self.monitor = monitor
+
+    def __getattr__(self, name):
+        monitor = self.monitor
+        start = time.perf_counter()
+        attribute = getattr(self.raw, name)
+        if not callable(attribute):
+            # COM 属性读取同样是一次 COM 调用
+            monitor.Record(self.owner, name, time.perf_counter() - start)
+            return attribute
+        owner = self.owner
+
+        def Call(*args):
+            call_start = time.perf_counter()
+            try:
+                return attribute(*args)
+            finally:
+                monitor.Record(owner, name, time.perf_counter() - call_start)
+        return Call
+
+    def __eq__(self, other):
+        if isinstance(other, InstrumentedHandle):
+            other = other.raw
+        return self.raw == other
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash(self.raw)
+
+
+class Monitor(object):
+    """
+    COM 调用统计器
+    by_method: {"Class.Method": 直方图}
+    by_caller: {("调用函数", "Class.Method"): 直方图}  调用函数为 hfss 对象定义之外最近的一层函数
+    by_entry:  {("入口函数", "Class.Method"): 直方图}  入口函数为调用栈中最外层的 hfss 接口函数
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.by_method = {}  # type: Dict[str, LatencyHistogram]
+        self.by_caller = {}  # type: Dict[Tuple[str, str], LatencyHistogram]
+        self.by_entry = {}  # type: Dict[Tuple[str, str], LatencyHistogram]
+
+    def Hook(self, instance, handle):
+        if type(handle) is InstrumentedHandle:
+            handle = handle.raw
+        return InstrumentedHandle(handle, type(instance).__name__, self)
+
+    def Enable(self):
+        """
+        启用计时, 对之后的所有句柄读取生效
+        :return: None
+        """
+        if not self.enabled:
+            hfss.handleHooks.append(self.Hook)
+            self.enabled = True
+
+    def Disable(self):
+        if self.enabled:
+            hfss.handleHooks.remove(self.Hook)
+            self.enabled = False
+
+    def Reset(self):
+        self.by_method = {}
+        self.by_caller = {}
+        self.by_entry = {}
+
+    @staticmethod
+    def Callers() -> Tuple[str, str]:
+        """
+        从调用栈中找出直接调用函数和入口函数
+        :return: (调用函数, 入口函数) 形如 "analysis.GenerateS11Graph"
+        """
+        frame = sys._getframe(2)
+        caller, entry = "<unknown>", None
+        while frame is not None:
+            file_name = frame.f_code.co_filename
+            if file_name not in _SKIPPED_FILES:
+                name = _FunctionName(frame)
+                if caller == "<unknown>":
+                    caller = name
+                if file_name.startswith(_PACKAGE_DIR) and not file_name.startswith(_NON_API_DIRS):
+                    entry = name
+            frame = frame.f_back
+        return caller, entry if entry is not None else caller
+
+    def Record(self, owner: str, method: str, elapsed: float):
+        key = owner + "." + method
+        caller, entry = self.Callers()
+        for table, table_key in ((self.by_method, key), (self.by_caller, (caller, key)),
+                                 (self.by_entry, (entry, key))):
+            histogram = table.get(table_key)
+            if histogram is None:
+                histogram = table[table_key] = LatencyHistogram()
+            histogram.Add(elapsed)
+
+    def Report(self) -> dict:
+        """
+        :return: 可序列化为 JSON 的统计结果
+        """
+        return {
+            "by_method": {key: h.ToDict() for key, h in self.by_method.items()},
+            "by_caller": [dict(caller=c, method=m, **h.ToDict()) for (c, m), h in self.by_caller.items()],
+            "by_entry": [dict(entry=e, method=m, **h.ToDict()) for (e, m), h in self.by_entry.items()],
+        }
+
+    def SaveJson(self, file_path: str) -> str:
+        with open(file_path, "w", encoding="utf-8") as f:
+            json.dump(self.Report(), f, indent=2, ensure_ascii=False)
+        return file_path
+
+    def FormatTable(self, group: str = "method", limit: int = 30) -> str:
+        """
+        将统计结果格式化为按累计耗时降序排列的表格
+        :param group: "method" 按方法, "caller" 按调用函数, "entry" 按入口函数
+        :param limit: 最多显示的行数
+        :return: str
+        """
+        if group == "method":
+            rows = [(key, h) for key, h in self.by_method.items()]
+        elif group == "caller":
+            rows = [(c + " -> " + m, h) for (c, m), h in self.by_caller.items()]
+        elif group == "entry":
+            rows = [(e + " -> " + m, h) for (e, m), h in self.by_entry.items()]
+        else:
+            raise ValueError("group 只能为 method, caller 或 entry")
+        rows.sort(key=lambda row: row[1].total, reverse=True)
+        width = max([len(name) for name, _ in rows[:limit]] + [4])
+        lines = ["%-*s %8s %10s %10s %10s %10s %10s" % (width, "name", "count", "total[s]", "mean[ms]",
+                                                       "p50[ms]", "p90[ms]", "p99[ms]")]
+        for name, h in rows[:limit]:
+            lines.append("%-*s %8d %10.4f %10.3f %10.3f %10.3f %10.3f" % (
+                width, name, h.count, h.total, 1e3 * h.total / h.count,
+                1e3 * h.Percentile(50), 1e3 * h.Percentile(90), 1e3 * h.Percentile(99)))
+        return "\n".join(lines)
+
+
+def _FunctionName(frame) -> str:
+    module = frame.f_globals.get("__name__", "")
+    if module.startswith("hfss."):
+        module = module[len("hfss."):]
+    return module + "." + frame.f_code.co_name
+
+
+# 默认统计器
+monitor = Monitor()
+
+
+def Enable():
+    monitor.Enable()
+
+
+def Disable():
+    monitor.Disable()
+
+
+def Reset():
+    monitor.Reset()
+
+
+def Report() -> dict:
+    return monitor.Report()
+
+
+def SaveJson(file_path: str) -> str:
+    return monitor.SaveJson(file_path)
+
+
+def FormatTable(group: str = "method", limit: int = 30) -> str:
+    return monitor.FormatTable(group, limit)
+
+
+class Instrumented(object):
+    """
+    with 语句中启用默认统计器, 退出时恢复原状态
+    with instrument.Instrumented():
+        analysis.GetAntennaPerformance(2.5)
+    print(instrument.FormatTable("entry"))
+    """
+
+    def __enter__(self):
+        self.__was_enabled = monitor.enabled
+        monitor.Enable()
+        return monitor
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if not self.__was_enabled:
+            monitor.Disable()
+        return False
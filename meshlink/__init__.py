@@ -0,0 +1,208 @@
+"""
+@FileName: meshlink/__init__.py
+@Description: 该文件提供设计变化之间的网格复用. 优化中相邻候选解的变量只相差零点几毫米, 每次从初始网格开始自适应迭代
+              浪费大量迭代. MeshReuse 将设计复制为参考设计 (默认 <设计>_MeshRef), 在参考变化下求解一次,
+              之后各候选解的求解设置通过 MeshLink 导入参考设计的收敛网格, 自适应迭代从该网格开始.
+              几何拓扑变化 (模型对象不同) 时不导入网格; 导入失败 (网格无法映射到变化后的几何) 时自动改为从初始网格求解,
+              refresh 为 True 时以该候选解更新参考变化. 只采用收敛的变化作为参考: 未收敛的求解已迭代到最大次数,
+              网格过大, 导入后每次迭代更慢, 未收敛的候选解导入该网格反而比从初始网格求解耗时更多.
+              Stats() 给出导入网格与从初始网格求解的迭代次数和耗时.
+              使用方法:
+                  reuse = meshlink.MeshReuse("Setup1")
+                  for values in candidates:
+                      output = meshlink.EvaluateCandidate(names, values, reuse, frequency=2.5)
+                  reuse.Stats()
+@Author: SJY
+@Time: 2026/10/18
+@Coding: UTF-8
+@Vision: V1.0
+"""
+
+# Official Standard Library
+import time
+
+# Import the LL with "from"
+import hfss
+from hfss import ResolveContext
+from hfss import analysis, basic, convergence
+
+
+# 计入拓扑签名的模型对象组
+TOPOLOGY_GROUPS = ("Solids", "Sheets")
+
+
+def TopologySignature(context=None) -> tuple:
+    """
+    设计的拓扑签名: 各组模型对象名称, 对象增减或改名时变化
+    :return: ((组名, (对象名, ...)), ...)
+    """
+    editor = ResolveContext(context).GetEditor()
+    return tuple((group, tuple(sorted(editor.GetObjectsInGroup(group) or ()))) for group in TOPOLOGY_GROUPS)
+
+
+class MeshReuse(object):
+    """
+    参考设计的管理、网格导入及回退, 并记录每次求解的迭代次数和耗时
+    """
+
+    def __init__(self, setup_name: str = "Setup1", reference_design: str = None, refresh: bool = True,
+                 context=None):
+        """
+        :param setup_name: 求解设置名称
+        :param reference_design: 参考设计名称, 默认为 <设计>_MeshRef
+        :param refresh: 回退或没有参考变化时, 是否以收敛的候选解更新参考变化 (参考设计多求解一次)
+        """
+        self.ctx = ResolveContext(context)
+        self.setup_name = setup_name
+        self.reference_design = reference_design
+        self.refresh = refresh
+        self.reference = None  # 参考变化的 MeshLinkConfig
+        self.signature = None  # 参考设计的拓扑签名
+        self.reference_ctx = None
+        self.attempted = False  # 是否已求解过参考变化
+        # 求解设置当前的网格导入 (MeshLinkConfig 或 None), linked 为 False 时未知;
+        # 只在变化时调用 SetMeshLink, 避免每次求解都使模型版本变化而重新计算结果缓存的指纹
+        self.link = None
+        self.linked = False
+        # 每次求解 {"mode": "reference"/"imported"/"failed"/"fresh", "passes", "seconds", "fallback", "status"}
+        self.records = []
+
+    def __Names(self):
+        return self.ctx.oProject.GetName(), self.ctx.oDesign.GetName()
+
+    def __Solve(self, context) -> tuple:
+        """
+        :return: (Analyze 的返回值, 迭代次数, 耗时 s, 求解消息, 收敛状态)
+        """
+        project_name, design_name = context.oProject.GetName(), context.oDesign.GetName()
+        known = len(context.oDesktop.GetMessages(project_name, design_name, 0))
+        start = time.perf_counter()
+        result = context.oDesign.Analyze(self.setup_name)
+        seconds = time.perf_counter() - start
+        messages = list(context.oDesktop.GetMessages(project_name, design_name, 0))[known:]
+        try:
+            passes = len(convergence.ExportConvergence(self.setup_name, context=context))
+        except Exception:
+            passes = 0
+        return result, passes, seconds, messages, convergence.MessageStatus(messages)
+
+    def __Link(self, link):
+        """
+        设置候选解设计的网格导入, 与当前的相同时不调用 SetMeshLink
+        :param link: MeshLinkConfig 或 None
+        """
+        if self.linked and self.link is link:
+            return
+        analysis.SetMeshLink(self.setup_name, link, self.ctx)
+        self.link, self.linked = link, True
+
+    def SetReference(self):
+        """
+        以当前变化作为参考变化: 参考设计不存在或拓扑不同时由当前设计复制, 在参考设计中求解 (不导入网格)
+        :return: None
+        """
+        project_name, design_name = self.__Names()
+        reference_name = self.reference_design or design_name + "_MeshRef"
+        signature = TopologySignature(self.ctx)
+        names = list(basic.GetVariableName(self.ctx))
+        values = [str(basic.GetVariableValue(name, self.ctx)) for name in names]
+        if self.reference_ctx is None or self.signature != signature:
+            if reference_name in self.ctx.oProject.GetTopDesignList():
+                self.ctx.oProject.DeleteDesign(reference_name)
+            self.reference_ctx = hfss.DesignContext(self.ctx.session, project_name, reference_name)
+            basic.CopyHFSSDesign(design_name, reference_name, self.reference_ctx)
+            self.ctx.oProject.SetActiveDesign(design_name)
+            # 复制的求解设置可能带有网格导入, 参考设计自身从初始网格求解
+            analysis.SetMeshLink(self.setup_name, None, self.reference_ctx)
+        # 变量值已带单位, 直接写入参考设计
+        changed_props = ["NAME:ChangedProps"]
+        for name, value in zip(names, values):
+            changed_props.append(["NAME:" + name, "PropType:=", "VariableProp", "UserDef:=", True, "Value:=", value])
+        self.reference_ctx.oDesign.ChangeProperty(["NAME:AllTabs",
+                                                   ["NAME:LocalVariableTab",
+                                                    ["NAME:PropServers", "LocalVariables"],
+                                                    changed_props]])
+        result, passes, seconds, _, status = self.__Solve(self.reference_ctx)
+        self.attempted = True
+        self.records.append({"mode": "reference", "passes": passes, "seconds": seconds, "fallback": None,
+                             "status": status})
+        # 未收敛的网格不作为参考; 消息中没有收敛状态时 (如旧版本) 按求解结果判断
+        if result != 0 or status not in ("converged", None):
+            self.reference, self.signature = None, None
+            return
+        self.signature = signature
+        self.reference = analysis.MeshLinkConfig(reference_name, dict(zip(names, values)),
+                                                 self.setup_name + " : LastAdaptive")
+
+    def Analyze(self) -> dict:
+        """
+        求解当前变化: 有参考变化且拓扑相同时导入参考网格, 导入失败时从初始网格重新求解
+        :return: {"result": Analyze 的返回值, "imported": 是否导入了网格, "fallback": 回退原因或 None,
+                  "passes": 迭代次数, "seconds": 耗时 s}
+        """
+        fallback = None
+        if self.reference is None and not self.attempted:
+            self.SetReference()
+        if self.reference is None:
+            fallback = "no reference"
+        elif TopologySignature(self.ctx) != self.signature:
+            fallback = "topology"
+        else:
+            self.__Link(self.reference)
+            result, passes, seconds, messages, status = self.__Solve(self.ctx)
+            failed = [m for m in messages if "mesh import failed" in m.lower()]
+            if result == 0 and not failed:
+                record = {"mode": "imported", "passes": passes, "seconds": seconds, "fallback": None,
+                          "status": status}
+                self.records.append(record)
+                return dict(record, result=result, imported=True)
+            fallback = failed[0] if failed else "result %s" % result
+            self.records.append({"mode": "failed", "passes": passes, "seconds": seconds, "fallback": fallback,
+                                 "status": status})
+        self.__Link(None)
+        result, passes, seconds, _, status = self.__Solve(self.ctx)
+        record = {"mode": "fresh", "passes": passes, "seconds": seconds, "fallback": fallback, "status": status}
+        self.records.append(record)
+        # 候选解未收敛时其网格也不能作为参考, 不必在参考设计中再求解
+        if self.refresh and result == 0 and status in ("converged", None):
+            self.SetReference()
+        return dict(record, result=result, imported=False)
+
+    def Stats(self) -> dict:
+        """
+        统计各类求解的次数、迭代次数和耗时, 以从初始网格求解 (含参考求解) 的平均值估计导入网格节省的迭代次数和时间
+        :return: {"reference", "imported", "fresh", "failed": {"count", "passes", "seconds"},
+                  "fallbacks", "passes_saved", "seconds_saved"}
+        """
+        stats = {}
+        for mode in ("reference", "imported", "fresh", "failed"):
+            records = [r for r in self.records if r["mode"] == mode]
+            stats[mode] = {"count": len(records), "passes": sum(r["passes"] for r in records),
+                           "seconds": sum(r["seconds"] for r in records)}
+        full = [r for r in self.records if r["mode"] in ("reference", "fresh")]
+        imported = stats["imported"]
+        stats["fallbacks"] = sum(1 for r in self.records if r["mode"] == "fresh" and r["fallback"] is not None)
+        stats["passes_saved"], stats["seconds_saved"] = 0.0, 0.0
+        if full and imported["count"]:
+            mean_passes = sum(r["passes"] for r in full) / len(full)
+            mean_seconds = sum(r["seconds"] for r in full) / len(full)
+            # 参考求解及失败的导入是网格复用的额外开销
+            overhead = stats["reference"]["seconds"] + stats["failed"]["seconds"]
+            stats["passes_saved"] = mean_passes * imported["count"] - imported["passes"]
+            stats["seconds_saved"] = mean_seconds * imported["count"] - imported["seconds"] - overhead
+        return stats
+
+
+def EvaluateCandidate(props_name_array, props_value_array, reuse: MeshReuse, frequency: float = 2.5,
+                      context=None) -> dict:
+    """
+    ChangeVariable -> MeshReuse.Analyze -> GetAntennaPerformance
+    :return: {"performance": (S11, BW, AR, Gain) 或 None, "mesh": MeshReuse.Analyze 的结果}
+    """
+    ctx = ResolveContext(context)
+    basic.ChangeVariable(props_name_array, props_value_array, context=ctx)
+    output = reuse.Analyze()
+    performance = None
+    if output["result"] == 0:
+        performance = tuple(float(v) for v in analysis.GetAntennaPerformance(frequency, ctx))
+    return {"performance": performance, "mesh": output}
@@ -0,0 +1,256 @@
+"""
+@FileName: metrics/__init__.py
+@Description: 该文件提供向量化的天线指标计算. 输入为 NumPy 数组, 形状为 (变化数, 频点数) 或 (变化数, 频点数, 角度数),
+              一次计算全部变化的 -10dB 阻抗带宽、轴比带宽、最小 S11、谐振频率、主轴方向增益、峰值增益等指标,
+              不逐行使用 pandas. 一维数组视为只有一个变化. 频率查找按容差匹配, 不使用浮点数的精确相等.
+              使用方法:
+                  result = metrics.AntennaMetrics(freqs, 2.5, s11=s11, ar=ar, gain=gain)
+                  result["BW"]  # 形状为 (变化数,)
+@Author: SJY
+@Time: 2026/10/18
+@Coding: UTF-8
+@Vision: V1.0
+"""
+
+# Third-party Library
+import numpy as np
+
+# Import the OSL with "from"
+from typing import Dict
+
+
+# 频率匹配的默认容差 单位 GHz
+FREQUENCY_TOLERANCE = 1e-6
+# S11 带宽阈值 单位 dB
+S11_THRESHOLD = -10.0
+# 轴比带宽阈值 单位 dB
+AR_THRESHOLD = 3.0
+# 求解数据中没有对应频点时轴比的取值, 与 GetAntennaPerformance 相同
+MISSING_AR = 999.0
+# GetAntennaPerformance 计算 S11 时取 frequency 前后各 5 点
+S11_HALF_WINDOW = 5
+
+
+def AsVariations(values) -> np.ndarray:
+    """
+    将数据转换为浮点数组, 一维数组 (频点数,) 视为一个变化, 转换为 (1, 频点数)
+    :param values: 形状为 (频点数,) (变化数, 频点数) 或 (变化数, 频点数, 角度数) 的数组
+    :return: np.ndarray
+    """
+    values = np.asarray(values, dtype=float)
+    if values.ndim == 1:
+        values = values[np.newaxis, :]
+    if values.ndim not in (2, 3):
+        raise ValueError("数据形状应为 (变化数, 频点数[, 角度数]): " + str(values.shape))
+    return values
+
+
+def FrequencyIndex(freqs, frequency: float, tolerance: float = FREQUENCY_TOLERANCE) -> int:
+    """
+    在升序频率数组中查找与 frequency 相差不超过 tolerance 的频点
+    :param freqs: 频率数组 单位 GHz
+    :param frequency: 单位 GHz
+    :param tolerance: 容差 单位 GHz
+    :return: 最近频点的序号, 没有时返回 -1
+    """
+    freqs = np.asarray(freqs, dtype=float)
+    if len(freqs) == 0:
+        return -1
+    index = int(np.abs(freqs - frequency).argmin())
+    return index if abs(freqs[index] - frequency) <= tolerance else -1
+
+
+def AngleIndex(angles, angle: float = 0.0) -> int:
+    """
+    角度数组中最接近 angle 的角度的序号
+    :param angles: 角度数组 单位 deg
+    :param angle: 单位 deg
+    :return: int
+    """
+    return int(np.abs(np.asarray(angles, dtype=float) - angle).argmin())
+
+
+def AtFrequency(freqs, values, frequency: float, missing: float = 0.0,
+                tolerance: float = FREQUENCY_TOLERANCE) -> np.ndarray:
+    """
+    取各变化在 frequency 处的数值
+    :param freqs: 频率数组 单位 GHz
+    :param values: (变化数, 频点数[, 角度数]) 数组
+    :param frequency: 单位 GHz
+    :param missing: 没有对应频点时的取值
+    :return: 形状为 (变化数[, 角度数]) 的数组
+    """
+    values = AsVariations(values)
+    index = FrequencyIndex(freqs, frequency, tolerance)
+    if index < 0:
+        return np.full((values.shape[0],) + values.shape[2:], missing)
+    return values[:, index]
+
+
+def WindowMean(freqs, values, frequency: float, half_window: int = S11_HALF_WINDOW,
+               tolerance: float = FREQUENCY_TOLERANCE) -> np.ndarray:
+    """
+    frequency 处的数值与其附近窗口 [index - half_window, index + half_window) 内数值的平均,
+    即 GetAntennaPerformance 中 S11 的计算方法 (频点本身计入两次)
+    :param freqs: 频率数组 单位 GHz
+    :param values: (变化数, 频点数) 数组
+    :param frequency: 单位 GHz
+    :param half_window: 窗口半宽 单位为频点数
+    :return: (变化数,) 数组, 没有对应频点时为 0
+    """
+    values = AsVariations(values)
+    index = FrequencyIndex(freqs, frequency, tolerance)
+    if index < 0:
+        return np.zeros(values.shape[0])
+    window = values[:, max(index - half_window, 0): min(index + half_window, values.shape[1])]
+    return (values[:, index] + window.sum(axis=1)) / (window.shape[1] + 1)
+
+
+def Bandwidth(freqs, values, frequency: float, threshold: float, below: bool = True,
+              tolerance: float = FREQUENCY_TOLERANCE) -> np.ndarray:
+    """
+    各变化中满足阈值 (below 为 True 时 values < threshold, 否则 values > threshold) 且包含 frequency 的连续频段宽度.
+    frequency 不在任何满足阈值的频段 [首频点, 末频点] 内时带宽为 0
+    :param freqs: 升序频率数组 单位 GHz
+    :param values: (变化数, 频点数) 数组
+    :param frequency: 单位 GHz
+    :param threshold: 阈值
+    :param below: 为 True 时低于阈值的频段满足要求 (S11), 否则高于阈值的频段满足要求
+    :return: (变化数,) 数组 单位 GHz
+    """
+    freqs = np.asarray(freqs, dtype=float)
+    values = AsVariations(values)
+    count = values.shape[1]
+    mask = values < threshold if below else values > threshold
+    # 不大于 frequency 的最后一个频点, 频段必须包含该频点
+    index = int(np.searchsorted(freqs, frequency + tolerance, side="right")) - 1
+    if index < 0 or count == 0:
+        return np.zeros(values.shape[0])
+    positions = np.arange(count)
+    # 频段左端: index 及之前最后一个不满足阈值的频点之后; 右端: index 及之后第一个不满足阈值的频点之前
+    left = np.where(~mask[:, :index + 1], positions[:index + 1], -1).max(axis=1) + 1
+    right = np.where(~mask[:, index:], positions[index:], count).min(axis=1) - 1
+    inside = mask[:, index] & (freqs[np.maximum(right, 0)] >= frequency - tolerance)
+    return np.where(inside, freqs[np.maximum(right, 0)] - freqs[np.minimum(left, count - 1)], 0.0)
+
+
+def S11Metrics(freqs, s11, frequency: float, threshold: float = S11_THRESHOLD,
+               tolerance: float = FREQUENCY_TOLERANCE) -> Dict[str, np.ndarray]:
+    """
+    S11 相关指标
+    :param freqs: 频率数组 单位 GHz
+    :param s11: dB(S(1,1)) (变化数, 频点数) 数组
+    :param frequency: 单位 GHz
+    :param threshold: 阻抗带宽阈值 单位 dB
+    :return: {"S11": frequency 处的窗口平均 S11, "S11AtFrequency": frequency 处的 S11, "BW": 阻抗带宽,
+              "MinS11": 最小 S11, "ResonantFrequency": 最小 S11 所在频率}, 各项形状为 (变化数,)
+    """
+    freqs = np.asarray(freqs, dtype=float)
+    s11 = AsVariations(s11)
+    minimum = s11.argmin(axis=1)
+    return {
+        "S11": WindowMean(freqs, s11, frequency, tolerance=tolerance),
+        "S11AtFrequency": AtFrequency(freqs, s11, frequency, np.nan, tolerance),
+        "BW": Bandwidth(freqs, s11, frequency, threshold, True, tolerance),
+        "MinS11": s11[np.arange(s11.shape[0]), minimum],
+        "ResonantFrequency": freqs[minimum],
+    }
+
+
+def AtAngle(values, angles=None, angle: float = 0.0) -> np.ndarray:
+    """
+    三维数据取 angle 方向的数值, 二维数据 (已是单一方向) 原样返回
+    :param values: (变化数, 频点数[, 角度数]) 数组
+    :param angles: 角度数组 单位 deg, 三维数据时必需
+    :param angle: 单位 deg
+    :return: (变化数, 频点数) 数组
+    """
+    values = AsVariations(values)
+    if values.ndim == 2:
+        return values
+    if angles is None:
+        raise ValueError("三维数据需要给出角度数组 angles")
+    return values[:, :, AngleIndex(angles, angle)]
+
+
+def AxialRatioMetrics(freqs, ar, frequency: float, angles=None, boresight: float = 0.0,
+                      threshold: float = AR_THRESHOLD, tolerance: float = FREQUENCY_TOLERANCE) -> Dict[str, np.ndarray]:
+    """
+    轴比相关指标, 均取主轴方向 boresight
+    :param freqs: 频率数组 单位 GHz
+    :param ar: dB(AxialRatioValue) (变化数, 频点数[, 角度数]) 数组
+    :param frequency: 单位 GHz
+    :param angles: 角度数组 单位 deg, ar 为三维时必需
+    :param boresight: 主轴方向 单位 deg
+    :param threshold: 轴比带宽阈值 单位 dB
+    :return: {"AR": frequency 处的轴比 (没有对应频点时为 999), "ARBW": 轴比带宽, "MinAR": 最小轴比},
+             各项形状为 (变化数,)
+    """
+    ar = AtAngle(ar, angles, boresight)
+    return {
+        "AR": AtFrequency(freqs, ar, frequency, MISSING_AR, tolerance),
+        "ARBW": Bandwidth(freqs, ar, frequency, threshold, True, tolerance),
+        "MinAR": ar.min(axis=1),
+    }
+
+
+def GainMetrics(freqs, gain, frequency: float, angles=None, boresight: float = 0.0,
+                tolerance: float = FREQUENCY_TOLERANCE) -> Dict[str, np.ndarray]:
+    """
+    增益相关指标
+    :param freqs: 频率数组 单位 GHz
+    :param gain: 增益 dB (变化数, 频点数[, 角度数]) 数组
+    :param frequency: 单位 GHz
+    :param angles: 角度数组 单位 deg, gain 为三维时必需
+    :param boresight: 主轴方向 单位 deg
+    :return: {"Gain": frequency 处主轴方向的增益, "PeakGain": frequency 处各方向的最大增益,
+              "PeakAngle": 最大增益方向 (gain 为二维时为 boresight)}, 没有对应频点时为 0, 各项形状为 (变化数,)
+    """
+    gain = AsVariations(gain)
+    boresight_gain = AtFrequency(freqs, AtAngle(gain, angles, boresight), frequency, 0.0, tolerance)
+    if gain.ndim == 2:
+        return {"Gain": boresight_gain, "PeakGain": boresight_gain,
+                "PeakAngle": np.full(gain.shape[0], float(boresight))}
+    pattern = AtFrequency(freqs, gain, frequency, 0.0, tolerance)
+    peak = pattern.argmax(axis=1)
+    return {
+        "Gain": boresight_gain,
+        "PeakGain": pattern[np.arange(pattern.shape[0]), peak],
+        "PeakAngle": np.asarray(angles, dtype=float)[peak],
+    }
+
+
+def AntennaMetrics(freqs, frequency: float, s11=None, ar=None, gain=None, angles=None, boresight: float = 0.0,
+                   tolerance: float = FREQUENCY_TOLERANCE) -> Dict[str, np.ndarray]:
+    """
+    一次计算全部变化的天线指标, 未给出的数据对应的指标不计算
+    :param freqs: 频率数组 单位 GHz
+    :param frequency: 单位 GHz
+    :param s11: dB(S(1,1)) (变化数, 频点数) 数组
+    :param ar: dB(AxialRatioValue) (变化数, 频点数[, 角度数]) 数组
+    :param gain: 增益 dB (变化数, 频点数[, 角度数]) 数组
+    :param angles: 角度数组 单位 deg
+    :param boresight: 主轴方向 单位 deg
+    :return: S11Metrics, AxialRatioMetrics, GainMetrics 结果合并后的字典
+    """
+    result = {}
+    if s11 is not None:
+        result.update(S11Metrics(freqs, s11, frequency, tolerance=tolerance))
+    if ar is not None:
+        result.update(AxialRatioMetrics(freqs, ar, frequency, angles, boresight, tolerance=tolerance))
+    if gain is not None:
+        result.update(GainMetrics(freqs, gain, frequency, angles, boresight, tolerance))
+    return result
+
+
+def PerformanceTuples(result: Dict[str, np.ndarray]) -> list:
+    """
+    将 AntennaMetrics 的结果转换为各变化的 (S11, BW, AR, Gain) 列表, 与 GetAntennaPerformance 的返回值相同.
+    缺少的指标取 GetAntennaPerformance 的默认值 S11 0, BW 0, AR 999, Gain 0
+    :param result: AntennaMetrics 的结果
+    :return: [(S11, BW, AR, Gain), ...]
+    """
+    count = max(len(values) for values in result.values()) if result else 0
+    defaults = (("S11", 0.0), ("BW", 0.0), ("AR", MISSING_AR), ("Gain", 0.0))
+    columns = [result.get(name, np.full(count, default)) for name, default in defaults]
+    return [tuple(float(column[i]) for column in columns) for i in range(count)]
@@ -0,0 +1,711 @@
+"""
+@FileName: modeler/__init__.py
+@Description: 该文件提供声明式的几何模型描述. Model 列出设计变量、模型对象 (Box, Rectangle, Cylinder, Circle, Sphere,
+              Polygon) 及布尔运算 (Subtract, Unite), 尺寸和坐标可以是引用设计变量的表达式.
+              Apply 将模型编译为最少的 Editor 调用; 再次应用时与上一次应用的模型比较, 只发出变化的操作:
+              删除的对象合并为一次 Delete, 只修改尺寸的对象按相同的修改合并为一次 ChangeProperty,
+              只修改材料的对象按材料合并为一次 AssignMaterial, 只修改设计变量时不调用 Editor.
+              参与布尔运算的对象作为一个整体, 其尺寸变化时删除后重建.
+              使用方法:
+                  model = modeler.Model({"length": 30, "width": 28})
+                  model.Add(modeler.Box("Substrate", ["-50mm", "-50mm", "0mm"], ["100mm", "100mm", "1.6mm"], "FR4_epoxy"),
+                            modeler.Rectangle("Patch", ["-length/2", "-width/2", "1.6mm"], ["length", "width"]))
+                  modeler.Apply(model)
+              在 AEDT 界面或直接通过 oEditor 修改模型后应调用 Invalidate()
+              阵列天线由 RectangularArray / CircularArray 创建一个单元后复制 (DuplicateAlongLine / DuplicateAroundAxis),
+              调用次数与单元个数无关, 单元上的端口随对象一并复制:
+                  layout = modeler.RectangularArray(element, 16, 16, ("pitch", "pitch"))
+                  layout[(0, 3)]  # 第 0 行第 3 列单元的对象名称
+@Author: SJY
+@Time: 2026/10/18
+@Coding: UTF-8
+@Vision: V1.0
+"""
+
+# Official Standard Library
+import copy
+
+# Import the OSL with "from"
+from collections import OrderedDict
+from typing import List
+
+# Import the LL with "from"
+from hfss import ResolveContext
+from hfss import basic
+
+
+# 数值坐标和尺寸的单位
+DEFAULT_UNITS = "mm"
+# 默认不在内部求解的导体材料
+CONDUCTORS = ("pec", "perfect conductor", "copper", "aluminum", "gold", "silver")
+
+
+def Expression(value, units: str = DEFAULT_UNITS) -> str:
+    """
+    数值加单位, 字符串 (表达式或带单位的值) 不变
+    :param value: 如 30, "length/2", "1.6mm"
+    :return: str
+    """
+    if isinstance(value, (int, float)):
+        return "%.12g%s" % (value, units)
+    return str(value)
+
+
+def Vector(values) -> tuple:
+    return tuple(Expression(v) for v in values)
+
+
+class Shape(object):
+    """
+    模型对象基类. Properties() 为 AEDT 中该对象创建命令 (如 "Patch:CreateRectangle:1") 的属性,
+    editable 为 True 时尺寸变化通过 ChangeProperty 修改, 否则删除后重建
+    """
+    command = ""
+    editable = True
+
+    def __init__(self, name: str, material: str = "vacuum", solve_inside: bool = None, color=(143, 175, 143),
+                 transparency: float = 0.0):
+        """
+        :param name: 对象名称
+        :param material: 材料名称
+        :param solve_inside: 是否在内部求解, 默认导体为 False, 其余为 True
+        :param color: (R, G, B)
+        :param transparency: 透明度 0~1
+        """
+        self.name = name
+        self.material = material
+        self.solve_inside = solve_inside if solve_inside is not None else material.lower() not in CONDUCTORS
+        self.color = tuple(int(c) for c in color)
+        self.transparency = float(transparency)
+
+    def Properties(self) -> OrderedDict:
+        raise NotImplementedError
+
+    def Parameters(self) -> list:
+        raise NotImplementedError
+
+    def Attributes(self) -> list:
+        """
+        :return: 创建对象时的 Attributes 数组
+        """
+        return [
+            "NAME:Attributes",
+            "Name:=", self.name,
+            "Flags:=", "",
+            "Color:=", "(%d %d %d)" % self.color,
+            "Transparency:=", self.transparency,
+            "PartCoordinateSystem:=", "Global",
+            "UDMId:=", "",
+            "MaterialValue:=", "\"%s\"" % self.material,
+            "SurfaceMaterialValue:=", "\"\"",
+            "SolveInside:=", self.solve_inside,
+            "ShellElement:=", False,
+            "ShellElementThickness:=", "0mm",
+            "IsMaterialEditable:=", True,
+            "UseMaterialAppearance:=", False,
+            "IsLightweight:=", False
+        ]
+
+    def Geometry(self) -> tuple:
+        """
+        比较几何是否变化的键
+        """
+        return (type(self).__name__,) + tuple(self.Properties().items())
+
+    def Material(self) -> tuple:
+        return self.material, self.solve_inside
+
+    def Appearance(self) -> tuple:
+        return self.color, self.transparency
+
+
+class Box(Shape):
+    command = "CreateBox"
+
+    def __init__(self, name: str, position, size, material: str = "vacuum", **attributes):
+        """
+        :param position: 起始角点 (X, Y, Z)
+        :param size: (XSize, YSize, ZSize)
+        """
+        super(Box, self).__init__(name, material, **attributes)
+        self.position = Vector(position)
+        self.size = Vector(size)
+
+    def Properties(self) -> OrderedDict:
+        return OrderedDict([("Position", self.position), ("XSize", self.size[0]), ("YSize", self.size[1]),
+                            ("ZSize", self.size[2])])
+
+    def Parameters(self) -> list:
+        return ["NAME:BoxParameters",
+                "XPosition:=", self.position[0], "YPosition:=", self.position[1], "ZPosition:=", self.position[2],
+                "XSize:=", self.size[0], "YSize:=", self.size[1], "ZSize:=", self.size[2]]
+
+
+class Rectangle(Shape):
+    command = "CreateRectangle"
+
+    def __init__(self, name: str, position, size, axis: str = "Z", material: str = "vacuum", **attributes):
+        """
+        :param position: 起始角点 (X, Y, Z)
+        :param size: (Width, Height), 平面由 axis 法向确定
+        :param axis: 法线方向 "X", "Y" 或 "Z"
+        """
+        super(Rectangle, self).__init__(name, material, **attributes)
+        self.position = Vector(position)
+        self.size = Vector(size)
+        self.axis = axis
+
+    def Properties(self) -> OrderedDict:
+        return OrderedDict([("Position", self.position), ("Axis", self.axis), ("XSize", self.size[0]),
+                            ("YSize", self.size[1])])
+
+    def Parameters(self) -> list:
+        return ["NAME:RectangleParameters", "IsCovered:=", True,
+                "XStart:=", self.position[0], "YStart:=", self.position[1], "ZStart:=", self.position[2],
+                "Width:=", self.size[0], "Height:=", self.size[1], "WhichAxis:=", self.axis]
+
+
+class Cylinder(Shape):
+    command = "CreateCylinder"
+
+    def __init__(self, name: str, center, radius, height, axis: str = "Z", material: str = "vacuum", **attributes):
+        """
+        :param center: 底面圆心 (X, Y, Z)
+        """
+        super(Cylinder, self).__init__(name, material, **attributes)
+        self.center = Vector(center)
+        self.radius = Expression(radius)
+        self.height = Expression(height)
+        self.axis = axis
+
+    def Properties(self) -> OrderedDict:
+        return OrderedDict([("Center Position", self.center), ("Axis", self.axis), ("Radius", self.radius),
+                            ("Height", self.height)])
+
+    def Parameters(self) -> list:
+        return ["NAME:CylinderParameters",
+                "XCenter:=", self.center[0], "YCenter:=", self.center[1], "ZCenter:=", self.center[2],
+                "Radius:=", self.radius, "Height:=", self.height, "WhichAxis:=", self.axis, "NumSides:=", "0"]
+
+
+class Circle(Shape):
+    command = "CreateCircle"
+
+    def __init__(self, name: str, center, radius, axis: str = "Z", material: str = "vacuum", **attributes):
+        super(Circle, self).__init__(name, material, **attributes)
+        self.center = Vector(center)
+        self.radius = Expression(radius)
+        self.axis = axis
+
+    def Properties(self) -> OrderedDict:
+        return OrderedDict([("Center Position", self.center), ("Axis", self.axis), ("Radius", self.radius)])
+
+    def Parameters(self) -> list:
+        return ["NAME:CircleParameters", "IsCovered:=", True,
+                "XCenter:=", self.center[0], "YCenter:=", self.center[1], "ZCenter:=", self.center[2],
+                "Radius:=", self.radius, "WhichAxis:=", self.axis, "NumSegments:=", "0"]
+
+
+class Sphere(Shape):
+    command = "CreateSphere"
+
+    def __init__(self, name: str, center, radius, material: str = "vacuum", **attributes):
+        super(Sphere, self).__init__(name, material, **attributes)
+        self.center = Vector(center)
+        self.radius = Expression(radius)
+
+    def Properties(self) -> OrderedDict:
+        return OrderedDict([("Center Position", self.center), ("Radius", self.radius)])
+
+    def Parameters(self) -> list:
+        return ["NAME:SphereParameters",
+                "XCenter:=", self.center[0], "YCenter:=", self.center[1], "ZCenter:=", self.center[2],
+                "Radius:=", self.radius]
+
+
+class Polygon(Shape):
+    """
+    由折线围成的平面, 顶点变化时删除后重建
+    """
+    command = "CreatePolyline"
+    editable = False
+
+    def __init__(self, name: str, points, material: str = "vacuum", **attributes):
+        """
+        :param points: 顶点 [(X, Y, Z), ...], 不需要重复第一个顶点
+        """
+        super(Polygon, self).__init__(name, material, **attributes)
+        self.points = tuple(Vector(point) for point in points)
+
+    def Properties(self) -> OrderedDict:
+        return OrderedDict([("Points", self.points)])
+
+    def Parameters(self) -> list:
+        points = list(self.points) + [self.points[0]]
+        return ["NAME:PolylineParameters", "IsPolylineCovered:=", True, "IsPolylineClosed:=", True,
+                ["NAME:PolylinePoints"] + [["NAME:PLPoint", "X:=", x, "Y:=", y, "Z:=", z] for x, y, z in points],
+                ["NAME:PolylineSegments"] + [["NAME:PLSegment", "SegmentType:=", "Line", "StartIndex:=", i,
+                                              "NoOfPoints:=", 2] for i in range(len(points) - 1)],
+                ["NAME:PolylineXSection", "XSectionType:=", "None", "XSectionOrient:=", "Auto",
+                 "XSectionWidth:=", "0mm", "XSectionTopWidth:=", "0mm", "XSectionHeight:=", "0mm",
+                 "XSectionNumSegments:=", "0", "XSectionBendType:=", "Corner"]]
+
+
+class Boolean(object):
+    """
+    布尔运算基类, operands 中第一个对象保留其名称作为结果
+    """
+
+    def __init__(self, operands, keep_originals: bool = False):
+        self.operands = tuple(operands)
+        self.keep_originals = keep_originals
+
+    def Consumed(self) -> tuple:
+        """
+        运算后不再存在的对象
+        """
+        return () if self.keep_originals else self.operands[1:]
+
+    def Key(self) -> tuple:
+        return type(self).__name__, self.operands, self.keep_originals
+
+    def Call(self) -> tuple:
+        raise NotImplementedError
+
+
+class Subtract(Boolean):
+    def __init__(self, blank: str, tools, keep_originals: bool = False):
+        """
+        :param blank: 被减对象
+        :param tools: 减去的对象名称列表
+        """
+        super(Subtract, self).__init__([blank] + list(tools), keep_originals)
+
+    def Call(self) -> tuple:
+        return ("Subtract",
+                (["NAME:Selections", "Blank Parts:=", self.operands[0], "Tool Parts:=", ",".join(self.operands[1:])],
+                 ["NAME:SubtractParameters", "KeepOriginals:=", self.keep_originals]))
+
+
+class Unite(Boolean):
+    def __init__(self, names, keep_originals: bool = False):
+        super(Unite, self).__init__(names, keep_originals)
+
+    def Call(self) -> tuple:
+        return ("Unite",
+                (["NAME:Selections", "Selections:=", ",".join(self.operands)],
+                 ["NAME:UniteParameters", "KeepOriginals:=", self.keep_originals]))
+
+
+class Component(object):
+    """
+    通过布尔运算连接的一组对象, 没有布尔运算的对象单独为一个 Component
+    """
+
+    def __init__(self, names, booleans):
+        """
+        :param names: 对象名称, 按模型中的顺序
+        """
+        self.order = list(names)
+        self.names = frozenset(names)
+        self.booleans = list(booleans)
+
+    def Survivors(self) -> list:
+        consumed = set()
+        for boolean in self.booleans:
+            consumed.update(boolean.Consumed())
+        return [name for name in self.order if name not in consumed]
+
+
+class Model(object):
+    """
+    声明式的几何模型: 设计变量、模型对象及布尔运算, 按添加顺序创建
+    """
+
+    def __init__(self, variables: dict = None):
+        """
+        :param variables: {设计变量名: 值} 值为数值时单位为 mm
+        """
+        self.variables = OrderedDict(variables or {})
+        self.shapes = OrderedDict()  # {名称: Shape}
+        self.booleans = []  # type: List[Boolean]
+
+    def Add(self, *shapes):
+        for shape in shapes:
+            if shape.name in self.shapes:
+                raise ValueError("模型对象名称重复: " + shape.name)
+            self.shapes[shape.name] = shape
+        return self
+
+    def AddBoolean(self, boolean: Boolean):
+        missing = [name for name in boolean.operands if name not in self.shapes]
+        if missing:
+            raise ValueError("布尔运算的对象不存在: " + ", ".join(missing))
+        self.booleans.append(boolean)
+        return self
+
+    def Subtract(self, blank: str, tools, keep_originals: bool = False):
+        return self.AddBoolean(Subtract(blank, tools, keep_originals))
+
+    def Unite(self, names, keep_originals: bool = False):
+        return self.AddBoolean(Unite(names, keep_originals))
+
+    def Components(self) -> List[Component]:
+        """
+        按布尔运算划分对象
+        """
+        parent = {name: name for name in self.shapes}
+
+        def Find(name):
+            while parent[name] != name:
+                parent[name] = parent[parent[name]]
+                name = parent[name]
+            return name
+
+        for boolean in self.booleans:
+            root = Find(boolean.operands[0])
+            for name in boolean.operands[1:]:
+                parent[Find(name)] = root
+        groups = OrderedDict()
+        for name in self.shapes:
+            groups.setdefault(Find(name), []).append(name)
+        components = []
+        for names in groups.values():
+            members = set(names)
+            components.append(Component(names, [b for b in self.booleans if b.operands[0] in members]))
+        return components
+
+    def Copy(self):
+        """
+        复制模型, 各对象的属性均为不可变值, 逐个浅复制
+        """
+        model = Model(self.variables)
+        model.shapes = OrderedDict((name, copy.copy(shape)) for name, shape in self.shapes.items())
+        model.booleans = list(self.booleans)
+        return model
+
+    def Survivors(self) -> list:
+        """
+        布尔运算后模型中存在的对象
+        """
+        return [name for component in self.Components() for name in component.Survivors()]
+
+
+class Plan(object):
+    """
+    编译结果: 按顺序执行的 Editor 调用 [(方法名, 参数元组)] 及统计
+    """
+
+    def __init__(self):
+        self.calls = []
+        self.created, self.deleted, self.edited, self.rebuilt = [], [], [], []
+
+    def Stats(self) -> dict:
+        return {"editor_calls": len(self.calls), "created": len(self.created),
+                "deleted": len(self.deleted), "edited": len(self.edited), "rebuilt": len(self.rebuilt)}
+
+
+def VectorProperty(name: str, value) -> list:
+    if isinstance(value, tuple) and len(value) == 3:
+        return ["NAME:" + name, "X:=", value[0], "Y:=", value[1], "Z:=", value[2]]
+    return ["NAME:" + name, "Value:=", value]
+
+
+def Compile(model: Model, applied: Model = None, existing=None) -> Plan:
+    """
+    比较模型与上一次应用的模型, 生成 Editor 调用
+    :param model: 新模型
+    :param applied: 上一次应用的模型, 为 None 时全部创建
+    :param existing: 设计中实际存在的对象名称, 为 None 时认为与 applied 一致
+    :return: Plan
+    """
+    plan = Plan()
+    applied = applied if applied is not None else Model()
+    old_components = applied.Components()
+    new_components = model.Components()
+    old_by_names = {component.names: component for component in old_components}
+    old_survivors = set(applied.Survivors())
+    existing = set(existing) if existing is not None else old_survivors
+
+    # 需要 (重新) 创建的对象
+    rebuild = set()
+    for component in new_components:
+        old = old_by_names.get(component.names)
+        if old is None or [b.Key() for b in old.booleans] != [b.Key() for b in component.booleans]:
+            rebuild |= component.names
+            continue
+        for name in component.Survivors():
+            if name not in existing:
+                rebuild |= component.names
+        if component.booleans:
+            # 布尔运算的结果不能直接修改各操作对象的尺寸
+            if any(model.shapes[n].Geometry() != applied.shapes[n].Geometry() for n in component.names):
+                rebuild |= component.names
+        else:
+            (name,) = component.names
+            new, old_shape = model.shapes[name], applied.shapes[name]
+            if type(new) is not type(old_shape) or (not new.editable and new.Geometry() != old_shape.Geometry()):
+                rebuild.add(name)
+    # 与上一次应用的模型无关但名称已存在的对象需要删除后重建
+    rebuild |= set(name for name in model.shapes if name in existing and name not in applied.shapes)
+    # 删除旧的布尔运算结果会删除其全部操作对象, 与之相关的新对象及其所在的整体都需要重建
+    changed = True
+    while changed:
+        changed = False
+        for component in old_components:
+            if component.names & rebuild:
+                extra = (component.names & set(model.shapes)) - rebuild
+                if extra:
+                    rebuild |= extra
+                    changed = True
+        for component in new_components:
+            if component.names & rebuild and not component.names <= rebuild:
+                rebuild |= component.names
+                changed = True
+
+    delete = []
+    for component in old_components:
+        if component.names & rebuild or not component.names & set(model.shapes):
+            delete.extend(name for name in component.Survivors() if name in existing)
+    delete.extend(name for name in model.shapes if name in rebuild and name in existing and name not in delete)
+    if delete:
+        plan.calls.append(("Delete", (["NAME:Selections", "Selections:=", ",".join(delete)],)))
+        plan.deleted = delete
+
+    for name, shape in model.shapes.items():
+        if name in rebuild:
+            plan.calls.append((shape.command, (shape.Parameters(), shape.Attributes())))
+            plan.created.append(name)
+            if name in applied.shapes:
+                plan.rebuilt.append(name)
+    for component in new_components:
+        if component.names & rebuild:
+            for boolean in component.booleans:
+                plan.calls.append(boolean.Call())
+
+    # 未重建的对象只修改变化的属性, 相同的修改合并为一次调用
+    geometry_groups, material_groups, appearance_groups = OrderedDict(), OrderedDict(), OrderedDict()
+    for component in new_components:
+        if component.names & rebuild:
+            continue
+        for name in component.Survivors():
+            new, old = model.shapes[name], applied.shapes[name]
+            if not component.booleans:
+                old_props, new_props = old.Properties(), new.Properties()
+                changes = tuple((k, v) for k, v in new_props.items() if old_props.get(k) != v)
+                if changes:
+                    geometry_groups.setdefault((new.command, changes), []).append(name)
+            if new.Material() != old.Material():
+                material_groups.setdefault(new.Material(), []).append(name)
+            if new.Appearance() != old.Appearance():
+                appearance_groups.setdefault(new.Appearance(), []).append(name)
+            if (new.Geometry(), new.Material(), new.Appearance()) != (old.Geometry(), old.Material(),
+                                                                       old.Appearance()):
+                plan.edited.append(name)
+    for (command, changes), names in geometry_groups.items():
+        servers = ["%s:%s:1" % (name, command) for name in names]
+        plan.calls.append(("ChangeProperty", (["NAME:AllTabs",
+                                               ["NAME:Geometry3DCmdTab",
+                                                ["NAME:PropServers"] + servers,
+                                                ["NAME:ChangedProps"] + [VectorProperty(k, v) for k, v in changes]]],)))
+    for (material, solve_inside), names in material_groups.items():
+        plan.calls.append(("AssignMaterial", (["NAME:Selections", "Selections:=", ",".join(names)],
+                                              ["NAME:Attributes", "MaterialValue:=", "\"%s\"" % material,
+                                               "SolveInside:=", solve_inside])))
+    for (color, transparency), names in appearance_groups.items():
+        plan.calls.append(("ChangeProperty", (["NAME:AllTabs",
+                                               ["NAME:Geometry3DAttributeTab",
+                                                ["NAME:PropServers"] + names,
+                                                ["NAME:ChangedProps",
+                                                 ["NAME:Color", "R:=", color[0], "G:=", color[1], "B:=", color[2]],
+                                                 ["NAME:Transparent", "Value:=", transparency]]]],)))
+    return plan
+
+
+def ApplyVariables(variables: dict, context=None) -> int:
+    """
+    新建不存在的设计变量, 已存在的设计变量只修改值变化的, 全部打包在一次 ChangeProperty 调用中完成.
+    值由 Expression 格式化: 数值加 mm, 字符串 (表达式或带单位的值) 不变
+    :param variables: {设计变量名: 值} 如 {"length": 30, "pitch": "60mm", "gap": "2*length"}
+    :return: 新建或修改的设计变量个数
+    """
+    if not variables:
+        return 0
+    ctx = ResolveContext(context)
+    names = set(basic.GetVariableName(ctx))
+    new_props = ["NAME:NewProps"]
+    changed_props = ["NAME:ChangedProps"]
+    for name, value in variables.items():
+        value = Expression(value)
+        prop = ["NAME:" + name, "PropType:=", "VariableProp", "UserDef:=", True, "Value:=", value]
+        if name not in names:
+            new_props.append(prop)
+        elif ctx.oDesign.variable_cache.Peek(name) != value:
+            changed_props.append(prop)
+    tab = ["NAME:LocalVariableTab", ["NAME:PropServers", "LocalVariables"]]
+    for props in (new_props, changed_props):
+        if len(props) > 1:
+            tab.append(props)
+    if len(tab) == 2:
+        return 0
+    ctx.oDesign.ChangeProperty(["NAME:AllTabs", tab])
+    return len(new_props) + len(changed_props) - 2
+
+
+def Apply(model: Model, context=None, verify: bool = True) -> dict:
+    """
+    应用模型: 修改设计变量 (只修改变化的变量), 执行与上一次应用的模型之间的差异
+    :param model: Model
+    :param verify: 为 True 时先读取设计中实际存在的对象 (一次调用), 被外部删除的对象重新创建
+    :return: {"editor_calls", "created", "deleted", "edited", "rebuilt", "variables": 新建或修改的设计变量个数}
+    """
+    ctx = ResolveContext(context)
+    editor = ctx.GetEditor()
+    applied = ctx.oDesign.geometry_model
+    existing = None
+    if verify:
+        existing = editor.GetMatchedObjectName("*") or ()
+    plan = Compile(model, applied, existing)
+    variables = ApplyVariables(model.variables, ctx)
+    for method, args in plan.calls:
+        getattr(editor, method)(*args)
+    if plan.calls:
+        # 几何变化后已有的求解结果不再有效
+        ctx.oDesign.ModelChanged()
+        ctx.oDesign.solution_state.Invalidate()
+    ctx.oDesign.geometry_model = model.Copy()
+    return dict(plan.Stats(), variables=variables)
+
+
+def Invalidate(context=None):
+    """
+    在 AEDT 界面或直接通过 oEditor 修改模型后调用, 下次 Apply 时按名称重建模型中的对象
+    :return: None
+    """
+    ctx = ResolveContext(context)
+    ctx.oDesign.geometry_model = None
+    ctx.oDesign.ModelChanged()
+
+
+def CreateElement(element, context=None) -> list:
+    """
+    创建阵列单元
+    :param element: 单元的 Model (设计变量、模型对象及布尔运算), 或设计中已存在的单元对象名称列表
+                    (如已分配端口的贴片和馈电面, 复制时一并复制端口)
+    :return: 单元中布尔运算后存在的对象名称
+    """
+    if not isinstance(element, Model):
+        return [str(name) for name in element]
+    ctx = ResolveContext(context)
+    editor = ctx.GetEditor()
+    # 同名对象已存在时 AEDT 自动改名, 之后的复制将使用错误的名称
+    existing = set(editor.GetMatchedObjectName("*") or ())
+    clash = [name for name in element.shapes if name in existing]
+    if clash:
+        raise ValueError("阵列单元的对象名称已存在: " + ", ".join(clash))
+    ApplyVariables(element.variables, ctx)
+    for method, args in Compile(element, existing=()).calls:
+        getattr(editor, method)(*args)
+    ctx.oDesign.ModelChanged()
+    ctx.oDesign.solution_state.Invalidate()
+    return element.Survivors()
+
+
+def SplitClones(names, created, count: int) -> list:
+    """
+    按副本划分复制得到的对象名称, 复制命令按副本顺序返回, 每个副本内按选择的对象顺序
+    :return: [(第 1 个副本的对象名称, ...), ...]
+    """
+    created = list(created or ())
+    if len(created) != len(names) * (count - 1):
+        raise RuntimeError("复制得到 %d 个对象, 应为 %d 个" % (len(created), len(names) * (count - 1)))
+    size = len(names)
+    return [tuple(created[i * size:(i + 1) * size]) for i in range(count - 1)]
+
+
+def DuplicateAlongLine(names, vector, count: int, duplicate_assignments: bool = True, context=None) -> list:
+    """
+    沿直线复制对象, 一次 Editor 调用
+    :param names: 对象名称列表
+    :param vector: 相邻副本之间的位移 (X, Y, Z), 可以是表达式
+    :param count: 包括原对象在内的个数
+    :param duplicate_assignments: 是否同时复制对象上的边界条件和激励 (端口)
+    :return: [(第 1 个副本的对象名称, ...), ...] 共 count - 1 个
+    """
+    if count < 2:
+        return []
+    x, y, z = Vector(vector)
+    created = ResolveContext(context).GetEditor().DuplicateAlongLine(
+        ["NAME:Selections", "Selections:=", ",".join(names), "NewPartsModelFlag:=", "Model"],
+        ["NAME:DuplicateToAlongLineParameters", "CreateNewObjects:=", True,
+         "XComponent:=", x, "YComponent:=", y, "ZComponent:=", z, "NumClones:=", str(count)],
+        ["NAME:Options", "DuplicateAssignments:=", duplicate_assignments],
+        ["CreateGroupsForNewObjects:=", False])
+    return SplitClones(names, created, count)
+
+
+def DuplicateAroundAxis(names, count: int, angle=None, axis: str = "Z", duplicate_assignments: bool = True,
+                        context=None) -> list:
+    """
+    绕坐标轴复制对象, 一次 Editor 调用
+    :param count: 包括原对象在内的个数
+    :param angle: 相邻副本之间的转角, 数值单位为 deg, 默认 360deg / count
+    :param axis: 转轴 "X", "Y" 或 "Z"
+    :return: [(第 1 个副本的对象名称, ...), ...] 共 count - 1 个
+    """
+    if count < 2:
+        return []
+    angle = Expression(angle if angle is not None else 360.0 / count, "deg")
+    created = ResolveContext(context).GetEditor().DuplicateAroundAxis(
+        ["NAME:Selections", "Selections:=", ",".join(names), "NewPartsModelFlag:=", "Model"],
+        ["NAME:DuplicateAroundAxisParameters", "CreateNewObjects:=", True, "WhichAxis:=", axis,
+         "AngleStr:=", angle, "NumClones:=", str(count)],
+        ["NAME:Options", "DuplicateAssignments:=", duplicate_assignments],
+        ["CreateGroupsForNewObjects:=", False])
+    return SplitClones(names, created, count)
+
+
+def RectangularArray(element, rows: int, columns: int, spacing, duplicate_assignments: bool = True,
+                     context=None) -> OrderedDict:
+    """
+    矩形阵列: 创建一个单元, 沿 X 方向复制为一行, 再将该行沿 Y 方向复制, 与单元个数无关, 共 2 次复制调用.
+    阵列对象不属于 Apply 的模型, 之后的 Apply 不会修改或删除它们
+    :param element: 单元的 Model 或设计中已存在的单元对象名称列表, 见 CreateElement
+    :param rows: 行数 (Y 方向)
+    :param columns: 列数 (X 方向)
+    :param spacing: (列间距, 行间距), 可以是表达式, 如 ("pitch", "pitch")
+    :return: {(行, 列): (对象名称, ...)}, (0, 0) 为单元本身, 各单元内的对象顺序相同
+    """
+    ctx = ResolveContext(context)
+    names = CreateElement(element, ctx)
+    dx, dy = Expression(spacing[0]), Expression(spacing[1])
+    row = [tuple(names)] + DuplicateAlongLine(names, (dx, "0mm", "0mm"), columns, duplicate_assignments, ctx)
+    row_names = [name for element_names in row for name in element_names]
+    copies = DuplicateAlongLine(row_names, ("0mm", dy, "0mm"), rows, duplicate_assignments, ctx)
+    layout = OrderedDict()
+    size = len(names)
+    for i, row_copy in enumerate([tuple(row_names)] + copies):
+        for j in range(columns):
+            layout[(i, j)] = row_copy[j * size:(j + 1) * size]
+    if columns > 1 or rows > 1:
+        ctx.oDesign.ModelChanged()
+        ctx.oDesign.solution_state.Invalidate()
+    return layout
+
+
+def CircularArray(element, count: int, angle=None, axis: str = "Z", duplicate_assignments: bool = True,
+                  context=None) -> OrderedDict:
+    """
+    环形阵列: 创建一个单元, 绕坐标轴复制, 一次复制调用
+    :param element: 单元的 Model 或设计中已存在的单元对象名称列表, 见 CreateElement
+    :param count: 单元个数
+    :param angle: 相邻单元之间的转角, 数值单位为 deg, 默认 360deg / count
+    :return: {序号: (对象名称, ...)}, 0 为单元本身
+    """
+    ctx = ResolveContext(context)
+    names = CreateElement(element, ctx)
+    copies = DuplicateAroundAxis(names, count, angle, axis, duplicate_assignments, ctx)
+    if copies:
+        ctx.oDesign.ModelChanged()
+        ctx.oDesign.solution_state.Invalidate()
+    return OrderedDict(enumerate([tuple(names)] + copies))
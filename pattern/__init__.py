@@ -0,0 +1,290 @@
+"""
+@FileName: pattern/__init__.py
+@Description: 该文件提供三维辐射方向图的二进制存储. 方向图保存为一个文件夹: pattern.json 记录表达式及 Freq/Phi/Theta 坐标轴,
+              数据为 float32 的 (频点数, Phi 点数, Theta 点数) 网格, 保存在一个数据文件中或每个频点一个数据文件中.
+              读取时以 np.memmap 按需映射, 取某一频点或某一 Phi 切面只读取对应的数据, 不解析整个网格.
+              使用方法:
+                  pattern.PatternFromCsv(csv_path, store_path)  # 转换 Generate3DGainRadiationPattern 导出的 CSV
+                  with pattern.OpenPattern(store_path) as stored:
+                      theta, gain = stored.theta, stored.PhiCut(2.5, 0)
+@Author: SJY
+@Time: 2026/10/18
+@Coding: UTF-8
+@Vision: V1.0
+"""
+
+# Official Standard Library
+import json
+import os
+
+# Third-party Library
+import numpy as np
+
+# Import the OSL with "from"
+from typing import Dict, List
+
+# Import the LL with "from"
+from hfss.metrics import FrequencyIndex, AngleIndex
+
+
+# 存储格式的版本及文件名
+STORE_VERSION = 1
+METADATA_FILE = "pattern.json"
+DATA_FILE = "data.f32"
+FREQUENCY_FILE = "freq_%05d.f32"
+DTYPE = "<f4"
+# 导出的 CSV 中坐标轴的列名
+AXIS_COLUMNS = {"Freq": "Freq [GHz]", "Phi": "Phi [deg]", "Theta": "Theta [deg]"}
+
+
+class PatternError(Exception):
+    """
+    方向图存储不存在、格式错误或查询的频点/角度不存在
+    """
+    pass
+
+
+def _ReadMetadata(store_path: str) -> dict:
+    file_path = os.path.join(store_path, METADATA_FILE)
+    if not os.path.exists(file_path):
+        raise PatternError("方向图存储不存在: " + store_path)
+    with open(file_path, "r", encoding="utf-8") as f:
+        metadata = json.load(f)
+    if metadata.get("version") != STORE_VERSION:
+        raise PatternError("不支持的方向图存储版本: " + str(metadata.get("version")))
+    return metadata
+
+
+def _WriteMetadata(store_path: str, metadata: dict):
+    # 先写临时文件再替换, 读取方不会读到写了一半的元数据
+    temporary = os.path.join(store_path, METADATA_FILE + ".tmp")
+    with open(temporary, "w", encoding="utf-8") as f:
+        json.dump(metadata, f, indent=1)
+    os.replace(temporary, os.path.join(store_path, METADATA_FILE))
+
+
+def SavePattern(store_path: str, freqs, phi, theta, values, expression: str = "dB(GainTotal)",
+                per_frequency: bool = False) -> str:
+    """
+    保存方向图网格, 已存在的存储被覆盖
+    :param store_path: 存储文件夹路径
+    :param freqs: 频率数组 单位 GHz
+    :param phi: Phi 数组 单位 deg
+    :param theta: Theta 数组 单位 deg
+    :param values: (频点数, Phi 点数, Theta 点数) 数组
+    :param expression: 数据的表达式 如 "dB(GainTotal)"
+    :param per_frequency: 为 True 时每个频点保存为一个数据文件, 之后可用 AddFrequency 追加频点
+    :return: 存储文件夹路径
+    """
+    freqs, phi, theta = (np.asarray(a, dtype=float).ravel() for a in (freqs, phi, theta))
+    values = np.asarray(values, dtype=DTYPE)
+    if values.shape != (len(freqs), len(phi), len(theta)):
+        raise PatternError("数据形状 %s 与坐标轴 (%d, %d, %d) 不符" % (values.shape, len(freqs), len(phi), len(theta)))
+    if os.path.exists(store_path) is False:
+        os.makedirs(store_path)
+    if per_frequency:
+        files = []
+        for i in range(len(freqs)):
+            files.append(FREQUENCY_FILE % i)
+            values[i].tofile(os.path.join(store_path, files[-1]))
+    else:
+        files = [DATA_FILE]
+        values.tofile(os.path.join(store_path, DATA_FILE))
+    _WriteMetadata(store_path, {
+        "version": STORE_VERSION,
+        "expression": expression,
+        "dtype": DTYPE,
+        "per_frequency": per_frequency,
+        "freqs": freqs.tolist(),
+        "phi": phi.tolist(),
+        "theta": theta.tolist(),
+        "files": files,
+    })
+    return store_path
+
+
+def AddFrequency(store_path: str, frequency: float, grid, phi=None, theta=None,
+                 expression: str = "dB(GainTotal)") -> str:
+    """
+    向每个频点一个数据文件的存储追加 (或替换) 一个频点, 不重写其他频点的数据; 存储不存在时创建
+    :param store_path: 存储文件夹路径
+    :param frequency: 单位 GHz
+    :param grid: (Phi 点数, Theta 点数) 数组
+    :param phi: Phi 数组 单位 deg, 创建存储时必需
+    :param theta: Theta 数组 单位 deg, 创建存储时必需
+    :param expression: 创建存储时的表达式
+    :return: 存储文件夹路径
+    """
+    grid = np.asarray(grid, dtype=DTYPE)
+    if not os.path.exists(os.path.join(store_path, METADATA_FILE)):
+        if phi is None or theta is None:
+            raise PatternError("创建方向图存储需要给出 phi 和 theta")
+        return SavePattern(store_path, [frequency], phi, theta, grid[np.newaxis], expression, True)
+    metadata = _ReadMetadata(store_path)
+    if not metadata["per_frequency"]:
+        raise PatternError("只能向每个频点一个数据文件的存储追加频点: " + store_path)
+    if grid.shape != (len(metadata["phi"]), len(metadata["theta"])):
+        raise PatternError("数据形状 %s 与存储的坐标轴不符" % (grid.shape,))
+    index = FrequencyIndex(metadata["freqs"], frequency)
+    if index < 0:
+        # 按频率顺序插入
+        index = int(np.searchsorted(metadata["freqs"], frequency))
+        metadata["freqs"].insert(index, float(frequency))
+        # 数据文件按创建的顺序编号, 与频率顺序无关
+        metadata["files"].insert(index, FREQUENCY_FILE % len(metadata["files"]))
+    grid.tofile(os.path.join(store_path, metadata["files"][index]))
+    _WriteMetadata(store_path, metadata)
+    return store_path
+
+
+def PatternFromArrays(store_path: str, axes: Dict[str, np.ndarray], values, expression: str,
+                      per_frequency: bool = False) -> str:
+    """
+    由坐标轴字典和多维数组 (GetSolutionData 的 axes/data) 保存方向图, 各维按 axes 的顺序, 保存时转置为 (Freq, Phi, Theta)
+    :param store_path: 存储文件夹路径
+    :param axes: {"Freq": 数组, "Phi": 数组, "Theta": 数组}, 可含其他长度为 1 的扫描变量
+    :param values: 多维数组
+    :param expression: 数据的表达式
+    :param per_frequency: 见 SavePattern
+    :return: 存储文件夹路径
+    """
+    names = list(axes)
+    values = np.asarray(values)
+    for name in ("Freq", "Phi", "Theta"):
+        if name not in names:
+            raise PatternError("缺少扫描变量: " + name)
+    order = [names.index(name) for name in ("Freq", "Phi", "Theta")]
+    others = [i for i in range(len(names)) if i not in order]
+    if any(values.shape[i] != 1 for i in others):
+        raise PatternError("除 Freq/Phi/Theta 外的扫描变量只能有一个值")
+    grid = values.transpose(order + others).reshape(values.shape[order[0]], values.shape[order[1]],
+                                                     values.shape[order[2]])
+    return SavePattern(store_path, axes["Freq"], axes["Phi"], axes["Theta"], grid, expression, per_frequency)
+
+
+def PatternFromCsv(csv_path: str, store_path: str = None, expression: str = None,
+                   per_frequency: bool = False) -> str:
+    """
+    将报告导出的方向图 CSV (Freq [GHz], Phi [deg], Theta [deg], 数据列) 转换为二进制存储, 行的顺序不限, 缺少的点为 NaN
+    :param csv_path: CSV 文件路径
+    :param store_path: 存储文件夹路径, 默认为 CSV 文件路径去掉 .csv 后加 .pattern
+    :param expression: 数据列的表达式 如 "dB(GainTotal)", 默认为第一个数据列
+    :param per_frequency: 见 SavePattern
+    :return: 存储文件夹路径
+    """
+    import pandas as pd
+    if store_path is None:
+        store_path = os.path.splitext(csv_path)[0] + ".pattern"
+    df = pd.read_csv(csv_path)
+    data_columns = [c for c in df.columns if c not in AXIS_COLUMNS.values()]
+    if expression is None:
+        column = data_columns[0]
+        expression = column.rsplit(" [", 1)[0]
+    else:
+        column = [c for c in data_columns if c.rsplit(" [", 1)[0] == expression][0]
+    axes, indices = [], []
+    for name in ("Freq", "Phi", "Theta"):
+        axis, index = np.unique(df[AXIS_COLUMNS[name]].values, return_inverse=True)
+        axes.append(axis)
+        indices.append(index)
+    grid = np.full(tuple(len(a) for a in axes), np.nan, dtype=DTYPE)
+    grid[tuple(indices)] = df[column].values
+    return SavePattern(store_path, axes[0], axes[1], axes[2], grid, expression, per_frequency)
+
+
+class StoredPattern(object):
+    """
+    已保存的方向图 数据文件在首次访问时以只读 np.memmap 映射, 返回的数组为映射的视图, 用完后调用 Close 或使用 with 语句
+    freqs: 频率数组 单位 GHz; phi/theta: 角度数组 单位 deg
+    """
+
+    def __init__(self, store_path: str):
+        metadata = _ReadMetadata(store_path)
+        self.store_path = store_path
+        self.expression = metadata["expression"]
+        self.dtype = np.dtype(metadata["dtype"])
+        self.per_frequency = metadata["per_frequency"]
+        self.freqs = np.asarray(metadata["freqs"], dtype=float)
+        self.phi = np.asarray(metadata["phi"], dtype=float)
+        self.theta = np.asarray(metadata["theta"], dtype=float)
+        self.files: List[str] = metadata["files"]
+        self.__maps = {}
+
+    @property
+    def shape(self):
+        return len(self.freqs), len(self.phi), len(self.theta)
+
+    def __Map(self, file_index: int) -> np.memmap:
+        if file_index not in self.__maps:
+            shape = self.shape[1:] if self.per_frequency else self.shape
+            self.__maps[file_index] = np.memmap(os.path.join(self.store_path, self.files[file_index]),
+                                                dtype=self.dtype, mode="r", shape=shape)
+        return self.__maps[file_index]
+
+    def FrequencyIndex(self, frequency: float) -> int:
+        index = FrequencyIndex(self.freqs, frequency)
+        if index < 0:
+            raise PatternError("方向图中没有该频点: %s GHz" % frequency)
+        return index
+
+    def Frequency(self, frequency: float) -> np.ndarray:
+        """
+        某一频点的 (Phi 点数, Theta 点数) 网格
+        :param frequency: 单位 GHz
+        """
+        index = self.FrequencyIndex(frequency)
+        if self.per_frequency:
+            return self.__Map(index)
+        return self.__Map(0)[index]
+
+    def PhiCut(self, frequency: float, phi: float) -> np.ndarray:
+        """
+        某一频点、最接近 phi 的切面, 沿 theta 的一维数组, 在数据文件中连续存放
+        :param frequency: 单位 GHz
+        :param phi: 单位 deg
+        """
+        return self.Frequency(frequency)[AngleIndex(self.phi, phi)]
+
+    def ThetaCut(self, frequency: float, theta: float) -> np.ndarray:
+        """
+        某一频点、最接近 theta 的切面, 沿 phi 的一维数组
+        :param frequency: 单位 GHz
+        :param theta: 单位 deg
+        """
+        return self.Frequency(frequency)[:, AngleIndex(self.theta, theta)]
+
+    def Value(self, frequency: float, phi: float, theta: float) -> float:
+        """
+        某一频点、某一方向的数值
+        """
+        return float(self.Frequency(frequency)[AngleIndex(self.phi, phi), AngleIndex(self.theta, theta)])
+
+    def Grid(self) -> np.ndarray:
+        """
+        整个 (频点数, Phi 点数, Theta 点数) 网格, 单个数据文件时为映射视图, 每个频点一个数据文件时读入内存
+        """
+        if self.per_frequency:
+            return np.stack([self.__Map(i) for i in range(len(self.files))])
+        return self.__Map(0)
+
+    def Close(self):
+        """
+        释放数据文件的映射 (Windows 下映射中的文件不能被覆盖或删除)
+        """
+        self.__maps.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.Close()
+        return False
+
+
+def OpenPattern(store_path: str) -> StoredPattern:
+    """
+    打开方向图存储, 只读取元数据
+    :param store_path: 存储文件夹路径
+    :return: StoredPattern
+    """
+    return StoredPattern(store_path)
@@ -0,0 +1,202 @@
+"""
+@FileName: pool/__init__.py
+@Description: 该文件提供多 AEDT 实例的并行评估进程池. 每个工作进程拥有独立的 COM 套间、独立启动的 AEDT 实例和
+              独立的项目副本, 候选解 (变量值) 以 ChangeVariable -> Analyze -> GetAntennaPerformance 的形式
+              分派给空闲的工作进程, 结果按完成顺序返回. 有 N 个许可证时吞吐量约为单实例的 N 倍.
+              使用模拟后端 (simulation 参数) 时无需 AEDT, 可用于测试.
+              使用方法:
+                  with pool.WorkerPool(4, "D:/antenna.aedt", "HFSSDesign1") as workers:
+                      for result in workers.Map(["length", "width"], candidates):
+                          print(result["index"], result["performance"])
+              给出 surrogate (hfss.surrogate.Surrogate) 时先用代理模型预筛选, 预测不满足条件的候选解不求解.
+@Author: SJY
+@Time: 2026/10/18
+@Coding: UTF-8
+@Vision: V1.0
+"""
+
+# Official Standard Library
+import copy
+import multiprocessing
+import multiprocessing.util
+import os
+import shutil
+import tempfile
+import time
+
+# Import the OSL with "from"
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, List
+
+# Import the LL with "from"
+import hfss
+from hfss import backend, basic, analysis, cache
+
+
+# 工作进程的状态, 仅在工作进程中有效
+_worker = {}
+
+
+def InitializeWorker(slots, settings: dict):
+    """
+    工作进程初始化: 领取编号, 复制项目, 启动独立的 AEDT 实例 (或模拟后端) 并打开项目副本
+    :param slots: 工作进程编号队列
+    :param settings: WorkerPool 的配置
+    :return: None
+    """
+    index = slots.get()
+    directory = os.path.join(settings["working_dir"], "worker%d" % index)
+    if os.path.exists(directory) is False:
+        os.makedirs(directory)
+    if settings["simulation"] is not None:
+        config = copy.copy(settings["simulation"])
+        config.project_directory = directory
+        backend.UseSimulated(config)
+    else:
+        # 每个工作进程启动自己的 AEDT 进程, 而不是连接已运行的 AEDT
+        hfss.oAnsoftApp.new_instance = True
+    project_file = settings["project_file"]
+    if project_file is not None:
+        project_path = os.path.join(directory, os.path.basename(project_file))
+        shutil.copyfile(project_file, project_path)
+        basic.OpenProject(project_path)
+        if settings["design_name"] is not None:
+            hfss.oDesign.handle = hfss.oProject.GetDesign(settings["design_name"])
+    if settings["prepare"] is not None:
+        settings["prepare"](index)
+    results = cache.ResultCache(settings["cache_path"]) if settings["cache_path"] is not None else None
+    _worker.update(index=index, directory=directory, simulated=settings["simulation"] is not None, cache=results)
+    # 工作进程退出时关闭其 AEDT 实例
+    multiprocessing.util.Finalize(None, ShutdownWorker, exitpriority=10)
+
+
+def ShutdownWorker():
+    if _worker.get("simulated") is False and hfss.oAnsoftApp.IsConnected():
+        try:
+            basic.CloseAnsysElectronicsDesktop()
+        except Exception as error:
+            print("关闭 AEDT 失败:", error)
+
+
+def EvaluateCandidate(index: int, names: List[str], values: list, setup_name: str, frequency: float) -> dict:
+    """
+    在工作进程中评估一个候选解, 进程池设置了结果缓存时先查询缓存
+    :return: {"index": 候选解序号, "values": 变量值, "performance": (S11, BW, AR, Gain),
+              "elapsed": 耗时 s, "worker": 工作进程编号, "cached": 是否命中缓存}
+    """
+    start = time.perf_counter()
+    results = _worker.get("cache")
+    if results is not None:
+        hits = results.hits
+        performance = cache.EvaluateCandidate(names, values, results, setup_name, frequency)
+        cached = results.hits > hits
+    else:
+        basic.ChangeVariable(names, values)
+        analysis.Analyze(setup_name)
+        performance, cached = analysis.GetAntennaPerformance(frequency), False
+    return {"index": index, "values": list(values), "performance": tuple(float(v) for v in performance),
+            "elapsed": time.perf_counter() - start, "worker": _worker.get("index"), "cached": cached}
+
+
+class WorkerPool(object):
+    """
+    多 AEDT 实例进程池
+    """
+
+    def __init__(self, worker_count: int, project_file: str = None, design_name: str = None,
+                 setup_name: str = "Setup1", frequency: float = 2.5, prepare: Callable[[int], None] = None,
+                 simulation: backend.SimulationConfig = None, working_dir: str = None, cache_path: str = None):
+        """
+        :param worker_count: 工作进程个数, 即同时运行的 AEDT 实例个数 (占用的许可证个数)
+        :param project_file: 项目文件 .aedt, 每个工作进程使用其副本
+        :param design_name: 评估使用的设计名称, 为 None 时使用项目的活动设计
+        :param setup_name: 求解设置名称
+        :param frequency: GetAntennaPerformance 的频率 单位 GHz
+        :param prepare: 工作进程初始化完成后调用的函数, 参数为工作进程编号, 须为模块级函数;
+                        可用于在模拟后端中建立项目, 或在副本中做额外设置
+        :param simulation: 模拟后端配置, 为 None 时使用 COM 连接 AEDT
+        :param working_dir: 项目副本的存放路径, 默认为系统临时文件夹下的 hfss_pool
+        :param cache_path: 结果缓存数据库路径 (见 hfss.cache), 各工作进程共享, 为 None 时不使用缓存
+        """
+        if working_dir is None:
+            working_dir = os.path.join(tempfile.gettempdir(), "hfss_pool")
+        self.worker_count = worker_count
+        self.setup_name = setup_name
+        self.frequency = frequency
+        settings = {"project_file": project_file, "design_name": design_name, "prepare": prepare,
+                    "simulation": simulation, "working_dir": os.path.abspath(working_dir),
+                    "cache_path": os.path.abspath(cache_path) if cache_path is not None else None}
+        # COM 对象不能跨进程继承, 工作进程一律以 spawn 方式启动
+        context = multiprocessing.get_context("spawn")
+        slots = context.Queue()
+        for i in range(worker_count):
+            slots.put(i)
+        self.executor = ProcessPoolExecutor(worker_count, mp_context=context, initializer=InitializeWorker,
+                                            initargs=(slots, settings))
+        self.submitted = 0
+
+    def Submit(self, names: List[str], values: list):
+        """
+        提交一个候选解
+        :param names: 变量名列表
+        :param values: 变量值列表
+        :return: Future, 结果见 EvaluateCandidate
+        """
+        future = self.executor.submit(EvaluateCandidate, self.submitted, list(names), list(values),
+                                      self.setup_name, self.frequency)
+        self.submitted += 1
+        return future
+
+    def Map(self, names: List[str], candidates: List[list], surrogate=None):
+        """
+        评估一组候选解, 按完成顺序逐个返回结果
+        :param names: 变量名列表
+        :param candidates: 候选解列表, 每个候选解为变量值列表
+        :param surrogate: hfss.surrogate.Surrogate, 给出时先预筛选: 预测不满足条件的候选解不提交,
+                          其余按满足条件的概率从高到低提交, 完成的结果加入代理模型
+        :return: 结果生成器, 结果中 index 为候选解在 candidates 中的序号;
+                 使用代理模型时结果另有 skipped 和 probability, 跳过的候选解 performance 为预测值
+        """
+        candidates = [list(values) for values in candidates]
+        decisions = [{"index": i, "skip": False, "probability": None} for i in range(len(candidates))]
+        if surrogate is not None:
+            decisions = surrogate.Screen(candidates)
+        futures = {}
+        for decision in decisions:
+            i = decision["index"]
+            if decision["skip"]:
+                yield {"index": i, "values": candidates[i], "performance": decision["predicted"], "elapsed": 0.0,
+                       "worker": None, "cached": False, "skipped": True, "probability": decision["probability"]}
+            else:
+                futures[self.Submit(names, candidates[i])] = decision
+        for future in as_completed(futures):
+            result = future.result()
+            result["index"] = futures[future]["index"]
+            if surrogate is not None:
+                result.update(skipped=False, probability=futures[future]["probability"])
+                surrogate.Observe(result["values"], result["performance"])
+                surrogate.solved += 1
+            yield result
+
+    def Evaluate(self, names: List[str], candidates: List[list], surrogate=None) -> List[dict]:
+        """
+        评估一组候选解, 全部完成后按 candidates 的顺序返回结果, surrogate 见 Map
+        """
+        results = [None] * len(candidates)
+        for result in self.Map(names, candidates, surrogate):
+            results[result["index"]] = result
+        return results
+
+    def Shutdown(self, wait: bool = True):
+        """
+        关闭进程池, 各工作进程关闭其 AEDT 实例后退出
+        :return: None
+        """
+        self.executor.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.Shutdown()
+        return False
@@ -0,0 +1,413 @@
+"""
+@FileName: replay/__init__.py
+@Description: 该文件提供 COM 调用的录制与回放功能.
+              录制: 在真实 HFSS 会话中记录经过 hfss 各对象 (AnsoftApp, Desktop, Project, Design, Module, Editor)
+                    的每一次调用 (对象、方法、参数、返回值、耗时), 保存为 gzip 压缩的 JSON Lines 文件.
+                    调用返回的 COM 对象 (如求解数据) 上的调用同样被记录.
+              回放: 不需要 HFSS, 按录制顺序返回录制的结果, 可在 Linux 上精确复现一次优化运行的调用序列,
+                    单独测量本库的开销, 并比较不同版本之间的调用次数.
+                    注意: ExportToFile 等调用写出的文件不会在回放时重新生成, 回放中读取的是磁盘上现有的导出文件.
+              使用方法:
+                  with replay.Record("run.jsonl.gz"):
+                      analysis.GetAntennaPerformance(2.5)
+                  with replay.Replay("run.jsonl.gz"):
+                      analysis.GetAntennaPerformance(2.5)
+@Author: SJY
+@Time: 2026/10/18
+@Coding: UTF-8
+@Vision: V1.0
+"""
+
+# Official Standard Library
+import gzip
+import json
+import time
+
+# Import the OSL with "from"
+from collections import Counter
+from typing import Dict, List
+
+# Import the LL with "from"
+import hfss
+from hfss import backend
+
+
+RECORDING_FORMAT = "hfss-api-recording"
+RECORDING_VERSION = 1
+# 脚本接口 (AnsoftApp 的句柄) 的标识
+ROOT_TOKEN = "app"
+
+
+class ReplayMismatch(Exception):
+    """
+    回放时的调用与录制的调用不一致
+    """
+    pass
+
+
+class RecordedComError(Exception):
+    """
+    录制时该调用抛出了异常, 回放时以此异常重现
+    """
+    pass
+
+
+def OpenRecording(file_path: str, mode: str):
+    if file_path.endswith(".gz"):
+        return gzip.open(file_path, mode + "t", encoding="utf-8")
+    return open(file_path, mode, encoding="utf-8")
+
+
+def LoadRecording(file_path: str) -> List[dict]:
+    """
+    读取录制文件
+    :param file_path: 录制文件路径
+    :return: 调用事件列表 每个事件为 {"i": 序号, "h": 对象标识, "o": 对象类名, "m": 方法名, "k": "call"/"get",
+             "a": 参数, "r": 返回值, "e": 异常信息, "t": 耗时}
+    """
+    events = []
+    with OpenRecording(file_path, "r") as f:
+        header = json.loads(f.readline())
+        if header.get("format") != RECORDING_FORMAT:
+            raise ValueError("不是 hfss 录制文件: " + file_path)
+        for line in f:
+            if line.strip():
+                events.append(json.loads(line))
+    return events
+
+
+def CallCounts(events) -> Dict[str, int]:
+    """
+    统计每个方法的调用次数
+    :param events: 事件列表或录制文件路径
+    :return: {"Class.Method": 次数}
+    """
+    if isinstance(events, str):
+        events = LoadRecording(events)
+    return dict(Counter(event["o"] + "." + event["m"] for event in events))
+
+
+def CompareCallCounts(baseline, current) -> Dict[str, tuple]:
+    """
+    比较两次录制 (或回放) 的调用次数, 用于发现版本之间调用次数的回归
+    :param baseline: 基准的事件列表、录制文件路径或调用次数字典
+    :param current: 当前的事件列表、录制文件路径或调用次数字典
+    :return: {"Class.Method": (基准次数, 当前次数)} 仅包含次数不同的方法
+    """
+    if not isinstance(baseline, dict):
+        baseline = CallCounts(baseline)
+    if not isinstance(current, dict):
+        current = CallCounts(current)
+    return {key: (baseline.get(key, 0), current.get(key, 0))
+            for key in sorted(set(baseline) | set(current))
+            if baseline.get(key, 0) != current.get(key, 0)}
+
+
+# 录制
+class RecordingHandle(object):
+    """
+    录制代理 由 Recorder 的句柄钩子在读取 handle 时创建, 调用转发给真实句柄并记录
+    """
+    __slots__ = ("raw", "token", "owner", "recorder")
+
+    def __init__(self, raw, token: str, owner: str, recorder):
+        self.raw = raw
+        self.token = token
+        self.owner = owner
+        self.recorder = recorder
+
+    def __getattr__(self, name):
+        recorder = self.recorder
+        start = time.perf_counter()
+        try:
+            attribute = getattr(self.raw, name)
+        except Exception as error:
+            recorder.Record(self, "get", name, (), None, error, time.perf_counter() - start)
+            raise
+        if not callable(attribute):
+            recorder.Record(self, "get", name, (), attribute, None, time.perf_counter() - start)
+            return attribute
+
+        def Call(*args):
+            call_start = time.perf_counter()
+            try:
+                result = attribute(*args)
+            except Exception as error:
+                recorder.Record(self, "call", name, args, None, error, time.perf_counter() - call_start)
+                raise
+            recorder.Record(self, "call", name, args, result, None, time.perf_counter() - call_start)
+            return recorder.Wrap(result, name)
+        return Call
+
+    def __eq__(self, other):
+        if isinstance(other, RecordingHandle):
+            other = other.raw
+        return self.raw == other
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash(self.raw)
+
+
+class Recorder(object):
+    """
+    录制器 Start() 后经过 hfss 各对象的调用被写入录制文件, Stop() 结束录制
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.file = None
+        self.sequence = 0
+        self.tokens = {}  # {id(句柄): (句柄, 标识)} 保留句柄引用以免 id 被复用
+        self.adopted = []  # 未经录制的调用得到的句柄, 回放时无法复现
+        self.previous_factory = None
+
+    def Token(self, raw, adopt: bool = False) -> str:
+        entry = self.tokens.get(id(raw))
+        if entry is None:
+            token = "h%d" % len(self.tokens)
+            self.tokens[id(raw)] = (raw, token)
+            if adopt:
+                self.adopted.append(token)
+            return token
+        return entry[1]
+
+    def Encode(self, value):
+        """
+        将参数/返回值编码为 JSON 可序列化的值, COM 对象编码为 {"__handle__": 标识}
+        """
+        if value is None or isinstance(value, (bool, int, float, str)):
+            return value
+        if isinstance(value, list):
+            return [self.Encode(v) for v in value]
+        if isinstance(value, tuple):
+            return {"__tuple__": [self.Encode(v) for v in value]}
+        if isinstance(value, RecordingHandle):
+            value = value.raw
+        return {"__handle__": self.Token(value)}
+
+    def Wrap(self, value, owner: str):
+        """
+        调用返回的 COM 对象 (如 GetSolutionDataPerVariation 返回的求解数据) 也包装为录制代理, 以记录对它们的调用
+        """
+        if value is None or isinstance(value, (bool, int, float, str, RecordingHandle)):
+            return value
+        if isinstance(value, (list, tuple)):
+            return type(value)(self.Wrap(v, owner) for v in value)
+        return RecordingHandle(value, self.Token(value), owner, self)
+
+    def Hook(self, instance, handle):
+        if type(handle) is RecordingHandle:
+            handle = handle.raw
+        return RecordingHandle(handle, self.Token(handle, adopt=True), type(instance).__name__, self)
+
+    def AppFactory(self, hfss_app: str, new_instance: bool):
+        if self.previous_factory is not None:
+            raw = self.previous_factory(hfss_app, new_instance)
+        else:
+            raw = hfss.DefaultAppFactory(hfss_app, new_instance)
+        self.tokens[id(raw)] = (raw, ROOT_TOKEN)
+        return raw
+
+    def Record(self, proxy: RecordingHandle, kind: str, method: str, args, result, error, latency: float):
+        event = {"i": self.sequence, "h": proxy.token, "o": proxy.owner, "m": method, "k": kind,
+                 "a": self.Encode(list(args)), "t": round(latency, 9)}
+        if error is not None:
+            event["e"] = "%s: %s" % (type(error).__name__, error)
+        else:
+            event["r"] = self.Encode(result)
+        self.sequence += 1
+        self.file.write(json.dumps(event, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+    def Start(self):
+        """
+        开始录制, 默认会话的句柄被置空, 下次使用时重新连接并被录制
+        :return: None
+        """
+        self.file = OpenRecording(self.file_path, "w")
+        header = {"format": RECORDING_FORMAT, "version": RECORDING_VERSION,
+                  "created": time.strftime("%Y-%m-%d %H:%M:%S"), "app": hfss.hfssAppName}
+        self.file.write(json.dumps(header) + "\n")
+        self.previous_factory = hfss.appFactory
+        hfss.appFactory = self.AppFactory
+        hfss.handleHooks.append(self.Hook)
+        backend.ResetDefaultSession()
+
+    def Stop(self):
+        hfss.handleHooks.remove(self.Hook)
+        hfss.appFactory = self.previous_factory
+        backend.ResetDefaultSession()
+        self.file.close()
+        self.file = None
+        if self.adopted:
+            print("以下句柄不是由录制的调用得到的, 回放时无法复现:", ", ".join(self.adopted))
+
+    def __enter__(self):
+        self.Start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.Stop()
+        return False
+
+
+# 回放
+class ReplayHandle(object):
+    """
+    回放句柄 方法调用由 Player 按录制顺序返回录制的结果
+    """
+    __slots__ = ("token", "player")
+
+    def __init__(self, token: str, player):
+        self.token = token
+        self.player = player
+
+    def __getattr__(self, name):
+        player = self.player
+        if player.PeekKind(self.token, name) == "get":
+            return player.Next(self.token, "get", name, ())
+
+        def Call(*args):
+            return player.Next(self.token, "call", name, args)
+        return Call
+
+    def __eq__(self, other):
+        return isinstance(other, ReplayHandle) and other.token == self.token
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash(self.token)
+
+    def __repr__(self):
+        return "<ReplayHandle %s>" % self.token
+
+
+class Player(object):
+    """
+    回放器 Start() 后默认会话连接到回放句柄, 调用按录制顺序得到录制的返回值
+    """
+
+    def __init__(self, file_path: str, verify_arguments: bool = True, replay_latency: bool = False):
+        """
+        :param file_path: 录制文件路径
+        :param verify_arguments: 为 True 时检查参数与录制时一致
+        :param replay_latency: 为 True 时按录制的耗时等待, 复现真实的调用耗时
+        """
+        self.file_path = file_path
+        self.events = LoadRecording(file_path)
+        self.verify_arguments = verify_arguments
+        self.replay_latency = replay_latency
+        self.position = 0
+        self.handles = {}
+        self.replayed = Counter()
+        self.previous_factory = None
+
+    def Handle(self, token: str) -> ReplayHandle:
+        handle = self.handles.get(token)
+        if handle is None:
+            handle = self.handles[token] = ReplayHandle(token, self)
+        return handle
+
+    def Decode(self, value):
+        if isinstance(value, list):
+            return [self.Decode(v) for v in value]
+        if isinstance(value, dict):
+            if "__tuple__" in value:
+                return tuple(self.Decode(v) for v in value["__tuple__"])
+            if "__handle__" in value:
+                return self.Handle(value["__handle__"])
+        return value
+
+    def Normalize(self, value):
+        """
+        将实际参数规范为录制文件中的形式, 用于比较
+        """
+        if isinstance(value, ReplayHandle):
+            return {"__handle__": value.token}
+        if isinstance(value, tuple):
+            return {"__tuple__": [self.Normalize(v) for v in value]}
+        if isinstance(value, list):
+            return [self.Normalize(v) for v in value]
+        return value
+
+    def PeekKind(self, token: str, method: str):
+        if self.position >= len(self.events):
+            return None
+        event = self.events[self.position]
+        if event["h"] == token and event["m"] == method:
+            return event["k"]
+        return None
+
+    def Next(self, token: str, kind: str, method: str, args):
+        if self.position >= len(self.events):
+            raise ReplayMismatch("录制的调用已全部回放, 多出的调用: %s.%s" % (token, method))
+        event = self.events[self.position]
+        if event["h"] != token or event["m"] != method or event["k"] != kind:
+            raise ReplayMismatch("第 %d 次调用不一致: 录制为 %s(%s).%s, 实际为 %s.%s" % (
+                event["i"], event["o"], event["h"], event["m"], token, method))
+        if self.verify_arguments and kind == "call" and \
+                json.loads(json.dumps(self.Normalize(list(args)))) != event["a"]:
+            raise ReplayMismatch("第 %d 次调用 %s.%s 的参数不一致" % (event["i"], event["o"], method))
+        self.position += 1
+        self.replayed[event["o"] + "." + method] += 1
+        if self.replay_latency:
+            time.sleep(event["t"])
+        if "e" in event:
+            raise RecordedComError(event["e"])
+        return self.Decode(event["r"])
+
+    def AppFactory(self, hfss_app: str, new_instance: bool):
+        return self.Handle(ROOT_TOKEN)
+
+    def Remaining(self) -> int:
+        """
+        :return: 尚未回放的调用个数
+        """
+        return len(self.events) - self.position
+
+    def RecordedLatency(self) -> float:
+        """
+        :return: 已回放调用在录制时的累计耗时 单位 s
+        """
+        return sum(event["t"] for event in self.events[:self.position])
+
+    def Start(self):
+        self.previous_factory = hfss.appFactory
+        hfss.appFactory = self.AppFactory
+        backend.ResetDefaultSession()
+
+    def Stop(self):
+        hfss.appFactory = self.previous_factory
+        backend.ResetDefaultSession()
+
+    def __enter__(self):
+        self.Start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.Stop()
+        return False
+
+
+def Record(file_path: str) -> Recorder:
+    """
+    创建录制器, 用于 with 语句
+    :param file_path: 录制文件路径, 以 .gz 结尾时使用 gzip 压缩
+    :return: Recorder
+    """
+    return Recorder(file_path)
+
+
+def Replay(file_path: str, verify_arguments: bool = True, replay_latency: bool = False) -> Player:
+    """
+    创建回放器, 用于 with 语句
+    :param file_path: 录制文件路径
+    :param verify_arguments: 为 True 时检查参数与录制时一致
+    :param replay_latency: 为 True 时按录制的耗时等待
+    :return: Player
+    """
+    return Player(file_path, verify_arguments, replay_latency)
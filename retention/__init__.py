@@ -0,0 +1,184 @@
+"""
+@FileName: retention/__init__.py
+@Description: 该文件提供长时间优化中求解数据的保留策略. 每个变化的天线参数提取后调用 RetentionPolicy.Record 记录,
+              保留集合 (得分最好的 best_n 个、最近的 recent_n 个及固定的变化) 之外的变化由
+              Design.DeleteFieldVariation 删除场数据和网格 (保留 S 参数), delete_full 为 True 时由
+              Design.DeleteFullVariation 删除全部求解数据. 结果文件夹 (.aedtresults) 不再随变化个数增长,
+              每次求解的管理开销和项目保存时间保持不变. 每次清理后记录结果文件夹的磁盘占用.
+              使用方法:
+                  policy = retention.RetentionPolicy(best_n=10, recent_n=5)
+                  for values in candidates:
+                      performance = retention.EvaluateCandidate(names, values, policy, frequency=2.5)
+                  policy.Stats()["usage"]
+@Author: SJY
+@Time: 2026/10/18
+@Coding: UTF-8
+@Vision: V1.0
+"""
+
+# Official Standard Library
+import os
+
+# Import the OSL with "from"
+from collections import OrderedDict
+from typing import Callable
+
+# Import the LL with "from"
+from hfss import ResolveContext
+from hfss import analysis, basic
+
+
+def DirectorySize(path: str) -> int:
+    """
+    文件夹中全部文件的大小 单位 byte, 不存在时为 0
+    """
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                # 求解过程中文件可能被 AEDT 删除或替换
+                pass
+    return total
+
+
+def GetResultsPath(context=None) -> str:
+    """
+    得到项目的结果文件夹 <工程路径>/<工程名>.aedtresults
+    :return: str
+    """
+    ctx = ResolveContext(context)
+    return ctx.oProject.GetPath() + "/" + ctx.oProject.GetName() + ".aedtresults"
+
+
+def GetResultsUsage(context=None) -> int:
+    """
+    结果文件夹的磁盘占用 单位 byte
+    """
+    return DirectorySize(GetResultsPath(context))
+
+
+class RetentionPolicy(object):
+    """
+    求解数据的保留策略, 按记录顺序维护各变化的得分和状态
+    """
+
+    def __init__(self, best_n: int = 10, recent_n: int = 5, pinned=(), maximize: bool = False,
+                 delete_full: bool = False, preserve_rad_fields: bool = False, batch: int = 1,
+                 track_usage: bool = True, context=None):
+        """
+        :param best_n: 保留得分最好的变化个数
+        :param recent_n: 保留最近记录的变化个数
+        :param pinned: 固定保留的变化键
+        :param maximize: 得分越大越好, 默认越小越好 (如 S11)
+        :param delete_full: 为 True 时删除全部求解数据, 否则只删除场数据和网格
+        :param preserve_rad_fields: 删除场数据时保留远场数据, 远场报告仍可用
+        :param batch: 累计 batch 个待删除的变化后一次删除, 减少调用次数
+        :param track_usage: 每次删除后统计结果文件夹的磁盘占用
+        """
+        self.ctx = ResolveContext(context)
+        self.best_n = best_n
+        self.recent_n = recent_n
+        self.pinned = set(pinned)
+        self.maximize = maximize
+        self.delete_full = delete_full
+        self.preserve_rad_fields = preserve_rad_fields
+        self.batch = batch
+        self.track_usage = track_usage
+        # {变化键: {"score": float 或 None, "index": 记录序号, "state": "kept"/"fields"/"full"}}
+        self.variations = OrderedDict()
+        self.records = 0
+        self.delete_calls = 0
+        self.usage = []  # [(记录次数, 结果文件夹占用 byte)]
+
+    def Pin(self, variation: str):
+        self.pinned.add(variation)
+
+    def Unpin(self, variation: str):
+        self.pinned.discard(variation)
+
+    def Record(self, score: float = None, variation: str = None, pin: bool = False) -> list:
+        """
+        记录已提取天线参数的变化, 之后按策略删除保留集合之外的变化
+        :param score: 变化的得分, 为 None 时只按最近记录保留
+        :param variation: 变化键, 默认为当前变化 GetNominalVariation()
+        :param pin: 是否固定保留
+        :return: 本次删除的变化键
+        """
+        if variation is None:
+            variation = self.ctx.oDesign.GetNominalVariation()
+        self.records += 1
+        # 再次求解的变化重新生成了场数据
+        self.variations.pop(variation, None)
+        self.variations[variation] = {"score": score, "index": self.records, "state": "kept"}
+        if pin:
+            self.pinned.add(variation)
+        if len(self.Pending()) >= self.batch:
+            return self.Prune()
+        return []
+
+    def KeepSet(self) -> set:
+        """
+        :return: 保留的变化键集合
+        """
+        keep = set(self.pinned)
+        recent = list(self.variations)
+        keep.update(recent[max(len(recent) - self.recent_n, 0):])
+        scored = [(item["score"], key) for key, item in self.variations.items()
+                  if item["score"] is not None and item["state"] == "kept"]
+        scored.sort(key=lambda pair: pair[0], reverse=self.maximize)
+        keep.update(key for _, key in scored[:self.best_n])
+        return keep
+
+    def Pending(self) -> list:
+        """
+        :return: 保留集合之外且尚未删除的变化键
+        """
+        keep = self.KeepSet()
+        return [key for key, item in self.variations.items() if item["state"] == "kept" and key not in keep]
+
+    def Prune(self) -> list:
+        """
+        删除保留集合之外的变化的求解数据
+        :return: 删除的变化键
+        """
+        pending = self.Pending()
+        if len(pending) == 0:
+            return []
+        if self.delete_full:
+            self.ctx.oDesign.DeleteFullVariation(pending, False)
+        else:
+            self.ctx.oDesign.DeleteFieldVariation(pending, True, False, self.preserve_rad_fields)
+        self.delete_calls += 1
+        state = "full" if self.delete_full else "fields"
+        for key in pending:
+            self.variations[key]["state"] = state
+        # 已导出的报告数据可能属于被删除的变化
+        self.ctx.oDesign.solution_state.Invalidate()
+        if self.track_usage:
+            self.usage.append((self.records, GetResultsUsage(self.ctx)))
+        return pending
+
+    def Stats(self) -> dict:
+        """
+        :return: {"recorded", "kept", "fields_deleted", "full_deleted", "delete_calls", "usage": [(记录次数, byte)]}
+        """
+        states = [item["state"] for item in self.variations.values()]
+        return {"recorded": self.records, "kept": states.count("kept"), "fields_deleted": states.count("fields"),
+                "full_deleted": states.count("full"), "delete_calls": self.delete_calls, "usage": list(self.usage)}
+
+
+def EvaluateCandidate(props_name_array, props_value_array, policy: RetentionPolicy, setup_name: str = "Setup1",
+                      frequency: float = 2.5, score: Callable[[tuple], float] = None, context=None) -> tuple:
+    """
+    ChangeVariable -> Analyze -> GetAntennaPerformance -> RetentionPolicy.Record
+    :param score: 由 (S11, BW, AR, Gain) 计算得分, 默认为 S11
+    :return: (S11, BW, AR, Gain)
+    """
+    ctx = ResolveContext(context)
+    basic.ChangeVariable(props_name_array, props_value_array, context=ctx)
+    analysis.Analyze(setup_name, ctx)
+    performance = tuple(float(v) for v in analysis.GetAntennaPerformance(frequency, ctx))
+    policy.Record(performance[0] if score is None else score(performance))
+    return performance
@@ -0,0 +1,397 @@
+"""
+@FileName: surrogate/__init__.py
+@Description: 该文件提供候选解的代理模型预筛选. 代理模型为 NumPy 实现的高斯过程回归 (平方指数核, 四个指标共用核函数),
+              由已求解的 (变量 -> S11, BW, AR, Gain) 结果训练, 预测指标的均值和标准差, 并给出满足筛选条件
+              (默认 S11 <= -10dB 且 AR <= 3dB) 的概率. 概率低于 min_probability 的候选解不再求解, 其余按概率从高到低求解.
+              新结果逐个加入时按分块公式增量训练 (O(n^2)), 每 refit_every 个结果重新选择长度尺度并完整训练.
+              使用方法:
+                  model = surrogate.Surrogate(["length", "width"], lower=[20, 20], upper=[40, 40])
+                  results = surrogate.EvaluateCandidates(["length", "width"], candidates, model)
+                  model.Stats()["saved"]  # 节省的求解次数
+              或者 pool.WorkerPool(...).Evaluate(names, candidates, surrogate=model)
+@Author: SJY
+@Time: 2026/10/18
+@Coding: UTF-8
+@Vision: V1.0
+"""
+
+# Official Standard Library
+import math
+
+# Third-party Library
+import numpy as np
+
+# Import the OSL with "from"
+from typing import Dict, List, Tuple
+
+# Import the LL with "from"
+from hfss import ResolveContext
+from hfss import analysis, basic
+from hfss.metrics import S11_THRESHOLD, AR_THRESHOLD
+
+
+# GetAntennaPerformance 返回的指标顺序
+METRICS = ("S11", "BW", "AR", "Gain")
+# 默认筛选条件 {指标: (下限, 上限)}, None 表示不限
+DEFAULT_CRITERIA = {"S11": (None, S11_THRESHOLD), "AR": (None, AR_THRESHOLD)}
+# 训练前将指标限制在该范围内, 避免 AR = 999 (无数据) 等异常值破坏模型
+METRIC_LIMITS = {"S11": (-60.0, 0.0), "BW": (0.0, None), "AR": (0.0, 40.0), "Gain": (-60.0, 60.0)}
+# 选择长度尺度时的候选值, 输入已按上下限归一化到 [0, 1]
+LENGTH_SCALES = np.geomspace(0.01, 2.0, 24)
+
+_erf = np.frompyfunc(math.erf, 1, 1)
+
+
+def NormalCdf(x) -> np.ndarray:
+    """
+    标准正态分布的累积分布函数
+    """
+    return 0.5 * (1.0 + _erf(np.asarray(x, dtype=float) / math.sqrt(2.0)).astype(float))
+
+
+def CriteriaProbability(mean, std, criteria: Dict[str, tuple]) -> np.ndarray:
+    """
+    由预测的均值和标准差计算满足全部筛选条件的概率, 各指标视为相互独立
+    :param mean: (m, 4), 列顺序为 METRICS
+    :param std: (m, 4)
+    :param criteria: {指标: (下限, 上限)}
+    :return: (m,)
+    """
+    mean, std = np.atleast_2d(mean), np.maximum(np.atleast_2d(std), 1e-12)
+    probability = np.ones(len(mean))
+    for metric, (low, high) in criteria.items():
+        i = METRICS.index(metric)
+        upper = NormalCdf((high - mean[:, i]) / std[:, i]) if high is not None else 1.0
+        lower = NormalCdf((low - mean[:, i]) / std[:, i]) if low is not None else 0.0
+        probability *= np.maximum(upper - lower, 0.0)
+    return probability
+
+
+def Kernel(a, b, length_scale: float) -> np.ndarray:
+    """
+    平方指数核 exp(-|a - b|^2 / (2 l^2))
+    :param a: (n, d)
+    :param b: (m, d)
+    :param length_scale: 长度尺度
+    :return: (n, m)
+    """
+    distance = (a * a).sum(axis=1)[:, np.newaxis] + (b * b).sum(axis=1)[np.newaxis, :] - 2.0 * a @ b.T
+    return np.exp(-0.5 * np.maximum(distance, 0.0) / (length_scale * length_scale))
+
+
+class GaussianProcess(object):
+    """
+    多输出高斯过程回归, 各输出共用核函数和长度尺度, 输出分别标准化.
+    保存核矩阵 Cholesky 因子的逆 (下三角), 增量训练和预测只需矩阵乘法
+    """
+
+    def __init__(self, length_scale: float = None, noise: float = 1e-4):
+        """
+        :param length_scale: 长度尺度, 为 None 时在 Fit 中按对数边际似然从 LENGTH_SCALES 中选择
+        :param noise: 标准化后输出的噪声方差, 同时保证矩阵正定
+        """
+        self.fixed_length_scale = length_scale
+        self.length_scale = length_scale
+        self.noise = noise
+        self.x = None
+        self.y = None
+        self.y_mean = None
+        self.y_std = None
+        self.inverse = None
+        self.alpha = None
+
+    def __Factor(self, length_scale: float):
+        lower = np.linalg.cholesky(Kernel(self.x, self.x, length_scale) + self.noise * np.eye(len(self.x)))
+        self.length_scale, self.inverse = length_scale, np.linalg.inv(lower)
+        self.alpha = self.inverse.T @ (self.inverse @ self.y)
+
+    def Fit(self, x, y):
+        """
+        完整训练
+        :param x: 输入 (n, d)
+        :param y: 输出 (n, k)
+        :return: self
+        """
+        self.x = np.array(x, dtype=float)
+        y = np.array(y, dtype=float)
+        self.y_mean = y.mean(axis=0)
+        self.y_std = y.std(axis=0)
+        self.y_std[self.y_std == 0] = 1.0
+        self.y = (y - self.y_mean) / self.y_std
+        if self.fixed_length_scale is None:
+            best = None
+            for length_scale in LENGTH_SCALES:
+                try:
+                    lower = np.linalg.cholesky(Kernel(self.x, self.x, length_scale) + self.noise * np.eye(len(self.x)))
+                except np.linalg.LinAlgError:
+                    continue
+                # 各输出的对数边际似然之和 (省略常数项), y^T K^-1 y = |L^-1 y|^2
+                whitened = np.linalg.solve(lower, self.y)
+                likelihood = -0.5 * (whitened * whitened).sum() - self.y.shape[1] * np.log(np.diag(lower)).sum()
+                if best is None or likelihood > best[0]:
+                    best = (likelihood, length_scale)
+            if best is None:
+                raise np.linalg.LinAlgError("核矩阵不正定, 请增大 noise")
+            self.__Factor(best[1])
+        else:
+            self.__Factor(self.length_scale)
+        return self
+
+    def Add(self, x, y):
+        """
+        增量训练: 保持长度尺度和输出标准化不变, 按分块公式扩展 Cholesky 因子的逆, O(n^2)
+        :param x: 新输入 (m, d)
+        :param y: 新输出 (m, k)
+        :return: self
+        """
+        if self.x is None:
+            return self.Fit(x, y)
+        x = np.array(x, dtype=float)
+        y = (np.array(y, dtype=float) - self.y_mean) / self.y_std
+        cross = self.inverse @ Kernel(self.x, x, self.length_scale)
+        schur = Kernel(x, x, self.length_scale) + self.noise * np.eye(len(x)) - cross.T @ cross
+        try:
+            corner = np.linalg.inv(np.linalg.cholesky(schur))
+        except np.linalg.LinAlgError:
+            # 与已有点几乎重合时数值上不正定, 改为完整训练
+            return self.Fit(np.vstack([self.x, x]), np.vstack([self.y, y]) * self.y_std + self.y_mean)
+        n, m = len(self.x), len(x)
+        inverse = np.zeros((n + m, n + m))
+        inverse[:n, :n] = self.inverse
+        inverse[n:, :n] = -corner @ cross.T @ self.inverse
+        inverse[n:, n:] = corner
+        self.inverse = inverse
+        self.x = np.vstack([self.x, x])
+        self.y = np.vstack([self.y, y])
+        self.alpha = inverse.T @ (inverse @ self.y)
+        return self
+
+    def Predict(self, x) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        预测
+        :param x: 输入 (m, d)
+        :return: (均值 (m, k), 标准差 (m, k))
+        """
+        cross = Kernel(np.asarray(x, dtype=float), self.x, self.length_scale)
+        mean = cross @ self.alpha * self.y_std + self.y_mean
+        v = self.inverse @ cross.T
+        variance = np.maximum(1.0 - (v * v).sum(axis=0), 0.0)
+        return mean, np.sqrt(variance)[:, np.newaxis] * self.y_std
+
+
+class Surrogate(object):
+    """
+    候选解预筛选的代理模型
+    """
+
+    def __init__(self, names: List[str], lower=None, upper=None, criteria: Dict[str, tuple] = None,
+                 min_observations: int = 10, min_probability: float = 0.01, refit_every: int = 20,
+                 length_scale: float = None, noise: float = 1e-4):
+        """
+        :param names: 变量名列表, 候选解的变量值按此顺序排列
+        :param lower: 各变量的下限, 用于归一化输入, 为 None 时取第一次训练数据的最小值
+        :param upper: 各变量的上限, 为 None 时取第一次训练数据的最大值
+        :param criteria: 筛选条件 {指标: (下限, 上限)}, 默认为 DEFAULT_CRITERIA
+        :param min_observations: 少于该结果数时不做筛选, 全部求解
+        :param min_probability: 满足筛选条件的预测概率低于该值的候选解不求解
+        :param refit_every: 每加入该数量的结果后完整训练一次, 其间增量训练
+        :param length_scale: 归一化输入下的长度尺度, 为 None 时自动选择
+        :param noise: 标准化输出的噪声方差
+        """
+        self.names = list(names)
+        self.lower = None if lower is None else np.asarray(lower, dtype=float)
+        self.upper = None if upper is None else np.asarray(upper, dtype=float)
+        self.criteria = dict(DEFAULT_CRITERIA if criteria is None else criteria)
+        unknown = set(self.criteria) - set(METRICS)
+        if unknown:
+            raise ValueError("未知的指标: " + ", ".join(sorted(unknown)))
+        self.min_observations = min_observations
+        self.min_probability = min_probability
+        self.refit_every = refit_every
+        self.process = GaussianProcess(length_scale, noise)
+        self.x = np.zeros((0, len(self.names)))
+        self.y = np.zeros((0, len(METRICS)))
+        self.pending = 0
+        self.trained = 0
+        self.screened = 0
+        self.skipped = 0
+        self.solved = 0
+
+    def __Scale(self, values) -> np.ndarray:
+        values = np.atleast_2d(np.asarray(values, dtype=float))
+        if values.shape[1] != len(self.names):
+            raise ValueError("候选解的变量个数应为 %d: %s" % (len(self.names), values.shape))
+        return (values - self.lower) / (self.upper - self.lower)
+
+    def Observe(self, values, performance):
+        """
+        加入已求解的结果
+        :param values: 变量值列表, 或多个候选解的二维列表
+        :param performance: (S11, BW, AR, Gain), 或与 values 对应的二维列表
+        :return: None
+        """
+        values = np.atleast_2d(np.asarray(values, dtype=float))
+        performance = np.atleast_2d(np.asarray(performance, dtype=float))
+        for i, metric in enumerate(METRICS):
+            low, high = METRIC_LIMITS[metric]
+            performance[:, i] = np.clip(performance[:, i], low, high)
+        self.x = np.vstack([self.x, values])
+        self.y = np.vstack([self.y, performance])
+        self.pending += len(values)
+
+    def Train(self, full: bool = False):
+        """
+        用尚未加入的结果训练模型, 达到 refit_every 或 full 为 True 时完整训练, 否则增量训练
+        :return: None
+        """
+        if len(self.x) == 0 or (self.pending == 0 and not full):
+            return
+        if self.lower is None or self.upper is None:
+            if self.lower is None:
+                self.lower = self.x.min(axis=0)
+            if self.upper is None:
+                self.upper = self.x.max(axis=0)
+            self.upper = np.where(self.upper > self.lower, self.upper, self.lower + 1.0)
+        if full or self.process.x is None or len(self.x) - self.trained >= self.refit_every:
+            self.process.Fit(self.__Scale(self.x), self.y)
+            self.trained = len(self.x)
+        else:
+            self.process.Add(self.__Scale(self.x[-self.pending:]), self.y[-self.pending:])
+        self.pending = 0
+
+    @property
+    def ready(self) -> bool:
+        """
+        结果数不少于 min_observations 时可用于筛选
+        """
+        return len(self.x) >= self.min_observations
+
+    def Predict(self, candidates) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        预测候选解的指标
+        :param candidates: 候选解的二维列表 (m, 变量数)
+        :return: (均值 (m, 4), 标准差 (m, 4)), 列顺序为 METRICS
+        """
+        self.Train()
+        if self.process.x is None:
+            raise ValueError("代理模型还没有训练数据")
+        return self.process.Predict(self.__Scale(candidates))
+
+    def Probability(self, candidates) -> np.ndarray:
+        """
+        预测候选解满足全部筛选条件的概率, 各指标视为相互独立
+        :return: (m,)
+        """
+        return CriteriaProbability(*self.Predict(candidates), self.criteria)
+
+    def Rank(self, candidates) -> List[dict]:
+        """
+        预测一组候选解并按满足条件的概率从高到低排序, 不计入统计
+        :param candidates: 候选解的二维列表
+        :return: 每个候选解一个 {"index", "skip", "probability", "predicted", "std"}, 按 probability 从高到低排列,
+                 训练数据不足时全部保留, probability 等为 None 且保持原顺序
+        """
+        candidates = [list(values) for values in candidates]
+        if not self.ready or len(candidates) == 0:
+            return [{"index": i, "skip": False, "probability": None, "predicted": None, "std": None}
+                    for i in range(len(candidates))]
+        mean, std = self.Predict(candidates)
+        probability = CriteriaProbability(mean, std, self.criteria)
+        decisions = []
+        for i in np.argsort(-probability, kind="stable"):
+            decisions.append({"index": int(i), "skip": bool(probability[i] < self.min_probability), "probability": float(probability[i]),
+                              "predicted": tuple(float(v) for v in mean[i]),
+                              "std": tuple(float(v) for v in std[i])})
+        return decisions
+
+    def Screen(self, candidates) -> List[dict]:
+        """
+        预筛选一组候选解, 与 Rank 相同, 并将 skip 为 True 的候选解计为节省的求解
+        """
+        decisions = self.Rank(candidates)
+        self.screened += len(decisions)
+        self.skipped += sum(decision["skip"] for decision in decisions)
+        return decisions
+
+    def Stats(self) -> dict:
+        """
+        :return: {"observations", "screened", "skipped", "solved", "saved": 节省的求解次数,
+                  "saved_fraction": 节省的求解次数 / 筛选的候选解数, "length_scale"}
+        """
+        return {"observations": len(self.x), "screened": self.screened, "skipped": self.skipped,
+                "solved": self.solved, "saved": self.skipped,
+                "saved_fraction": self.skipped / self.screened if self.screened else 0.0,
+                "length_scale": None if self.process.length_scale is None else float(self.process.length_scale)}
+
+    def Save(self, file_path: str) -> str:
+        """
+        保存训练数据 (.npz), 筛选条件等设置不保存
+        :return: 文件路径
+        """
+        np.savez(file_path, names=np.array(self.names), x=self.x, y=self.y,
+                 lower=self.lower if self.lower is not None else np.array([]),
+                 upper=self.upper if self.upper is not None else np.array([]))
+        return file_path if file_path.endswith(".npz") else file_path + ".npz"
+
+    @classmethod
+    def Load(cls, file_path: str, **kwargs):
+        """
+        由 Save 保存的文件创建代理模型, 变量上下限未在 kwargs 中给出时使用文件中的值
+        :param kwargs: 见 Surrogate.__init__
+        :return: Surrogate
+        """
+        with np.load(file_path) as data:
+            names = [str(name) for name in data["names"]]
+            for key in ("lower", "upper"):
+                if kwargs.get(key) is None and data[key].size:
+                    kwargs[key] = data[key]
+            model = cls(names, **kwargs)
+            if len(data["x"]):
+                model.Observe(data["x"], data["y"])
+        return model
+
+
+def EvaluateCandidates(props_name_array, candidates, model: Surrogate, setup_name: str = "Setup1",
+                       frequency: float = 2.5, context=None, results=None) -> List[dict]:
+    """
+    依次求解一组候选解, 求解前用代理模型预筛选: 按满足条件的概率从高到低求解, 每个结果加入模型后重新预测,
+    概率低于 model.min_probability 的候选解不求解
+    :param props_name_array: 变量名列表, 顺序须与 model.names 相同
+    :param candidates: 候选解的二维列表, 变量值单位为 mm
+    :param model: Surrogate
+    :param setup_name: 求解设置名称
+    :param frequency: 单位 GHz
+    :param results: hfss.cache.ResultCache, 给出时先查询结果缓存
+    :return: 按 candidates 顺序的 {"index", "values", "performance", "skipped", "probability"},
+             跳过的候选解 performance 为预测值
+    """
+    if list(props_name_array) != model.names:
+        raise ValueError("变量名与代理模型不一致: %s, %s" % (list(props_name_array), model.names))
+    ctx = ResolveContext(context)
+    candidates = [list(values) for values in candidates]
+    outputs = [None] * len(candidates)
+    order = [decision["index"] for decision in model.Rank(candidates)]
+    for index in order:
+        values = candidates[index]
+        probability = None
+        if model.ready:
+            mean, std = model.Predict([values])
+            probability = float(CriteriaProbability(mean, std, model.criteria)[0])
+            if probability < model.min_probability:
+                outputs[index] = {"index": index, "values": values, "performance": tuple(float(v) for v in mean[0]),
+                                  "skipped": True, "probability": probability}
+                continue
+        if results is not None:
+            from hfss import cache
+            performance = cache.EvaluateCandidate(props_name_array, values, results, setup_name, frequency, ctx)
+        else:
+            basic.ChangeVariable(props_name_array, values, context=ctx)
+            analysis.Analyze(setup_name, ctx)
+            performance = tuple(float(v) for v in analysis.GetAntennaPerformance(frequency, ctx))
+        model.Observe(values, performance)
+        model.solved += 1
+        outputs[index] = {"index": index, "values": values, "performance": tuple(performance), "skipped": False,
+                          "probability": probability}
+    model.screened += len(outputs)
+    model.skipped += sum(output["skipped"] for output in outputs)
+    return outputs
@@ -0,0 +1,338 @@
+"""
+@FileName: touchstone/__init__.py
+@Description: 该文件提供 Touchstone v1/v2 (.sNp, .ts) 文件的读取, 用于载入 ExportNetworkData 导出的网络参数.
+              数据段单次扫描, 去除注释后由 NumPy 直接解析为浮点数组, 再转换为复数数组 (频点数, N, N);
+              支持 MA/RI/DB 格式、S/Y/Z/H/G 参数、v2 的 [Two-Port Data Order] 和 Lower/Upper 矩阵格式.
+              大于内存的文件可用 IterTouchstone 按频点分块读取. 噪声参数 (二端口 v1 文件末尾及 v2 [Noise Data]) 被忽略.
+              使用方法:
+                  network = touchstone.ReadTouchstone("P://data/NetworkData.s4p")
+                  network.freqs, network.data[:, 0, 0]
+                  for freqs, data in touchstone.IterTouchstone(file_path, 10000): ...
+@Author: SJY
+@Time: 2026/10/18
+@Coding: UTF-8
+@Vision: V1.0
+"""
+
+# Official Standard Library
+import os
+import re
+import warnings
+
+# Third-party Library
+import numpy as np
+
+# Import the OSL with "from"
+from typing import Iterator, List, Tuple
+
+
+# 频率单位换算为 GHz
+FREQUENCY_UNITS = {"HZ": 1e-9, "KHZ": 1e-6, "MHZ": 1e-3, "GHZ": 1.0}
+PARAMETERS = ("S", "Y", "Z", "H", "G")
+FORMATS = ("MA", "RI", "DB")
+# IterTouchstone 每次从文件读取的字节数
+READ_BYTES = 1 << 22
+# IterTouchstone 默认每块的频点数
+CHUNK_FREQUENCIES = 65536
+
+_COMMENT = re.compile(rb"![^\n]*")
+_PORTS_IN_NAME = re.compile(r"\.s(\d+)p$", re.IGNORECASE)
+
+
+class TouchstoneError(Exception):
+    """
+    Touchstone 文件格式错误或使用了不支持的特性
+    """
+    pass
+
+
+class TouchstoneHeader(object):
+    """
+    Touchstone 文件头: 选项行 (# GHz S MA R 50) 及 v2 关键字
+    """
+
+    def __init__(self):
+        self.version = 1.0
+        self.ports = 0
+        self.frequency_scale = FREQUENCY_UNITS["GHZ"]
+        self.parameter = "S"
+        self.format = "MA"
+        self.reference = [50.0]
+        self.two_port_order = "21_12"
+        self.matrix_format = "FULL"
+        self.frequency_count = None
+        self.data_offset = 0  # 数据段在文件中的字节偏移
+
+    @property
+    def values_per_frequency(self) -> int:
+        """
+        每个频点的实数个数 (不含频率)
+        """
+        if self.matrix_format == "FULL":
+            return 2 * self.ports * self.ports
+        return self.ports * (self.ports + 1)
+
+    def References(self) -> np.ndarray:
+        """
+        各端口的参考阻抗 单位 ohm
+        """
+        reference = np.asarray(self.reference, dtype=float)
+        if len(reference) == 1:
+            return np.full(self.ports, reference[0])
+        return reference
+
+
+class TouchstoneData(object):
+    """
+    网络参数数据
+    freqs: 频率数组 单位 GHz
+    data: 复数数组 (频点数, N, N), Y/Z 参数为非归一化值
+    """
+
+    def __init__(self, header: TouchstoneHeader, freqs: np.ndarray, data: np.ndarray):
+        self.header = header
+        self.freqs = freqs
+        self.data = data
+
+    @property
+    def ports(self) -> int:
+        return self.header.ports
+
+    @property
+    def parameter(self) -> str:
+        return self.header.parameter
+
+    @property
+    def reference(self) -> np.ndarray:
+        return self.header.References()
+
+    def dB(self, row: int = 1, column: int = 1) -> np.ndarray:
+        """
+        某一参数的 dB 值, 如 dB(1, 1) 即 dB(S(1,1)), 端口序号从 1 开始
+        """
+        return 20.0 * np.log10(np.maximum(np.abs(self.data[:, row - 1, column - 1]), 1e-300))
+
+
+def _Keyword(line: str) -> Tuple[str, str]:
+    """
+    解析 v2 关键字行 "[Number of Ports] 4" -> ("NUMBER OF PORTS", "4")
+    """
+    end = line.index("]")
+    return line[1:end].strip().upper(), line[end + 1:].strip()
+
+
+def ReadHeader(file_path: str) -> TouchstoneHeader:
+    """
+    读取文件头, 确定端口数、单位、格式及数据段的起始位置
+    :param file_path: 文件路径
+    :return: TouchstoneHeader
+    """
+    header = TouchstoneHeader()
+    match = _PORTS_IN_NAME.search(file_path)
+    if match is not None:
+        header.ports = int(match.group(1))
+    option_found = False
+    reference_pending = False
+    offset = 0
+    with open(file_path, "rb") as f:
+        for raw in f:
+            line_offset = offset
+            offset += len(raw)
+            line = raw.split(b"!", 1)[0].decode("ascii", "replace").strip()
+            if not line:
+                continue
+            if reference_pending and not line.startswith("["):
+                # [Reference] 的阻抗可跨多行
+                header.reference += [float(v) for v in line.split()]
+                continue
+            reference_pending = False
+            if line.startswith("#"):
+                if option_found:
+                    continue  # 只有第一个选项行有效
+                option_found = True
+                tokens = line[1:].upper().split()
+                i = 0
+                while i < len(tokens):
+                    token = tokens[i]
+                    if token in FREQUENCY_UNITS:
+                        header.frequency_scale = FREQUENCY_UNITS[token]
+                    elif token in PARAMETERS:
+                        header.parameter = token
+                    elif token in FORMATS:
+                        header.format = token
+                    elif token == "R" and i + 1 < len(tokens):
+                        header.reference = [float(tokens[i + 1])]
+                        i += 1
+                    else:
+                        raise TouchstoneError("无法识别的选项: " + token)
+                    i += 1
+                continue
+            if line.startswith("["):
+                keyword, value = _Keyword(line)
+                if keyword == "VERSION":
+                    header.version = float(value)
+                elif keyword == "NUMBER OF PORTS":
+                    header.ports = int(value)
+                elif keyword == "TWO-PORT DATA ORDER":
+                    header.two_port_order = value
+                elif keyword == "NUMBER OF FREQUENCIES":
+                    header.frequency_count = int(value)
+                elif keyword == "REFERENCE":
+                    header.reference = [float(v) for v in value.split()]
+                    reference_pending = True
+                elif keyword == "MATRIX FORMAT":
+                    header.matrix_format = value.upper()
+                elif keyword == "MIXED-MODE ORDER":
+                    raise TouchstoneError("不支持混合模式参数")
+                elif keyword == "NETWORK DATA":
+                    header.data_offset = offset
+                    break
+                continue
+            # v1 文件的第一行数据
+            header.data_offset = line_offset
+            break
+    if header.ports <= 0:
+        raise TouchstoneError("无法确定端口数: " + file_path)
+    if header.matrix_format not in ("FULL", "LOWER", "UPPER"):
+        raise TouchstoneError("不支持的矩阵格式: " + header.matrix_format)
+    return header
+
+
+def _DataText(block: bytes) -> Tuple[str, bool]:
+    """
+    去除注释, 截止到数据段之后的第一个关键字 ([Noise Data], [End] 等)
+    :return: (数据文本, 是否遇到数据段结束)
+    """
+    if b"!" in block:
+        block = _COMMENT.sub(b"", block)
+    end = block.find(b"[")
+    if end >= 0:
+        return block[:end].decode("ascii"), True
+    return block.decode("ascii"), False
+
+
+def _ParseNumbers(text: str, file_path: str = "", first_line: int = 1) -> np.ndarray:
+    """
+    将以空白分隔的数字文本解析为一维浮点数组
+    :param file_path: 文件路径, 用于错误信息
+    :param first_line: text 第一行在文件中的行号, 用于错误信息
+    """
+    if not text.strip():
+        return np.empty(0)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", DeprecationWarning)
+        try:
+            return np.fromstring(text, sep=" ")
+        except (DeprecationWarning, ValueError):
+            # numpy 1.x 给出 DeprecationWarning, 2.x 抛出 ValueError
+            pass
+    for number, line in enumerate(text.splitlines(), first_line):
+        for token in line.split():
+            try:
+                float(token)
+            except ValueError:
+                raise TouchstoneError("%s 第 %d 行存在无法解析的内容: %s" % (file_path, number, line.strip()))
+    raise TouchstoneError("%s 第 %d 行之后的数据段中存在无法解析的内容" % (file_path, first_line))
+
+
+def _ToMatrix(values: np.ndarray, header: TouchstoneHeader) -> np.ndarray:
+    """
+    将每行 values_per_frequency 个实数转换为 (频点数, N, N) 复数数组
+    """
+    a, b = values[:, 0::2], values[:, 1::2]
+    if header.format == "RI":
+        pairs = a + 1j * b
+    else:
+        magnitude = a if header.format == "MA" else 10.0 ** (a / 20.0)
+        pairs = magnitude * np.exp(1j * np.deg2rad(b))
+    n = header.ports
+    if header.matrix_format == "FULL":
+        data = pairs.reshape(-1, n, n)
+        if n == 2 and header.two_port_order == "21_12":
+            # 二端口数据的顺序为 N11 N21 N12 N22
+            data = data.transpose(0, 2, 1)
+    else:
+        data = np.zeros((len(pairs), n, n), dtype=complex)
+        rows, columns = np.tril_indices(n) if header.matrix_format == "LOWER" else np.triu_indices(n)
+        data[:, rows, columns] = pairs
+        data[:, columns, rows] = pairs
+    if header.version < 2.0 and header.parameter in ("Y", "Z"):
+        # v1 文件中的 Y/Z 参数为归一化值
+        scale = header.reference[0] if header.parameter == "Z" else 1.0 / header.reference[0]
+        data = data * scale
+    return np.ascontiguousarray(data)
+
+
+def IterTouchstone(file_path: str, chunk_frequencies: int = CHUNK_FREQUENCIES,
+                   header: TouchstoneHeader = None) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    按频点分块读取 Touchstone 文件, 内存占用与块大小成正比, 与文件大小无关
+    :param file_path: 文件路径
+    :param chunk_frequencies: 每块的频点数
+    :param header: 已读取的文件头, 为 None 时读取
+    :return: 迭代器, 每次返回 (频率数组 单位 GHz, 复数数组 (频点数, N, N))
+    """
+    if header is None:
+        header = ReadHeader(file_path)
+    width = 1 + header.values_per_frequency
+    pending = np.empty(0)
+    previous = -np.inf
+    with open(file_path, "rb") as f:
+        # 数据段第一行的行号, 用于错误信息
+        line_number = f.read(header.data_offset).count(b"\n") + 1
+        f.seek(header.data_offset)
+        tail = b""
+        finished = False
+        while not finished:
+            block = f.read(READ_BYTES)
+            if block:
+                block = tail + block
+                cut = block.rfind(b"\n")
+                if cut < 0:
+                    tail = block
+                    continue
+                block, tail = block[:cut + 1], block[cut + 1:]
+            else:
+                block, tail, finished = tail, b"", True
+            text, end = _DataText(block)
+            finished = finished or end
+            numbers = _ParseNumbers(text, file_path, line_number)
+            line_number += block.count(b"\n")
+            if len(pending):
+                numbers = np.concatenate((pending, numbers))
+            count = len(numbers) // width
+            records = numbers[:count * width].reshape(count, width)
+            pending = numbers[count * width:]
+            # 频率不再递增说明进入了二端口 v1 文件末尾的噪声参数
+            increasing = np.diff(np.concatenate(([previous], records[:, 0]))) > 0
+            if not increasing.all():
+                records = records[:int(np.argmin(increasing))]
+                pending, finished = np.empty(0), True
+            if len(records):
+                previous = records[-1, 0]
+            for start in range(0, len(records), chunk_frequencies):
+                chunk = records[start:start + chunk_frequencies]
+                yield chunk[:, 0] * header.frequency_scale, _ToMatrix(chunk[:, 1:], header)
+    if len(pending):
+        raise TouchstoneError("数据段的数值个数不是每个频点 %d 个的整数倍" % width)
+
+
+def ReadTouchstone(file_path: str) -> TouchstoneData:
+    """
+    读取整个 Touchstone 文件
+    :param file_path: 文件路径, 如 ExportNetworkData 导出的 .sNp 文件
+    :return: TouchstoneData
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(file_path)
+    header = ReadHeader(file_path)
+    freqs: List[np.ndarray] = []
+    data: List[np.ndarray] = []
+    for chunk_freqs, chunk_data in IterTouchstone(file_path, CHUNK_FREQUENCIES, header):
+        freqs.append(chunk_freqs)
+        data.append(chunk_data)
+    if len(data) == 0:
+        return TouchstoneData(header, np.empty(0), np.empty((0, header.ports, header.ports), dtype=complex))
+    if len(data) == 1:
+        return TouchstoneData(header, freqs[0], data[0])
+    return TouchstoneData(header, np.concatenate(freqs), np.concatenate(data))